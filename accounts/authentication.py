@@ -0,0 +1,101 @@
+# JWT 인증 사용자 캐시
+# - 토큰의 user_id로 매 요청 User를 조회하지 않고 공유 캐시(Django cache)에 USER_CACHE_TIMEOUT 동안 보관
+#   프로필 수정/비밀번호 변경/탈퇴 등 User 저장·삭제 시 accounts.signals에서 캐시 삭제
+# - 요청 단위 identity map: 인증한 사용자와 get_active_user로 불러온 사용자를 요청 객체에 보관해
+#   같은 요청 안에서 같은 사용자를 다시 조회하지 않음
+# - 캐시된 User는 읽기 전용으로 사용 (수정 후 save()하는 곳은 DB에서 새로 조회)
+import redis
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+USER_CACHE_TIMEOUT = 60  # 초
+USER_CACHE_KEY = "auth:user:{}"
+
+
+def user_cache_key(user_id):
+    return USER_CACHE_KEY.format(user_id)
+
+
+def invalidate_user(user_id):
+    try:
+        cache.delete(user_cache_key(user_id))
+    except redis.RedisError:
+        pass
+
+
+def get_cached_user(user_id):
+    """
+    캐시에 없으면 DB에서 조회해 캐시 (캐시 장애 시 DB 조회)
+    없는 사용자면 DoesNotExist
+    """
+    key = user_cache_key(user_id)
+    try:
+        user = cache.get(key)
+    except redis.RedisError:
+        user = None
+    if user is None:
+        user = get_user_model().objects.get(pk=user_id)
+        try:
+            cache.set(key, user, USER_CACHE_TIMEOUT)
+        except redis.RedisError:
+            pass
+    return user
+
+
+def identity_map(request):
+    # DRF Request가 감싼 HttpRequest에 보관 (같은 요청의 모든 Request 객체가 공유)
+    request = getattr(request, "_request", request)
+    if not hasattr(request, "_user_identity_map"):
+        request._user_identity_map = {}
+    return request._user_identity_map
+
+
+def get_active_user(request, user_id):
+    """
+    조회 전용 사용자 조회 (get_user_model().objects.get(pk=user_id, is_active=True) 대체)
+    없거나 탈퇴한 사용자면 DoesNotExist
+    """
+    users = identity_map(request)
+    try:
+        user_id = int(user_id)
+    except (TypeError, ValueError):
+        raise get_user_model().DoesNotExist
+    user = users.get(user_id)
+    if user is None:
+        user = users[user_id] = get_cached_user(user_id)
+    if not user.is_active:
+        raise get_user_model().DoesNotExist
+    return user
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def authenticate(self, request):
+        result = super().authenticate(request)
+        if result is not None:
+            identity_map(request)[result[0].pk] = result[0]
+        return result
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken("Token contained no recognizable user identification")
+
+        try:
+            user = get_cached_user(user_id)
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+
+        if not user.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed("The user's password has been changed.", code="password_changed")
+
+        return user
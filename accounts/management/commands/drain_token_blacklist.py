@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from accounts.token_store import RedisTokenStore
+
+
+class Command(BaseCommand):
+    help = (
+        "simplejwt token_blacklist 테이블(OutstandingToken/BlacklistedToken)의 만료되지 않은 토큰을 "
+        "Redis 저장소(accounts.token_store.RedisTokenStore)로 옮깁니다. TOKEN_STORE를 Redis로 바꿔 배포한 직후 실행하고, "
+        "--delete를 주면 옮긴 뒤 테이블을 비웁니다. 여러 번 실행해도 안전합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch", type=int, default=5000, help="한 번에 옮길 행 수")
+        parser.add_argument("--delete", action="store_true", help="옮긴 뒤 테이블의 모든 행 삭제")
+
+    def handle(self, *args, **options):
+        store = RedisTokenStore()
+        now = timezone.now()
+        rows = (
+            OutstandingToken.objects.filter(expires_at__gt=now)
+            .values_list("pk", "jti", "user_id", "expires_at", "blacklistedtoken__id")
+            .order_by("pk")
+        )
+        blacklisted_count = outstanding_count = 0
+        last_pk = 0
+        while True:
+            batch = list(rows.filter(pk__gt=last_pk)[:options["batch"]])
+            if not batch:
+                break
+            last_pk = batch[-1][0]
+            blacklisted, outstanding = [], []
+            for _, jti, user_id, expires_at, blacklisted_id in batch:
+                if blacklisted_id:
+                    blacklisted.append((jti, expires_at.timestamp()))
+                else:
+                    outstanding.append((jti, user_id, expires_at.timestamp()))
+            store.import_tokens(blacklisted, outstanding)
+            blacklisted_count += len(blacklisted)
+            outstanding_count += len(outstanding)
+
+        self.stdout.write(f"블랙리스트 {blacklisted_count}개, 발급 기록 {outstanding_count}개를 Redis로 옮겼습니다.")
+        if options["delete"]:
+            # BlacklistedToken을 먼저 지워 OutstandingToken 삭제 시 CASCADE 조회를 줄임
+            deleted, _ = BlacklistedToken.objects.all().delete()
+            deleted += OutstandingToken.objects.all().delete()[0]
+            self.stdout.write(self.style.SUCCESS(f"테이블에서 {deleted}행을 삭제했습니다."))
@@ -1,6 +1,7 @@
 from datetime import timedelta
 
 from django.contrib.auth.models import AbstractUser, BaseUserManager
+from django.contrib.contenttypes.fields import GenericRelation
 from django.db import models
 from django.utils import timezone
 
@@ -47,6 +48,9 @@ class User(AbstractUser):
         blank=True,
         null=True,
     )
+    renditions = GenericRelation(
+        "commons.ImageRendition", content_type_field="content_type", object_id_field="content_id"
+    )  # 이미지 변환본 (commons.images)
     is_maker = models.BooleanField(default=False)
     introduce = models.TextField()
     game_category = models.ManyToManyField(
@@ -0,0 +1,114 @@
+# 소셜 로그인(구글, 네이버, 카카오, 디스코드) 외부 요청
+# - 프로세스마다 하나의 requests 세션을 공유해 커넥션(TLS 핸드셰이크)을 재사용하고, 제공자별 타임아웃 적용
+# - 구글은 토큰 교환 응답의 id_token을 서버에서 직접 검증 (tokeninfo 호출 없음)
+#   서명 키(JWKS)는 캐시해 두고 Cache-Control max-age가 지나거나 모르는 kid가 오면 다시 받음
+import threading
+import time
+
+import jwt
+import requests
+
+from spartagames import config
+from spartagames.utils import http_session
+
+
+# (연결, 응답) 초
+PROVIDER_TIMEOUTS = {
+    "google": (3.05, 5),
+    "naver": (3.05, 5),
+    "kakao": (3.05, 5),
+    "discord": (3.05, 8),
+}
+
+GOOGLE_CERTS_URL = "https://www.googleapis.com/oauth2/v3/certs"
+GOOGLE_ISSUERS = ("https://accounts.google.com", "accounts.google.com")
+JWKS_DEFAULT_MAX_AGE = 60 * 60  # Cache-Control이 없을 때 (초)
+JWKS_MIN_REFRESH_INTERVAL = 60  # 모르는 kid로 인한 재요청 최소 간격 (초)
+ID_TOKEN_LEEWAY = 30  # 서버 시계 오차 허용 (초)
+
+session = http_session()
+
+
+class OAuthError(Exception):
+    pass
+
+
+def request(provider, method, url, **kwargs):
+    """
+    제공자 API 요청 후 JSON 응답 반환
+    """
+    try:
+        response = session.request(method, url, timeout=PROVIDER_TIMEOUTS[provider], **kwargs)
+    except requests.RequestException as e:
+        raise OAuthError(f"{provider} 요청 실패 ({str(e)})")
+    try:
+        return response.json()
+    except ValueError:
+        raise OAuthError(f"{provider} 응답을 해석할 수 없습니다. (HTTP {response.status_code})")
+
+
+class GoogleKeySet:
+    """
+    구글 id_token 서명 키 캐시 (프로세스 단위, 스레드 간 공유)
+    """
+
+    def __init__(self, url=GOOGLE_CERTS_URL):
+        self.url = url
+        self.keys = {}
+        self.expires_at = 0
+        self.fetched_at = 0
+        self.lock = threading.Lock()
+
+    def _max_age(self, response):
+        for directive in response.headers.get("Cache-Control", "").split(","):
+            name, _, value = directive.strip().partition("=")
+            if name == "max-age" and value.isdigit():
+                return int(value)
+        return JWKS_DEFAULT_MAX_AGE
+
+    def refresh(self):
+        try:
+            response = session.get(self.url, timeout=PROVIDER_TIMEOUTS["google"])
+            response.raise_for_status()
+            jwk_set = jwt.PyJWKSet.from_dict(response.json())
+        except (requests.RequestException, ValueError, jwt.PyJWTError) as e:
+            raise OAuthError(f"구글 서명 키를 가져오지 못했습니다. ({str(e)})")
+        now = time.monotonic()
+        self.keys = {key.key_id: key for key in jwk_set.keys}
+        self.fetched_at = now
+        self.expires_at = now + self._max_age(response)
+
+    def get(self, kid):
+        with self.lock:
+            now = time.monotonic()
+            # 키 교체 직후에는 캐시에 없는 kid가 올 수 있으므로 간격을 두고 다시 받음
+            if now >= self.expires_at or (kid not in self.keys and now - self.fetched_at >= JWKS_MIN_REFRESH_INTERVAL):
+                self.refresh()
+            key = self.keys.get(kid)
+        if key is None:
+            raise OAuthError("알 수 없는 구글 서명 키입니다.")
+        return key
+
+
+google_keys = GoogleKeySet()
+
+
+def verify_google_id_token(id_token):
+    """
+    서명, 발급자, 대상(client_id), 만료 시각 검증 후 클레임 반환
+    """
+    try:
+        kid = jwt.get_unverified_header(id_token).get("kid")
+        claims = jwt.decode(
+            id_token,
+            google_keys.get(kid).key,
+            algorithms=["RS256"],
+            audience=config.GOOGLE_AUTH["client_id"],
+            leeway=ID_TOKEN_LEEWAY,
+            options={"require": ["exp", "iat", "iss", "aud"]},
+        )
+    except jwt.PyJWTError as e:
+        raise OAuthError(f"유효하지 않은 구글 id_token입니다. ({str(e)})")
+    if claims["iss"] not in GOOGLE_ISSUERS:
+        raise OAuthError("유효하지 않은 구글 id_token 발급자입니다.")
+    return claims
@@ -1,3 +1,284 @@
-from django.test import TestCase
+import io
+import time
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+import jwt
+import redis
+import requests
+from cryptography.hazmat.primitives.asymmetric import rsa
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from games.tests import use_fake_redis
+from . import oauth, token_store
+from .tokens import RefreshToken, TokenRefreshSerializer
+
+
+CLIENT_ID = "client-id.apps.googleusercontent.com"
+
+
+def rsa_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def jwk(private_key, kid):
+    key = jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key(), as_dict=True)
+    key.update({"kid": kid, "use": "sig", "alg": "RS256"})
+    return key
+
+
+class FakeResponse:
+    def __init__(self, body, headers=None, status_code=200):
+        self.body = body
+        self.headers = headers or {}
+        self.status_code = status_code
+
+    def json(self):
+        return self.body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"HTTP {self.status_code}")
+
+
+class GoogleIdTokenTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.private_key = rsa_key()
+        cls.rotated_key = rsa_key()
+
+    def setUp(self):
+        self.now = 1000.0
+        self.session = mock.Mock()
+        self.serve(["key-1"])
+        for patcher in [
+            mock.patch.object(oauth, "session", self.session),
+            mock.patch.object(oauth, "google_keys", oauth.GoogleKeySet()),
+            mock.patch.object(oauth.config, "GOOGLE_AUTH", {"client_id": CLIENT_ID}),
+            mock.patch("accounts.oauth.time", mock.Mock(monotonic=lambda: self.now)),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def serve(self, kids, max_age=3600):
+        keys = {"key-1": self.private_key, "key-2": self.rotated_key}
+        self.session.get.return_value = FakeResponse(
+            {"keys": [jwk(keys[kid], kid) for kid in kids]},
+            headers={"Cache-Control": f"public, max-age={max_age}, must-revalidate"},
+        )
+
+    def token(self, kid="key-1", private_key=None, **claims):
+        now = int(time.time())
+        payload = {
+            "iss": "https://accounts.google.com", "aud": CLIENT_ID, "sub": "1234",
+            "email": "user@gmail.com", "iat": now, "exp": now + 3600,
+        }
+        payload.update(claims)
+        return jwt.encode(payload, private_key or self.private_key, algorithm="RS256", headers={"kid": kid})
+
+    def test_valid_token(self):
+        claims = oauth.verify_google_id_token(self.token())
+        self.assertEqual((claims["sub"], claims["email"]), ("1234", "user@gmail.com"))
+        self.assertEqual(oauth.verify_google_id_token(self.token(iss="accounts.google.com"))["sub"], "1234")
+
+    def test_invalid_tokens(self):
+        now = int(time.time())
+        invalid = {
+            "wrong audience": self.token(aud="other-client"),
+            "wrong issuer": self.token(iss="https://evil.example.com"),
+            "expired": self.token(iat=now - 7200, exp=now - 3600),
+            "wrong signature": self.token(private_key=self.rotated_key),
+            "missing claim": jwt.encode({"aud": CLIENT_ID, "iss": "accounts.google.com"}, self.private_key,
+                                        algorithm="RS256", headers={"kid": "key-1"}),
+            "malformed": "not-a-token",
+        }
+        for reason, token in invalid.items():
+            with self.subTest(reason), self.assertRaises(oauth.OAuthError):
+                oauth.verify_google_id_token(token)
+
+    def test_leeway_allows_small_clock_skew(self):
+        now = int(time.time())
+        token = self.token(iat=now - 3600, exp=now - oauth.ID_TOKEN_LEEWAY + 5)
+        self.assertEqual(oauth.verify_google_id_token(token)["sub"], "1234")
+
+    def test_unknown_kid(self):
+        with self.assertRaisesMessage(oauth.OAuthError, "알 수 없는 구글 서명 키입니다."):
+            oauth.verify_google_id_token(self.token(kid="key-2", private_key=self.rotated_key))
+
+    def test_keys_are_refreshed_once_per_max_age(self):
+        for _ in range(3):
+            oauth.verify_google_id_token(self.token())
+        self.assertEqual(self.session.get.call_count, 1)
+
+        self.now += 3599
+        oauth.verify_google_id_token(self.token())
+        self.assertEqual(self.session.get.call_count, 1)
+
+        self.now += 1
+        oauth.verify_google_id_token(self.token())
+        self.assertEqual(self.session.get.call_count, 2)
+
+    def test_default_max_age_without_cache_control(self):
+        self.session.get.return_value.headers = {}
+        oauth.google_keys.get("key-1")
+        self.assertEqual(oauth.google_keys.expires_at, self.now + oauth.JWKS_DEFAULT_MAX_AGE)
+
+    def test_unknown_kid_refresh_is_throttled(self):
+        oauth.verify_google_id_token(self.token())
+        # 키 교체 직후 모르는 kid가 와도 최소 간격 안에서는 다시 받지 않음
+        self.serve(["key-1", "key-2"])
+        rotated = self.token(kid="key-2", private_key=self.rotated_key)
+        with self.assertRaises(oauth.OAuthError):
+            oauth.verify_google_id_token(rotated)
+        self.assertEqual(self.session.get.call_count, 1)
+
+        self.now += oauth.JWKS_MIN_REFRESH_INTERVAL
+        self.assertEqual(oauth.verify_google_id_token(rotated)["sub"], "1234")
+        self.assertEqual(self.session.get.call_count, 2)
+
+        # 계속 모르는 kid가 와도 간격마다 한 번만 요청
+        for _ in range(5):
+            with self.assertRaises(oauth.OAuthError):
+                oauth.verify_google_id_token(self.token(kid="key-3"))
+        self.assertEqual(self.session.get.call_count, 2)
+
+    def test_key_fetch_failure(self):
+        self.session.get.side_effect = requests.ConnectionError("down")
+        with self.assertRaisesMessage(oauth.OAuthError, "구글 서명 키를 가져오지 못했습니다."):
+            oauth.verify_google_id_token(self.token())
+
+        self.session.get.side_effect = None
+        self.session.get.return_value = FakeResponse({}, status_code=500)
+        with self.assertRaises(oauth.OAuthError):
+            oauth.verify_google_id_token(self.token())
+
+
+@override_settings(TOKEN_STORE="accounts.token_store.RedisTokenStore")
+class RedisTokenStoreTest(TestCase):
+    def setUp(self):
+        self.redis = use_fake_redis(self)
+        patcher = mock.patch.object(token_store, "_store", None)  # 테스트마다 새 로컬 캐시
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.user = get_user_model().objects.create_user(
+            email="user@test.com", nickname="tester1", password="password1!", login_type="DEFAULT"
+        )
+        self.client = APIClient()
+
+    def refresh(self, token):
+        return self.client.post("/accounts/api/refresh/", {"refresh": str(token)}, format="json")
+
+    def test_issue_records_outstanding_without_db_rows(self):
+        token = RefreshToken.for_user(self.user)
+        key = f"{token_store.OUTSTANDING_KEY_PREFIX}{token['jti']}"
+        self.assertEqual(self.redis.get(key), str(self.user.pk).encode())
+        self.assertAlmostEqual(self.redis.ttl(key), timedelta(days=14).total_seconds(), delta=5)
+        self.assertFalse(OutstandingToken.objects.exists())
+
+    def test_rotation_blacklists_old_token(self):
+        token = RefreshToken.for_user(self.user)
+        response = self.refresh(token)
+        self.assertEqual(response.status_code, 200)
+        rotated = response.json()["data"]["refresh"]
+        self.assertNotEqual(RefreshToken(rotated)["jti"], token["jti"])
+        self.assertTrue(self.redis.exists(f"{token_store.BLACKLIST_KEY_PREFIX}{token['jti']}"))
+        self.assertTrue(self.redis.exists(f"{token_store.OUTSTANDING_KEY_PREFIX}{RefreshToken(rotated)['jti']}"))
+
+        self.assertEqual(self.refresh(token).status_code, 401)  # 재사용
+        self.assertEqual(self.refresh(rotated).status_code, 200)
+
+    def test_concurrent_rotation_succeeds_once(self):
+        token = str(RefreshToken.for_user(self.user))
+        # 두 요청이 모두 블랙리스트 확인을 통과한 뒤 등록을 시도하는 경우 SET NX에 성공한 요청만 새 토큰을 받음
+        serializers = [TokenRefreshSerializer(data={"refresh": token}) for _ in range(2)]
+        with mock.patch.object(RefreshToken, "check_blacklist"):
+            self.assertTrue(serializers[0].is_valid())
+            with self.assertRaises(TokenError):
+                serializers[1].is_valid()
+        self.assertIn("refresh", serializers[0].validated_data)
+
+        refresh = RefreshToken(token, verify=False)
+        self.assertFalse(token_store.RedisTokenStore().blacklist(refresh["jti"], refresh["exp"], token))
+
+    def test_blacklisted_jti_is_cached_locally(self):
+        store = token_store.get_token_store()
+        exp = int(timezone.now().timestamp()) + 60
+        self.redis.set(f"{token_store.BLACKLIST_KEY_PREFIX}known", exp)
+        self.assertTrue(store.is_blacklisted("known"))
+        self.assertFalse(store.is_blacklisted("unknown"))
+
+        with mock.patch.object(self.redis, "get", side_effect=AssertionError("Redis 조회 없음")):
+            self.assertTrue(store.is_blacklisted("known"))
+        with mock.patch.object(self.redis, "get", return_value=None):
+            self.assertFalse(store.is_blacklisted("unknown"))  # 블랙리스트가 아닌 결과는 캐시하지 않음
+
+    def test_local_cache_is_bounded_lru(self):
+        store = token_store.RedisTokenStore(cache_size=2)
+        exp = int(timezone.now().timestamp()) + 60
+        for jti in ["a", "b"]:
+            store.blacklist(jti, exp, "")
+        store.is_blacklisted("a")  # 최근 사용
+        store.blacklist("c", exp, "")
+        self.assertEqual(list(store.known_blacklisted), ["a", "c"])
+
+        store._remember("expired", int(timezone.now().timestamp()) - 1)
+        self.assertFalse(store._known("expired"))
+        self.assertNotIn("expired", store.known_blacklisted)
+
+    def test_redis_failure_fails_closed(self):
+        token = RefreshToken.for_user(self.user)
+        for method in ["get", "set"]:
+            with self.subTest(method=method), \
+                    mock.patch.object(self.redis, method, side_effect=redis.ConnectionError):
+                self.assertEqual(self.refresh(token).status_code, 401)
+                response = self.client.post("/accounts/api/verify/", {"token": str(token)}, format="json")
+                self.assertEqual(response.status_code, 401 if method == "get" else 200)
+        self.assertEqual(self.refresh(token).status_code, 200)
+
+        # 발급 기록 저장 실패로는 로그인을 막지 않음
+        with mock.patch.object(self.redis, "set", side_effect=redis.ConnectionError):
+            self.assertIsNotNone(RefreshToken.for_user(self.user)["jti"])
+
+    def test_logout_blacklists_token(self):
+        token = RefreshToken.for_user(self.user)
+        self.assertEqual(self.client.post("/accounts/api/logout/", {"refresh": str(token)}, format="json").status_code, 200)
+        self.assertEqual(self.refresh(token).status_code, 401)
+        response = self.client.post("/accounts/api/verify/", {"token": str(token)}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_drain_token_blacklist(self):
+        now = timezone.now()
+        rows = {}
+        for jti, expires_at in [("active", now + timedelta(days=1)), ("revoked", now + timedelta(days=1)),
+                                ("expired", now - timedelta(days=1))]:
+            rows[jti] = OutstandingToken.objects.create(
+                user=self.user, jti=jti, token=jti, expires_at=expires_at, created_at=now
+            )
+        BlacklistedToken.objects.create(token=rows["revoked"])
+        BlacklistedToken.objects.create(token=rows["expired"])
+
+        out = io.StringIO()
+        call_command("drain_token_blacklist", "--batch", "1", stdout=out)
+        self.assertIn("블랙리스트 1개, 발급 기록 1개", out.getvalue())
+        self.assertEqual(
+            sorted(key.decode() for key in self.redis.keys("jwt:*")),
+            [f"{token_store.BLACKLIST_KEY_PREFIX}revoked", f"{token_store.OUTSTANDING_KEY_PREFIX}active"],
+        )
+        self.assertAlmostEqual(
+            self.redis.ttl(f"{token_store.BLACKLIST_KEY_PREFIX}revoked"), timedelta(days=1).total_seconds(), delta=5
+        )
+        self.assertTrue(token_store.get_token_store().is_blacklisted("revoked"))
+        self.assertEqual(OutstandingToken.objects.count(), 3)
+
+        # 다시 실행해도 같은 결과, --delete로 테이블 비움
+        call_command("drain_token_blacklist", "--delete", stdout=out)
+        self.assertEqual(len(self.redis.keys("jwt:*")), 2)
+        self.assertFalse(OutstandingToken.objects.exists())
+        self.assertFalse(BlacklistedToken.objects.exists())
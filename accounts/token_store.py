@@ -0,0 +1,123 @@
+# refresh 토큰 발급/블랙리스트 저장소 (accounts.tokens에서 사용, TOKEN_STORE 설정으로 선택)
+# - RedisTokenStore: jti별 키를 토큰 만료 시각까지만 보관 (TTL) -> 만료된 토큰 정리 작업이 필요 없음
+#   블랙리스트 등록은 SET NX로 처리해 같은 refresh 토큰으로 동시에 재발급을 요청해도 한 번만 성공
+#   이 프로세스에서 블랙리스트로 확인된 jti는 LRU 캐시에 두고 Redis 조회 없이 거절 (로그아웃/재사용된 토큰 반복 요청)
+#   블랙리스트는 만료 전까지 해제되지 않으므로 캐시된 "블랙리스트임" 결과는 항상 유효함
+#   (블룸 필터는 오탐 시 정상 토큰을 거절하게 되므로 정확한 LRU 캐시를 사용)
+# - DatabaseTokenStore: 기존 simplejwt token_blacklist 테이블 (OutstandingToken/BlacklistedToken) 사용
+# - 기존 테이블의 데이터는 drain_token_blacklist 명령으로 Redis로 옮김
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from spartagames.utils import get_redis
+
+
+BLACKLIST_KEY_PREFIX = "jwt:blacklist:"
+OUTSTANDING_KEY_PREFIX = "jwt:outstanding:"
+LOCAL_CACHE_SIZE = 10000
+
+
+def _ttl(exp):
+    # 이미 만료된 토큰도 최소 1초는 남겨 SET이 실패하지 않도록 함
+    return max(1, int(exp - time.time()))
+
+
+class DatabaseTokenStore:
+    def add_outstanding(self, jti, user_id, exp, token):
+        OutstandingToken.objects.create(
+            user_id=user_id, jti=jti, token=token, expires_at=datetime_from_epoch(exp),
+        )
+
+    def is_blacklisted(self, jti):
+        return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+    def blacklist(self, jti, exp, token):
+        """
+        반환: 이번에 새로 블랙리스트에 등록했으면 True
+        """
+        with transaction.atomic():
+            outstanding, _ = OutstandingToken.objects.get_or_create(
+                jti=jti, defaults={"token": token, "expires_at": datetime_from_epoch(exp)},
+            )
+            _, created = BlacklistedToken.objects.get_or_create(token=outstanding)
+        return created
+
+
+class RedisTokenStore:
+    def __init__(self, url=None, cache_size=LOCAL_CACHE_SIZE):
+        self.url = url
+        self.cache_size = cache_size
+        self.known_blacklisted = OrderedDict()  # jti: exp
+        self.lock = Lock()
+
+    @property
+    def client(self):
+        return get_redis(self.url)
+
+    def _remember(self, jti, exp):
+        with self.lock:
+            self.known_blacklisted[jti] = exp
+            self.known_blacklisted.move_to_end(jti)
+            while len(self.known_blacklisted) > self.cache_size:
+                self.known_blacklisted.popitem(last=False)
+
+    def _known(self, jti):
+        with self.lock:
+            exp = self.known_blacklisted.get(jti)
+            if exp is None:
+                return False
+            if exp <= time.time():
+                del self.known_blacklisted[jti]
+                return False
+            self.known_blacklisted.move_to_end(jti)
+            return True
+
+    def add_outstanding(self, jti, user_id, exp, token):
+        self.client.set(f"{OUTSTANDING_KEY_PREFIX}{jti}", user_id or "", ex=_ttl(exp))
+
+    def is_blacklisted(self, jti):
+        if self._known(jti):
+            return True
+        exp = self.client.get(f"{BLACKLIST_KEY_PREFIX}{jti}")
+        if exp is None:
+            return False
+        self._remember(jti, int(exp))
+        return True
+
+    def blacklist(self, jti, exp, token):
+        """
+        반환: 이번에 새로 블랙리스트에 등록했으면 True
+        """
+        created = self.client.set(f"{BLACKLIST_KEY_PREFIX}{jti}", int(exp), ex=_ttl(exp), nx=True)
+        self._remember(jti, int(exp))
+        return bool(created)
+
+    def import_tokens(self, blacklisted, outstanding):
+        """
+        기존 테이블 데이터 이관용
+        blacklisted: [(jti, exp)], outstanding: [(jti, user_id, exp)]
+        """
+        with self.client.pipeline(transaction=False) as pipe:
+            for jti, exp in blacklisted:
+                pipe.set(f"{BLACKLIST_KEY_PREFIX}{jti}", int(exp), ex=_ttl(exp), nx=True)
+            for jti, user_id, exp in outstanding:
+                pipe.set(f"{OUTSTANDING_KEY_PREFIX}{jti}", user_id or "", ex=_ttl(exp), nx=True)
+            pipe.execute()
+
+
+_store = None
+
+
+def get_token_store():
+    # 프로세스마다 한 번 만들어 재사용 (로컬 캐시 유지)
+    global _store
+    if _store is None:
+        _store = import_string(settings.TOKEN_STORE)()
+    return _store
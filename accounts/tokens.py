@@ -0,0 +1,90 @@
+# refresh 토큰 발급/재발급/로그아웃을 accounts.token_store 저장소로 처리
+# simplejwt 기본 RefreshToken은 token_blacklist 테이블에 직접 쓰므로 발급하는 곳에서는 이 모듈의 RefreshToken을 사용
+import redis
+from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import (
+    TokenBlacklistSerializer as BaseTokenBlacklistSerializer,
+    TokenRefreshSerializer as BaseTokenRefreshSerializer,
+    TokenVerifySerializer as BaseTokenVerifySerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import BlacklistMixin, RefreshToken as BaseRefreshToken, UntypedToken
+
+from .token_store import get_token_store
+
+
+class RefreshToken(BaseRefreshToken):
+    @classmethod
+    def for_user(cls, user):
+        # BlacklistMixin.for_user(OutstandingToken 행 생성)를 건너뜀
+        token = super(BlacklistMixin, cls).for_user(user)
+        token.add_outstanding()
+        return token
+
+    def add_outstanding(self):
+        try:
+            get_token_store().add_outstanding(
+                self[api_settings.JTI_CLAIM], self.get(api_settings.USER_ID_CLAIM), self["exp"], str(self),
+            )
+        except redis.RedisError:
+            # 발급 기록은 블랙리스트 판단에 쓰이지 않으므로 저장소 장애로 로그인을 막지 않음
+            pass
+
+    def check_blacklist(self):
+        try:
+            blacklisted = get_token_store().is_blacklisted(self.payload[api_settings.JTI_CLAIM])
+        except redis.RedisError:
+            raise TokenError("토큰 저장소에 연결할 수 없습니다.")
+        if blacklisted:
+            raise TokenError("Token is blacklisted")
+
+    def blacklist(self):
+        """
+        반환: 이번에 새로 블랙리스트에 등록했으면 True
+        """
+        try:
+            return get_token_store().blacklist(self.payload[api_settings.JTI_CLAIM], self.payload["exp"], str(self))
+        except redis.RedisError:
+            raise TokenError("토큰 저장소에 연결할 수 없습니다.")
+
+
+class TokenRefreshSerializer(BaseTokenRefreshSerializer):
+    token_class = RefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        data = {"access": str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            # 같은 토큰으로 동시에 요청하면 먼저 블랙리스트에 등록한 요청만 새 토큰을 받음
+            if api_settings.BLACKLIST_AFTER_ROTATION and not refresh.blacklist():
+                raise TokenError("Token is blacklisted")
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.add_outstanding()
+            data["refresh"] = str(refresh)
+
+        return data
+
+
+class TokenVerifySerializer(BaseTokenVerifySerializer):
+    def validate(self, attrs):
+        token = UntypedToken(attrs["token"])
+        jti = token.get(api_settings.JTI_CLAIM)
+        try:
+            blacklisted = jti is not None and get_token_store().is_blacklisted(jti)
+        except redis.RedisError:
+            raise TokenError("토큰 저장소에 연결할 수 없습니다.")
+        if blacklisted:
+            raise serializers.ValidationError("Token is blacklisted")
+        return {}
+
+
+class TokenBlacklistSerializer(BaseTokenBlacklistSerializer):
+    token_class = RefreshToken
+
+    def validate(self, attrs):
+        self.token_class(attrs["refresh"]).blacklist()
+        return {}
@@ -1,34 +1,29 @@
-import os
-import pickle
-import base64
 import random
 import re
-import requests
 import urllib.parse
 
 from django.contrib import messages
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 
-from google.auth.transport.requests import Request
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from email.mime.text import MIMEText
-
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.decorators import api_view, renderer_classes
+from rest_framework.decorators import api_view, renderer_classes, throttle_classes
 from rest_framework.renderers import JSONRenderer
 
 from rest_framework_simplejwt.exceptions import InvalidToken
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework_simplejwt.views import TokenObtainPairView
 
+from commons.outbox import enqueue_email
 from spartagames import config
+from spartagames.throttling import EmailAddressThrottle, EmailCodeThrottle, EmailSendThrottle
 from spartagames.utils import std_response
+from . import oauth
 from .models import EmailVerification
+from .tokens import RefreshToken
 
 
 class AlertException(Exception):
@@ -45,6 +40,8 @@ from games.models import GameCategory
 
 # TokenObtainPairView에서 사용하는 serializer 커스터마이징
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = RefreshToken
+
     def validate(self, attrs):
         data = super().validate(attrs)
         user_data = {
@@ -296,8 +293,7 @@ def google_login_callback(request):
             "redirect_uri": config.GOOGLE_AUTH["redirect_uri"],
             "grant_type": "authorization_code"
         }
-        tokens_request = requests.post(url, headers=headers, data=data)
-        tokens_json = tokens_request.json()
+        tokens_json = oauth.request("google", "POST", url, headers=headers, data=data)
     except Exception as e:
         messages.error(request, e)
         # 유저에게 알림
@@ -311,8 +307,8 @@ def google_login_callback(request):
     # token 유효성 확인 및 로그인 진행, 유저 정보 전달
     try:
         id_token = tokens_json["id_token"]
-        profile_request = requests.get(f'https://www.googleapis.com/oauth2/v3/tokeninfo?id_token={id_token}')
-        profile_json = profile_request.json()
+        # tokeninfo 호출 없이 캐시된 구글 서명 키로 직접 검증
+        profile_json = oauth.verify_google_id_token(id_token)
 
         email = profile_json.get('email', None)
 
@@ -371,7 +367,7 @@ def google_login_callback(request):
             error_code="THIRD_FAIL",
             status_code=status.HTTP_406_NOT_ACCEPTABLE
         )
-    except TokenException as e:
+    except (TokenException, oauth.OAuthError) as e:
         print(e)
         # 개발 단계에서 확인
         return std_response(
@@ -395,8 +391,7 @@ def naver_login_callback(request):
             "code": authorization_code,
             "state": config.NAVER_AUTH["state"],
         }
-        tokens_request = requests.get(url, params=data)
-        tokens_json = tokens_request.json()
+        tokens_json = oauth.request("naver", "GET", url, params=data)
     except Exception as e:
         messages.error(request, e)
         # 유저에게 알림
@@ -413,8 +408,7 @@ def naver_login_callback(request):
         headers = {
             "Authorization": "Bearer " + access_token,
         }
-        profile_request = requests.get(url, headers=headers)
-        profile_json = profile_request.json().get("response", None)
+        profile_json = oauth.request("naver", "GET", url, headers=headers).get("response", None)
 
         email = profile_json.get('email', None)
 
@@ -473,7 +467,7 @@ def naver_login_callback(request):
             error_code="THIRD_FAIL",
             status_code=status.HTTP_406_NOT_ACCEPTABLE
         )
-    except TokenException as e:
+    except (TokenException, oauth.OAuthError) as e:
         print(e)
         # 개발 단계에서 확인
         return std_response(
@@ -498,8 +492,7 @@ def kakao_login_callback(request):
             "redirect_uri": config.KAKAO_AUTH["redirect_uri"],
             "grant_type": "authorization_code"
         }
-        tokens_request = requests.post(url, headers=headers, data=data)
-        tokens_json = tokens_request.json()
+        tokens_json = oauth.request("kakao", "POST", url, headers=headers, data=data)
     except Exception as e:
         messages.error(request, e)
         # 유저에게 알림
@@ -518,8 +511,7 @@ def kakao_login_callback(request):
             "Content-Type": "application/x-www-form-urlencoded;charset=utf-8",
             "Authorization": "Bearer " + access_token,
         }
-        profile_request = requests.get(url, headers=headers)
-        profile_json = profile_request.json()
+        profile_json = oauth.request("kakao", "GET", url, headers=headers)
         
         account = profile_json.get('kakao_account', None)
         email = account["email"]
@@ -581,7 +573,7 @@ def kakao_login_callback(request):
             error_code="THIRD_FAIL",
             status_code=status.HTTP_406_NOT_ACCEPTABLE
         )
-    except TokenException as e:
+    except (TokenException, oauth.OAuthError) as e:
         print(e)
         # 개발 단계에서 확인
         return std_response(
@@ -608,8 +600,7 @@ def discord_login_callback(request):
             "grant_type": "authorization_code",
             "scope": 'identify, email',
         }
-        tokens_request = requests.post(url, headers=headers, data=data)
-        tokens_json = tokens_request.json()
+        tokens_json = oauth.request("discord", "POST", url, headers=headers, data=data)
     except Exception as e:
         print(e)
         messages.error(request, e)
@@ -629,8 +620,7 @@ def discord_login_callback(request):
             "Content-Type": "application/x-www-form-urlencoded;charset=utf-8",
             "Authorization": "Bearer " + access_token,
         }
-        profile_request = requests.get(url, headers=headers)
-        profile_json = profile_request.json()
+        profile_json = oauth.request("discord", "GET", url, headers=headers)
         
         email = profile_json.get('email', None)
         # nickname = profile_json.get('username', None)
@@ -690,7 +680,7 @@ def discord_login_callback(request):
             error_code="THIRD_FAIL",
             status_code=status.HTTP_406_NOT_ACCEPTABLE
         )
-    except TokenException as e:
+    except (TokenException, oauth.OAuthError) as e:
         print(e)
         # 개발 단계에서 확인
         return std_response(
@@ -701,29 +691,9 @@ def discord_login_callback(request):
         )
 
 
-# 이메일 인증 관련 상수 값
-SCOPES = ['https://www.googleapis.com/auth/gmail.send']
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # 현재 파일의 디렉토리를 기준으로 절대 경로 설정
-CLIENT_SECRET_FILE = os.path.join(BASE_DIR, 'client_secret.json')
-
-def get_credentials():
-    creds = None
-    if os.path.exists('token.pickle'):
-        with open('token.pickle', 'rb') as token:
-            creds = pickle.load(token)
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            flow = InstalledAppFlow.from_client_secrets_file(CLIENT_SECRET_FILE, SCOPES)
-            creds = flow.run_local_server(port=0, access_type="offline")
-        with open('token.pickle', 'wb') as token:
-            pickle.dump(creds, token)
-    return creds
-
-
 @api_view(('POST',))
 @renderer_classes((JSONRenderer,))
+@throttle_classes([EmailSendThrottle, EmailAddressThrottle])
 def email_verification(request):
     email = request.data.get("email")
     is_new = request.data.get("is_new", '')
@@ -764,39 +734,16 @@ def email_verification(request):
             status_code=status.HTTP_400_BAD_REQUEST
         )
     
-    # 기존 이메일 인증 데이터 삭제=>여기서 이미 삭제 하기에 아래에는 필요가 없음(뭐가 있든 지우고 있기때문)
-    EmailVerification.objects.filter(email=email).delete()
-    
-    creds = get_credentials()
-    service = build('gmail', 'v1', credentials=creds)
-
+    # 인증번호 저장과 메일 발송 요청을 같은 트랜잭션으로 처리 (메일은 commons.tasks.dispatch_outbox가 전송)
     code = ''.join(random.choices('0123456789', k=6))
-    message = MIMEText(f"이메일 인증 코드는  {code}  입니다.")
-    message['from'] = 'sparta.games.master@gmail.com'
-    message['to'] = email
-    message['subject'] = "Sparta Games 메일 주소 인증 번호"
-    raw = base64.urlsafe_b64encode(message.as_bytes()).decode()
-
-    message = {
-        'raw': raw
-    }
+    with transaction.atomic():
+        # 기존 이메일 인증 데이터 삭제
+        EmailVerification.objects.filter(email=email).delete()
+        EmailVerification.objects.create(email=email, verification_code=code)
+        enqueue_email(email, "Sparta Games 메일 주소 인증 번호", f"이메일 인증 코드는  {code}  입니다.")
 
-    try:
-        message = (service.users().messages().send(userId='me', body=message).execute())
-    except Exception as e:
-        print(f'An error occurred: {e}')
-        return std_response(
-            message=f"이메일 전송 중 에러가 발생했습니다. ({str(e)})",
-            status="error",
-            error_code="THIRD_FAIL",
-            status_code=status.HTTP_400_BAD_REQUEST
-        )
-    
-    # 이메일 인증 데이터 저장
-    EmailVerification.objects.create(email=email, verification_code=code)
-    
     return std_response(
-        message=f"인증번호를 발송했습니다. (이메일 message id: {message['id']})",
+        message="인증번호를 발송했습니다.",
         status="success",
         status_code=status.HTTP_200_OK
     )
@@ -804,6 +751,7 @@ def email_verification(request):
 
 @api_view(('POST',))
 @renderer_classes((JSONRenderer,))
+@throttle_classes([EmailCodeThrottle])
 def verify_code(request):
     email = request.data.get('email')
     code = request.data.get('code')
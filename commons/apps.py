@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class CommonsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'commons'
+
+    def ready(self):
+        from .signals import connect_image_signals
+
+        connect_image_signals()
@@ -0,0 +1,189 @@
+# 이미지 변환 파이프라인 (commons.tasks.generate_image_renditions에서 실행)
+# - 업로드 요청에서는 헤더/구조만 확인하고(games.utils.validate_image), 전체 디코딩과 변환은 Celery에서 처리
+# - EXIF 방향을 적용한 뒤 메타데이터(EXIF/XMP, 촬영 위치 등)를 제거
+#   원본에 메타데이터가 있으면 제거한 이미지로 같은 이름에 다시 저장
+# - 크기별(card/retina/detail) 변환본을 원본 옆에 저장 (images/thumbnail/abc.png -> images/thumbnail/abc__card.webp)
+#   WebP는 항상, AVIF는 Pillow가 인코더를 지원할 때만 생성 (원본보다 크게 늘리지 않음)
+# - 원본 이름이 같으면 변환본 이름도 같으므로 재시도/재실행해도 파일이 늘어나지 않음
+import io
+import mimetypes
+import os
+
+from django.contrib.contenttypes.models import ContentType
+from PIL import Image, ImageOps
+
+from .models import ImageRendition
+
+
+# 변환본 이름 -> 최대 가로 크기
+RENDITIONS = {
+    "card": 400,     # 목록 카드
+    "retina": 800,   # 목록 카드 (고해상도 화면)
+    "detail": 1200,  # 상세 화면
+}
+WEBP_QUALITY = 80
+AVIF_QUALITY = 60
+JPEG_QUALITY = 95  # 메타데이터 제거 후 원본을 다시 저장할 때 사용
+MAX_IMAGE_PIXELS = 40_000_000  # 이보다 큰 이미지는 거부 (디코딩 시 메모리 폭증 방지)
+
+# 변환 대상 (app_label, 모델 이름, ImageField 이름)
+IMAGE_FIELDS = (
+    ("games", "Game", "thumbnail"),
+    ("games", "Screenshot", "src"),
+    ("teambuildings", "TeamBuildPost", "thumbnail"),
+    ("teambuildings", "TeamBuildProfile", "image"),
+    ("accounts", "User", "image"),
+)
+
+# 메타데이터로 보는 Image.info 키
+METADATA_KEYS = ("exif", "xmp", "XML:com.adobe.xmp", "comment", "photoshop")
+
+# S3 업로드 시 Content-Type을 확장자로 추측하므로 등록 (Python 3.11 mimetypes에는 avif가 없음)
+mimetypes.add_type("image/avif", ".avif")
+
+
+class ImageProcessingError(Exception):
+    pass
+
+
+def get_formats():
+    """
+    생성할 변환본 형식 (브라우저가 앞의 형식부터 선택하도록 AVIF를 먼저 둠)
+    """
+    Image.init()
+    return [fmt for fmt in ("avif", "webp") if fmt.upper() in Image.SAVE]
+
+
+def rendition_name(source_name, name, fmt):
+    root, _ = os.path.splitext(source_name)
+    return f"{root}__{name}.{fmt}"
+
+
+def _write(storage, name, data):
+    # 같은 이름에 덮어씀 (storage.save는 이름이 겹치면 새 이름을 만듦)
+    with storage.open(name, "wb") as file:
+        file.write(data)
+
+
+def _has_metadata(image):
+    return any(key in image.info for key in METADATA_KEYS) or bool(image.getexif())
+
+
+def _open(data):
+    try:
+        image = Image.open(io.BytesIO(data))
+        if image.width * image.height > MAX_IMAGE_PIXELS:
+            raise ImageProcessingError("이미지 해상도가 너무 큽니다.")
+        image.load()  # 전체 디코딩 (손상된 파일은 여기서 실패)
+    except ImageProcessingError:
+        raise
+    except Exception as e:
+        raise ImageProcessingError("유효한 이미지 파일이 아닙니다.") from e
+    return image
+
+
+def _strip_original(storage, name, image):
+    """
+    원본에서 메타데이터를 제거해 다시 저장 (애니메이션 이미지는 그대로 둠)
+    """
+    if getattr(image, "n_frames", 1) > 1 or not image.format:
+        return False
+    clean = ImageOps.exif_transpose(image)
+    clean.info = {}
+    options = {"icc_profile": image.info.get("icc_profile")}
+    if image.format == "JPEG":
+        options.update(quality=JPEG_QUALITY, optimize=True)
+    buffer = io.BytesIO()
+    clean.save(buffer, format=image.format, **options)
+    _write(storage, name, buffer.getvalue())
+    return True
+
+
+def _encode(image, fmt):
+    buffer = io.BytesIO()
+    if fmt == "avif":
+        image.save(buffer, format="AVIF", quality=AVIF_QUALITY)
+    else:
+        image.save(buffer, format="WEBP", quality=WEBP_QUALITY, method=4)
+    return buffer.getvalue()
+
+
+def generate_renditions(instance, field):
+    """
+    instance의 이미지 필드(field)를 변환해 ImageRendition으로 기록
+    반환: 만든 변환본 수 (이미지가 없으면 0)
+    """
+    file = getattr(instance, field)
+    if not file:
+        return 0
+    storage, source_name = file.storage, file.name
+    try:
+        with storage.open(source_name, "rb") as source:
+            data = source.read()
+    except FileNotFoundError as e:
+        raise ImageProcessingError("원본 이미지 파일이 없습니다.") from e
+    image = _open(data)
+
+    if _has_metadata(image):
+        _strip_original(storage, source_name, image)
+
+    # 방향 적용 후 메타데이터 없이 변환 (투명도가 있으면 유지)
+    image = ImageOps.exif_transpose(image)
+    has_alpha = image.mode in ("RGBA", "LA") or "transparency" in image.info
+    image = image.convert("RGBA" if has_alpha else "RGB")
+    image.info = {}
+
+    content_type = ContentType.objects.get_for_model(instance)
+    existing = {
+        (row.name, row.format): row
+        for row in ImageRendition.objects.filter(content_type=content_type, content_id=instance.pk, field=field)
+    }
+    formats = get_formats()
+    count = 0
+    # 큰 변환본부터 만들고 다음 크기는 직전 결과에서 줄여 리샘플링 비용을 줄임
+    resized = image
+    for name, max_width in sorted(RENDITIONS.items(), key=lambda item: -item[1]):
+        width = min(max_width, resized.width)
+        height = max(1, round(resized.height * width / resized.width))
+        if (width, height) != resized.size:
+            resized = resized.resize((width, height), Image.LANCZOS)
+        for fmt in formats:
+            target = rendition_name(source_name, name, fmt)
+            _write(storage, target, _encode(resized, fmt))
+            row = existing.get((name, fmt))
+            if row is None:
+                row = ImageRendition(content_type=content_type, content_id=instance.pk, field=field, name=name, format=fmt)
+            elif row.src.name != target:
+                # 원본이 교체된 경우 이전 변환본 파일 삭제
+                storage.delete(row.src.name)
+            row.src = target
+            row.width, row.height = width, height
+            row.source_name = source_name
+            row.save()
+            count += 1
+    return count
+
+
+def delete_renditions(instance, field):
+    """
+    원본 이미지가 삭제된 경우 변환본 삭제 (파일은 ImageRendition post_delete에서 삭제)
+    """
+    ImageRendition.objects.filter(
+        content_type=ContentType.objects.get_for_model(instance), content_id=instance.pk, field=field
+    ).delete()
+
+
+def serialize_renditions(instance, field):
+    """
+    반환: {"card": {"avif": url, "webp": url}, "retina": {...}, "detail": {...}}
+    변환 전이거나 원본이 바뀌어 아직 변환 중이면 빈 dict (클라이언트는 원본 사용)
+    prefetch_related("renditions")로 불러온 경우 추가 쿼리 없음
+    """
+    file = getattr(instance, field)
+    if not file:
+        return {}
+    result = {}
+    for rendition in instance.renditions.all():
+        if rendition.field == field and rendition.source_name == file.name:
+            result.setdefault(rendition.name, {})[rendition.format] = rendition.src.url
+    return result
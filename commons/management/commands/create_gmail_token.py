@@ -0,0 +1,30 @@
+import os
+import pickle
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from commons.transports import GMAIL_SCOPES, GMAIL_TOKEN_FILE
+
+
+class Command(BaseCommand):
+    help = (
+        "브라우저에서 Gmail 발송 권한에 동의해 token.pickle을 만듭니다 (client_secret.json 필요). "
+        "알림 전송 작업(commons.transports.GmailTransport)은 이 토큰을 갱신만 하므로 토큰이 없거나 "
+        "갱신할 수 없게 되면 로컬에서 실행한 뒤 서버에 배포하세요."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--client-secret", default=os.path.join(settings.BASE_DIR, "client_secret.json"),
+            help="OAuth 클라이언트 파일 경로",
+        )
+
+    def handle(self, *args, **options):
+        from google_auth_oauthlib.flow import InstalledAppFlow
+
+        flow = InstalledAppFlow.from_client_secrets_file(options["client_secret"], GMAIL_SCOPES)
+        creds = flow.run_local_server(port=0, access_type="offline")
+        with open(GMAIL_TOKEN_FILE, "wb") as token:
+            pickle.dump(creds, token)
+        self.stdout.write(self.style.SUCCESS(f"{GMAIL_TOKEN_FILE} 저장 완료"))
@@ -0,0 +1,58 @@
+from celery import group
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+
+from commons.images import IMAGE_FIELDS, ImageProcessingError, generate_renditions
+from commons.models import ImageRendition
+from commons.tasks import generate_image_renditions
+
+
+class Command(BaseCommand):
+    help = (
+        "변환본이 없거나 원본이 바뀐 이미지(게임 썸네일/스크린샷, 팀빌딩 썸네일/프로필, 유저 프로필)의 "
+        "WebP/AVIF 변환본을 생성합니다. 기본은 Celery 작업으로 나누어 보내고 --sync면 바로 실행합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sync", action="store_true", help="Celery를 거치지 않고 이 프로세스에서 변환")
+        parser.add_argument("--chunk", type=int, default=100, help="한 번에 보낼 작업 수")
+        parser.add_argument("--force", action="store_true", help="변환본이 있어도 다시 생성")
+
+    def _targets(self, force):
+        for app_label, model_name, field in IMAGE_FIELDS:
+            model = apps.get_model(app_label, model_name)
+            rows = model.objects.exclude(**{field: ""}).exclude(**{f"{field}__isnull": True})
+            done = set()
+            if not force:
+                # 현재 원본 이름으로 만든 변환본이 있는 행은 건너뜀
+                done = set(
+                    ImageRendition.objects.filter(
+                        content_type=ContentType.objects.get_for_model(model), field=field
+                    ).values_list("content_id", "source_name")
+                )
+            for pk, name in rows.values_list("pk", field).iterator():
+                if (pk, name) not in done:
+                    yield model, app_label, model_name, pk, field
+
+    def handle(self, *args, **options):
+        count = failed = 0
+        batch = []
+        for model, app_label, model_name, pk, field in self._targets(options["force"]):
+            count += 1
+            if options["sync"]:
+                try:
+                    generate_renditions(model.objects.get(pk=pk), field)
+                except ImageProcessingError as e:
+                    failed += 1
+                    self.stderr.write(f"{model_name} {pk}.{field}: {e}")
+                continue
+            batch.append(generate_image_renditions.s(app_label, model_name, pk, field))
+            if len(batch) >= options["chunk"]:
+                group(batch).apply_async()
+                batch = []
+        if batch:
+            group(batch).apply_async()
+
+        action = "처리" if options["sync"] else "작업 등록"
+        self.stdout.write(self.style.SUCCESS(f"이미지 {count}개 {action} 완료 (실패 {failed}개)"))
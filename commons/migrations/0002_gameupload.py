@@ -0,0 +1,30 @@
+# Generated by Django 4.2 on 2026-10-18 21:10
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('commons', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GameUpload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=511, unique=True)),
+                ('upload_id', models.CharField(max_length=255)),
+                ('size', models.BigIntegerField()),
+                ('part_size', models.IntegerField()),
+                ('status', models.CharField(choices=[('uploading', '업로드 중'), ('completed', '업로드 완료'), ('used', '게임에 연결됨'), ('aborted', '취소')], default='uploading', max_length=20)),
+                ('create_dt', models.DateTimeField(auto_now_add=True)),
+                ('completed_dt', models.DateTimeField(blank=True, null=True)),
+                ('uploader', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='game_uploads', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -18,3 +18,90 @@ class UploadImage(models.Model):
     src = models.URLField(unique=True)
     is_used = models.BooleanField(default=False)
     create_dt = models.DateTimeField(auto_now_add=True)
+
+
+# 게임 zip 직접 업로드 (S3 멀티파트, commons.uploads 참고)
+# 클라이언트가 presigned URL로 파트를 올리고 완료하면, 게임 등록/수정 시 upload id로 gamefile을 지정
+class GameUpload(models.Model):
+    STATUS_UPLOADING = "uploading"
+    STATUS_COMPLETED = "completed"
+    STATUS_USED = "used"
+    STATUS_ABORTED = "aborted"
+    STATUS_CHOICES = (
+        (STATUS_UPLOADING, "업로드 중"),
+        (STATUS_COMPLETED, "업로드 완료"),
+        (STATUS_USED, "게임에 연결됨"),
+        (STATUS_ABORTED, "취소"),
+    )
+
+    uploader = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="game_uploads")
+    key = models.CharField(max_length=511, unique=True)  # 버킷 안의 키 (media/zips/...)
+    upload_id = models.CharField(max_length=255)  # S3 멀티파트 업로드 id
+    size = models.BigIntegerField()
+    part_size = models.IntegerField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_UPLOADING)
+    create_dt = models.DateTimeField(auto_now_add=True)
+    completed_dt = models.DateTimeField(null=True, blank=True)
+
+    @property
+    def gamefile_name(self):
+        # MediaStorage(location='media') 기준 파일 이름
+        return self.key[len("media/"):]
+
+
+# 이미지 변환본 (commons.images 참고)
+# 원본 이미지(게임 썸네일/스크린샷, 팀빌딩 썸네일/프로필, 유저 프로필) 옆에 크기별 WebP/AVIF 파일을 만들어 기록
+class ImageRendition(models.Model):
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    content_id = models.PositiveIntegerField()
+    content_info = GenericForeignKey('content_type', 'content_id')
+
+    field = models.CharField(max_length=50)  # 원본 ImageField 이름 (thumbnail, src, image)
+    name = models.CharField(max_length=20)  # card, retina, detail
+    format = models.CharField(max_length=10)  # webp, avif
+    src = models.ImageField(max_length=255)
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    source_name = models.CharField(max_length=255)  # 변환에 사용한 원본 파일 이름 (원본이 바뀌면 무시)
+    create_dt = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["content_type", "content_id", "field", "name", "format"],
+                name="unique_image_rendition",
+            ),
+        ]
+
+
+# 외부 알림(디스코드 웹훅, Gmail) 전송 대기열 (commons.outbox 참고)
+# 알림을 만드는 변경과 같은 트랜잭션에 저장하고, Celery 작업(commons.tasks.dispatch_outbox)이 꺼내 전송
+class OutboxMessage(models.Model):
+    KIND_DISCORD = "discord"
+    KIND_GMAIL = "gmail"
+    KIND_CHOICES = (
+        (KIND_DISCORD, "디스코드 웹훅"),
+        (KIND_GMAIL, "Gmail"),
+    )
+    STATUS_PENDING = "pending"
+    STATUS_SENT = "sent"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = (
+        (STATUS_PENDING, "전송 대기"),
+        (STATUS_SENT, "전송 완료"),
+        (STATUS_FAILED, "전송 실패"),
+    )
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    payload = models.JSONField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_dt = models.DateTimeField(default=timezone.now)  # 다음 전송 시각 (재시도 대기, 전송 중 임대 만료)
+    last_error = models.TextField(blank=True, default="")
+    create_dt = models.DateTimeField(auto_now_add=True)
+    sent_dt = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "next_attempt_dt"], name="outbox_due_idx"),
+        ]
@@ -0,0 +1,143 @@
+# 외부 알림 전송 대기열 (transactional outbox)
+# - enqueue: 알림을 만드는 변경과 같은 트랜잭션에 OutboxMessage 행을 저장하고, 커밋 후 dispatch_outbox 작업을 깨움
+#   트랜잭션이 롤백되면 알림도 사라지고, 커밋된 알림은 브로커 장애가 있어도 beat 주기 작업이 결국 전송
+# - dispatch(Celery 작업): 전송할 행을 select_for_update(skip_locked)로 가져와 임대(LEASE) 시각을 기록한 뒤
+#   트랜잭션 밖에서 종류별 transport로 묶어 전송하고 결과를 반영
+#   실패하면 지수 백오프로 다시 시도하고 MAX_ATTEMPTS번 실패하거나 재시도해도 소용없는 오류면 failed
+#   전송 중 작업이 죽으면 임대가 끝난 뒤 다시 전송되므로 드물게 중복 전송될 수 있음 (유실은 없음)
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import OutboxMessage
+from .transports import TransportError
+
+
+DISPATCH_BATCH = 100
+LEASE = timedelta(minutes=5)  # 전송 중인 행을 다른 작업이 가져가지 않는 시간
+MAX_ATTEMPTS = 6
+RETRY_BASE = timedelta(seconds=30)
+RETRY_MAX = timedelta(hours=1)
+SENT_RETENTION = timedelta(days=7)
+
+_transports = {}
+
+
+def get_transport(kind):
+    # 작업 프로세스마다 한 번 만들어 재사용
+    transport = _transports.get(kind)
+    if transport is None:
+        transport = _transports.setdefault(kind, import_string(settings.OUTBOX_TRANSPORTS[kind])())
+    return transport
+
+
+def _kick():
+    from .tasks import dispatch_outbox
+
+    try:
+        dispatch_outbox.delay()
+    except Exception as e:
+        # 브로커 장애 시에도 요청은 성공시키고 beat 주기 작업이 전송
+        print(f"알림 전송 작업 등록 실패: {e}")
+
+
+def enqueue(kind, payload):
+    message = OutboxMessage.objects.create(kind=kind, payload=payload)
+    transaction.on_commit(_kick)
+    return message
+
+
+def enqueue_discord(webhook, content):
+    return enqueue(OutboxMessage.KIND_DISCORD, {"webhook": webhook, "content": content})
+
+
+def enqueue_email(to, subject, body):
+    return enqueue(OutboxMessage.KIND_GMAIL, {"to": to, "subject": subject, "body": body})
+
+
+def retry_delay(attempts):
+    return min(RETRY_BASE * 2 ** (attempts - 1), RETRY_MAX)
+
+
+def _claim(batch_size):
+    now = timezone.now()
+    with transaction.atomic():
+        messages = list(
+            OutboxMessage.objects.select_for_update(skip_locked=True)
+            .filter(status=OutboxMessage.STATUS_PENDING, next_attempt_dt__lte=now)
+            .order_by("next_attempt_dt", "pk")[:batch_size]
+        )
+        if messages:
+            OutboxMessage.objects.filter(pk__in=[message.pk for message in messages]).update(
+                next_attempt_dt=now + LEASE
+            )
+    return messages
+
+
+def _send(messages):
+    results = {}
+    by_kind = {}
+    for message in messages:
+        by_kind.setdefault(message.kind, []).append(message)
+    for kind, group in by_kind.items():
+        try:
+            results.update(get_transport(kind).send(group))
+        except Exception as e:
+            # transport 자체의 예상치 못한 오류는 그룹 전체를 재시도
+            error = e if isinstance(e, TransportError) else TransportError(f"{type(e).__name__}: {e}")
+            results.update({message.pk: error for message in group})
+    return results
+
+
+def _record(messages, results):
+    now = timezone.now()
+    sent = []
+    for message in messages:
+        error = results.get(message.pk, TransportError("전송 결과가 없습니다."))
+        if error is None:
+            sent.append(message.pk)
+            continue
+        attempts = message.attempts + 1
+        failed = not error.retryable or attempts >= MAX_ATTEMPTS
+        OutboxMessage.objects.filter(pk=message.pk).update(
+            attempts=attempts,
+            status=OutboxMessage.STATUS_FAILED if failed else OutboxMessage.STATUS_PENDING,
+            next_attempt_dt=now if failed else now + retry_delay(attempts),
+            last_error=str(error)[:1000],
+        )
+    if sent:
+        OutboxMessage.objects.filter(pk__in=sent).update(
+            status=OutboxMessage.STATUS_SENT, attempts=F("attempts") + 1, sent_dt=now, last_error=""
+        )
+    return len(sent), len(messages) - len(sent)
+
+
+def dispatch(batch_size=DISPATCH_BATCH):
+    """
+    전송할 알림이 없을 때까지 배치 단위로 전송
+    반환: (전송 성공 수, 실패 수)
+    """
+    total_sent = total_failed = 0
+    while True:
+        messages = _claim(batch_size)
+        if not messages:
+            return total_sent, total_failed
+        sent, failed = _record(messages, _send(messages))
+        total_sent += sent
+        total_failed += failed
+        if len(messages) < batch_size:
+            return total_sent, total_failed
+
+
+def prune(retention=SENT_RETENTION):
+    """
+    보관 기간이 지난 전송 완료 알림 삭제
+    """
+    deleted, _ = OutboxMessage.objects.filter(
+        status=OutboxMessage.STATUS_SENT, sent_dt__lt=timezone.now() - retention
+    ).delete()
+    return deleted
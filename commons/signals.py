@@ -0,0 +1,66 @@
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from .images import IMAGE_FIELDS, delete_renditions
+from .models import ImageRendition
+from .tasks import generate_image_renditions
+
+
+# 이미지 변환본 생성
+# 인스턴스를 불러올 때의 이미지 이름을 기억해 두고, 저장 후 이름이 바뀌었으면 커밋 후 변환 작업 실행
+def _raw_name(instance, field):
+    # 지연 로딩(only/defer)된 필드는 조회하지 않도록 __dict__에서 직접 확인
+    if field not in instance.__dict__:
+        return None
+    value = instance.__dict__[field]
+    return getattr(value, "name", value) or ""
+
+
+def _remember_images(sender, instance, **kwargs):
+    instance._image_names = {
+        field: _raw_name(instance, field) for field in sender._image_fields
+    }
+
+
+def _process_changed_images(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    remembered = getattr(instance, "_image_names", {})
+    for field in sender._image_fields:
+        if update_fields is not None and field not in update_fields:
+            continue
+        name = getattr(instance, field).name or ""
+        previous = remembered.get(field)
+        if previous is None and not created and update_fields is None:
+            # 불러올 때 지연 로딩된 필드는 변경 여부를 알 수 없으므로 건너뜀
+            continue
+        if name == previous:
+            continue
+        if name:
+            transaction.on_commit(
+                lambda pk=instance.pk, field=field: generate_image_renditions.delay(
+                    sender._meta.app_label, sender.__name__, pk, field
+                )
+            )
+        else:
+            delete_renditions(instance, field)
+    _remember_images(sender, instance)
+
+
+def connect_image_signals():
+    for app_label, model_name, field in IMAGE_FIELDS:
+        model = apps.get_model(app_label, model_name)
+        if not hasattr(model, "_image_fields"):
+            model._image_fields = []
+            post_init.connect(_remember_images, sender=model, dispatch_uid=f"remember_images_{model_name}")
+            post_save.connect(_process_changed_images, sender=model, dispatch_uid=f"process_images_{model_name}")
+        model._image_fields.append(field)
+
+
+# 변환본 행이 삭제되면(원본 삭제/교체, 원본 행 삭제) 파일도 삭제
+@receiver(post_delete, sender=ImageRendition)
+def delete_rendition_file(sender, instance, **kwargs):
+    if instance.src:
+        instance.src.storage.delete(instance.src.name)
@@ -0,0 +1,51 @@
+from botocore.exceptions import BotoCoreError
+from celery import shared_task
+from django.apps import apps
+
+from . import outbox
+from .images import ImageProcessingError, generate_renditions
+
+
+@shared_task(
+    bind=True,
+    autoretry_for=(BotoCoreError,),
+    retry_backoff=True,
+    retry_kwargs={'max_retries': 3},
+)
+def generate_image_renditions(self, app_label, model_name, pk, field):
+    """
+    업로드된 이미지의 메타데이터를 제거하고 크기별 WebP/AVIF 변환본 생성
+    이미지마다 별도 작업으로 실행되므로 스크린샷 여러 장은 작업 프로세스들이 나누어 동시에 처리
+    """
+    instance = apps.get_model(app_label, model_name).objects.filter(pk=pk).first()
+    if instance is None:
+        return f"{model_name} {pk} does not exist."
+    try:
+        count = generate_renditions(instance, field)
+    except ImageProcessingError as e:
+        return f"Skipped {model_name} {pk}.{field}: {str(e)}"
+    return f"Generated {count} renditions for {model_name} {pk}.{field}."
+
+
+@shared_task
+def dispatch_outbox():
+    """
+    대기 중인 외부 알림(디스코드, Gmail) 전송 (commons.outbox)
+    알림 저장 트랜잭션 커밋 직후 실행되고, 놓친 알림과 재시도 대상은 beat 주기로 처리
+    """
+    try:
+        sent, failed = outbox.dispatch()
+        return f"Dispatched {sent} outbox messages ({failed} failed)."
+    except Exception as e:
+        return f"Error occurred: {str(e)}"
+
+
+@shared_task
+def prune_outbox():
+    """
+    보관 기간이 지난 전송 완료 알림 삭제
+    """
+    try:
+        return f"Deleted {outbox.prune()} sent outbox messages."
+    except Exception as e:
+        return f"Error occurred: {str(e)}"
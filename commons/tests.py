@@ -1,3 +1,364 @@
-from django.test import TestCase
+import io
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from PIL import Image
+
+from games.models import Game
+from games.tests import LOCMEM_CACHES
+from qnas.tests import FakeS3
+from . import images, outbox, uploads
+from .models import GameUpload, ImageRendition, OutboxMessage
+from .tasks import dispatch_outbox
+from .transports import FakeTransport, TransportError
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class GameUploadTest(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="user@test.com", nickname="tester1", password="password1!", login_type="DEFAULT"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.s3 = FakeS3()
+        # 파트 크기를 4바이트로 줄여 작은 본문으로 여러 파트를 만듦
+        for patcher in [
+            mock.patch("commons.uploads.PART_SIZE", 4),
+            mock.patch("commons.uploads.get_s3_client", return_value=self.s3),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def start(self, size=10):
+        response = self.client.post(
+            "/commons/api/presigned-url/game-upload/", {"filename": "my game.zip", "size": size}, format="json"
+        )
+        self.assertEqual(response.status_code, 201)
+        data = response.json()["data"]
+        return GameUpload.objects.get(pk=data["upload_id"]), data
+
+    def upload_parts(self, upload, body):
+        return [
+            {"part_number": number, "etag": self.s3.upload_part(upload.upload_id, number, body[start:start + 4])}
+            for number, start in enumerate(range(0, len(body), 4), start=1)
+        ]
+
+    def complete(self, upload, parts):
+        return self.client.post(f"/commons/api/presigned-url/game-upload/{upload.pk}/", {"parts": parts}, format="json")
+
+    def test_start_returns_part_urls(self):
+        upload, data = self.start(size=10)
+        self.assertEqual([part["part_number"] for part in data["parts"]], [1, 2, 3])
+        self.assertTrue(upload.key.startswith("media/zips/"))
+        self.assertTrue(upload.key.endswith("_my_game.zip"))
+        self.assertEqual(upload.status, GameUpload.STATUS_UPLOADING)
+
+        for filename, size in [("game.txt", 10), ("game.zip", 0), ("game.zip", uploads.MAX_ZIP_SIZE + 1), ("game.zip", "x")]:
+            with self.subTest(filename=filename, size=size):
+                response = self.client.post(
+                    "/commons/api/presigned-url/game-upload/", {"filename": filename, "size": size}, format="json"
+                )
+                self.assertEqual(response.status_code, 400)
+
+    def test_complete(self):
+        upload, _ = self.start(size=10)
+        response = self.complete(upload, self.upload_parts(upload, b"0123456789"))
+        self.assertEqual(response.status_code, 200)
+        upload.refresh_from_db()
+        self.assertEqual(upload.status, GameUpload.STATUS_COMPLETED)
+        self.assertIsNotNone(upload.completed_dt)
+        self.assertEqual(self.s3.objects[upload.key]["body"], b"0123456789")
+
+    def test_complete_validates_part_list(self):
+        upload, _ = self.start(size=10)
+        parts = self.upload_parts(upload, b"0123456789")
+        for invalid in [parts[:2], parts + [{"part_number": 4, "etag": "x"}], [parts[0], parts[0], parts[2]],
+                        [{"etag": "x"}], [{"part_number": "one", "etag": "x"}], None]:
+            with self.subTest(parts=invalid):
+                self.assertEqual(self.complete(upload, invalid).status_code, 400)
+        self.assertEqual(self.s3.calls_of("complete_multipart_upload"), [])
+
+        # 순서와 관계없이 모든 파트가 있으면 완료
+        self.assertEqual(self.complete(upload, list(reversed(parts))).status_code, 200)
+
+    def test_second_complete_is_rejected(self):
+        upload, _ = self.start(size=10)
+        parts = self.upload_parts(upload, b"0123456789")
+        stale = GameUpload.objects.get(pk=upload.pk)  # 동시 요청이 읽어 둔 상태 (업로드 중)
+        uploads.complete_upload(upload, parts)
+
+        with self.assertRaisesMessage(uploads.UploadError, "이미 완료되었거나 취소된 업로드입니다."):
+            uploads.complete_upload(stale, parts)
+        self.assertEqual(len(self.s3.calls_of("complete_multipart_upload")), 1)
+        self.assertEqual(self.complete(upload, parts).status_code, 400)
+
+    def test_size_mismatch_deletes_object(self):
+        upload, _ = self.start(size=10)
+        response = self.complete(upload, self.upload_parts(upload, b"0123456789ab"))  # 선언보다 큼
+        self.assertEqual(response.status_code, 400)
+        upload.refresh_from_db()
+        self.assertEqual(upload.status, GameUpload.STATUS_ABORTED)
+        self.assertNotIn(upload.key, self.s3.objects)
+        self.assertEqual(self.s3.calls_of("delete_object"), [("delete_object", upload.key)])
+
+    def test_abort(self):
+        upload, _ = self.start(size=10)
+        url = f"/commons/api/presigned-url/game-upload/{upload.pk}/"
+        self.assertEqual(self.client.delete(url).status_code, 200)
+        upload.refresh_from_db()
+        self.assertEqual(upload.status, GameUpload.STATUS_ABORTED)
+        self.assertNotIn(upload.upload_id, self.s3.uploads)
+
+        self.assertEqual(self.client.delete(url).status_code, 400)
+        self.assertEqual(self.complete(upload, []).status_code, 400)
+
+    def test_other_users_upload_is_not_found(self):
+        upload, _ = self.start(size=10)
+        other = get_user_model().objects.create_user(
+            email="other@test.com", nickname="other", password="password1!", login_type="DEFAULT"
+        )
+        self.client.force_authenticate(other)
+        self.assertEqual(self.complete(upload, self.upload_parts(upload, b"0123456789")).status_code, 404)
+        self.assertEqual(self.client.delete(f"/commons/api/presigned-url/game-upload/{upload.pk}/").status_code, 404)
+
+    def test_abort_stale_uploads(self):
+        stale, _ = self.start(size=10)
+        missing, _ = self.start(size=10)
+        fresh, _ = self.start(size=10)
+        GameUpload.objects.filter(pk__in=[stale.pk, missing.pk]).update(create_dt=timezone.now() - timedelta(days=2))
+        del self.s3.uploads[missing.upload_id]  # S3에서 이미 정리된 업로드
+
+        self.assertEqual(uploads.abort_stale_uploads(), 2)
+        statuses = dict(GameUpload.objects.values_list("pk", "status"))
+        self.assertEqual(statuses[stale.pk], GameUpload.STATUS_ABORTED)
+        self.assertEqual(statuses[missing.pk], GameUpload.STATUS_ABORTED)
+        self.assertEqual(statuses[fresh.pk], GameUpload.STATUS_UPLOADING)
+        self.assertIn(fresh.upload_id, self.s3.uploads)
+
+
+def jpeg_with_exif(width, height, color=(200, 10, 10)):
+    # 90도 회전(Orientation=6)과 카메라 정보가 들어간 JPEG
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    exif[0x010F] = "Camera"
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), color).save(buffer, "JPEG", exif=exif.tobytes())
+    return buffer.getvalue()
+
+
+class ImageRenditionTest(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(
+            DEFAULT_FILE_STORAGE="django.core.files.storage.FileSystemStorage",
+            MEDIA_ROOT=media_root, MEDIA_URL="/media/",
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.folder = os.path.join(media_root, "images", "thumbnail")
+
+        user = get_user_model().objects.create_user(
+            email="user@test.com", nickname="tester1", password="password1!", login_type="DEFAULT"
+        )
+        self.game = Game.objects.create(
+            title="game", thumbnail=SimpleUploadedFile("cover.jpg", jpeg_with_exif(1000, 600)), maker=user,
+            content="content", gamefile="zips/test.zip", star=0, review_cnt=0, register_state=1,
+        )
+        self.formats = images.get_formats()
+
+    def rendition_rows(self):
+        return ImageRendition.objects.filter(content_id=self.game.pk, field="thumbnail")
+
+    def test_strips_metadata_and_applies_orientation(self):
+        count = images.generate_renditions(self.game, "thumbnail")
+        self.assertEqual(count, len(images.RENDITIONS) * len(self.formats))
+
+        with self.game.thumbnail.open("rb") as file:
+            original = Image.open(io.BytesIO(file.read()))
+        self.assertEqual(original.size, (600, 1000))  # 방향 적용
+        self.assertFalse(original.getexif())
+
+        sizes = {(row.name, row.format): (row.width, row.height) for row in self.rendition_rows()}
+        for fmt in self.formats:
+            self.assertEqual(sizes[("detail", fmt)], (600, 1000))  # 원본보다 크게 늘리지 않음
+            self.assertEqual(sizes[("card", fmt)], (400, 667))
+        for row in self.rendition_rows():
+            with row.src.open("rb") as file:
+                rendition = Image.open(io.BytesIO(file.read()))
+            self.assertEqual(rendition.size, (row.width, row.height))
+            self.assertFalse(rendition.getexif())
+
+    def test_rerun_does_not_add_files_or_rows(self):
+        images.generate_renditions(self.game, "thumbnail")
+        files = sorted(os.listdir(self.folder))
+        rows = list(self.rendition_rows().values_list("pk", flat=True))
+
+        images.generate_renditions(self.game, "thumbnail")
+        self.assertEqual(sorted(os.listdir(self.folder)), files)
+        self.assertEqual(list(self.rendition_rows().values_list("pk", flat=True)), rows)
+        self.assertEqual(len(files), 1 + len(rows))
+
+    def test_replacing_original_deletes_old_renditions(self):
+        images.generate_renditions(self.game, "thumbnail")
+        old_names = set(self.rendition_rows().values_list("src", flat=True))
+        old_original = self.game.thumbnail.name
+
+        self.game.thumbnail = SimpleUploadedFile("new.png", jpeg_with_exif(300, 300))
+        self.game.save()
+        # 변환 전에는 이전 원본의 변환본을 응답에 쓰지 않음
+        self.assertEqual(images.serialize_renditions(self.game, "thumbnail"), {})
+
+        images.generate_renditions(self.game, "thumbnail")
+        files = set(os.listdir(self.folder))
+        for name in old_names:
+            self.assertNotIn(os.path.basename(name), files)
+        self.assertEqual(self.rendition_rows().count(), len(images.RENDITIONS) * len(self.formats))
+        self.assertEqual(set(self.rendition_rows().values_list("source_name", flat=True)), {self.game.thumbnail.name})
+
+        serialized = images.serialize_renditions(self.game, "thumbnail")
+        self.assertEqual(set(serialized), set(images.RENDITIONS))
+        self.assertEqual(set(serialized["card"]), set(self.formats))
+        self.assertTrue(serialized["card"]["webp"].startswith("/media/images/thumbnail/"))
+        self.assertNotEqual(old_original, self.game.thumbnail.name)
+
+    def test_clearing_image_deletes_renditions(self):
+        images.generate_renditions(self.game, "thumbnail")
+        images.delete_renditions(self.game, "thumbnail")
+        self.assertFalse(self.rendition_rows().exists())
+        self.assertEqual(os.listdir(self.folder), [os.path.basename(self.game.thumbnail.name)])
+
+    def test_invalid_image(self):
+        self.game.thumbnail.save("broken.png", io.BytesIO(b"not an image"), save=False)
+        with self.assertRaises(images.ImageProcessingError):
+            images.generate_renditions(self.game, "thumbnail")
+
+
+@override_settings(OUTBOX_TRANSPORTS={
+    "discord": "commons.transports.FakeTransport",
+    "gmail": "commons.transports.FakeTransport",
+})
+class OutboxTest(TestCase):
+    def setUp(self):
+        for patcher in [
+            mock.patch.dict("commons.outbox._transports", clear=True),
+            mock.patch.object(FakeTransport, "sent", []),
+            mock.patch.object(FakeTransport, "error", None),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def enqueue(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            message = outbox.enqueue_email("user@test.com", "subject", "body")
+        self.assertEqual(callbacks, [outbox._kick])
+        return message
+
+    def make_due(self):
+        # 재시도 대기/임대 시간이 지난 것처럼 앞당김
+        OutboxMessage.objects.update(next_attempt_dt=timezone.now() - timedelta(seconds=1))
+
+    def assert_next_attempt_in(self, message, delay):
+        message.refresh_from_db()
+        self.assertAlmostEqual(
+            (message.next_attempt_dt - timezone.now()).total_seconds(), delay.total_seconds(), delta=5
+        )
+
+    def test_dispatch_sends_pending_messages(self):
+        message = self.enqueue()
+        outbox.enqueue_discord("game_upload", "content")
+        self.assertEqual(outbox.dispatch(), (2, 0))
+        self.assertCountEqual(FakeTransport.sent, [
+            ("gmail", {"to": "user@test.com", "subject": "subject", "body": "body"}),
+            ("discord", {"webhook": "game_upload", "content": "content"}),
+        ])
+        message.refresh_from_db()
+        self.assertEqual((message.status, message.attempts), (OutboxMessage.STATUS_SENT, 1))
+        self.assertIsNotNone(message.sent_dt)
+        self.assertEqual(dispatch_outbox(), "Dispatched 0 outbox messages (0 failed).")
+
+    def test_rollback_drops_message(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                outbox.enqueue_email("user@test.com", "subject", "body")
+                raise RuntimeError
+        self.assertEqual(callbacks, [])
+        self.assertFalse(OutboxMessage.objects.exists())
+
+    def test_retry_backoff(self):
+        message = self.enqueue()
+        FakeTransport.error = TransportError("timeout")
+        self.assertEqual(outbox.dispatch(), (0, 1))
+        message.refresh_from_db()
+        self.assertEqual((message.status, message.attempts, message.last_error), (OutboxMessage.STATUS_PENDING, 1, "timeout"))
+        self.assert_next_attempt_in(message, outbox.RETRY_BASE)
+        self.assertEqual(outbox.dispatch(), (0, 0))  # 재시도 시각 전
+
+        self.make_due()
+        self.assertEqual(outbox.dispatch(), (0, 1))
+        self.assert_next_attempt_in(message, outbox.RETRY_BASE * 2)
+        self.assertEqual(outbox.retry_delay(20), outbox.RETRY_MAX)
+
+        FakeTransport.error = None
+        self.make_due()
+        self.assertEqual(outbox.dispatch(), (1, 0))
+        message.refresh_from_db()
+        self.assertEqual((message.status, message.attempts, message.last_error), (OutboxMessage.STATUS_SENT, 3, ""))
+
+    def test_fails_after_max_attempts(self):
+        message = self.enqueue()
+        FakeTransport.error = TransportError("timeout")
+        for _ in range(outbox.MAX_ATTEMPTS):
+            self.make_due()
+            self.assertEqual(outbox.dispatch(), (0, 1))
+        message.refresh_from_db()
+        self.assertEqual((message.status, message.attempts), (OutboxMessage.STATUS_FAILED, outbox.MAX_ATTEMPTS))
+
+        self.make_due()
+        self.assertEqual(outbox.dispatch(), (0, 0))  # failed는 다시 보내지 않음
+
+    def test_non_retryable_error_fails_immediately(self):
+        message = self.enqueue()
+        FakeTransport.error = TransportError("invalid address", retryable=False)
+        self.assertEqual(outbox.dispatch(), (0, 1))
+        message.refresh_from_db()
+        self.assertEqual((message.status, message.attempts, message.last_error), (OutboxMessage.STATUS_FAILED, 1, "invalid address"))
+
+    def test_unexpected_transport_exception_is_retried(self):
+        message = self.enqueue()
+        with mock.patch.object(FakeTransport, "send", side_effect=ValueError("boom")):
+            self.assertEqual(outbox.dispatch(), (0, 1))
+        message.refresh_from_db()
+        self.assertEqual((message.status, message.last_error), (OutboxMessage.STATUS_PENDING, "ValueError: boom"))
+
+    def test_leased_message_is_reclaimed_after_lease(self):
+        message = self.enqueue()
+        # 전송 중 작업이 죽어 결과가 기록되지 않은 경우
+        self.assertEqual(outbox._claim(10), [message])
+        self.assert_next_attempt_in(message, outbox.LEASE)
+        self.assertEqual(outbox._claim(10), [])
+        self.assertEqual(outbox.dispatch(), (0, 0))
+
+        self.make_due()
+        self.assertEqual(outbox.dispatch(), (1, 0))
+        message.refresh_from_db()
+        self.assertEqual((message.status, message.attempts), (OutboxMessage.STATUS_SENT, 1))
+        self.assertEqual(len(FakeTransport.sent), 1)
+
+    def test_missing_result_is_retried(self):
+        message = self.enqueue()
+        with mock.patch.object(FakeTransport, "send", return_value={}):
+            self.assertEqual(outbox.dispatch(), (0, 1))
+        message.refresh_from_db()
+        self.assertEqual((message.status, message.last_error), (OutboxMessage.STATUS_PENDING, "전송 결과가 없습니다."))
@@ -0,0 +1,191 @@
+# 외부 알림 전송 방식 (commons.outbox에서 사용, OUTBOX_TRANSPORTS 설정으로 선택)
+# - 작업 프로세스마다 한 번 만들어 재사용 (HTTP 커넥션 풀, Gmail 서비스 객체 유지)
+# - send(messages)는 메시지별 결과 {pk: None(성공) 또는 TransportError}를 반환
+# - 테스트/로컬 개발에서는 FakeTransport로 바꿔 실제로 보내지 않고 기록만 함
+import base64
+import os
+import pickle
+from email.mime.text import MIMEText
+
+import requests
+
+from spartagames import config
+from spartagames.utils import http_session
+
+
+HTTP_TIMEOUT = (3.05, 10)  # (연결, 응답) 초
+
+DISCORD_MAX_CONTENT = 2000  # 디스코드 메시지 최대 길이
+DISCORD_WEBHOOKS = {
+    "game_upload": getattr(config, "DISCORD_GAME_UPLOAD_CHANNEL_WEBHOOK_URL", None),
+}
+
+GMAIL_SCOPES = ['https://www.googleapis.com/auth/gmail.send']
+GMAIL_TOKEN_FILE = 'token.pickle'
+GMAIL_SENDER = 'sparta.games.master@gmail.com'
+GMAIL_BATCH = 50  # Gmail 배치 요청 한 번에 담을 메시지 수
+GMAIL_TIMEOUT = 10
+
+
+class TransportError(Exception):
+    """
+    전송 실패 (retryable이 False이면 다시 보내도 실패하므로 재시도하지 않음)
+    """
+
+    def __init__(self, message, retryable=True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+def _chunks(messages, key, limit):
+    # 합친 길이가 limit를 넘지 않도록 메시지를 묶음
+    chunk, length = [], 0
+    for message in messages:
+        size = len(key(message)) + 1
+        if chunk and length + size > limit:
+            yield chunk
+            chunk, length = [], 0
+        chunk.append(message)
+        length += size
+    if chunk:
+        yield chunk
+
+
+class DiscordTransport:
+    """
+    같은 웹훅으로 가는 메시지는 2000자 안에서 하나로 합쳐 전송 (웹훅 요청 수 제한 대응)
+    payload: {"webhook": DISCORD_WEBHOOKS 키, "content": 내용}
+    """
+
+    def __init__(self):
+        self.session = http_session()
+
+    def _post(self, url, content):
+        try:
+            response = self.session.post(url, json={"content": content}, timeout=HTTP_TIMEOUT)
+        except requests.RequestException as e:
+            return TransportError(f"디스코드 요청 실패: {e}")
+        if response.status_code == 429 or response.status_code >= 500:
+            return TransportError(f"디스코드 응답 {response.status_code}")
+        if response.status_code >= 400:
+            return TransportError(f"디스코드 응답 {response.status_code}: {response.text[:200]}", retryable=False)
+        return None
+
+    def send(self, messages):
+        results = {}
+        by_webhook = {}
+        for message in messages:
+            by_webhook.setdefault(message.payload.get("webhook"), []).append(message)
+        for webhook, group in by_webhook.items():
+            url = DISCORD_WEBHOOKS.get(webhook)
+            if not url:
+                for message in group:
+                    results[message.pk] = TransportError(f"등록되지 않은 웹훅: {webhook}", retryable=False)
+                continue
+            for chunk in _chunks(group, lambda message: message.payload["content"], DISCORD_MAX_CONTENT):
+                error = self._post(url, "\n".join(message.payload["content"] for message in chunk))
+                for message in chunk:
+                    results[message.pk] = error
+        return results
+
+
+def load_gmail_credentials():
+    """
+    저장된 토큰을 불러오고 만료됐으면 갱신해 다시 저장
+    (최초 토큰은 관리자가 로컬에서 OAuth 동의 후 token.pickle로 배포)
+    """
+    from google.auth.transport.requests import Request
+
+    if not os.path.exists(GMAIL_TOKEN_FILE):
+        raise TransportError("Gmail 토큰 파일(token.pickle)이 없습니다.", retryable=False)
+    with open(GMAIL_TOKEN_FILE, 'rb') as token:
+        creds = pickle.load(token)
+    if not creds.valid:
+        if not (creds.expired and creds.refresh_token):
+            raise TransportError("Gmail 토큰을 갱신할 수 없습니다.", retryable=False)
+        creds.refresh(Request())
+        with open(GMAIL_TOKEN_FILE, 'wb') as token:
+            pickle.dump(creds, token)
+    return creds
+
+
+class GmailTransport:
+    """
+    Gmail API 서비스 객체를 재사용하고, 메시지를 배치 요청으로 묶어 전송
+    payload: {"to": 받는 주소, "subject": 제목, "body": 본문}
+    """
+
+    def __init__(self):
+        self.creds = None
+        self.service = None
+
+    def _get_service(self):
+        import google_auth_httplib2
+        import httplib2
+        from googleapiclient.discovery import build
+
+        if self.service is None or not self.creds.valid:
+            self.creds = load_gmail_credentials()
+            http = google_auth_httplib2.AuthorizedHttp(self.creds, http=httplib2.Http(timeout=GMAIL_TIMEOUT))
+            self.service = build('gmail', 'v1', http=http, cache_discovery=False)
+        return self.service
+
+    @staticmethod
+    def _raw(payload):
+        message = MIMEText(payload["body"])
+        message['from'] = GMAIL_SENDER
+        message['to'] = payload["to"]
+        message['subject'] = payload["subject"]
+        return base64.urlsafe_b64encode(message.as_bytes()).decode()
+
+    def send(self, messages):
+        from googleapiclient.errors import HttpError
+
+        try:
+            service = self._get_service()
+        except TransportError as e:
+            return {message.pk: e for message in messages}
+        except Exception as e:
+            error = TransportError(f"Gmail 서비스 생성 실패: {e}")
+            return {message.pk: error for message in messages}
+
+        results = {}
+
+        def callback(request_id, response, exception):
+            if exception is None:
+                results[int(request_id)] = None
+            elif isinstance(exception, HttpError) and 400 <= exception.status_code < 500 and exception.status_code != 429:
+                results[int(request_id)] = TransportError(f"Gmail 응답 {exception.status_code}", retryable=False)
+            else:
+                results[int(request_id)] = TransportError(f"Gmail 전송 실패: {exception}")
+
+        for start in range(0, len(messages), GMAIL_BATCH):
+            batch = service.new_batch_http_request(callback=callback)
+            for message in messages[start:start + GMAIL_BATCH]:
+                batch.add(
+                    service.users().messages().send(userId='me', body={'raw': self._raw(message.payload)}),
+                    request_id=str(message.pk),
+                )
+            try:
+                batch.execute()
+            except Exception as e:
+                for message in messages[start:start + GMAIL_BATCH]:
+                    results.setdefault(message.pk, TransportError(f"Gmail 배치 요청 실패: {e}"))
+        return results
+
+
+class FakeTransport:
+    """
+    실제로 보내지 않고 sent에 payload를 기록 (테스트/로컬 개발용)
+    error를 지정하면 모든 메시지를 그 오류로 실패 처리
+    """
+
+    sent = []
+    error = None
+
+    def send(self, messages):
+        if self.error is not None:
+            return {message.pk: self.error for message in messages}
+        for message in messages:
+            FakeTransport.sent.append((message.kind, message.payload))
+        return {message.pk: None for message in messages}
@@ -0,0 +1,175 @@
+# 게임 zip 직접 업로드 (S3 멀티파트 + presigned URL)
+# 1. start_upload: 멀티파트 업로드를 만들고 파트별 presigned PUT URL 발급
+# 2. 클라이언트가 각 파트를 S3에 바로 올리고 ETag 수집 (Django 웹 작업자를 거치지 않음)
+# 3. complete_upload: 파트 목록으로 업로드를 완료하고 실제 크기 확인
+# 4. 게임 등록/수정 시 claim_upload로 gamefile 지정 -> register_state=3(검증 중)으로 저장 후
+#    games.tasks.validate_game_file이 zip 무결성/압축 폭탄 검사 후 검수 대기(0)로 전환
+import math
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+
+from spartagames.utils import get_s3_client
+from .models import GameUpload
+
+
+MAX_ZIP_SIZE = 500 * 1024 * 1024
+PART_SIZE = 16 * 1024 * 1024  # S3 최소 파트 크기는 5MB (마지막 파트 제외)
+URL_EXPIRES = 60 * 60  # presigned URL 유효 시간 (초)
+STALE_UPLOAD = timedelta(days=1)  # 완료되지 않은 업로드를 취소하기 전 대기 시간
+
+
+class UploadError(Exception):
+    pass
+
+
+def _part_urls(s3, upload):
+    part_count = max(1, math.ceil(upload.size / upload.part_size))
+    return [
+        {
+            "part_number": number,
+            "url": s3.generate_presigned_url(
+                ClientMethod="upload_part",
+                Params={
+                    "Bucket": settings.AWS_STORAGE_BUCKET_NAME,
+                    "Key": upload.key,
+                    "UploadId": upload.upload_id,
+                    "PartNumber": number,
+                },
+                ExpiresIn=URL_EXPIRES,
+            ),
+        }
+        for number in range(1, part_count + 1)
+    ]
+
+
+def start_upload(user, filename, size):
+    """
+    반환: (GameUpload, [{"part_number", "url"}])
+    """
+    filename = os.path.basename(filename or "")
+    name, extension = os.path.splitext(filename)
+    if extension.lower() != ".zip":
+        raise UploadError("ZIP 파일만 업로드 가능합니다.")
+    try:
+        size = int(size)
+    except (TypeError, ValueError):
+        raise UploadError("파일 크기(size)가 필요합니다.")
+    if size <= 0 or size > MAX_ZIP_SIZE:
+        raise UploadError(f"ZIP 파일 크기는 최대 {MAX_ZIP_SIZE / (1024 * 1024)}MB 이어야 합니다.")
+
+    # Game.upload_to_func와 같은 형식의 이름
+    time_data = timezone.now().strftime("%Y%m%d%H%M%S%f")
+    key = f"media/zips/{time_data}_{get_valid_filename(name) or 'game'}.zip"
+
+    s3 = get_s3_client()
+    response = s3.create_multipart_upload(
+        Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+        Key=key,
+        ContentType="application/zip",
+    )
+    upload = GameUpload.objects.create(
+        uploader=user,
+        key=key,
+        upload_id=response["UploadId"],
+        size=size,
+        part_size=PART_SIZE,
+    )
+    return upload, _part_urls(s3, upload)
+
+
+def complete_upload(upload, parts):
+    """
+    parts: [{"part_number": int, "etag": str}]
+    동시에 두 번 요청되어도 한 번만 완료하도록 업로드 행을 잠근 뒤 상태 확인
+    """
+    try:
+        parts = sorted(
+            ({"PartNumber": int(part["part_number"]), "ETag": str(part["etag"])} for part in parts or []),
+            key=lambda part: part["PartNumber"],
+        )
+    except (KeyError, TypeError, ValueError):
+        raise UploadError("parts 형식이 올바르지 않습니다. [{part_number, etag}] 형식으로 보내주세요.")
+
+    s3 = get_s3_client()
+    bucket = settings.AWS_STORAGE_BUCKET_NAME
+    with transaction.atomic():
+        upload = GameUpload.objects.select_for_update().get(pk=upload.pk)
+        if upload.status != GameUpload.STATUS_UPLOADING:
+            raise UploadError("이미 완료되었거나 취소된 업로드입니다.")
+        expected = max(1, math.ceil(upload.size / upload.part_size))
+        if [part["PartNumber"] for part in parts] != list(range(1, expected + 1)):
+            raise UploadError(f"파트 {expected}개가 모두 필요합니다.")
+
+        s3.complete_multipart_upload(
+            Bucket=bucket, Key=upload.key, UploadId=upload.upload_id, MultipartUpload={"Parts": parts}
+        )
+        # 선언한 크기와 실제 크기가 다르면 (최대 크기 우회 방지) 객체 삭제
+        size_matches = s3.head_object(Bucket=bucket, Key=upload.key)["ContentLength"] == upload.size
+        if size_matches:
+            upload.status = GameUpload.STATUS_COMPLETED
+            upload.completed_dt = timezone.now()
+            upload.save(update_fields=["status", "completed_dt"])
+        else:
+            s3.delete_object(Bucket=bucket, Key=upload.key)
+            upload.status = GameUpload.STATUS_ABORTED
+            upload.save(update_fields=["status"])
+    if not size_matches:
+        raise UploadError("업로드된 파일 크기가 요청한 크기와 다릅니다.")
+    return upload
+
+
+def abort_upload(upload):
+    with transaction.atomic():
+        upload = GameUpload.objects.select_for_update().get(pk=upload.pk)
+        if upload.status != GameUpload.STATUS_UPLOADING:
+            raise UploadError("진행 중인 업로드가 아닙니다.")
+        get_s3_client().abort_multipart_upload(
+            Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=upload.key, UploadId=upload.upload_id
+        )
+        upload.status = GameUpload.STATUS_ABORTED
+        upload.save(update_fields=["status"])
+    return upload
+
+
+def claim_upload(user, upload_pk):
+    """
+    완료된 업로드를 게임에 연결할 수 있도록 사용 처리 (한 번만 사용 가능)
+    반환: GameUpload (없거나 이미 사용했으면 None)
+    """
+    with transaction.atomic():
+        upload = (
+            GameUpload.objects.select_for_update()
+            .filter(pk=upload_pk, uploader=user, status=GameUpload.STATUS_COMPLETED)
+            .first()
+        )
+        if upload is None:
+            return None
+        upload.status = GameUpload.STATUS_USED
+        upload.save(update_fields=["status"])
+    return upload
+
+
+def abort_stale_uploads(now=None):
+    """
+    완료되지 않고 오래된 멀티파트 업로드 취소 (S3에 남은 파트 정리)
+    반환: 취소한 업로드 수
+    """
+    now = now or timezone.now()
+    s3 = get_s3_client()
+    aborted = 0
+    for upload in GameUpload.objects.filter(status=GameUpload.STATUS_UPLOADING, create_dt__lt=now - STALE_UPLOAD):
+        try:
+            s3.abort_multipart_upload(
+                Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=upload.key, UploadId=upload.upload_id
+            )
+        except s3.exceptions.NoSuchUpload:
+            pass
+        upload.status = GameUpload.STATUS_ABORTED
+        upload.save(update_fields=["status"])
+        aborted += 1
+    return aborted
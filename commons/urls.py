@@ -6,5 +6,7 @@ app_name = "commons"
 
 urlpatterns = [
     # ---------- API---------- #
-    path("api/presigned-url/upload/", views.S3UploadPresignedUrlView.as_view(), name="presigned_url_for_upload")
+    path("api/presigned-url/upload/", views.S3UploadPresignedUrlView.as_view(), name="presigned_url_for_upload"),
+    path("api/presigned-url/game-upload/", views.GameUploadStartView.as_view(), name="game_upload_start"),
+    path("api/presigned-url/game-upload/<int:upload_pk>/", views.GameUploadDetailView.as_view(), name="game_upload_detail"),
 ]
@@ -21,7 +21,10 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 
+from spartagames.throttling import PresignedUrlThrottle
 from spartagames.utils import std_response
+from . import uploads
+from .models import GameUpload
 from spartagames.config import AWS_AUTH, AWS_S3_BUCKET_NAME, AWS_S3_REGION_NAME, AWS_S3_CUSTOM_DOMAIN, AWS_S3_BUCKET_IMAGES
 
 
@@ -65,6 +68,7 @@ def generate_presigned_url_for_upload(base_path, extension):
 # 업로드 용 presigned url 응답
 class S3UploadPresignedUrlView(APIView):
     permission_classes = [IsAuthenticated]
+    throttle_classes = [PresignedUrlThrottle]
 
     def post(self, request):
         base_path = request.data.get("base_path")
@@ -85,6 +89,66 @@ class S3UploadPresignedUrlView(APIView):
         )
 
 
+# 게임 zip 멀티파트 업로드 시작 (파트별 presigned url 발급)
+class GameUploadStartView(APIView):
+    permission_classes = [IsAuthenticated]
+    throttle_classes = [PresignedUrlThrottle]
+
+    def post(self, request):
+        try:
+            upload, parts = uploads.start_upload(request.user, request.data.get("filename"), request.data.get("size"))
+        except uploads.UploadError as e:
+            return std_response(message=str(e), status="fail", error_code="CLIENT_FAIL", status_code=status.HTTP_400_BAD_REQUEST)
+
+        return std_response(
+            status="success",
+            data={
+                "upload_id": upload.pk,
+                "part_size": upload.part_size,
+                "parts": parts,  # 각 url에 PUT 후 응답 헤더의 ETag를 모아 complete로 전송
+                "expires_in": uploads.URL_EXPIRES,
+            },
+            status_code=status.HTTP_201_CREATED
+        )
+
+
+# 게임 zip 멀티파트 업로드 완료 / 취소
+class GameUploadDetailView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get_object(self, request, upload_pk):
+        return GameUpload.objects.filter(pk=upload_pk, uploader=request.user).first()
+
+    def post(self, request, upload_pk):
+        upload = self.get_object(request, upload_pk)
+        if upload is None:
+            return std_response(message="업로드를 찾을 수 없습니다.", status="fail", error_code="CLIENT_FAIL", status_code=status.HTTP_404_NOT_FOUND)
+        try:
+            uploads.complete_upload(upload, request.data.get("parts"))
+        except uploads.UploadError as e:
+            return std_response(message=str(e), status="fail", error_code="CLIENT_FAIL", status_code=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            return std_response(message=f"업로드 완료 처리 실패: {str(e)}", status="error", error_code="THIRD_FAIL", status_code=status.HTTP_502_BAD_GATEWAY)
+
+        return std_response(
+            status="success",
+            message="업로드가 완료되었습니다. 게임 등록/수정 시 upload_id를 함께 보내주세요.",
+            data={"upload_id": upload.pk, "size": upload.size},
+            status_code=status.HTTP_200_OK
+        )
+
+    def delete(self, request, upload_pk):
+        upload = self.get_object(request, upload_pk)
+        if upload is None:
+            return std_response(message="업로드를 찾을 수 없습니다.", status="fail", error_code="CLIENT_FAIL", status_code=status.HTTP_404_NOT_FOUND)
+        try:
+            uploads.abort_upload(upload)
+        except uploads.UploadError as e:
+            return std_response(message=str(e), status="fail", error_code="CLIENT_FAIL", status_code=status.HTTP_400_BAD_REQUEST)
+
+        return std_response(status="success", message="업로드를 취소했습니다.", status_code=status.HTTP_200_OK)
+
+
 # 추후 필요할 경우 수정 예정
 class LocalImageUploadView(APIView):
     permission_classes = [IsAuthenticated]
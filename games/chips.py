@@ -0,0 +1,75 @@
+# 칩 레지스트리
+# - 칩 이름 -> id를 프로세스 메모리에 보관하여 칩을 부여할 때마다 get_or_create 하지 않도록 함
+# - 처음 사용할 때 전체 칩을 한 번에 불러오고, 없는 이름은 그때 생성
+# - Chip이 저장/삭제되면 signals에서 clear() 호출
+import threading
+
+from django.db import IntegrityError, transaction
+
+from .feeds import invalidate_home_feed
+from .models import Chip, Game
+
+
+class ChipRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids = None
+
+    def _load(self):
+        with self._lock:
+            if self._ids is None:
+                self._ids = dict(Chip.objects.values_list("name", "id"))
+            return self._ids
+
+    def clear(self):
+        with self._lock:
+            self._ids = None
+
+    def get_id(self, name):
+        ids = self._ids if self._ids is not None else self._load()
+        chip_id = ids.get(name)
+        if chip_id is None:
+            try:
+                with transaction.atomic():
+                    chip_id = Chip.objects.get_or_create(name=name)[0].pk
+            except IntegrityError:
+                chip_id = Chip.objects.get(name=name).pk
+            with self._lock:
+                if self._ids is not None:
+                    self._ids[name] = chip_id
+        return chip_id
+
+    def get_ids(self, names):
+        return {name: self.get_id(name) for name in names}
+
+
+registry = ChipRegistry()
+
+
+def get_chip_id(name):
+    return registry.get_id(name)
+
+
+def set_exclusive_chip(game_id, chip_name, group):
+    """
+    group(예: 난이도 칩) 중 chip_name 하나만 게임에 남도록 through 테이블을 차이만큼 갱신
+    이미 같은 상태면 조회 1회로 끝나며, m2m 신호를 거치지 않으므로 커밋 후 홈 피드 캐시를 직접 무효화
+    반환: 변경 여부
+    """
+    Through = Game.chip.through
+    group_ids = registry.get_ids(group)
+    target_id = group_ids[chip_name]
+
+    current = set(
+        Through.objects.filter(game_id=game_id, chip_id__in=group_ids.values()).values_list("chip_id", flat=True)
+    )
+    if current == {target_id}:
+        return False
+
+    stale = current - {target_id}
+    if stale:
+        Through.objects.filter(game_id=game_id, chip_id__in=stale).delete()
+    if target_id not in current:
+        Through.objects.bulk_create([Through(game_id=game_id, chip_id=target_id)], ignore_conflicts=True)
+    transaction.on_commit(invalidate_home_feed)
+    return True
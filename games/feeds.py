@@ -0,0 +1,192 @@
+# 메인 페이지(홈 피드) 구성용 캐시
+# - 각 선반(카테고리별 최신 게임, Daily Top, New Game, 최근 업데이트)을 비로그인 기준으로 직렬화하여 캐시에 저장
+# - 게임 저장/승인, 칩/카테고리 변경 시 버전 값을 올려 전체 캐시를 한 번에 무효화
+# - 요청 시에는 캐시된 조각을 이어 붙이고, 로그인 유저의 is_liked만 한 번의 쿼리로 덮어씀
+# - 캐시(Redis) 장애 시에는 무효화를 건너뛰고, 읽기는 DB에서 선반을 생성해 응답
+import random
+import time
+
+import redis
+from django.core.cache import cache
+
+from .models import Game, GameCategory
+from .serializers import GameListSerializer, get_liked_game_ids, prefetch_game_list
+
+
+HOME_FEED_VERSION_KEY = "games:home_feed:version"
+HOME_FEED_TIMEOUT = 60 * 10  # 10분
+HOME_FEED_DEFAULT_LIMIT = 4
+HOME_FEED_MAX_LIMIT = 20
+
+
+def get_feed_version():
+    """
+    캐시 장애 시 None
+    """
+    try:
+        version = cache.get(HOME_FEED_VERSION_KEY)
+        if version is None:
+            # 버전 키가 사라진 경우 이전 버전과 겹치지 않도록 현재 시각으로 초기화
+            cache.add(HOME_FEED_VERSION_KEY, int(time.time() * 1000), timeout=None)
+            version = cache.get(HOME_FEED_VERSION_KEY)
+    except redis.RedisError:
+        return None
+    return version
+
+
+def invalidate_home_feed():
+    """
+    홈 피드 캐시 무효화 (버전 증가)
+    트랜잭션 안에서 호출하는 곳은 transaction.on_commit(invalidate_home_feed)로 커밋 후 실행
+    (커밋 전에 무효화하면 다른 요청이 이전 데이터로 선반을 다시 캐시할 수 있음)
+    """
+    try:
+        cache.incr(HOME_FEED_VERSION_KEY)
+    except ValueError:
+        try:
+            cache.set(HOME_FEED_VERSION_KEY, int(time.time() * 1000), timeout=None)
+        except redis.RedisError:
+            pass
+    except redis.RedisError:
+        pass
+
+
+def _feed_key(version, name):
+    return f"games:home_feed:{version}:{name}"
+
+
+def _serialize_shelf(queryset):
+    # 캐시 공유를 위해 유저 정보 없이 직렬화 (is_liked는 요청 시 덮어씀)
+    serializer = GameListSerializer(
+        prefetch_game_list(queryset), many=True, context={'user': None, 'liked_game_ids': set()}
+    )
+    return [dict(item) for item in serializer.data]
+
+
+def _visible_games():
+    return Game.objects.filter(is_visible=True, register_state=1)
+
+
+def build_categories():
+    return list(GameCategory.objects.order_by('id').values_list('id', 'name'))
+
+
+def build_category_shelf(category_id, limit):
+    return _serialize_shelf(
+        _visible_games().filter(category__id=category_id).order_by('-created_at')[:limit]
+    )
+
+
+def build_trending_shelf(limit):
+    return _serialize_shelf(
+        _visible_games().filter(chip__name="Daily Top").order_by('-created_at')[:limit]
+    )
+
+
+def build_recent_shelf(limit):
+    return _serialize_shelf(
+        _visible_games().filter(chip__name="New Game").order_by('-created_at')[:limit]
+    )
+
+
+def build_updated_shelf(limit):
+    return _serialize_shelf(_visible_games().order_by('-updated_at')[:limit])
+
+
+def _get_shelves(version, builders):
+    """
+    builders: {캐시 이름: 선반 생성 함수}
+    캐시에 없는 선반만 생성 후 저장 (version이 None이거나 캐시 장애 시 모두 DB에서 생성)
+    """
+    if version is None:
+        return {name: build() for name, build in builders.items()}
+
+    keys = {name: _feed_key(version, name) for name in builders}
+    try:
+        cached = cache.get_many(keys.values())
+    except redis.RedisError:
+        cached = {}
+
+    shelves = {}
+    missing = {}
+    for name, key in keys.items():
+        if key in cached:
+            shelves[name] = cached[key]
+        else:
+            shelves[name] = builders[name]()
+            missing[key] = shelves[name]
+    if missing:
+        try:
+            cache.set_many(missing, timeout=HOME_FEED_TIMEOUT)
+        except redis.RedisError:
+            pass
+    return shelves
+
+
+def get_categories(version=None):
+    if version is None:
+        version = get_feed_version()
+    return _get_shelves(version, {"categories": build_categories})["categories"]
+
+
+def get_home_feed(user, limit=HOME_FEED_DEFAULT_LIMIT, category_count=3):
+    """
+    홈 피드 데이터 구성
+    카테고리가 category_count 개보다 적으면 None 반환
+    """
+    limit = max(0, min(limit, HOME_FEED_MAX_LIMIT))
+    version = get_feed_version()
+
+    categories = get_categories(version)
+    if len(categories) < category_count:
+        return None
+    selected_categories = random.sample(categories, category_count)
+
+    builders = {
+        f"trending:{limit}": lambda: build_trending_shelf(limit),
+        f"recent:{limit}": lambda: build_recent_shelf(limit),
+        f"updated:{limit}": lambda: build_updated_shelf(limit),
+    }
+    for category_id, _ in selected_categories:
+        builders[f"category:{category_id}:{limit}"] = (
+            lambda category_id=category_id: build_category_shelf(category_id, limit)
+        )
+    shelves = _get_shelves(version, builders)
+
+    # 로그인 유저의 즐겨찾기 여부 덮어쓰기 (쿼리 1회)
+    game_ids = [game["id"] for shelf in shelves.values() for game in shelf]
+    liked_game_ids = get_liked_game_ids(user, game_ids)
+
+    def with_is_liked(shelf):
+        return [{**game, "is_liked": game["id"] in liked_game_ids} for game in shelf]
+
+    data = {}
+    for index, (category_id, category_name) in enumerate(selected_categories, start=1):
+        data[f"rand{index}"] = {
+            "category_name": category_name,
+            "game_list": with_is_liked(shelves[f"category:{category_id}:{limit}"]),
+        }
+    data["trending_games"] = with_is_liked(shelves[f"trending:{limit}"])
+    data["recent"] = with_is_liked(shelves[f"recent:{limit}"])
+    data["updated"] = with_is_liked(shelves[f"updated:{limit}"])
+    return data
+
+
+def warm_home_feed(limit=HOME_FEED_DEFAULT_LIMIT):
+    """
+    기본 limit 기준으로 모든 선반을 미리 생성하여 캐시에 저장
+    """
+    version = get_feed_version()
+    if version is None:
+        return 0
+    categories = build_categories()
+    shelves = {
+        _feed_key(version, "categories"): categories,
+        _feed_key(version, f"trending:{limit}"): build_trending_shelf(limit),
+        _feed_key(version, f"recent:{limit}"): build_recent_shelf(limit),
+        _feed_key(version, f"updated:{limit}"): build_updated_shelf(limit),
+    }
+    for category_id, _ in categories:
+        shelves[_feed_key(version, f"category:{category_id}:{limit}")] = build_category_shelf(category_id, limit)
+    cache.set_many(shelves, timeout=HOME_FEED_TIMEOUT)
+    return len(shelves)
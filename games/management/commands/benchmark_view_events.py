@@ -0,0 +1,69 @@
+import random
+import time
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+
+from games import view_events
+from games.models import Game, View
+
+
+class Command(BaseCommand):
+    help = (
+        "게임 조회 이벤트를 Redis 버퍼에 기록(record_view)하고 flush해 처리량과 유실/중복 여부를 확인합니다. "
+        "비회원 IP를 viewers개 중에서 무작위로 골라 중복 조회를 섞으며, 저장된 View 행 수가 "
+        "서로 다른 (게임, IP) 쌍의 수와 같아야 합니다. 개발 DB/Redis에서만 실행하세요."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--events", type=int, default=50000, help="기록할 조회 수")
+        parser.add_argument("--viewers", type=int, default=5000, help="서로 다른 비회원 IP 수")
+        parser.add_argument("--games", type=int, default=20, help="사용할 게임 수 (공개된 게임 중 앞에서부터)")
+        parser.add_argument("--keep", action="store_true", help="저장된 View 행을 지우지 않음")
+
+    def handle(self, *args, **options):
+        game_ids = list(Game.objects.filter(is_visible=True).order_by("pk").values_list("pk", flat=True)[:options["games"]])
+        if not game_ids:
+            raise CommandError("공개된 게임이 없습니다.")
+        if view_events.pending_view_events():
+            raise CommandError("버퍼에 처리되지 않은 조회 이벤트가 있습니다. 먼저 flush 해주세요.")
+
+        # 이전 실행의 중복 확인 키와 섞이지 않도록 실행마다 다른 IP 대역 사용
+        run = random.randrange(256)
+        factory = RequestFactory()
+        requests = []
+        for viewer in range(options["viewers"]):
+            request = factory.get("/", REMOTE_ADDR=f"10.{run}.{viewer // 256 % 256}.{viewer % 256}")
+            request.user = AnonymousUser()
+            requests.append(request)
+
+        last_pk = View.objects.order_by("-pk").values_list("pk", flat=True).first() or 0
+        expected = set()
+        recorded = 0
+        started = time.monotonic()
+        for _ in range(options["events"]):
+            index = random.randrange(len(requests))
+            game_id = random.choice(game_ids)
+            expected.add((game_id, index))
+            recorded += view_events.record_view(requests[index], game_id)
+        record_elapsed = time.monotonic() - started
+
+        started = time.monotonic()
+        processed, saved = view_events.flush_view_events() or (0, 0)
+        flush_elapsed = time.monotonic() - started
+        stored = View.objects.filter(pk__gt=last_pk).count()
+
+        self.stdout.write(
+            f"기록: {options['events']}회 조회 -> 새 조회 {recorded}건, {record_elapsed:.3f}s "
+            f"({options['events'] / record_elapsed:.0f} req/s)"
+        )
+        self.stdout.write(
+            f"flush: 이벤트 {processed}건 -> View {saved}행, {flush_elapsed:.3f}s "
+            f"({processed / flush_elapsed if flush_elapsed else 0:.0f} rows/s)"
+        )
+        style = self.style.SUCCESS if stored == recorded == len(expected) else self.style.ERROR
+        self.stdout.write(style(f"기대 {len(expected)}행 / 저장 {stored}행 (유실 {max(0, len(expected) - stored)}, 중복 {max(0, stored - len(expected))})"))
+
+        if not options["keep"]:
+            View.objects.filter(pk__gt=last_pk).delete()
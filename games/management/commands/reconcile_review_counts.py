@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from games.models import Review, ReviewsLike
+
+
+def count_subquery(is_like):
+    counts = ReviewsLike.objects.filter(review=OuterRef("pk"), is_like=is_like).order_by().values("review")
+    return Coalesce(
+        Subquery(counts.annotate(cnt=Count("pk")).values("cnt"), output_field=IntegerField()),
+        Value(0),
+    )
+
+
+class Command(BaseCommand):
+    help = "ReviewsLike 기준으로 Review.like_count / dislike_count를 다시 계산합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000, help="한 번에 검사할 리뷰 수 (pk 구간)")
+        parser.add_argument("--dry-run", action="store_true", help="값이 어긋난 리뷰 수만 출력")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        dry_run = options["dry_run"]
+
+        last_pk = 0
+        checked = fixed = 0
+        while True:
+            pks = list(
+                Review.objects.filter(pk__gt=last_pk).order_by("pk").values_list("pk", flat=True)[:batch_size]
+            )
+            if not pks:
+                break
+            first_pk, last_pk = pks[0], pks[-1]
+            checked += len(pks)
+
+            # pk 구간 안에서 저장된 값과 실제 집계가 다른 리뷰만 갱신
+            with transaction.atomic():
+                mismatched = list(
+                    Review.objects.filter(pk__gte=first_pk, pk__lte=last_pk)
+                    .annotate(actual_like=count_subquery(1), actual_dislike=count_subquery(2))
+                    .filter(~Q(like_count=F("actual_like")) | ~Q(dislike_count=F("actual_dislike")))
+                    .values_list("pk", flat=True)
+                )
+                if mismatched and not dry_run:
+                    Review.objects.filter(pk__in=mismatched).update(
+                        like_count=count_subquery(1),
+                        dislike_count=count_subquery(2),
+                    )
+            fixed += len(mismatched)
+
+        action = "불일치" if dry_run else "수정"
+        self.stdout.write(self.style.SUCCESS(f"리뷰 {checked}개 검사, {fixed}개 {action}"))
@@ -0,0 +1,62 @@
+import re
+
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+def backfill_search_document(apps, schema_editor):
+    Game = apps.get_model("games", "Game")
+    games = Game.objects.using(schema_editor.connection.alias).select_related("maker").prefetch_related("category")
+    for game in games.iterator(chunk_size=500):
+        parts = [game.title]
+        parts.extend(category.name for category in game.category.all())
+        parts.append(game.maker.nickname)
+        document = re.sub(r"\s+", " ", " ".join(part for part in parts if part)).strip().lower()
+        Game.objects.using(schema_editor.connection.alias).filter(pk=game.pk).update(search_document=document)
+
+
+def create_search_indexes(apps, schema_editor):
+    # GIN / 트라이그램 인덱스는 PostgreSQL에서만 생성
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute(
+        "UPDATE games_game SET search_vector = to_tsvector('simple'::regconfig, COALESCE(search_document, ''))"
+    )
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS games_game_search_vector_gin ON games_game USING gin (search_vector)"
+    )
+    # icontains 조회(UPPER(...) LIKE UPPER(...))에 사용되는 트라이그램 인덱스
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS games_game_search_document_trgm "
+        "ON games_game USING gin (UPPER(search_document) gin_trgm_ops)"
+    )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS games_game_search_document_trgm")
+    schema_editor.execute("DROP INDEX IF EXISTS games_game_search_vector_gin")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0008_alter_game_content_alter_review_content'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_search_document, migrations.RunPython.noop),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2 on 2026-10-18 20:55
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_review_counts(apps, schema_editor):
+    Review = apps.get_model("games", "Review")
+    ReviewsLike = apps.get_model("games", "ReviewsLike")
+
+    def count_subquery(is_like):
+        counts = ReviewsLike.objects.filter(review=OuterRef("pk"), is_like=is_like).order_by().values("review")
+        return Coalesce(
+            Subquery(counts.annotate(cnt=Count("pk")).values("cnt"), output_field=IntegerField()),
+            Value(0),
+        )
+
+    Review.objects.using(schema_editor.connection.alias).update(
+        like_count=count_subquery(1),
+        dislike_count=count_subquery(2),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0009_game_search_document_game_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='dislike_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='like_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_review_counts, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['game', '-like_count', '-created_at'], name='review_game_like_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['game', '-dislike_count', '-created_at'], name='review_game_dislike_idx'),
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 4.2 on 2026-10-18 20:57
+
+from django.db import migrations, models
+from django.db.models import Case, Count, FloatField, IntegerField, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Cast, Coalesce
+from django.db.models.lookups import GreaterThan
+
+
+def backfill_rating_sums(apps, schema_editor):
+    # 공개 리뷰 기준으로 집계를 채우고, 그동안 어긋난 star/review_cnt도 함께 바로잡음
+    Game = apps.get_model("games", "Game")
+    Review = apps.get_model("games", "Review")
+
+    def review_aggregate(expression):
+        reviews = Review.objects.filter(game=OuterRef("pk"), is_visible=True).order_by().values("game")
+        return Coalesce(
+            Subquery(reviews.annotate(value=expression).values("value"), output_field=IntegerField()),
+            Value(0),
+        )
+
+    star_sum = review_aggregate(Sum("star"))
+    review_cnt = review_aggregate(Count("pk"))
+    Game.objects.using(schema_editor.connection.alias).update(
+        star_sum=star_sum,
+        review_cnt=review_cnt,
+        difficulty_sum=review_aggregate(Sum("difficulty")),
+        difficulty_cnt=review_aggregate(Count("difficulty")),
+        star=Case(
+            When(GreaterThan(review_cnt, 0), then=Cast(star_sum, FloatField()) / Cast(review_cnt, FloatField())),
+            default=Value(0.0),
+            output_field=FloatField(),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0010_review_like_count_review_dislike_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='difficulty_cnt',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='difficulty_sum',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='star_sum',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_rating_sums, migrations.RunPython.noop),
+    ]
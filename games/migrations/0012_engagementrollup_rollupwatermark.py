@@ -0,0 +1,46 @@
+# Generated by Django 4.2 on 2026-10-18 21:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0011_game_star_sum_game_difficulty_sum_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('last_id', models.BigIntegerField(default=0)),
+                ('ceiling', models.BigIntegerField(default=0)),
+                ('ceiling_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='EngagementRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket_size', models.CharField(choices=[('hour', 'hour'), ('day', 'day')], max_length=4)),
+                ('bucket', models.DateTimeField()),
+                ('likes', models.IntegerField(default=0)),
+                ('views', models.IntegerField(default=0)),
+                ('reviews', models.IntegerField(default=0)),
+                ('playtime_seconds', models.BigIntegerField(default=0)),
+                ('game', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='engagement_rollups', to='games.game')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='engagementrollup',
+            index=models.Index(fields=['bucket_size', 'bucket'], name='engagement_rollup_bucket_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='engagementrollup',
+            constraint=models.UniqueConstraint(fields=('game', 'bucket_size', 'bucket'), name='unique_engagement_rollup'),
+        ),
+    ]
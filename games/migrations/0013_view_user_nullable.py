@@ -0,0 +1,21 @@
+# Generated by Django 4.2 on 2026-10-18 22:40
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('games', '0012_engagementrollup_rollupwatermark'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='view',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='view_games', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2 on 2026-10-18 22:55
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Sum
+
+
+def merge_duplicate_totals(apps, schema_editor):
+    # 같은 (user, game) 행이 여러 개면 가장 먼저 만든 행에 합치고 나머지 삭제
+    TotalPlayTime = apps.get_model("games", "TotalPlayTime")
+    duplicates = (
+        TotalPlayTime.objects.values("user_id", "game_id")
+        .annotate(rows=Count("pk"), total=Sum("totaltime"), latest=Max("latest_at"))
+        .filter(rows__gt=1)
+    )
+    for row in duplicates:
+        rows = TotalPlayTime.objects.filter(user_id=row["user_id"], game_id=row["game_id"]).order_by("pk")
+        keep = rows.first()
+        rows.exclude(pk=keep.pk).delete()
+        TotalPlayTime.objects.filter(pk=keep.pk).update(totaltime=row["total"], latest_at=row["latest"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0013_view_user_nullable'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_totals, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='totalplaytime',
+            constraint=models.UniqueConstraint(fields=('user', 'game'), name='unique_total_play_time'),
+        ),
+    ]
@@ -2,6 +2,8 @@ import os
 import re
 
 from django.conf import settings
+from django.contrib.contenttypes.fields import GenericRelation
+from django.contrib.postgres.search import SearchVectorField
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils import timezone
@@ -45,6 +47,9 @@ class Game(models.Model):
 
     title = models.CharField(max_length=100)
     thumbnail = models.ImageField(upload_to="images/thumbnail/")
+    renditions = GenericRelation(
+        "commons.ImageRendition", content_type_field="content_type", object_id_field="content_id"
+    )  # 이미지 변환본 (commons.images)
     youtube_url = models.URLField(blank=True, null=True)
     maker = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="games"
@@ -64,8 +69,15 @@ class Game(models.Model):
     is_visible = models.BooleanField(default=True)
     star = models.FloatField()
     review_cnt = models.IntegerField()
+    # 별점/난이도 집계 (games.ratings에서 F()로 갱신, star는 star_sum / review_cnt)
+    star_sum = models.IntegerField(default=0)
+    difficulty_sum = models.IntegerField(default=0)
+    difficulty_cnt = models.IntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # 검색용 (games.search 참고, 인덱스는 PostgreSQL에서만 마이그레이션으로 생성)
+    search_document = models.TextField(blank=True, default="", editable=False)
+    search_vector = SearchVectorField(null=True, editable=False)
 
 
 class Like(models.Model):
@@ -79,8 +91,9 @@ class Like(models.Model):
 
 
 class View(models.Model):
+    # 조회 이벤트는 games.view_events가 Redis에 모았다가 일괄 저장 (비회원 조회는 user 없음)
     user = models.ForeignKey(
-        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="view_games"
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="view_games", null=True, blank=True
     )
     game = models.ForeignKey(
         Game, on_delete=models.CASCADE, related_name="views"
@@ -110,6 +123,12 @@ class TotalPlayTime(models.Model):
     latest_at = models.DateTimeField(null=True)
     totaltime = models.IntegerField(default=0)
 
+    class Meta:
+        constraints = [
+            # games.play_sessions에서 INSERT ... ON CONFLICT (user, game)로 누적
+            models.UniqueConstraint(fields=["user", "game"], name="unique_total_play_time"),
+        ]
+
 
 # 기존 Comment 테이블
 # class Comment(models.Model):
@@ -139,9 +158,18 @@ class Review(models.Model):
     star = models.IntegerField(null=True)
     difficulty = models.IntegerField(null=True)
     is_visible = models.BooleanField(default=True)
+    # ReviewsLike 집계 값 (toggle_review_like에서 F()로 갱신, reconcile_review_counts 명령으로 재계산)
+    like_count = models.IntegerField(default=0)
+    dislike_count = models.IntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["game", "-like_count", "-created_at"], name="review_game_like_idx"),
+            models.Index(fields=["game", "-dislike_count", "-created_at"], name="review_game_dislike_idx"),
+        ]
+
 
 class ReviewsLike(models.Model):
     user = models.ForeignKey(
@@ -159,11 +187,53 @@ class Screenshot(models.Model):
         blank=True,
         null=True,
     )
+    renditions = GenericRelation(
+        "commons.ImageRendition", content_type_field="content_type", object_id_field="content_id"
+    )  # 이미지 변환본 (commons.images)
     game = models.ForeignKey(
         Game, on_delete=models.CASCADE, related_name="screenshots"
     )
 
 
+class EngagementRollup(models.Model):
+    """
+    게임별 시간/일 단위 참여 집계 (games.rollups에서 원본별 워터마크 이후 행만 증분 반영)
+    """
+    HOUR = "hour"
+    DAY = "day"
+    BUCKET_SIZE_CHOICES = [(HOUR, "hour"), (DAY, "day")]
+
+    game = models.ForeignKey(
+        Game, on_delete=models.CASCADE, related_name="engagement_rollups"
+    )
+    bucket_size = models.CharField(max_length=4, choices=BUCKET_SIZE_CHOICES)
+    bucket = models.DateTimeField()
+    likes = models.IntegerField(default=0)  # 버킷 시간에 새로 추가된 좋아요 수 (취소는 반영하지 않음)
+    views = models.IntegerField(default=0)
+    reviews = models.IntegerField(default=0)
+    playtime_seconds = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["game", "bucket_size", "bucket"], name="unique_engagement_rollup"),
+        ]
+        indexes = [
+            models.Index(fields=["bucket_size", "bucket"], name="engagement_rollup_bucket_idx"),
+        ]
+
+
+class RollupWatermark(models.Model):
+    """
+    집계 작업별로 어디까지 반영했는지 기록
+    last_id: 마지막으로 반영한 원본 행 id, ceiling: ceiling_at 시각에 관찰한 원본 최대 id (다음 반영 목표)
+    """
+    name = models.CharField(max_length=50, unique=True)
+    last_id = models.BigIntegerField(default=0)
+    ceiling = models.BigIntegerField(default=0)
+    ceiling_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+
 # class Star(models.Model):
 #     star = models.IntegerField(null=True)
 #     user = models.ForeignKey(
@@ -0,0 +1,233 @@
+# 게임 플레이 세션 (하트비트 기반, Redis에 모았다가 PlayLog/TotalPlayTime에 일괄 반영)
+# - 시작: 세션 id를 발급하고 Redis 해시(user, game, start, last)와 진행 중 zset(점수 = 마감 시각)에 등록
+#   하트비트를 보내지 않는 기존 클라이언트도 종료 요청을 보낼 수 있도록 처음 마감은 START_TIMEOUT 뒤
+# - 하트비트: last를 갱신하고 마감을 HEARTBEAT_TIMEOUT 뒤로 연장
+# - 종료: 종료 시각으로 세션을 닫아 종료 리스트에 추가
+# - flush_play_sessions(Celery beat 1분 주기)
+#   1. 마감이 지난 세션(브라우저를 닫아 종료 요청이 오지 않은 세션)을 마지막 하트비트 시각으로 닫음
+#   2. 종료 리스트를 배치 단위로 PlayLog bulk_create + TotalPlayTime upsert(INSERT ... ON CONFLICT)
+#   DB 커밋 후에만 리스트에서 제거 (spartagames.utils.drain_list)
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+import redis
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+
+from spartagames.utils import drain_list, get_redis
+from .models import Game, PlayLog, TotalPlayTime
+
+
+HEARTBEAT_INTERVAL = timedelta(seconds=30)  # 클라이언트 권장 하트비트 주기
+HEARTBEAT_TIMEOUT = timedelta(seconds=90)  # 하트비트가 이만큼 없으면 마지막 하트비트 시각으로 종료
+START_TIMEOUT = timedelta(hours=6)  # 하트비트 없이 종료 요청만 보내는 클라이언트를 기다리는 시간
+SESSION_TTL = timedelta(days=1)  # 세션 해시 보관 시간 (하트비트마다 연장)
+FLUSH_BATCH = 2000
+CLOSE_BATCH = 1000
+FLUSH_LOCK_TIMEOUT = 5 * 60  # 초
+
+SESSION_KEY_PREFIX = "play:session:"
+ACTIVE_KEY = "play:active"
+ENDED_KEY = "play:ended"
+PROCESSING_KEY = "play:ended:processing"
+FLUSH_LOCK_KEY = "play:flush-lock"
+
+# KEYS[1]: 세션 해시, KEYS[2]: 진행 중 zset
+# ARGV: user, game, 현재 시각, 새 마감 시각, 세션 id, 해시 TTL(초)
+HEARTBEAT_SCRIPT = """
+if redis.call('HGET', KEYS[1], 'user') ~= ARGV[1] or redis.call('HGET', KEYS[1], 'game') ~= ARGV[2] then
+    return 0
+end
+if not redis.call('ZSCORE', KEYS[2], ARGV[5]) then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'last', ARGV[3])
+redis.call('EXPIRE', KEYS[1], ARGV[6])
+redis.call('ZADD', KEYS[2], ARGV[4], ARGV[5])
+return 1
+"""
+
+# KEYS[1]: 세션 해시, KEYS[2]: 진행 중 zset, KEYS[3]: 종료 리스트
+# ARGV: user, game, 종료 시각, 세션 id
+# 반환: 시작 시각 (이미 닫힌 세션이면 false)
+END_SCRIPT = """
+if redis.call('HGET', KEYS[1], 'user') ~= ARGV[1] or redis.call('HGET', KEYS[1], 'game') ~= ARGV[2] then
+    return false
+end
+if redis.call('ZREM', KEYS[2], ARGV[4]) == 0 then
+    return false
+end
+local start = redis.call('HGET', KEYS[1], 'start')
+redis.call('RPUSH', KEYS[3], ARGV[1] .. ':' .. ARGV[2] .. ':' .. start .. ':' .. ARGV[3])
+redis.call('DEL', KEYS[1])
+return start
+"""
+
+# KEYS[1]: 진행 중 zset, KEYS[2]: 종료 리스트
+# ARGV: 현재 시각, 최대 개수, 세션 해시 키 접두사
+# 반환: 닫은 세션 수
+CLOSE_SCRIPT = """
+local sids = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+for _, sid in ipairs(sids) do
+    local key = ARGV[3] .. sid
+    local session = redis.call('HMGET', key, 'user', 'game', 'start', 'last')
+    redis.call('ZREM', KEYS[1], sid)
+    if session[1] then
+        redis.call('RPUSH', KEYS[2], session[1] .. ':' .. session[2] .. ':' .. session[3] .. ':' .. (session[4] or session[3]))
+    end
+    redis.call('DEL', key)
+end
+return #sids
+"""
+
+
+class PlaySessionError(Exception):
+    pass
+
+
+def _now():
+    return int(datetime.now(dt_timezone.utc).timestamp())
+
+
+def _datetime(timestamp):
+    return datetime.fromtimestamp(int(timestamp), tz=dt_timezone.utc)
+
+
+def start_session(user, game):
+    """
+    반환: 세션 id
+    """
+    client = get_redis()
+    session_id = uuid.uuid4().hex
+    now = _now()
+    key = f"{SESSION_KEY_PREFIX}{session_id}"
+    with client.pipeline() as pipe:
+        pipe.hset(key, mapping={"user": user.pk, "game": game.pk, "start": now})
+        pipe.expire(key, SESSION_TTL)
+        pipe.zadd(ACTIVE_KEY, {session_id: now + int(START_TIMEOUT.total_seconds())})
+        pipe.execute()
+    return session_id
+
+
+def heartbeat(user, game, session_id):
+    """
+    반환: 진행 중인 세션이면 True (이미 닫혔거나 다른 사용자/게임의 세션이면 False)
+    """
+    client = get_redis()
+    now = _now()
+    return bool(client.register_script(HEARTBEAT_SCRIPT)(
+        keys=[f"{SESSION_KEY_PREFIX}{session_id}", ACTIVE_KEY],
+        args=[
+            user.pk, game.pk, now, now + int(HEARTBEAT_TIMEOUT.total_seconds()),
+            session_id, int(SESSION_TTL.total_seconds()),
+        ],
+    ))
+
+
+def end_session(user, game, session_id):
+    """
+    세션을 닫아 종료 리스트에 추가 (DB 반영은 flush_play_sessions)
+    반환: (시작 시각, 종료 시각, 플레이 시간(초))
+    """
+    client = get_redis()
+    now = _now()
+    start = client.register_script(END_SCRIPT)(
+        keys=[f"{SESSION_KEY_PREFIX}{session_id}", ACTIVE_KEY, ENDED_KEY],
+        args=[user.pk, game.pk, now, session_id],
+    )
+    if start is None:
+        raise PlaySessionError("진행 중인 플레이 기록이 없습니다.")
+    start = int(start)
+    return _datetime(start), _datetime(now), max(0, now - start)
+
+
+def close_abandoned_sessions(now=None):
+    """
+    마감이 지난 세션을 마지막 하트비트 시각으로 닫음
+    반환: 닫은 세션 수
+    """
+    client = get_redis()
+    script = client.register_script(CLOSE_SCRIPT)
+    now = now or _now()
+    closed = 0
+    while True:
+        count = script(keys=[ACTIVE_KEY, ENDED_KEY], args=[now, CLOSE_BATCH, SESSION_KEY_PREFIX])
+        closed += count
+        if count < CLOSE_BATCH:
+            return closed
+
+
+def _parse(raw):
+    user_id, game_id, start, end = (int(value) for value in raw.decode().split(":"))
+    return user_id, game_id, start, end
+
+
+def _upsert_totals(totals):
+    """
+    totals: {(user_id, game_id): (추가 플레이 시간, 마지막 플레이 시각)}
+    (user, game) 행이 있으면 더하고 없으면 만듦 (한 번의 INSERT ... ON CONFLICT)
+    """
+    table = connection.ops.quote_name(TotalPlayTime._meta.db_table)
+    latest = "GREATEST" if connection.vendor == "postgresql" else "MAX"
+    placeholders = ", ".join(["(%s, %s, %s, %s)"] * len(totals))
+    params = []
+    for (user_id, game_id), (seconds, latest_at) in totals.items():
+        params.extend([user_id, game_id, seconds, latest_at])
+    sql = (
+        f"INSERT INTO {table} (user_id, game_id, totaltime, latest_at) VALUES {placeholders} "
+        f"ON CONFLICT (user_id, game_id) DO UPDATE SET "
+        f"totaltime = {table}.totaltime + EXCLUDED.totaltime, "
+        f"latest_at = {latest}(COALESCE({table}.latest_at, EXCLUDED.latest_at), EXCLUDED.latest_at)"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+
+
+def _save(sessions):
+    # 세션이 쌓이는 동안 삭제된 게임/회원은 제외
+    game_ids = set(Game.objects.filter(pk__in={game_id for _, game_id, _, _ in sessions}).values_list("pk", flat=True))
+    user_ids = set(
+        get_user_model().objects.filter(pk__in={user_id for user_id, _, _, _ in sessions}).values_list("pk", flat=True)
+    )
+    logs = []
+    totals = defaultdict(lambda: [0, None])
+    for user_id, game_id, start, end in sessions:
+        if game_id not in game_ids or user_id not in user_ids:
+            continue
+        playtime = max(0, end - start)
+        end_at = _datetime(end)
+        logs.append(PlayLog(user_id=user_id, game_id=game_id, start_at=_datetime(start), end_at=end_at, playtime=playtime))
+        total = totals[(user_id, game_id)]
+        total[0] += playtime
+        total[1] = max(total[1], end_at) if total[1] else end_at
+    if not logs:
+        return 0
+    with transaction.atomic():
+        PlayLog.objects.bulk_create(logs, batch_size=1000)
+        _upsert_totals(totals)
+    return len(logs)
+
+
+def flush_play_sessions(batch_size=FLUSH_BATCH):
+    """
+    반환: (닫은 방치 세션 수, 처리한 종료 세션 수, 저장한 PlayLog 수), 다른 작업이 처리 중이면 None
+    """
+    client = get_redis()
+    lock = client.lock(FLUSH_LOCK_KEY, timeout=FLUSH_LOCK_TIMEOUT)
+    if not lock.acquire(blocking=False):
+        return None
+    try:
+        closed = close_abandoned_sessions()
+        saved = []
+        processed = drain_list(
+            client, ENDED_KEY, PROCESSING_KEY,
+            lambda items: saved.append(_save([_parse(item) for item in items])),
+            batch_size,
+        )
+        return closed, processed, sum(saved)
+    finally:
+        try:
+            lock.release()
+        except redis.exceptions.LockError:  # 처리 중 잠금 시간이 지난 경우
+            pass
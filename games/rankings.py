@@ -0,0 +1,151 @@
+# 칩 랭킹 (Daily Top, Bookmark Top, Long Play, Review Top)
+# - 좋아요/리뷰/조회/플레이 시간은 각각 독립된 서브쿼리로 집계 (JOIN 곱으로 수가 부풀지 않음)
+# - 최근 1일/7일 값은 원본 행 대신 EngagementRollup 버킷 합으로 계산 (games.rollups)
+# - 점수가 같으면 최신 게임, 생성 시각까지 같으면 pk가 큰 게임 우선 (실행마다 같은 결과)
+# - 선정된 게임으로 칩 부여 상태를 through 테이블에서 한 트랜잭션 안에 일괄 삭제/삽입
+# - 각 단계 소요 시간(ms)을 함께 반환
+import time
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, FloatField, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Cast, Coalesce
+from django.utils import timezone
+
+from .chips import get_chip_id
+from .feeds import invalidate_home_feed
+from .models import EngagementRollup, Game, Like, Review
+from .rollups import recent_sum, roll_up
+
+
+TOP_GAME_COUNT = 4
+
+
+def _aggregate(queryset, expression):
+    """
+    게임별 집계 서브쿼리 (queryset은 game=OuterRef("pk") 조건이 포함된 상태)
+    """
+    rows = queryset.order_by().values("game")
+    return Coalesce(
+        Subquery(rows.annotate(value=expression).values("value"), output_field=IntegerField()),
+        Value(0),
+    )
+
+
+def _ranked_games():
+    return Game.objects.filter(is_visible=True, register_state=1)
+
+
+def daily_top_games(now):
+    day_ago = now - timedelta(days=1)
+    # 좋아요는 취소까지 반영된 누적 개수를 사용 (롤업의 likes는 새로 추가된 수만 기록)
+    likes = _aggregate(Like.objects.filter(game=OuterRef("pk")), Count("pk"))
+    reviews = recent_sum("reviews", day_ago)
+    views = recent_sum("views", day_ago)
+    return _ranked_games().annotate(
+        score=Cast(likes, FloatField()) * 0.4 + Cast(reviews, FloatField()) * 0.3 + Cast(views, FloatField()) * 0.3
+    ).order_by("-score", "-created_at", "-pk")
+
+
+def bookmark_top_games(now):
+    return _ranked_games().annotate(
+        bookmark_count=_aggregate(Like.objects.filter(game=OuterRef("pk")), Count("pk"))
+    ).filter(bookmark_count__gte=5).order_by("-bookmark_count", "-created_at", "-pk")
+
+
+def long_play_games(now):
+    week_ago = now - timedelta(weeks=1)
+    return _ranked_games().annotate(
+        total_playtime=recent_sum("playtime_seconds", week_ago, EngagementRollup.DAY)
+    ).filter(total_playtime__gt=0).order_by("-total_playtime", "-created_at", "-pk")
+
+
+def review_top_games(now):
+    return _ranked_games().annotate(
+        total_review_count=_aggregate(Review.objects.filter(game=OuterRef("pk")), Count("pk"))
+    ).filter(total_review_count__gte=10).order_by("-total_review_count", "-created_at", "-pk")
+
+
+# 칩 이름: (랭킹 queryset 함수, 기존 부여 게임에서 제거 여부)
+RANKINGS = {
+    "Daily Top": (daily_top_games, True),
+    "Bookmark Top": (bookmark_top_games, False),  # 중복 할당 허용 (기존 칩 유지)
+    "Long Play": (long_play_games, True),
+    "Review Top": (review_top_games, True),
+}
+
+
+def _elapsed_ms(started):
+    return round((time.monotonic() - started) * 1000, 1)
+
+
+def swap_chip(chip_name, game_ids, exclusive=True):
+    """
+    chip_name 칩을 game_ids 게임에 부여
+    exclusive이면 game_ids에 없는 게임에서는 제거 (through 테이블 일괄 삭제/삽입, 한 트랜잭션)
+    m2m 신호를 거치지 않으므로 커밋 후 홈 피드 캐시를 직접 무효화
+    반환: (추가 수, 제거 수)
+    """
+    Through = Game.chip.through
+    chip_id = get_chip_id(chip_name)
+    game_ids = set(game_ids)
+
+    with transaction.atomic():
+        removed = 0
+        if exclusive:
+            removed, _ = Through.objects.filter(chip_id=chip_id).exclude(game_id__in=game_ids).delete()
+        existing = set(
+            Through.objects.filter(chip_id=chip_id, game_id__in=game_ids).values_list("game_id", flat=True)
+        )
+        missing = game_ids - existing
+        Through.objects.bulk_create(
+            [Through(game_id=game_id, chip_id=chip_id) for game_id in missing], ignore_conflicts=True
+        )
+        if removed or missing:
+            transaction.on_commit(invalidate_home_feed)
+    return len(missing), removed
+
+
+def run_ranking(chip_name, limit=TOP_GAME_COUNT, now=None):
+    """
+    랭킹 계산 후 칩 교체
+    반환: {"chip", "games", "added", "removed", "rank_ms", "swap_ms"} (rank_ms는 집계 반영 포함)
+    """
+    ranking, exclusive = RANKINGS[chip_name]
+    now = now or timezone.now()
+
+    # 마지막 집계 이후 쌓인 행을 먼저 반영
+    started = time.monotonic()
+    roll_up(now)
+    game_ids = list(ranking(now).values_list("pk", flat=True)[:limit])
+    rank_ms = _elapsed_ms(started)
+
+    started = time.monotonic()
+    added, removed = swap_chip(chip_name, game_ids, exclusive=exclusive)
+    swap_ms = _elapsed_ms(started)
+
+    return {
+        "chip": chip_name,
+        "games": game_ids,
+        "added": added,
+        "removed": removed,
+        "rank_ms": rank_ms,
+        "swap_ms": swap_ms,
+    }
+
+
+def clear_chip(chip_name):
+    """
+    chip_name 칩을 모든 게임에서 일괄 제거
+    반환: (제거 수, 소요 시간 ms)
+    """
+    started = time.monotonic()
+    _, removed = swap_chip(chip_name, [], exclusive=True)
+    return removed, _elapsed_ms(started)
+
+
+def format_result(result):
+    return (
+        f"Assigned '{result['chip']}' chip to {len(result['games'])} games "
+        f"(+{result['added']}/-{result['removed']}, rank {result['rank_ms']}ms, swap {result['swap_ms']}ms)."
+    )
@@ -0,0 +1,107 @@
+# 게임 별점/난이도 집계
+# - Game.star_sum, review_cnt, difficulty_sum, difficulty_cnt를 F()로 한 번의 UPDATE에서 증감
+# - star(평균 별점)도 같은 UPDATE에서 합계/개수로 계산하여 동시 요청에도 값이 어긋나지 않음
+# - 난이도 칩(EASY/NORMAL/HARD)은 리뷰를 다시 읽지 않고 난이도 합계/개수로 결정
+# - verify_ratings(): 공개 리뷰 기준 실제 집계와 비교하여 어긋난 게임을 바로잡음 (Celery 주기 작업)
+from django.db.models import Case, Count, F, FloatField, IntegerField, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Cast, Coalesce
+from django.db.models.lookups import GreaterThan
+
+from .models import Game, Review
+
+
+def _difficulty_delta(difficulty, sign):
+    # 난이도를 남기지 않은 리뷰는 난이도 집계에서 제외
+    if difficulty is None:
+        return 0, 0
+    return sign * difficulty, sign
+
+
+def apply_rating_delta(game_id, star_delta=0, count_delta=0, difficulty_delta=0, difficulty_cnt_delta=0):
+    """
+    게임의 별점/난이도 집계를 증감하고 평균 별점을 다시 계산 (UPDATE 1회)
+    """
+    new_star_sum = F("star_sum") + star_delta
+    new_review_cnt = F("review_cnt") + count_delta
+    Game.objects.filter(pk=game_id).update(
+        star_sum=new_star_sum,
+        review_cnt=new_review_cnt,
+        difficulty_sum=F("difficulty_sum") + difficulty_delta,
+        difficulty_cnt=F("difficulty_cnt") + difficulty_cnt_delta,
+        star=Case(
+            When(Q(review_cnt__gt=-count_delta), then=Cast(new_star_sum, FloatField()) / Cast(new_review_cnt, FloatField())),
+            default=Value(0.0),
+            output_field=FloatField(),
+        ),
+    )
+
+
+def review_created(review):
+    difficulty_delta, difficulty_cnt_delta = _difficulty_delta(review.difficulty, 1)
+    apply_rating_delta(review.game_id, review.star or 0, 1, difficulty_delta, difficulty_cnt_delta)
+
+
+def review_deleted(review):
+    difficulty_delta, difficulty_cnt_delta = _difficulty_delta(review.difficulty, -1)
+    apply_rating_delta(review.game_id, -(review.star or 0), -1, difficulty_delta, difficulty_cnt_delta)
+
+
+def review_updated(game_id, before, after):
+    """
+    before/after: 수정 전후의 {"star": ..., "difficulty": ...} (DB에 저장된 값 기준)
+    """
+    old_difficulty, old_difficulty_cnt = _difficulty_delta(before.get("difficulty"), -1)
+    new_difficulty, new_difficulty_cnt = _difficulty_delta(after.get("difficulty"), 1)
+    star_delta = (after.get("star") or 0) - (before.get("star") or 0)
+    difficulty_delta = old_difficulty + new_difficulty
+    difficulty_cnt_delta = old_difficulty_cnt + new_difficulty_cnt
+    if star_delta or difficulty_delta or difficulty_cnt_delta:
+        apply_rating_delta(game_id, star_delta, 0, difficulty_delta, difficulty_cnt_delta)
+
+
+def get_average_difficulty(game):
+    if not game.difficulty_cnt:
+        return 0
+    return game.difficulty_sum / game.difficulty_cnt
+
+
+def _review_aggregate(expression):
+    reviews = Review.objects.filter(game=OuterRef("pk"), is_visible=True).order_by().values("game")
+    return Coalesce(
+        Subquery(reviews.annotate(value=expression).values("value"), output_field=IntegerField()),
+        Value(0),
+    )
+
+
+def verify_ratings(queryset=None):
+    """
+    공개 리뷰 기준으로 집계를 다시 계산하여 저장된 값과 다른 게임만 바로잡음
+    반환: 수정한 게임 id 목록
+    """
+    queryset = Game.objects.all() if queryset is None else queryset
+    actual = {
+        "star_sum": _review_aggregate(Sum("star")),
+        "review_cnt": _review_aggregate(Count("pk")),
+        "difficulty_sum": _review_aggregate(Sum("difficulty")),
+        "difficulty_cnt": _review_aggregate(Count("difficulty")),
+    }
+    drifted = queryset.annotate(**{f"actual_{name}": value for name, value in actual.items()}).filter(
+        ~Q(star_sum=F("actual_star_sum"))
+        | ~Q(review_cnt=F("actual_review_cnt"))
+        | ~Q(difficulty_sum=F("actual_difficulty_sum"))
+        | ~Q(difficulty_cnt=F("actual_difficulty_cnt"))
+    )
+
+    fixed = list(drifted.values_list("pk", flat=True))
+    if fixed:
+        # 값은 UPDATE 시점에 다시 집계하여 그 사이에 들어온 리뷰 변경도 반영
+        star_sum, review_cnt = actual["star_sum"], actual["review_cnt"]
+        Game.objects.filter(pk__in=fixed).update(
+            **actual,
+            star=Case(
+                When(GreaterThan(review_cnt, 0), then=Cast(star_sum, FloatField()) / Cast(review_cnt, FloatField())),
+                default=Value(0.0),
+                output_field=FloatField(),
+            ),
+        )
+    return fixed
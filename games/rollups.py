@@ -0,0 +1,160 @@
+# 게임 참여 집계 (좋아요/조회/리뷰/플레이 시간)
+# - 원본(Like, View, Review, PlayLog)별로 워터마크(마지막으로 반영한 행 id) 이후 행만 읽어 시간/일 단위 EngagementRollup에 더함
+#   버킷은 이벤트 시각(created_at, end_at) 기준이지만 반영 여부는 id로 판단하므로, 늦게 저장된 과거 시각 행도 빠짐없이 반영
+# - 트랜잭션이 늦게 커밋되는 행(id가 먼저 발급된 행)을 놓치지 않도록, 관찰한 최대 id(ceiling)가 ROLLUP_LAG 이상 지난 뒤에만 그 id까지 반영
+# - 첫 실행(워터마크 없음)은 처음 행부터 ROLLUP_CHUNK 개의 id 범위 단위로 나누어 따라잡음
+# - "최근 1일/7일" 값은 원본 대신 버킷 몇 개의 합으로 계산 (recent_sum)
+# - 좋아요 버킷은 새로 추가된 좋아요 수 (삭제된 행은 id 워터마크로 알 수 없으므로 취소는 빼지 않음)
+#   취소가 반영된 누적 좋아요 수가 필요한 랭킹(Daily Top, Bookmark Top)은 Like를 직접 셈 (games.rankings)
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, IntegerField, Max, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, TruncHour
+from django.utils import timezone
+
+from .models import EngagementRollup, Like, PlayLog, Review, RollupWatermark, View
+
+
+WATERMARK_PREFIX = "engagement:"
+# 조회/플레이 기록은 Redis 버퍼에서 1분마다 짧은 트랜잭션으로 저장되므로 그보다 길게 둠
+ROLLUP_LAG = timedelta(minutes=2)
+ROLLUP_CHUNK = 50000  # 한 트랜잭션에서 반영할 원본 id 범위
+HOUR_RETENTION = timedelta(days=3)
+DAY_RETENTION = timedelta(days=90)
+
+# metric: (원본 모델, 버킷 기준 시각 필드, 집계식, 추가 조건)
+SOURCES = {
+    "likes": (Like, "created_at", Count("pk"), {}),
+    "views": (View, "created_at", Count("pk"), {}),
+    "reviews": (Review, "created_at", Count("pk"), {}),
+    "playtime_seconds": (PlayLog, "end_at", Sum("playtime"), {"end_at__isnull": False, "playtime__isnull": False}),
+}
+METRICS = tuple(SOURCES)
+
+
+def _day_of(bucket):
+    return bucket.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _collect(metric, start_id, end_id):
+    """
+    id가 start_id 초과 end_id 이하인 원본 행 집계
+    반환: {(game_id, bucket_size, bucket): 값}
+    """
+    model, field, expression, filters = SOURCES[metric]
+    rows = (
+        model.objects.filter(pk__gt=start_id, pk__lte=end_id, **filters)
+        .order_by()
+        .annotate(bucket=TruncHour(field))
+        .values("game_id", "bucket")
+        .annotate(value=expression)
+    )
+    deltas = defaultdict(int)
+    for row in rows:
+        value = row["value"] or 0
+        deltas[(row["game_id"], EngagementRollup.HOUR, row["bucket"])] += value
+        deltas[(row["game_id"], EngagementRollup.DAY, _day_of(row["bucket"]))] += value
+    return deltas
+
+
+def _apply(metric, deltas):
+    if not deltas:
+        return 0
+    game_ids = {game_id for game_id, _, _ in deltas}
+    buckets = {bucket for _, _, bucket in deltas}
+    existing = {
+        (row.game_id, row.bucket_size, row.bucket): row
+        for row in EngagementRollup.objects.select_for_update().filter(game_id__in=game_ids, bucket__in=buckets)
+    }
+
+    to_update, to_create = [], []
+    for key, value in deltas.items():
+        row = existing.get(key)
+        if row is None:
+            game_id, bucket_size, bucket = key
+            to_create.append(EngagementRollup(game_id=game_id, bucket_size=bucket_size, bucket=bucket, **{metric: value}))
+        else:
+            setattr(row, metric, getattr(row, metric) + value)
+            to_update.append(row)
+
+    EngagementRollup.objects.bulk_create(to_create, batch_size=1000)
+    EngagementRollup.objects.bulk_update(to_update, [metric], batch_size=1000)
+    return len(deltas)
+
+
+def _max_id(metric):
+    return SOURCES[metric][0].objects.aggregate(value=Max("pk"))["value"] or 0
+
+
+def _roll_up_metric(metric, now):
+    name = WATERMARK_PREFIX + metric
+    if not RollupWatermark.objects.filter(name=name).exists():
+        RollupWatermark.objects.get_or_create(name=name)
+
+    chunks = buckets = 0
+    while True:
+        with transaction.atomic():
+            # 워터마크 행 잠금으로 동시에 실행된 작업은 순서대로 처리됨
+            watermark = RollupWatermark.objects.select_for_update().get(name=name)
+            if watermark.ceiling_at is not None and watermark.ceiling_at > now - ROLLUP_LAG:
+                break  # 아직 ceiling 이하 id의 트랜잭션이 커밋 중일 수 있음
+            if watermark.ceiling_at is None or watermark.last_id >= watermark.ceiling:
+                # 따라잡았으면 현재 최대 id를 다음 반영 목표로 기록
+                watermark.ceiling = max(_max_id(metric), watermark.last_id)
+                watermark.ceiling_at = now
+                watermark.save(update_fields=["ceiling", "ceiling_at", "updated_at"])
+                break
+            end = min(watermark.last_id + ROLLUP_CHUNK, watermark.ceiling)
+            buckets += _apply(metric, _collect(metric, watermark.last_id, end))
+            watermark.last_id = end
+            watermark.save(update_fields=["last_id", "updated_at"])
+        chunks += 1
+    return chunks, buckets
+
+
+def roll_up(now=None):
+    """
+    원본별 워터마크 이후의 행을 집계 테이블에 반영
+    반환: (반영 구간 수, 갱신한 버킷 수)
+    """
+    now = now or timezone.now()
+    chunks = buckets = 0
+    for metric in METRICS:
+        metric_chunks, metric_buckets = _roll_up_metric(metric, now)
+        chunks += metric_chunks
+        buckets += metric_buckets
+    return chunks, buckets
+
+
+def prune(now=None):
+    """
+    보관 기간이 지난 버킷 삭제
+    """
+    now = now or timezone.now()
+    hours, _ = EngagementRollup.objects.filter(
+        bucket_size=EngagementRollup.HOUR, bucket__lt=now - HOUR_RETENTION
+    ).delete()
+    days, _ = EngagementRollup.objects.filter(
+        bucket_size=EngagementRollup.DAY, bucket__lt=now - DAY_RETENTION
+    ).delete()
+    return hours + days
+
+
+def recent_sum(metric, since, bucket_size=EngagementRollup.HOUR):
+    """
+    게임별 since 이후 버킷의 metric 합계 서브쿼리 (Game queryset annotate용)
+    버킷 단위로 합산하므로 since가 속한 버킷 전체가 포함됨
+    """
+    if bucket_size == EngagementRollup.HOUR:
+        since = since.replace(minute=0, second=0, microsecond=0)
+    else:
+        since = _day_of(since)
+    rows = EngagementRollup.objects.filter(
+        game=OuterRef("pk"), bucket_size=bucket_size, bucket__gte=since
+    ).order_by().values("game")
+    return Coalesce(
+        Subquery(rows.annotate(value=Sum(metric)).values("value"), output_field=IntegerField()),
+        Value(0),
+    )
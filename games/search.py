@@ -0,0 +1,203 @@
+# 게임 검색
+# - Game.search_document: 제목, 카테고리명, 제작자 닉네임을 합친 검색용 문서 (signals에서 갱신)
+# - PostgreSQL: search_vector(tsvector, GIN) + search_document 트라이그램(GIN) 인덱스로 검색 및 관련도 정렬
+# - 그 외(SQLite 등 로컬/테스트 환경): 프로세스 내 역색인(unigram/bigram)으로 검색
+# - 사용할 백엔드는 settings.GAME_SEARCH_BACKEND ("postgres" / "memory")로 지정, 없으면 DB 종류로 결정
+import re
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, F, FloatField, IntegerField, Q, Value, When
+from django.db.models.functions import Coalesce
+
+from .models import Game
+
+
+def normalize(text):
+    return re.sub(r"\s+", " ", (text or "")).strip().lower()
+
+
+def build_search_document(game):
+    """
+    게임 검색용 문서 생성 (category, maker가 prefetch/select 되어 있어야 쿼리가 늘지 않음)
+    """
+    parts = [game.title]
+    parts.extend(category.name for category in game.category.all())
+    parts.append(game.maker.nickname)
+    return normalize(" ".join(part for part in parts if part))
+
+
+class PostgresSearchBackend:
+    config = "simple"  # 한국어 형태소 분석기가 없으므로 공백 단위 토큰 + 트라이그램으로 부분 일치 보완
+
+    def index(self, documents):
+        from django.contrib.postgres.search import SearchVector
+
+        Game.objects.filter(pk__in=documents.keys()).update(
+            search_vector=SearchVector("search_document", config=self.config)
+        )
+
+    def remove(self, game_ids):
+        pass
+
+    def search(self, queryset, keyword):
+        from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+
+        keyword = normalize(keyword)
+        query = SearchQuery(keyword, config=self.config, search_type="plain")
+        return queryset.filter(
+            Q(search_vector=query) | Q(search_document__icontains=keyword)
+        ).annotate(
+            rank=Coalesce(SearchRank(F("search_vector"), query), Value(0.0), output_field=FloatField())
+            + TrigramSimilarity("search_document", keyword)
+        ).order_by("-rank", "-created_at")
+
+
+class InMemorySearchBackend:
+    """
+    프로세스 내 역색인 (unigram/bigram -> game id)
+    프로세스마다 따로 유지되므로 로컬/테스트 용도
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._documents = {}
+        self._postings = defaultdict(set)
+
+    @staticmethod
+    def _grams(text, unigrams=True):
+        """
+        색인할 때는 모든 글자(unigram)도 넣어 한 글자 검색어("전")가 단어 중간에서도 일치하도록 함
+        검색어는 두 글자 이상 토큰이면 bigram만 사용
+        """
+        grams = set()
+        for token in text.split(" "):
+            if unigrams or len(token) == 1:
+                grams.update(token)
+            grams.update(token[i:i + 2] for i in range(len(token) - 1))
+        return grams
+
+    def _add(self, game_id, document):
+        self._remove(game_id)
+        self._documents[game_id] = document
+        for gram in self._grams(document):
+            self._postings[gram].add(game_id)
+
+    def _remove(self, game_id):
+        document = self._documents.pop(game_id, None)
+        if document is None:
+            return
+        for gram in self._grams(document):
+            self._postings[gram].discard(game_id)
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            for game_id, document in Game.objects.values_list("id", "search_document"):
+                self._add(game_id, document)
+            self._loaded = True
+
+    def index(self, documents):
+        if not self._loaded:
+            return  # 첫 검색 시 DB에서 전체를 읽어오므로 그 전에는 따로 유지하지 않음
+        with self._lock:
+            for game_id, document in documents.items():
+                self._add(game_id, document)
+
+    def remove(self, game_ids):
+        if not self._loaded:
+            return
+        with self._lock:
+            for game_id in game_ids:
+                self._remove(game_id)
+
+    def reset(self):
+        with self._lock:
+            self._loaded = False
+            self._documents.clear()
+            self._postings.clear()
+
+    def _score(self, document, keyword):
+        # 단어 전체 일치 > 단어 시작 일치 > 부분 일치, 등장 횟수가 많을수록 우선
+        words = document.split(" ")
+        score = document.count(keyword)
+        score += sum(3 for word in words if word == keyword)
+        score += sum(1 for word in words if word.startswith(keyword))
+        return score
+
+    def search(self, queryset, keyword):
+        keyword = normalize(keyword)
+        self._ensure_loaded()
+
+        grams = self._grams(keyword, unigrams=False)
+        with self._lock:
+            if grams:
+                candidates = set.intersection(*(self._postings.get(gram, set()) for gram in grams))
+            else:
+                candidates = set()
+            scores = {
+                game_id: self._score(self._documents[game_id], keyword)
+                for game_id in candidates
+                if keyword in self._documents[game_id]
+            }
+
+        return queryset.filter(pk__in=scores.keys()).annotate(
+            rank=Case(
+                *[When(pk=game_id, then=Value(score)) for game_id, score in scores.items()],
+                default=Value(0),
+                output_field=IntegerField(),
+            )
+        ).order_by("-rank", "-created_at")
+
+
+_backends = {}
+
+
+def get_backend():
+    name = getattr(settings, "GAME_SEARCH_BACKEND", None)
+    if name is None:
+        name = "postgres" if connection.vendor == "postgresql" else "memory"
+    if name not in _backends:
+        if name == "postgres":
+            _backends[name] = PostgresSearchBackend()
+        elif name == "memory":
+            _backends[name] = InMemorySearchBackend()
+        else:
+            raise ValueError(f"알 수 없는 검색 백엔드입니다: {name}")
+    return _backends[name]
+
+
+def search_games(queryset, keyword):
+    """
+    키워드가 없으면 최신순, 있으면 관련도순으로 정렬된 queryset 반환
+    """
+    if not keyword or not normalize(keyword):
+        return queryset.order_by("-created_at")
+    return get_backend().search(queryset, keyword)
+
+
+def refresh_search_documents(game_ids):
+    """
+    게임 검색 문서 갱신
+    update()를 사용하므로 post_save 신호, updated_at 갱신이 일어나지 않음
+    """
+    games = Game.objects.filter(pk__in=game_ids).select_related("maker").prefetch_related("category")
+    documents = {}
+    for game in games:
+        document = build_search_document(game)
+        if document != game.search_document:
+            Game.objects.filter(pk=game.pk).update(search_document=document)
+        documents[game.pk] = document
+    if documents:
+        get_backend().index(documents)
+    return len(documents)
+
+
+def remove_from_search_index(game_ids):
+    get_backend().remove(game_ids)
@@ -1,62 +1,131 @@
 from rest_framework import serializers
+from django.db import models
+
+from commons.images import serialize_renditions
 from .models import Game, Review, GameCategory, Screenshot, ReviewsLike, Like
 
 
-class GameListSerializer(serializers.ModelSerializer):
-    maker_data = serializers.SerializerMethodField()
-    chips= serializers.SerializerMethodField()
-    is_liked = serializers.SerializerMethodField()
-    category_data = serializers.SerializerMethodField()
-    star = serializers.SerializerMethodField()
-    
-    class Meta:
-        model = Game
-        fields = ("id", "title", "thumbnail",
-                  "star", "maker_data", "content", "chips", "is_liked", "category_data")
-    
+# 칩 표시 규칙: 난이도 칩 1개 + 우선순위 칩 (최대 3개)
+DIFFICULTY_CHIPS = ["EASY", "NORMAL", "HARD"]
+PRIORITY_CHIPS = ["Daily Top", "New Game", "Bookmark Top", "Long Play", "Review Top"]
+MAX_DISPLAY_CHIPS = 3
+
+
+def prefetch_game_list(queryset):
+    """
+    게임 카드 직렬화에 필요한 연관 데이터를 한 번에 불러오는 쿼리셋 반환
+    maker는 JOIN, chip/category/썸네일 변환본은 prefetch로 가져와 게임마다 추가 쿼리가 발생하지 않도록 함
+    """
+    return queryset.select_related("maker").prefetch_related("chip", "category", "renditions")
+
+
+def get_liked_game_ids(user, game_ids):
+    """
+    game_ids 중 user가 즐겨찾기한 게임 id 집합을 한 번의 쿼리로 조회
+    """
+    if not user or not user.is_authenticated:
+        return set()
+    if not game_ids:
+        return set()
+    return set(
+        Like.objects.filter(user=user, game_id__in=game_ids).values_list("game_id", flat=True)
+    )
+
+
+def select_display_chips(chips):
+    """
+    게임에 부여된 칩 중 화면에 표시할 칩을 메모리에서 선택
+    chips: prefetch_related('chip')로 불러온 Chip 객체 목록
+    """
+    chips = sorted(chips, key=lambda chip: chip.id)
+    result = []
+
+    # 난이도 칩 하나 선택
+    difficulty_chip = next((chip for chip in chips if chip.name in DIFFICULTY_CHIPS), None)
+    if difficulty_chip:
+        result.append({"id": difficulty_chip.id, "name": difficulty_chip.name})
+
+    # 우선순위 칩 추가 (최대 3개까지)
+    chips_by_name = {}
+    for chip in chips:
+        chips_by_name.setdefault(chip.name, chip)
+    for chip_name in PRIORITY_CHIPS:
+        if len(result) >= MAX_DISPLAY_CHIPS:
+            break
+        chip = chips_by_name.get(chip_name)
+        if chip:
+            result.append({"id": chip.id, "name": chip.name})
+
+    return result
+
+
+class GameCardListSerializer(serializers.ListSerializer):
+    """
+    게임 목록 직렬화 시 좋아요 여부를 페이지 단위로 한 번만 조회
+    """
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        games = list(iterable)
+        if "liked_game_ids" not in self.context:
+            self.context["liked_game_ids"] = get_liked_game_ids(
+                self.context.get("user"), [game.pk for game in games]
+            )
+        return [self.child.to_representation(game) for game in games]
+
+
+class GameCardMixin:
+    """
+    게임 목록/상세 시리얼라이저에서 공통으로 사용하는 필드 계산 로직
+    prefetch_game_list()로 불러온 쿼리셋이면 추가 쿼리 없이 동작함
+    """
+
     def get_maker_data(self, obj):
         return {
             "id": obj.maker.id,
             "nickname": obj.maker.nickname,
         }
-    
+
     def get_star(self, obj):
         return round(obj.star, 2) if obj.star is not None else 0
-    
+
+    def get_thumbnail_renditions(self, obj):
+        return serialize_renditions(obj, "thumbnail")
+
     def get_chips(self, obj):
-        chips = obj.chip.all()
-        difficulty_chips = ["EASY", "NORMAL", "HARD"]
-        priority_chips = ["Daily Top", "New Game", "Bookmark Top", "Long Play", "Review Top"]
-
-        result = []
-
-        # 난이도 칩 하나 선택
-        difficulty_chip = chips.filter(name__in=difficulty_chips).first()
-        if difficulty_chip:
-            result.append({"id": difficulty_chip.id, "name": difficulty_chip.name})
-
-        # 우선순위 칩 최대 2개 추가
-        for chip_name in priority_chips:
-            if len(result) >= 3:
-                break
-            chip = chips.filter(name=chip_name).first()
-            if chip:
-                result.append({"id": chip.id, "name": chip.name})
-
-        return result
-    
+        return select_display_chips(obj.chip.all())
+
     def get_is_liked(self, obj):
+        # 목록 직렬화 시 미리 계산한 좋아요 게임 id 집합 사용
+        liked_game_ids = self.context.get("liked_game_ids")
+        if liked_game_ids is not None:
+            return obj.pk in liked_game_ids
         user = self.context.get('user')
         # 사용자가 인증된 경우 해당 게임에 대한 좋아요 상태를 확인
         if user and user.is_authenticated:
             return Like.objects.filter(user=user, game=obj).exists()
         return False
-    
+
     def get_category_data(self, obj):
         # 카테고리 리스트를 반환
         return [{"id": category.id, "name": category.name,} for category in obj.category.all()]
 
 
+class GameListSerializer(GameCardMixin, serializers.ModelSerializer):
+    maker_data = serializers.SerializerMethodField()
+    thumbnail_renditions = serializers.SerializerMethodField()
+    chips= serializers.SerializerMethodField()
+    is_liked = serializers.SerializerMethodField()
+    category_data = serializers.SerializerMethodField()
+    star = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = Game
+        fields = ("id", "title", "thumbnail", "thumbnail_renditions",
+                  "star", "maker_data", "content", "chips", "is_liked", "category_data")
+        list_serializer_class = GameCardListSerializer
+
+
 class GameCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Game
@@ -64,62 +133,52 @@ class GameCreateSerializer(serializers.ModelSerializer):
         read_only_fields = ('maker', 'is_visible', 'view_cnt', 'register_state',)
 
 
-class GameDetailSerializer(serializers.ModelSerializer):
+class GameDetailSerializer(GameCardMixin, serializers.ModelSerializer):
     maker_data = serializers.SerializerMethodField()
+    thumbnail_renditions = serializers.SerializerMethodField()
     is_liked = serializers.SerializerMethodField()
     chips= serializers.SerializerMethodField()
     star = serializers.SerializerMethodField()
 
     class Meta:
         model = Game
-        fields = ("id", "maker_data", "title", "thumbnail",
+        fields = ("id", "maker_data", "title", "thumbnail", "thumbnail_renditions",
                   "star", "content", "chips", "is_liked", "youtube_url",
                   "gamefile", "gamepath", "register_state", "is_visible", "review_cnt")
         read_only_fields = ('maker',)
-    
-    def get_maker_data(self, obj):
-        return {
-            "id": obj.maker.id,
-            "nickname": obj.maker.nickname,
-        }
-    
-    def get_star(self, obj):
-        return round(obj.star, 2) if obj.star is not None else 0
 
-    def get_is_liked(self, obj):
-        user = self.context.get('user')
-        if user and user.is_authenticated:
-            return Like.objects.filter(user=user, game=obj).exists()
-        return False
-    
-    def get_chips(self, obj):
-        chips = obj.chip.all()
-        difficulty_chips = ["EASY", "NORMAL", "HARD"]
-        priority_chips = ["Daily Top", "New Game", "Bookmark Top", "Long Play", "Review Top"]
 
-        result = []
+def get_review_like_states(user, review_ids):
+    """
+    review_ids 중 user가 남긴 좋아요/싫어요 상태를 {리뷰 id: is_like} 형태로 한 번의 쿼리로 조회
+    """
+    if not user or not user.is_authenticated:
+        return {}
+    if not review_ids:
+        return {}
+    return dict(
+        ReviewsLike.objects.filter(user=user, review_id__in=review_ids).values_list("review_id", "is_like")
+    )
 
-        # 난이도 칩 하나 선택
-        difficulty_chip = chips.filter(name__in=difficulty_chips).first()
-        if difficulty_chip:
-            result.append({"id": difficulty_chip.id, "name": difficulty_chip.name})
 
-        # 우선순위 칩 최대 2개 추가
-        for chip_name in priority_chips:
-            if len(result) >= 3:
-                break
-            chip = chips.filter(name=chip_name).first()
-            if chip:
-                result.append({"id": chip.id, "name": chip.name})
+class ReviewListSerializer(serializers.ListSerializer):
+    """
+    리뷰 목록 직렬화 시 사용자의 좋아요/싫어요 상태를 페이지 단위로 한 번만 조회
+    """
 
-        return result
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        reviews = list(iterable)
+        if "review_like_states" not in self.context:
+            self.context["review_like_states"] = get_review_like_states(
+                self.context.get("user"), [review.pk for review in reviews]
+            )
+        return [self.child.to_representation(review) for review in reviews]
 
 
 class ReviewSerializer(serializers.ModelSerializer):
     author_data = serializers.SerializerMethodField()
-    game_id = serializers.IntegerField(source='game.id', read_only=True)
-    like_count = serializers.SerializerMethodField()
-    dislike_count = serializers.SerializerMethodField()
+    game_id = serializers.IntegerField(read_only=True)
     user_is_like = serializers.SerializerMethodField()
 
     class Meta:
@@ -128,7 +187,8 @@ class ReviewSerializer(serializers.ModelSerializer):
             'id', 'author_data', 'game_id', 'like_count', 'dislike_count', 'user_is_like',
             'content', 'star', 'difficulty', 'is_visible', 'created_at', 'updated_at',
         ]
-        read_only_fields = ('is_visible', 'game', 'author',)
+        read_only_fields = ('is_visible', 'game', 'author', 'like_count', 'dislike_count',)
+        list_serializer_class = ReviewListSerializer
     
     def get_author_data(self, obj):
         return {
@@ -136,12 +196,6 @@ class ReviewSerializer(serializers.ModelSerializer):
             "nickname": obj.author.nickname,
             "image": obj.author.image.url if obj.author.image else '',
         }
-    
-    def get_like_count(self, obj):
-        return ReviewsLike.objects.filter(review=obj, is_like=1).count()
-
-    def get_dislike_count(self, obj):
-        return ReviewsLike.objects.filter(review=obj, is_like=2).count()
 
     def get_user_is_like(self, obj):
         # 현재 요청을 보낸 사용자 확인
@@ -150,6 +204,11 @@ class ReviewSerializer(serializers.ModelSerializer):
         if not user or not user.is_authenticated:
             return 0
 
+        # 목록 직렬화 시 미리 조회한 상태 사용
+        review_like_states = self.context.get('review_like_states')
+        if review_like_states is not None:
+            return review_like_states.get(obj.pk, 0)
+
         # 사용자가 인증된 경우, 해당 리뷰에 남긴 상태를 조회
         review_like = ReviewsLike.objects.filter(review=obj, user=user).first()
         # 리뷰 상태가 존재하면 그 값을 반환, 없으면 0을 반환
@@ -157,9 +216,14 @@ class ReviewSerializer(serializers.ModelSerializer):
 
 
 class ScreenshotSerializer(serializers.ModelSerializer):
+    renditions = serializers.SerializerMethodField()
+
     class Meta:
         model = Screenshot
-        fields = ('id', 'src', )
+        fields = ('id', 'src', 'renditions', )
+
+    def get_renditions(self, obj):
+        return serialize_renditions(obj, "src")
 
 
 class CategorySerailizer(serializers.ModelSerializer):
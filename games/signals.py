@@ -0,0 +1,81 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from commons.models import ImageRendition
+from .chips import registry as chip_registry
+from .feeds import invalidate_home_feed
+from .models import Chip, Game, GameCategory
+from .search import refresh_search_documents, remove_from_search_index
+
+
+# 홈 피드 캐시 무효화
+# 게임 저장(등록/수정/승인/삭제 처리), 칩/카테고리 변경 시 커밋 후 홈 피드 캐시 버전을 올림
+@receiver(post_save, sender=Game)
+@receiver(post_delete, sender=Game)
+@receiver(post_save, sender=GameCategory)
+@receiver(post_delete, sender=GameCategory)
+def invalidate_home_feed_on_change(sender, **kwargs):
+    transaction.on_commit(invalidate_home_feed)
+
+
+# 썸네일 변환본이 만들어지면 캐시된 카드에도 반영
+@receiver(post_save, sender=ImageRendition)
+def invalidate_home_feed_on_rendition(sender, instance, raw=False, **kwargs):
+    if not raw and instance.content_type.model_class() is Game:
+        transaction.on_commit(invalidate_home_feed)
+
+
+@receiver(m2m_changed, sender=Game.chip.through)
+@receiver(m2m_changed, sender=Game.category.through)
+def invalidate_home_feed_on_m2m_change(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        transaction.on_commit(invalidate_home_feed)
+
+
+# 검색 문서 갱신
+# 제목(게임 저장), 카테고리 연결/이름, 제작자 닉네임이 바뀌면 해당 게임의 검색 문서를 다시 생성
+@receiver(post_save, sender=Game)
+def refresh_search_on_game_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        refresh_search_documents([instance.pk])
+
+
+@receiver(post_delete, sender=Game)
+def remove_search_on_game_delete(sender, instance, **kwargs):
+    remove_from_search_index([instance.pk])
+
+
+@receiver(m2m_changed, sender=Game.category.through)
+def refresh_search_on_category_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        refresh_search_documents([instance.pk])
+    elif pk_set:
+        refresh_search_documents(pk_set)
+
+
+@receiver(post_save, sender=GameCategory)
+def refresh_search_on_category_save(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        refresh_search_documents(list(instance.games.values_list("pk", flat=True)))
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def refresh_search_on_maker_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    # 로그인 시 last_login만 저장하는 경우 등은 건너뜀
+    if update_fields is not None and "nickname" not in update_fields:
+        return
+    if not created and not raw:
+        game_ids = list(instance.games.values_list("pk", flat=True))
+        if game_ids:
+            refresh_search_documents(game_ids)
+
+
+# 칩 레지스트리 초기화 (이름 -> id 캐시)
+@receiver(post_save, sender=Chip)
+@receiver(post_delete, sender=Chip)
+def clear_chip_registry(sender, **kwargs):
+    chip_registry.clear()
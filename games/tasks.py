@@ -1,42 +1,41 @@
-from datetime import timedelta
-from django.utils import timezone
+import zipfile
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from botocore.exceptions import BotoCoreError
 from celery import shared_task
-from django.db.models import Count, Q,Sum
-from .models import Game, Chip
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import BotCnt
+from commons.uploads import abort_stale_uploads
+from qnas.remote_zip import S3RangeFile
+from spartagames.throttling import ChatbotThrottle
+from spartagames.utils import get_s3_client
+from .feeds import warm_home_feed
+from .models import Game
+from .rankings import clear_chip, format_result, run_ranking
+from .ratings import verify_ratings
+from .rollups import prune, roll_up
+from .utils import assign_chip_based_on_difficulty, inspect_game_zip, send_discord_notification
+from .play_sessions import flush_play_sessions
+from .view_events import flush_view_events
+
+
+STALE_VALIDATION = timedelta(minutes=30)  # 이 시간 동안 검증 중(3)이면 검증 작업을 다시 등록
+VALIDATION_GIVE_UP = timedelta(days=1)  # 이보다 오래된 게임은 다시 등록하지 않음 (관리자 확인 필요)
 
 
 @shared_task
 def assign_chips_to_top_games():
     """
     매일 상위 4개의 게임에 'Daily Top' 칩을 할당합니다.
+    점수: 전체 좋아요 수 * 0.4 + 하루 리뷰 수 * 0.3 + 하루 조회 수 * 0.3 (각각 독립 집계)
     기존에 할당된 'Daily Top' 칩을 제거하고 다시 할당합니다.
     """
     try:
-        # 'Daily Top' 칩 가져오기 (없으면 생성)
-        daily_chip, _ = Chip.objects.get_or_create(name='Daily Top')
-        
-        # 기존에 'Daily Top' 칩이 할당된 게임들에서 칩 제거
-        games_with_daily_chip = Game.objects.filter(chip=daily_chip)
-        for game in games_with_daily_chip:
-            game.chip.remove(daily_chip)
-        
-        # 좋아요 수가 가장 많은 상위 4개 게임 가져오기
-        top_games = Game.objects.annotate(
-            score=(
-                Count('likes') * 0.4 +
-                Count('reviews', filter=Q(reviews__created_at__gte=timezone.now() - timedelta(days=1))) * 0.3 +
-                Count('views', filter=Q(views__created_at__gte=timezone.now() - timedelta(days=1))) * 0.3
-            )
-        ).filter(
-            is_visible=True,
-            register_state=1,
-        ).order_by('-score', '-created_at')[:4]
-        
-        # 상위 4개 게임에 'Daily Top' 칩 할당
-        for game in top_games:
-            game.chip.add(daily_chip)
-        
-        return f"Assigned 'Daily Top' chip to {len(top_games)} games."
+        return format_result(run_ranking('Daily Top'))
     except Exception as e:
         # 예외 발생 시 로그 남기기 (추가적인 로깅 설정 필요 시 설정)
         return f"Error in assigning 'Daily Top' chips: {str(e)}"
@@ -48,17 +47,8 @@ def cleanup_new_game_chip():
     주기적으로 'New Game' 칩을 제거합니다.
     """
     try:
-        # 'New Game' 칩 가져오기
-        new_game_chip = Chip.objects.filter(name='New Game').first()
-        if not new_game_chip:
-            return "새로 생성된 게임 칩이 없습니다."
-        
-        # 'New Game' 칩이 할당된 모든 게임에서 칩 제거
-        games_with_new_game = Game.objects.filter(chip=new_game_chip)
-        for game in games_with_new_game:
-            game.chip.remove(new_game_chip)
-        
-        return f"Removed 'New Game' chip from {len(games_with_new_game)} games."
+        removed, elapsed_ms = clear_chip('New Game')
+        return f"Removed 'New Game' chip from {removed} games ({elapsed_ms}ms)."
     except Exception as e:
         return f"Error in cleaning up 'New Game' chips: {str(e)}"
 
@@ -71,23 +61,7 @@ def assign_bookmark_top_chips():
     중복 할당을 허용합니다.
     """
     try:
-        # 'Bookmark Top' 칩 가져오기 (없으면 생성)
-        bookmark_chip, created = Chip.objects.get_or_create(name='Bookmark Top')
-        
-        # 최소 5개의 즐겨찾기를 가진 게임 중 즐겨찾기 수가 가장 많은 상위 4개 게임 가져오기
-        top_bookmarked_games = Game.objects.annotate(
-            bookmark_count=Count('likes')
-        ).filter(
-            bookmark_count__gte=5,
-            is_visible=True,
-            register_state=1
-        ).order_by('-bookmark_count', '-created_at')[:4]
-        
-        # 상위 4개 게임에 'Bookmark Top' 칩 할당 (중복 허용)
-        for game in top_bookmarked_games:
-            game.chip.add(bookmark_chip)
-        
-        return f"Assigned 'Bookmark Top' chip to {len(top_bookmarked_games)} games."
+        return format_result(run_ranking('Bookmark Top'))
     except Exception as e:
         # 예외 발생 시 로그 남기기 (추가적인 로깅 설정 필요 시 설정)
         return f"Error in assigning 'Bookmark Top' chips: {str(e)}"
@@ -100,30 +74,7 @@ def assign_long_play_chips():
     기존에 할당된 'Long Play' 칩을 제거하고 새로 할당합니다.
     """
     try:
-        # 'Long Play' 칩 가져오기 (없으면 생성)
-        long_play_chip, created = Chip.objects.get_or_create(name='Long Play')
-        
-        # 기존에 'Long Play' 칩이 할당된 게임들에서 칩 제거
-        games_with_long_play_chip = Game.objects.filter(chip=long_play_chip)
-        for game in games_with_long_play_chip:
-            game.chip.remove(long_play_chip)
-        
-        # 지난 일주일 동안의 총 플레이 시간을 계산
-        one_week_ago = timezone.now() - timedelta(weeks=1)
-        top_long_play_games = Game.objects.annotate(
-            total_playtime=Sum('playlog__playtime')
-        ).filter(
-            total_playtime__isnull=False,
-            #total_playtime__gte=0,  # 최소 조건 설정 가능
-            is_visible=True,
-            register_state=1
-        ).order_by('-total_playtime', '-created_at')[:4]
-        
-        # 상위 4개 게임에 'Long Play' 칩 할당
-        for game in top_long_play_games:
-            game.chip.add(long_play_chip)
-        
-        return f"Assigned 'Long Play' chip to {len(top_long_play_games)} games."
+        return format_result(run_ranking('Long Play'))
     except Exception as e:
         return f"Error in assigning 'Long Play' chips: {str(e)}"
     
@@ -131,31 +82,189 @@ def assign_long_play_chips():
 def assign_review_top_chips():
     """
     매일 상위 4개의 게임에 'Review Top' 칩을 할당합니다.
-    지난 하루 동안 최소 10개의 리뷰가 달린 게임 중에서 리뷰 수가 가장 많은 상위 4개를 선정합니다.
+    최소 10개의 리뷰가 달린 게임 중에서 리뷰 수가 가장 많은 상위 4개를 선정합니다.
     기존에 할당된 'Review Top' 칩을 제거하고 새로 할당합니다.
     """
     try:
-        # 'Review Top' 칩 가져오기 (없으면 생성)
-        review_top_chip, created = Chip.objects.get_or_create(name='Review Top')
-        
-        # 기존에 'Review Top' 칩이 할당된 게임들에서 칩 제거
-        games_with_review_top_chip = Game.objects.filter(chip=review_top_chip)
-        for game in games_with_review_top_chip:
-            game.chip.remove(review_top_chip)
-        
-        # 총 리뷰 수가 최소 10개 이상인 게임 중 리뷰 수가 가장 많은 상위 4개 게임 가져오기
-        top_reviewed_games = Game.objects.annotate(
-            total_review_count=Count('reviews')
-        ).filter(
-            total_review_count__gte=10,
-            is_visible=True,
-            register_state=1
-        ).order_by('-total_review_count', '-created_at')[:4]
-        
-        # 상위 4개 게임에 'Review Top' 칩 할당
-        for game in top_reviewed_games:
-            game.chip.add(review_top_chip)
-        
-        return f"Assigned 'Review Top' chip to {len(top_reviewed_games)} games."
+        return format_result(run_ranking('Review Top'))
+    except Exception as e:
+        return f"Error in assigning 'Review Top' chips: {str(e)}"
+
+@shared_task
+def build_home_feed():
+    """
+    홈 피드 선반(카테고리별 최신 게임, Daily Top, New Game, 최근 업데이트)을 미리 생성하여 캐시에 저장합니다.
+    """
+    try:
+        shelf_count = warm_home_feed()
+        return f"Built {shelf_count} home feed shelves."
+    except Exception as e:
+        return f"Error in building home feed: {str(e)}"
+
+@shared_task
+def verify_game_ratings():
+    """
+    공개 리뷰 기준으로 게임의 별점/난이도 집계를 검증하고, 어긋난 게임은 다시 계산하여 바로잡습니다.
+    """
+    try:
+        fixed_game_ids = verify_ratings()
+        for game in Game.objects.filter(pk__in=fixed_game_ids):
+            assign_chip_based_on_difficulty(game)
+        return f"Verified game ratings, repaired {len(fixed_game_ids)} games."
+    except Exception as e:
+        return f"Error in verifying game ratings: {str(e)}"
+
+@shared_task
+def roll_up_engagement():
+    """
+    마지막 집계 이후 쌓인 조회/리뷰/플레이 시간을 시간/일 단위 집계 테이블에 반영하고, 오래된 버킷을 정리합니다.
+    """
+    try:
+        chunks, buckets = roll_up()
+        pruned = prune()
+        return f"Rolled up {chunks} windows into {buckets} buckets, pruned {pruned} buckets."
+    except Exception as e:
+        return f"Error in rolling up engagement: {str(e)}"
+
+
+@shared_task
+def flush_game_views():
+    """
+    Redis에 모인 게임 조회 이벤트를 View 테이블에 일괄 저장합니다.
+    """
+    try:
+        result = flush_view_events()
+        if result is None:
+            return "Another flush is in progress."
+        processed, saved = result
+        return f"Flushed {processed} view events into {saved} rows."
+    except Exception as e:
+        return f"Error in flushing view events: {str(e)}"
+
+
+@shared_task
+def flush_game_play_sessions():
+    """
+    하트비트가 끊긴 플레이 세션을 닫고, 종료된 세션을 PlayLog/TotalPlayTime에 일괄 반영합니다.
+    """
+    try:
+        result = flush_play_sessions()
+        if result is None:
+            return "Another flush is in progress."
+        closed, processed, saved = result
+        return f"Closed {closed} abandoned sessions, flushed {processed} sessions into {saved} play logs."
+    except Exception as e:
+        return f"Error in flushing play sessions: {str(e)}"
+
+
+@shared_task
+def persist_chatbot_usage():
+    """
+    Redis 카운터(spartagames.throttling.ChatbotThrottle)의 챗봇 사용량을 BotCnt에 반영합니다.
+    자정 직후에도 전날 사용량이 모두 반영되도록 오늘과 어제 창을 함께 처리합니다.
+    """
+    try:
+        throttle = ChatbotThrottle()
+        today = throttle.window()
+        saved = 0
+        for window in (today - 1, today):
+            date = datetime.fromtimestamp(window * throttle.duration, tz=dt_timezone.utc).date()
+            rows = [
+                BotCnt(user_id=int(user_id), date=date, count=count)
+                for user_id, count in throttle.usage(window).items()
+            ]
+            # 사용량 수집 중 탈퇴(삭제)한 회원은 제외
+            user_ids = set(
+                get_user_model().objects.filter(pk__in=[row.user_id for row in rows]).values_list("pk", flat=True)
+            )
+            rows = [row for row in rows if row.user_id in user_ids]
+            BotCnt.objects.bulk_create(
+                rows, batch_size=1000, update_conflicts=True, unique_fields=["user", "date"], update_fields=["count"],
+            )
+            saved += len(rows)
+        return f"Persisted chatbot usage for {saved} users."
+    except Exception as e:
+        return f"Error in persisting chatbot usage: {str(e)}"
+
+
+@shared_task(
+    bind=True,
+    autoretry_for=(BotoCoreError,),
+    retry_backoff=True,
+    retry_kwargs={'max_retries': 3},
+)
+def validate_game_file(self, game_id):
+    """
+    업로드된 게임 zip을 검사 (register_state 3: 검증 중)
+    통과하면 검수 대기(0)로 전환, 실패하면 등록 거부(2)와 사유 기록
+    신규 등록(등록 로그가 없는 게임)이 통과하면 검수요청 로그를 남기고 관리자에게 알림
+    (게임 파일 수정은 GameDetailAPIView.put에서 "수정 후 검수요청" 로그를 남김)
+    """
+    game = Game.objects.filter(pk=game_id, register_state=3).select_related("maker").first()
+    if game is None:
+        return f"Game {game_id} is not waiting for validation."
+
+    source = S3RangeFile(get_s3_client(), settings.AWS_STORAGE_BUCKET_NAME, f"media/{game.gamefile.name}")
+    try:
+        with zipfile.ZipFile(source) as zf:
+            error = inspect_game_zip(zf)
+    except zipfile.BadZipFile:
+        error = "유효한 ZIP 파일이 아닙니다."
+
+    # 검증 중 다시 업로드(수정)된 경우에는 상태를 바꾸지 않음
+    with transaction.atomic():
+        is_new = not game.logs_game.exists()
+        updated = Game.objects.filter(pk=game_id, register_state=3, gamefile=game.gamefile.name).update(
+            register_state=2 if error else 0
+        )
+        if not updated:
+            return f"Game {game_id} changed during validation."
+        if error:
+            game.logs_game.create(
+                recoder=game.maker,
+                maker=game.maker,
+                game=game,
+                content=f"자동 검증 실패: {error}",
+            )
+        elif is_new:
+            game.logs_game.create(
+                recoder=game.maker,
+                maker=game.maker,
+                game=game,
+                content=f"검수요청 (기록자: {game.maker.email}, 제작자: {game.maker.email})",
+            )
+            send_discord_notification(game)
+
+    if error:
+        return f"Game {game_id} rejected: {error}"
+    return f"Game {game_id} validated ({source.cache.stats()['bytes_fetched']} bytes read)."
+
+
+@shared_task
+def requeue_stale_game_validations():
+    """
+    검증 작업이 유실되었거나 재시도를 모두 실패해 검증 중(3)으로 남은 게임의 검증 작업을 다시 등록합니다.
+    """
+    try:
+        now = timezone.now()
+        game_ids = list(Game.objects.filter(
+            register_state=3,
+            updated_at__lt=now - STALE_VALIDATION,
+            updated_at__gte=now - VALIDATION_GIVE_UP,
+        ).values_list("pk", flat=True))
+        for game_id in game_ids:
+            validate_game_file.delay(game_id)
+        return f"Requeued validation for {len(game_ids)} games."
+    except Exception as e:
+        return f"Error in requeueing game validations: {str(e)}"
+
+
+@shared_task
+def abort_stale_game_uploads():
+    """
+    완료되지 않은 채 남은 멀티파트 업로드 취소
+    """
+    try:
+        return f"Aborted {abort_stale_uploads()} stale game uploads."
     except Exception as e:
-        return f"Error in assigning 'Review Top' chips: {str(e)}"
\ No newline at end of file
+        return f"Error in aborting stale game uploads: {str(e)}"
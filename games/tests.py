@@ -1,3 +1,955 @@
-from django.test import TestCase
+import io
+import zipfile
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+import fakeredis
+import redis
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.core.cache import cache
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .chips import get_chip_id, registry, set_exclusive_chip
+from .feeds import HOME_FEED_VERSION_KEY, get_feed_version, invalidate_home_feed
+from commons.models import GameUpload, ImageRendition, OutboxMessage
+from qnas.models import GameRegisterLog
+from qnas.tests import FakeS3
+from .models import Chip, EngagementRollup, Game, GameCategory, Like, PlayLog, Review, ReviewsLike, TotalPlayTime, View
+from .rankings import run_ranking, swap_chip
+from .ratings import apply_rating_delta, verify_ratings
+from .rollups import ROLLUP_LAG, roll_up
+from .search import InMemorySearchBackend, get_backend, search_games
+from .serializers import DIFFICULTY_CHIPS
+from .tasks import flush_game_play_sessions, flush_game_views, requeue_stale_game_validations, validate_game_file
+from .utils import assign_chip_based_on_difficulty
+from . import play_sessions, view_events
+
+
+LOCMEM_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+def use_fake_redis(test_case):
+    """
+    spartagames.utils.get_redis가 테스트마다 새 fakeredis 클라이언트를 돌려주도록 교체 (Lua 스크립트 지원)
+    반환: 모든 REDIS URL이 공유하는 클라이언트
+    """
+    client = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+    for patcher in [
+        mock.patch.dict("spartagames.utils._redis_clients", clear=True),
+        mock.patch("redis.Redis.from_url", return_value=client),
+    ]:
+        patcher.start()
+        test_case.addCleanup(patcher.stop)
+    return client
+
+
+def reset_search_index(test_case):
+    # 메모리 검색 색인은 프로세스 전역이므로 테스트마다 비움 (롤백된 게임 id 재사용 대비)
+    get_backend().reset()
+    test_case.addCleanup(get_backend().reset)
+
+
+def reset_chip_registry(test_case):
+    # 칩 id 레지스트리도 프로세스 전역이므로 롤백된 칩 id가 남지 않도록 비움
+    registry.clear()
+    test_case.addCleanup(registry.clear)
+
+
+def create_game(maker, title, categories=(), chips=(), **kwargs):
+    game = Game.objects.create(
+        title=title, thumbnail="images/thumbnail/test.png", maker=maker, content="content",
+        gamefile="zips/test.zip", star=0, review_cnt=0, register_state=1, **kwargs
+    )
+    game.category.set(categories)
+    game.chip.set(chips)
+    return game
+
+
+class QueryCountTestMixin:
+    """
+    목록 API의 쿼리 수가 게임 수와 무관한지 확인 (게임별 추가 쿼리 회귀 방지)
+    """
+
+    def assertConstantQueries(self, url, add_games):
+        # 첫 요청은 ContentType 등 프로세스 캐시를 채우므로 측정에서 제외
+        self.client.get(url)
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        first = response.json()["data"]
+
+        add_games()
+        cache.clear()
+        with self.assertNumQueries(len(context.captured_queries)):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return first, response.json()["data"]
+
+
+@override_settings(CACHES=LOCMEM_CACHES, GAME_SEARCH_BACKEND="memory")
+class GameListQueryCountTest(QueryCountTestMixin, TestCase):
+    def setUp(self):
+        reset_search_index(self)
+        # 검색 API의 요청 제한(Redis)은 테스트에서 사용하지 않음
+        patcher = mock.patch("spartagames.throttling.SearchThrottle.allow_request", return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.user = get_user_model().objects.create_user(
+            email="user@test.com", nickname="tester1", password="password1!", login_type="DEFAULT"
+        )
+        self.categories = [GameCategory.objects.create(name=name) for name in ["Action", "Puzzle"]]
+        self.chips = [
+            Chip.objects.create(name=name) for name in ["EASY", "NORMAL", "Daily Top", "New Game", "Long Play"]
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.seed(3)
+
+    def seed(self, count):
+        start = Game.objects.count()
+        for i in range(start, start + count):
+            game = create_game(
+                self.user, f"game {i}", categories=[self.categories[0]],
+                chips=[self.chips[i % 2], self.chips[2 + i % 3]],
+            )
+            if i % 2:
+                Like.objects.create(user=self.user, game=game)
+            # 변환본도 prefetch로 함께 불러오는지 확인
+            ImageRendition.objects.create(
+                content_type=ContentType.objects.get_for_model(Game), content_id=game.pk, field="thumbnail",
+                name="card", format="webp", src=f"images/thumbnail/{i}__card.webp", width=400, height=300,
+                source_name=game.thumbnail.name,
+            )
+
+    def test_game_list_search(self):
+        first, second = self.assertConstantQueries(
+            "/games/api/list/search/?keyword=game&limit=100", lambda: self.seed(3)
+        )
+        self.assertEqual(len(first["all_games"]), 3)
+        self.assertEqual(len(second["all_games"]), 6)
+        # 즐겨찾기한 게임은 favorite_games로 옮겨지고 all_games에는 빈 자리만 남음
+        for game in second["favorite_games"] + [game for game in second["all_games"] if game]:
+            self.assertIn("webp", game["thumbnail_renditions"]["card"])
+
+    def test_category_games_list(self):
+        first, second = self.assertConstantQueries(
+            "/games/api/list/categories/?category=Action&limit=100", lambda: self.seed(3)
+        )
+        self.assertEqual((len(first), len(second)), (3, 6))
+        for game in second:
+            self.assertIn("webp", game["thumbnail_renditions"]["card"])
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class HomeFeedCacheTest(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="user@test.com", nickname="tester1", password="password1!", login_type="DEFAULT"
+        )
+        self.categories = [GameCategory.objects.create(name=name) for name in ["Action", "Puzzle", "RPG"]]
+        for name in ["Daily Top", "New Game"]:
+            Chip.objects.create(name=name)
+        for i, category in enumerate(self.categories):
+            create_game(self.user, f"game {i}", categories=[category])
+        cache.clear()
+
+    def test_invalidate_after_commit(self):
+        version = get_feed_version()
+        with self.captureOnCommitCallbacks() as callbacks:
+            create_game(self.user, "new game", categories=[self.categories[0]])
+            self.assertEqual(get_feed_version(), version)
+        self.assertIn(invalidate_home_feed, callbacks)
+
+        for callback in callbacks:
+            callback()
+        self.assertGreater(get_feed_version(), version)
+
+    def test_invalidate_ignores_cache_error(self):
+        with mock.patch("games.feeds.cache.incr", side_effect=redis.ConnectionError):
+            invalidate_home_feed()
+
+    def test_read_falls_back_to_db_on_cache_error(self):
+        error = redis.ConnectionError
+        with mock.patch("games.feeds.cache.get", side_effect=error), \
+                mock.patch("games.feeds.cache.get_many", side_effect=error), \
+                mock.patch("games.feeds.cache.set_many", side_effect=error):
+            response = self.client.get("/games/api/list/")
+        self.assertEqual(response.status_code, 200)
+        data = response.json()["data"]
+        self.assertEqual(len(data["updated"]), 3)
+        self.assertEqual(len(data["rand1"]["game_list"]), 1)
+        self.assertIsNone(cache.get(HOME_FEED_VERSION_KEY))
+
+
+@override_settings(CACHES=LOCMEM_CACHES, GAME_SEARCH_BACKEND="memory")
+class InMemorySearchTest(TestCase):
+    def setUp(self):
+        reset_search_index(self)
+        patcher = mock.patch("spartagames.throttling.SearchThrottle.allow_request", return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.user = get_user_model().objects.create_user(
+            email="user@test.com", nickname="maker", password="password1!", login_type="DEFAULT"
+        )
+        self.action = GameCategory.objects.create(name="Action")
+        self.puzzle = GameCategory.objects.create(name="Puzzle")
+
+    def search(self, keyword):
+        queryset = Game.objects.filter(is_visible=True, register_state=1)
+        return list(search_games(queryset, keyword).values_list("title", flat=True))
+
+    def test_backend(self):
+        self.assertIsInstance(get_backend(), InMemorySearchBackend)
+
+    def test_rank_whole_word_before_prefix_before_substring(self):
+        for title in ["lodestar", "star", "starlight", "moon"]:
+            create_game(self.user, title, categories=[self.action])
+        self.assertEqual(self.search("Star"), ["star", "starlight", "lodestar"])
+
+    def test_single_character_matches_inside_words(self):
+        # PostgreSQL 백엔드의 icontains와 같이 한 글자 검색어도 단어 중간까지 일치
+        for title in ["전설의 용사", "작전명", "abc", "moon"]:
+            create_game(self.user, title, categories=[self.action])
+        self.assertEqual(self.search("전"), ["전설의 용사", "작전명"])
+        self.assertEqual(self.search("b"), ["abc"])
+        self.assertEqual(self.search("x"), [])
+
+    def test_search_category_and_maker(self):
+        create_game(self.user, "block drop", categories=[self.puzzle])
+        create_game(self.user, "runner", categories=[self.action])
+        self.assertEqual(self.search("puzzle"), ["block drop"])
+        self.assertEqual(set(self.search("maker")), {"block drop", "runner"})
+
+    def test_index_follows_changes_after_load(self):
+        game = create_game(self.user, "runner", categories=[self.action])
+        self.assertEqual(self.search("runner"), ["runner"])
+
+        create_game(self.user, "runner two", categories=[self.action])
+        game.title = "jumper"
+        game.save()
+        self.assertEqual(self.search("runner"), ["runner two"])
+        self.assertEqual(self.search("jumper"), ["jumper"])
+
+        self.user.nickname = "studio"
+        self.user.save()
+        self.assertEqual(len(self.search("studio")), 2)
+
+        game.delete()
+        self.assertEqual(self.search("jumper"), [])
+
+    def test_no_keyword_orders_by_latest(self):
+        for title in ["first", "second", "third"]:
+            create_game(self.user, title, categories=[self.action])
+        self.assertEqual(self.search(""), ["third", "second", "first"])
+
+    def test_favorite_games_first(self):
+        games = {
+            title: create_game(self.user, title, categories=[self.action])
+            for title in ["star", "starlight", "lodestar", "stardust", "starfish"]
+        }
+        # 관련도가 낮은 게임을 즐겨찾기
+        for title in ["lodestar", "starfish"]:
+            Like.objects.create(user=self.user, game=games[title])
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        response = self.client.get("/games/api/list/search/?keyword=star")
+        self.assertEqual(response.status_code, 200)
+        data = response.json()["data"]
+        self.assertEqual([game["title"] for game in data["favorite_games"]], ["starfish", "lodestar"])
+        self.assertEqual(data["all_games"][:2], [{}, {}])
+        self.assertEqual([game["title"] for game in data["all_games"][2:]], ["star", "stardust"])
+        self.assertEqual(response.json()["pagination"]["count"], 5)
+
+        response = self.client.get("/games/api/list/search/?keyword=star&page=2")
+        data = response.json()["data"]
+        self.assertEqual(data["favorite_games"], [])
+        self.assertEqual([game["title"] for game in data["all_games"]], ["starlight"])
+
+    def test_anonymous_has_no_favorite_games(self):
+        create_game(self.user, "star", categories=[self.action])
+        response = self.client.get("/games/api/list/search/?keyword=star")
+        data = response.json()["data"]
+        self.assertNotIn("favorite_games", data)
+        self.assertEqual([game["title"] for game in data["all_games"]], ["star"])
+
+
+class EngagementRollupTest(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="user@test.com", nickname="tester1", password="password1!", login_type="DEFAULT"
+        )
+        self.game = create_game(self.user, "game")
+        self.now = timezone.now().replace(minute=30, second=0, microsecond=0)
+
+    def add_views(self, count, at):
+        views = View.objects.bulk_create([View(game=self.game) for _ in range(count)])
+        View.objects.filter(pk__in=[view.pk for view in views]).update(created_at=at)
+
+    def rolled_up(self, metric, bucket, bucket_size=EngagementRollup.HOUR):
+        row = EngagementRollup.objects.filter(game=self.game, bucket_size=bucket_size, bucket=bucket).first()
+        return getattr(row, metric) if row else 0
+
+    def advance(self):
+        self.now += ROLLUP_LAG
+        return roll_up(self.now)
+
+    def test_rows_are_rolled_up_after_lag(self):
+        self.add_views(3, self.now)
+        roll_up(self.now)  # 최대 id만 기록
+        self.assertEqual(self.rolled_up("views", self.now.replace(minute=0)), 0)
+
+        self.advance()
+        self.assertEqual(self.rolled_up("views", self.now.replace(minute=0)), 3)
+        self.assertEqual(
+            self.rolled_up("views", self.now.replace(hour=0, minute=0), EngagementRollup.DAY), 3
+        )
+
+    def test_late_inserted_rows_with_old_timestamps(self):
+        old_bucket = (self.now - timedelta(hours=5)).replace(minute=0)
+        self.add_views(2, old_bucket)
+        roll_up(self.now)
+        self.advance()
+        self.assertEqual(self.rolled_up("views", old_bucket), 2)
+
+        # 워터마크가 지난 뒤에 과거 시각으로 저장된 행 (방치된 플레이 세션, 늦은 버퍼 저장 등)
+        self.add_views(1, old_bucket + timedelta(minutes=10))
+        PlayLog.objects.create(
+            user=self.user, game=self.game, start_at=old_bucket, end_at=old_bucket + timedelta(minutes=20), playtime=600
+        )
+        self.advance()  # 새 ceiling 기록
+        self.advance()
+        self.assertEqual(self.rolled_up("views", old_bucket), 3)
+        self.assertEqual(self.rolled_up("playtime_seconds", old_bucket), 600)
+
+        # 다시 실행해도 중복 반영하지 않음
+        self.advance()
+        self.advance()
+        self.assertEqual(self.rolled_up("views", old_bucket), 3)
+
+    def test_likes_count_added_rows(self):
+        other = get_user_model().objects.create_user(
+            email="other@test.com", nickname="other", password="password1!", login_type="DEFAULT"
+        )
+        Like.objects.create(user=self.user, game=self.game)
+        like = Like.objects.create(user=other, game=self.game)
+        Like.objects.update(created_at=self.now)
+        roll_up(self.now)
+        self.advance()
+        self.assertEqual(self.rolled_up("likes", self.now.replace(minute=0)), 2)
+
+        # 취소된 좋아요는 이미 집계된 버킷에서 빼지 않음
+        like.delete()
+        self.advance()
+        self.advance()
+        self.assertEqual(self.rolled_up("likes", self.now.replace(minute=0)), 2)
+
+    def test_rows_after_ceiling_wait_for_next_cycle(self):
+        roll_up(self.now)
+        self.add_views(1, self.now)
+        self.advance()
+        self.assertEqual(self.rolled_up("views", self.now.replace(minute=0)), 0)
+        self.advance()
+        self.assertEqual(self.rolled_up("views", self.now.replace(minute=0)), 1)
+
+
+def game_zip():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("index.html", "<html><body></body></html>")
+        archive.writestr("Build/game.js", "var game = 1;")
+    return buffer.getvalue()
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class GameUpdateTest(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="maker@test.com", nickname="maker", password="password1!", login_type="DEFAULT"
+        )
+        self.category = GameCategory.objects.create(name="Action")
+        self.game = create_game(self.user, "game", categories=[self.category])
+        self.upload = GameUpload.objects.create(
+            uploader=self.user, key="media/zips/new.zip", upload_id="s3-upload", size=100, part_size=100,
+            status=GameUpload.STATUS_COMPLETED,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = f"/games/api/list/{self.game.pk}/"
+        self.s3 = FakeS3()
+
+        patcher = mock.patch("games.views.validate_game_file.delay")
+        self.validate_delay = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def put(self, data):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.put(self.url, data, format="multipart")
+
+    def test_non_integer_upload_id(self):
+        response = self.put({"upload_id": "abc"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_invalid_screenshot_does_not_claim_upload_or_save(self):
+        screenshot = io.BytesIO(b"not an image")
+        screenshot.name = "screenshot.png"
+        response = self.put({"upload_id": self.upload.pk, "title": "changed", "new_screenshots": [screenshot]})
+        self.assertEqual(response.status_code, 400)
+
+        self.upload.refresh_from_db()
+        self.game.refresh_from_db()
+        self.assertEqual(self.upload.status, GameUpload.STATUS_COMPLETED)
+        self.assertEqual(self.game.title, "game")
+        self.assertEqual(self.game.register_state, 1)
+        self.validate_delay.assert_not_called()
+
+    def test_unknown_category_does_not_claim_upload(self):
+        response = self.put({"upload_id": self.upload.pk, "category": "Unknown"})
+        self.assertEqual(response.status_code, 404)
+        self.upload.refresh_from_db()
+        self.assertEqual(self.upload.status, GameUpload.STATUS_COMPLETED)
+
+    def test_gamefile_update_requests_review_once(self):
+        response = self.put({"upload_id": self.upload.pk, "title": "changed"})
+        self.assertEqual(response.status_code, 200)
+
+        self.game.refresh_from_db()
+        self.upload.refresh_from_db()
+        self.assertEqual(self.game.register_state, 3)
+        self.assertEqual(self.game.gamefile.name, "zips/new.zip")
+        self.assertEqual(self.upload.status, GameUpload.STATUS_USED)
+        self.validate_delay.assert_called_once_with(self.game.pk)
+        self.s3.put(self.upload.key, game_zip())
+
+        # 검증 통과 시 검수요청 로그/알림을 다시 남기지 않음
+        with mock.patch("games.tasks.get_s3_client", return_value=self.s3):
+            validate_game_file(self.game.pk)
+        self.game.refresh_from_db()
+        self.assertEqual(self.game.register_state, 0)
+        logs = list(GameRegisterLog.objects.filter(game=self.game).values_list("content", flat=True))
+        self.assertEqual(len(logs), 1)
+        self.assertTrue(logs[0].startswith("수정 후 검수요청: gamefile, title"))
+        self.assertFalse(OutboxMessage.objects.exists())
+
+    def test_new_game_validation_requests_review(self):
+        self.game.register_state = 3
+        self.game.save(update_fields=["register_state"])
+        self.s3.put(f"media/{self.game.gamefile.name}", game_zip())
+        with mock.patch("games.tasks.get_s3_client", return_value=self.s3):
+            validate_game_file(self.game.pk)
+        logs = list(GameRegisterLog.objects.filter(game=self.game).values_list("content", flat=True))
+        self.assertEqual(len(logs), 1)
+        self.assertTrue(logs[0].startswith("검수요청"))
+        self.assertEqual(OutboxMessage.objects.count(), 1)
+
+    def test_requeue_stale_validations(self):
+        stale = create_game(self.user, "stale")
+        fresh = create_game(self.user, "fresh")
+        abandoned = create_game(self.user, "abandoned")
+        now = timezone.now()
+        Game.objects.filter(pk=stale.pk).update(register_state=3, updated_at=now - timedelta(hours=1))
+        Game.objects.filter(pk=fresh.pk).update(register_state=3, updated_at=now)
+        Game.objects.filter(pk=abandoned.pk).update(register_state=3, updated_at=now - timedelta(days=2))
+
+        with mock.patch("games.tasks.validate_game_file.delay") as delay:
+            self.assertEqual(requeue_stale_game_validations(), "Requeued validation for 1 games.")
+        delay.assert_called_once_with(stale.pk)
+
+
+class ReviewLikeTest(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.author = User.objects.create_user(
+            email="author@test.com", nickname="author", password="password1!", login_type="DEFAULT"
+        )
+        self.user = User.objects.create_user(
+            email="user@test.com", nickname="tester1", password="password1!", login_type="DEFAULT"
+        )
+        game = create_game(self.author, "game")
+        self.review = Review.objects.create(game=game, author=self.author, content="good", star=5, difficulty=1)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def toggle(self, action):
+        response = self.client.post(f"/games/api/review/{self.review.pk}/like/", {"action": action})
+        self.assertEqual(response.status_code, 200)
+        self.review.refresh_from_db()
+        return ReviewsLike.objects.get(user=self.user, review=self.review).is_like, (
+            self.review.like_count, self.review.dislike_count
+        )
+
+    def test_transitions(self):
+        # (동작, 바뀐 상태, (좋아요 수, 싫어요 수))
+        steps = [
+            ("like", 1, (1, 0)),     # 없음 -> 좋아요
+            ("like", 0, (0, 0)),     # 좋아요 -> 없음
+            ("dislike", 2, (0, 1)),  # 없음 -> 싫어요
+            ("like", 1, (1, 0)),     # 싫어요 -> 좋아요
+            ("dislike", 2, (0, 1)),  # 좋아요 -> 싫어요
+            ("dislike", 0, (0, 0)),  # 싫어요 -> 없음
+        ]
+        for action, state, counts in steps:
+            with self.subTest(action=action, state=state):
+                self.assertEqual(self.toggle(action), (state, counts))
+
+    def test_counts_from_several_users(self):
+        other = get_user_model().objects.create_user(
+            email="other@test.com", nickname="other", password="password1!", login_type="DEFAULT"
+        )
+        ReviewsLike.objects.create(user=other, review=self.review, is_like=1)
+        Review.objects.filter(pk=self.review.pk).update(like_count=1)
+
+        self.assertEqual(self.toggle("dislike"), (2, (1, 1)))
+        self.assertEqual(self.toggle("like"), (1, (2, 0)))
+
+    def test_reconcile_review_counts(self):
+        other = get_user_model().objects.create_user(
+            email="other@test.com", nickname="other", password="password1!", login_type="DEFAULT"
+        )
+        ReviewsLike.objects.create(user=self.user, review=self.review, is_like=1)
+        ReviewsLike.objects.create(user=other, review=self.review, is_like=2)
+        correct = Review.objects.create(
+            game=self.review.game, author=other, content="ok", star=3, difficulty=1, like_count=0, dislike_count=0
+        )
+        Review.objects.filter(pk=self.review.pk).update(like_count=5, dislike_count=0)
+
+        out = io.StringIO()
+        call_command("reconcile_review_counts", "--dry-run", stdout=out)
+        self.assertIn("1개 불일치", out.getvalue())
+        self.review.refresh_from_db()
+        self.assertEqual((self.review.like_count, self.review.dislike_count), (5, 0))
+
+        out = io.StringIO()
+        call_command("reconcile_review_counts", "--batch-size", "1", stdout=out)
+        self.assertIn("리뷰 2개 검사, 1개 수정", out.getvalue())
+        self.review.refresh_from_db()
+        correct.refresh_from_db()
+        self.assertEqual((self.review.like_count, self.review.dislike_count), (1, 1))
+        self.assertEqual((correct.like_count, correct.dislike_count), (0, 0))
+
+
+class RatingTest(TestCase):
+    def setUp(self):
+        reset_chip_registry(self)
+        User = get_user_model()
+        self.users = [
+            User.objects.create_user(
+                email=f"user{i}@test.com", nickname=f"tester{i}", password="password1!", login_type="DEFAULT"
+            )
+            for i in range(2)
+        ]
+        self.game = create_game(self.users[0], "game")
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def post_review(self, user, star, difficulty):
+        response = self.client_for(user).post(
+            f"/games/api/list/{self.game.pk}/reviews/",
+            {"content": "review", "star": star, "difficulty": difficulty}, format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        return response.json()["data"]["id"]
+
+    def assertRatings(self, star, review_cnt, difficulty_sum, difficulty_cnt):
+        self.game.refresh_from_db()
+        self.assertEqual(
+            (self.game.star, self.game.review_cnt, self.game.difficulty_sum, self.game.difficulty_cnt),
+            (star, review_cnt, difficulty_sum, difficulty_cnt),
+        )
+
+    def test_create_update_delete(self):
+        first = self.post_review(self.users[0], 5, 2)
+        second = self.post_review(self.users[1], 2, 0)
+        self.assertRatings(3.5, 2, 2, 2)
+        self.assertEqual(self.game.star_sum, 7)
+
+        # pre_star는 무시하고 DB에 저장된 이전 별점 기준으로 갱신
+        response = self.client_for(self.users[0]).put(
+            f"/games/api/review/{first}/", {"star": 1, "difficulty": 1, "pre_star": 1}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertRatings(1.5, 2, 1, 2)
+
+        response = self.client_for(self.users[1]).delete(f"/games/api/review/{second}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertRatings(1.0, 1, 1, 1)
+
+        # 이미 삭제된 리뷰는 집계에서 다시 빠지지 않음
+        response = self.client_for(self.users[1]).delete(f"/games/api/review/{second}/")
+        self.assertEqual(response.status_code, 404)
+        self.assertRatings(1.0, 1, 1, 1)
+
+    def test_deleting_last_review_resets_star(self):
+        review = self.post_review(self.users[0], 4, 1)
+        self.assertRatings(4.0, 1, 1, 1)
+        self.client_for(self.users[0]).delete(f"/games/api/review/{review}/")
+        self.assertRatings(0.0, 0, 0, 0)
+        self.assertEqual(self.game.star_sum, 0)
+
+    def test_star_case_uses_count_before_update(self):
+        Game.objects.filter(pk=self.game.pk).update(star_sum=9, review_cnt=2, star=4.5)
+        apply_rating_delta(self.game.pk, star_delta=-4, count_delta=-1)
+        self.assertRatings(5.0, 1, 0, 0)
+        apply_rating_delta(self.game.pk, star_delta=-5, count_delta=-1)
+        self.assertRatings(0.0, 0, 0, 0)
+        apply_rating_delta(self.game.pk, star_delta=3, count_delta=1)
+        self.assertRatings(3.0, 1, 0, 0)
+
+    def test_verify_ratings_repairs_drifted_games(self):
+        self.post_review(self.users[0], 5, 2)
+        self.post_review(self.users[1], 3, None)
+        correct = create_game(self.users[1], "correct")
+        Review.objects.create(game=correct, author=self.users[0], content="ok", star=4, difficulty=1)
+        apply_rating_delta(correct.pk, 4, 1, 1, 1)
+        Game.objects.filter(pk=self.game.pk).update(star_sum=1, review_cnt=5, star=0.2, difficulty_cnt=0)
+
+        self.assertEqual(verify_ratings(), [self.game.pk])
+        self.assertRatings(4.0, 2, 2, 1)
+        self.assertEqual(self.game.star_sum, 8)
+        correct.refresh_from_db()
+        self.assertEqual((correct.star, correct.review_cnt), (4.0, 1))
+        self.assertEqual(verify_ratings(), [])
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ChipTest(TestCase):
+    def setUp(self):
+        reset_chip_registry(self)
+        self.user = get_user_model().objects.create_user(
+            email="user@test.com", nickname="tester1", password="password1!", login_type="DEFAULT"
+        )
+        self.chips = {name: Chip.objects.create(name=name) for name in DIFFICULTY_CHIPS + ["New Game"]}
+        self.game = create_game(self.user, "game", chips=[self.chips["EASY"], self.chips["New Game"]])
+
+    def chip_names(self):
+        return set(self.game.chip.values_list("name", flat=True))
+
+    def test_registry_loads_once_and_creates_missing(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(get_chip_id("EASY"), self.chips["EASY"].pk)
+            self.assertEqual(get_chip_id("HARD"), self.chips["HARD"].pk)
+        chip_id = get_chip_id("Daily Top")
+        self.assertEqual(Chip.objects.get(name="Daily Top").pk, chip_id)
+
+        # 칩이 삭제되면 (signals) 레지스트리를 다시 불러옴
+        Chip.objects.filter(pk=chip_id).delete()
+        self.chips["HARD"].delete()
+        hard_id = get_chip_id("HARD")
+        self.assertNotEqual(hard_id, self.chips["HARD"].pk)
+        self.assertEqual(Chip.objects.get(name="HARD").pk, hard_id)
+
+    def test_set_exclusive_chip_swaps_difficulty(self):
+        self.game.chip.add(self.chips["NORMAL"])  # 이전에 어긋난 상태 (난이도 칩 2개)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.assertTrue(set_exclusive_chip(self.game.pk, "HARD", DIFFICULTY_CHIPS))
+        self.assertEqual(self.chip_names(), {"HARD", "New Game"})
+        self.assertIn(invalidate_home_feed, callbacks)
+
+        get_chip_id("EASY")  # 레지스트리 로드
+        with self.assertNumQueries(1), self.captureOnCommitCallbacks() as callbacks:
+            self.assertFalse(set_exclusive_chip(self.game.pk, "HARD", DIFFICULTY_CHIPS))
+        self.assertEqual(callbacks, [])
+
+    def test_assign_chip_based_on_difficulty(self):
+        for difficulty_sum, difficulty_cnt, expected in [(0, 0, "EASY"), (4, 2, "HARD"), (3, 3, "NORMAL"), (1, 2, "EASY")]:
+            Game.objects.filter(pk=self.game.pk).update(difficulty_sum=difficulty_sum, difficulty_cnt=difficulty_cnt)
+            assign_chip_based_on_difficulty(self.game)
+            with self.subTest(expected=expected):
+                self.assertEqual(self.chip_names() & set(DIFFICULTY_CHIPS), {expected})
+                self.assertIn("New Game", self.chip_names())
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class RankingTest(TestCase):
+    def setUp(self):
+        reset_chip_registry(self)
+        User = get_user_model()
+        self.users = [
+            User.objects.create_user(
+                email=f"user{i}@test.com", nickname=f"tester{i}", password="password1!", login_type="DEFAULT"
+            )
+            for i in range(5)
+        ]
+        self.games = [create_game(self.users[0], f"game {i}") for i in range(6)]
+        # 점수와 생성 시각이 모두 같은 게임들 (pk로 순서 결정)
+        Game.objects.update(created_at=timezone.now() - timedelta(days=3))
+        for game in self.games:
+            Like.objects.bulk_create([Like(user=user, game=game) for user in self.users])
+        self.unliked = create_game(self.users[0], "unliked")
+
+    def chip_games(self, name):
+        return set(Game.objects.filter(chip__name=name).values_list("pk", flat=True))
+
+    def test_ties_are_deterministic_and_chip_set_is_replaced(self):
+        top = sorted((game.pk for game in self.games), reverse=True)[:4]
+        Game.objects.get(pk=self.games[0].pk).chip.add(Chip.objects.create(name="Daily Top"))
+
+        result = run_ranking("Daily Top")
+        self.assertEqual(result["games"], top)
+        self.assertEqual((result["added"], result["removed"]), (4, 1))
+        self.assertEqual(self.chip_games("Daily Top"), set(top))
+
+        result = run_ranking("Daily Top")
+        self.assertEqual(result["games"], top)
+        self.assertEqual((result["added"], result["removed"]), (0, 0))
+
+    def test_non_exclusive_ranking_keeps_previous_games(self):
+        self.unliked.chip.add(Chip.objects.create(name="Bookmark Top"))
+        result = run_ranking("Bookmark Top", limit=2)
+        self.assertEqual((result["added"], result["removed"]), (2, 0))
+        self.assertEqual(self.chip_games("Bookmark Top"), set(result["games"]) | {self.unliked.pk})
+
+    def test_swap_is_atomic(self):
+        swap_chip("Daily Top", [self.games[0].pk])
+        with mock.patch("django.db.models.query.QuerySet.bulk_create", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                swap_chip("Daily Top", [self.games[1].pk])
+        self.assertEqual(self.chip_games("Daily Top"), {self.games[0].pk})
+
+
+class ViewEventTest(TestCase):
+    def setUp(self):
+        self.redis = use_fake_redis(self)
+        User = get_user_model()
+        self.user = User.objects.create_user(
+            email="user@test.com", nickname="tester1", password="password1!", login_type="DEFAULT"
+        )
+        self.other = User.objects.create_user(
+            email="other@test.com", nickname="other", password="password1!", login_type="DEFAULT"
+        )
+        self.game = create_game(self.user, "game")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def view(self, client=None):
+        response = (client or self.client).get(f"/games/api/list/{self.game.pk}/")
+        self.assertEqual(response.status_code, 200)
+
+    def test_dedupe_within_window(self):
+        self.view()
+        self.view()
+        self.view(APIClient())  # 비회원 (IP 기준)
+        self.view(APIClient())
+        self.assertEqual(self.redis.llen(view_events.EVENTS_KEY), 2)
+        self.assertFalse(View.objects.exists())
+
+        seen = f"{view_events.SEEN_KEY_PREFIX}{self.game.pk}:u{self.user.pk}"
+        self.assertAlmostEqual(self.redis.ttl(seen), view_events.VIEW_DEDUPE_WINDOW.total_seconds(), delta=5)
+        self.redis.delete(seen)  # 중복 창이 지난 뒤
+        self.view()
+        self.assertEqual(self.redis.llen(view_events.EVENTS_KEY), 3)
+
+    def test_flush_writes_views(self):
+        self.view()
+        self.view(APIClient())
+        self.assertEqual(flush_game_views(), "Flushed 2 view events into 2 rows.")
+        self.assertCountEqual(View.objects.values_list("user_id", flat=True), [None, self.user.pk])
+        self.assertEqual(view_events.pending_view_events(), 0)
+        self.assertEqual(flush_game_views(), "Flushed 0 view events into 0 rows.")
+
+    def test_list_is_trimmed_only_after_commit(self):
+        for _ in range(3):
+            self.redis.rpush(view_events.EVENTS_KEY, f"{self.game.pk}:{self.user.pk}")
+        with mock.patch("games.view_events.View.objects.bulk_create", side_effect=RuntimeError("db down")):
+            with self.assertRaises(RuntimeError):
+                view_events.flush_view_events(batch_size=2)
+        self.assertFalse(View.objects.exists())
+        self.assertEqual(view_events.pending_view_events(), 3)
+
+        # 다음 실행에서 처리용 리스트에 남은 항목부터 처리하고, 새로 쌓인 이벤트는 그다음 실행에서 처리
+        self.redis.rpush(view_events.EVENTS_KEY, f"{self.game.pk}:")
+        self.assertEqual(view_events.flush_view_events(batch_size=2), (3, 3))
+        self.assertEqual(view_events.flush_view_events(batch_size=2), (1, 1))
+        self.assertEqual(View.objects.count(), 4)
+        self.assertEqual(view_events.pending_view_events(), 0)
+
+    def test_deleted_user_and_game(self):
+        # 이벤트가 쌓인 뒤 탈퇴한 회원, 삭제된 게임 (존재하지 않는 id)
+        deleted_user_id = self.other.pk + 100
+        deleted_game_id = self.game.pk + 100
+        self.redis.rpush(
+            view_events.EVENTS_KEY,
+            f"{self.game.pk}:{deleted_user_id}", f"{deleted_game_id}:{self.user.pk}", f"{self.game.pk}:{self.user.pk}",
+        )
+        self.assertEqual(view_events.flush_view_events(), (3, 2))
+        self.assertCountEqual(
+            View.objects.values_list("game_id", "user_id"), [(self.game.pk, None), (self.game.pk, self.user.pk)]
+        )
+
+    def test_concurrent_flush_is_skipped(self):
+        lock = self.redis.lock(view_events.FLUSH_LOCK_KEY, timeout=60)
+        lock.acquire()
+        self.assertIsNone(view_events.flush_view_events())
+        self.assertEqual(flush_game_views(), "Another flush is in progress.")
+
+    def test_redis_error_falls_back_to_direct_insert(self):
+        with mock.patch.object(self.redis, "evalsha", side_effect=redis.ConnectionError), \
+                mock.patch.object(self.redis, "eval", side_effect=redis.ConnectionError):
+            self.view()
+            self.view()  # 중복 제거 없이 기록
+        self.assertEqual(View.objects.filter(game=self.game, user=self.user).count(), 2)
+        self.assertEqual(self.redis.llen(view_events.EVENTS_KEY), 0)
+
+
+class PlaySessionTest(TestCase):
+    def setUp(self):
+        self.redis = use_fake_redis(self)
+        User = get_user_model()
+        self.user = User.objects.create_user(
+            email="user@test.com", nickname="tester1", password="password1!", login_type="DEFAULT"
+        )
+        self.other = User.objects.create_user(
+            email="other@test.com", nickname="other", password="password1!", login_type="DEFAULT"
+        )
+        self.game = create_game(self.user, "game")
+        self.url = f"/games/api/list/{self.game.pk}/playlog/"
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.now = 1_700_000_000
+        patcher = mock.patch("games.play_sessions._now", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def start(self, client=None):
+        response = (client or self.client).get(self.url)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()["data"]
+        self.assertEqual(data["heartbeat_interval"], 30)
+        return data["playtime_id"]
+
+    def send(self, playtime_id, event="end", client=None):
+        return (client or self.client).post(self.url, {"playtime_id": playtime_id, "event": event}, format="json")
+
+    def totals(self):
+        return list(TotalPlayTime.objects.values_list("user_id", "game_id", "totaltime"))
+
+    def test_start_heartbeat_end(self):
+        playtime_id = self.start()
+        self.now += 30
+        self.assertEqual(self.send(playtime_id, "heartbeat").status_code, 200)
+        self.now += 30
+        self.assertEqual(self.send(playtime_id).status_code, 200)
+        self.assertEqual(self.redis.zcard(play_sessions.ACTIVE_KEY), 0)
+
+        # 이미 닫힌 세션
+        self.assertEqual(self.send(playtime_id, "heartbeat").status_code, 404)
+        self.assertEqual(self.send(playtime_id).status_code, 404)
+
+        self.assertEqual(flush_game_play_sessions(), "Closed 0 abandoned sessions, flushed 1 sessions into 1 play logs.")
+        log = PlayLog.objects.get()
+        self.assertEqual((log.user_id, log.game_id, log.playtime), (self.user.pk, self.game.pk, 60))
+        self.assertEqual(self.totals(), [(self.user.pk, self.game.pk, 60)])
+
+    def test_other_users_session_is_rejected(self):
+        playtime_id = self.start()
+        other_client = APIClient()
+        other_client.force_authenticate(self.other)
+        self.assertEqual(self.send(playtime_id, "heartbeat", client=other_client).status_code, 404)
+        self.assertEqual(self.send(playtime_id, client=other_client).status_code, 404)
+
+        other_game = create_game(self.user, "other game")
+        with self.assertRaises(play_sessions.PlaySessionError):
+            play_sessions.end_session(self.user, other_game, playtime_id)
+
+        # 원래 사용자의 세션은 그대로 진행 중
+        self.now += 10
+        self.assertEqual(self.send(playtime_id).status_code, 200)
+
+    def test_abandoned_session_closes_at_last_heartbeat(self):
+        playtime_id = self.start()
+        started = self.now
+        self.now += 30
+        self.assertEqual(self.send(playtime_id, "heartbeat").status_code, 200)
+
+        self.now += int(play_sessions.HEARTBEAT_TIMEOUT.total_seconds()) - 1
+        self.assertEqual(play_sessions.flush_play_sessions(), (0, 0, 0))  # 아직 마감 전
+
+        self.now += 2
+        self.assertEqual(play_sessions.flush_play_sessions(), (1, 1, 1))
+        log = PlayLog.objects.get()
+        self.assertEqual(log.playtime, 30)
+        self.assertEqual(int(log.end_at.timestamp()), started + 30)
+        self.assertEqual(self.send(playtime_id).status_code, 404)
+
+    def test_session_without_heartbeat_waits_for_start_timeout(self):
+        self.start()
+        self.now += int(play_sessions.HEARTBEAT_TIMEOUT.total_seconds()) + 1
+        self.assertEqual(play_sessions.flush_play_sessions(), (0, 0, 0))
+
+        self.now += int(play_sessions.START_TIMEOUT.total_seconds())
+        self.assertEqual(play_sessions.flush_play_sessions(), (1, 1, 1))
+        self.assertEqual(PlayLog.objects.get().playtime, 0)  # 하트비트가 없으면 시작 시각으로 닫힘
+
+    def test_flushes_accumulate_totals_once_per_session(self):
+        for playtime in [10, 20]:
+            playtime_id = self.start()
+            self.now += playtime
+            self.assertEqual(self.send(playtime_id).status_code, 200)
+        self.assertEqual(play_sessions.flush_play_sessions(), (0, 2, 2))
+        self.assertEqual(self.totals(), [(self.user.pk, self.game.pk, 30)])
+        first_latest = TotalPlayTime.objects.get().latest_at
+
+        playtime_id = self.start()
+        self.now += 5
+        self.send(playtime_id)
+        self.assertEqual(play_sessions.flush_play_sessions(), (0, 1, 1))
+        self.assertEqual(play_sessions.flush_play_sessions(), (0, 0, 0))  # 다시 처리해도 더하지 않음
+        self.assertEqual(self.totals(), [(self.user.pk, self.game.pk, 35)])
+        self.assertEqual(PlayLog.objects.count(), 3)
+        self.assertGreater(TotalPlayTime.objects.get().latest_at, first_latest)
+
+    def test_upsert_keeps_latest_play_time(self):
+        latest = timezone.now()
+        play_sessions._upsert_totals({(self.user.pk, self.game.pk): (10, latest)})
+        play_sessions._upsert_totals({
+            (self.user.pk, self.game.pk): (5, latest - timedelta(hours=1)),  # 늦게 반영된 이전 세션
+            (self.other.pk, self.game.pk): (7, latest),
+        })
+        totals = {row.user_id: row for row in TotalPlayTime.objects.all()}
+        self.assertEqual((totals[self.user.pk].totaltime, totals[self.user.pk].latest_at), (15, latest))
+        self.assertEqual(totals[self.other.pk].totaltime, 7)
+
+
+class MergeDuplicateTotalsMigrationTest(TransactionTestCase):
+    before = [("games", "0013_view_user_nullable")]
+    after = [("games", "0014_totalplaytime_unique")]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def test_duplicates_are_merged(self):
+        apps = self.migrate(self.before)
+        self.addCleanup(self.migrate, self.after)  # 다른 테스트를 위해 최신 스키마로 되돌림
+        user = get_user_model().objects.create_user(
+            email="user@test.com", nickname="tester1", password="password1!", login_type="DEFAULT"
+        )
+        game = apps.get_model("games", "Game").objects.create(
+            title="game", thumbnail="images/thumbnail/test.png", maker_id=user.pk, content="content",
+            gamefile="zips/test.zip", star=0, review_cnt=0, register_state=1,
+        )
+        TotalPlayTime = apps.get_model("games", "TotalPlayTime")
+        latest = timezone.now()
+        first = TotalPlayTime.objects.create(user_id=user.pk, game_id=game.pk, totaltime=10, latest_at=latest)
+        TotalPlayTime.objects.create(user_id=user.pk, game_id=game.pk, totaltime=20, latest_at=latest - timedelta(days=1))
+        TotalPlayTime.objects.create(user_id=user.pk, game_id=game.pk, totaltime=5, latest_at=None)
+
+        self.migrate(self.after)
+        row = TotalPlayTime.objects.get()
+        self.assertEqual((row.pk, row.totaltime, row.latest_at), (first.pk, 35, latest))
@@ -1,26 +1,25 @@
 from PIL import Image
-import requests
 import zipfile
+import zlib
 
-from django.db.models import Avg
-from .models import Chip
+from .chips import set_exclusive_chip
+from .ratings import get_average_difficulty
+from .serializers import DIFFICULTY_CHIPS
 
-from spartagames.config import DISCORD_GAME_UPLOAD_CHANNEL_WEBHOOK_URL
-from spartagames.exceptions import DiscordAlertException
+from commons.images import MAX_IMAGE_PIXELS
+from commons.outbox import enqueue_discord
 
 
 def validate_image(image):
     """
     이미지 파일 형식만 검증하는 함수 (확장자 무관)
+    헤더/구조만 확인하고, 전체 디코딩과 변환본 생성은 저장 후 commons.tasks.generate_image_renditions에서 진행
     """
     try:
         img = Image.open(image)
-        img.verify()  # 파일 손상 여부 확인
-
-        # 확실한 검증을 위해 다시 열어서 실제로 로드해보기
-        img = Image.open(image)
-        img.load()  # 로드 과정에서 오류 발생 시 비정상적인 이미지
-
+        if img.width * img.height > MAX_IMAGE_PIXELS:
+            return False, "이미지 해상도가 너무 큽니다."
+        img.verify()  # 파일 손상 여부 확인 (픽셀 디코딩 없음)
         return True, None
     except Exception:
         return False, "유효한 이미지 파일이 아닙니다."
@@ -28,6 +27,7 @@ def validate_image(image):
 def validate_zip_file(zip_file, max_size=500 * 1024 * 1024):
     """
     ZIP 파일의 크기 및 형식을 검증하는 함수
+    (중앙 디렉터리만 확인, 압축 해제 검사는 games.tasks.validate_game_file에서 비동기로 진행)
     """
     if not zip_file.name.endswith('.zip'):
         return False, "ZIP 파일만 업로드 가능합니다."
@@ -36,55 +36,84 @@ def validate_zip_file(zip_file, max_size=500 * 1024 * 1024):
         return False, f"ZIP 파일 크기는 최대 {max_size / (1024 * 1024)}MB 이어야 합니다."
 
     try:
-        with zipfile.ZipFile(zip_file, 'r') as zf:
-            if zf.testzip() is not None:
-                return False, "손상된 ZIP 파일입니다."
+        with zipfile.ZipFile(zip_file, 'r'):
+            pass
     except zipfile.BadZipFile:
         return False, "유효한 ZIP 파일이 아닙니다."
 
     return True, None
 
-def assign_chip_based_on_difficulty(game):
+# 업로드된 게임 zip 검사 기준 (games.tasks.validate_game_file)
+MAX_ZIP_MEMBERS = 20000
+MAX_UNCOMPRESSED_SIZE = 2 * 1024 * 1024 * 1024
+MAX_COMPRESSION_RATIO = 200  # 1MB 이상인 파일의 압축률 상한 (압축 폭탄 방지)
+ZIP_READ_CHUNK = 1024 * 1024
+
+
+def inspect_game_zip(zf):
     """
-    게임에 난이도 칩 부여 (EASY, NORMAL, HARD)
-    난이도 평균을 이용함
+    zip 무결성/압축 폭탄 검사 (모든 파일을 끝까지 읽어 CRC 확인, 헤더 값은 믿지 않고 실제 읽은 크기로 제한)
+    반환: 오류 메시지 (문제가 없으면 None)
     """
-    #게임에 대한 평균 난이도
-    average_difficulty = game.reviews.filter(is_visible=True).aggregate(
-        average_difficulty=Avg('difficulty')
-    )['average_difficulty'] or 0
+    infos = zf.infolist()
+    if len(infos) > MAX_ZIP_MEMBERS:
+        return f"ZIP 안의 파일은 최대 {MAX_ZIP_MEMBERS}개까지 가능합니다."
+    if "index.html" not in {info.filename for info in infos}:
+        return "ZIP 최상위에 index.html이 없습니다."
+    if sum(info.file_size for info in infos) > MAX_UNCOMPRESSED_SIZE:
+        return "압축을 푼 크기가 너무 큽니다."
+
+    total = 0
+    for info in infos:
+        parts = info.filename.replace('\\', '/').split('/')
+        if info.filename.startswith('/') or '..' in parts or ':' in parts[0]:
+            return f"허용되지 않는 경로가 있습니다: {info.filename}"
+        if info.flag_bits & 0x1:
+            return f"암호화된 파일은 업로드할 수 없습니다: {info.filename}"
+        if info.is_dir():
+            continue
+        if info.file_size > ZIP_READ_CHUNK and info.file_size > info.compress_size * MAX_COMPRESSION_RATIO:
+            return f"압축률이 비정상적으로 높은 파일이 있습니다: {info.filename}"
+
+        read = 0
+        try:
+            with zf.open(info) as member:
+                while chunk := member.read(ZIP_READ_CHUNK):
+                    read += len(chunk)
+                    if read > info.file_size or total + read > MAX_UNCOMPRESSED_SIZE:
+                        return f"압축을 푼 크기가 헤더와 다릅니다: {info.filename}"
+        except (zipfile.BadZipFile, zlib.error, EOFError, NotImplementedError) as e:
+            return f"손상된 ZIP 파일입니다: {info.filename} ({e})"
+        total += read
+    return None
 
-    easy_chip, _ = Chip.objects.get_or_create(name="EASY")
-    normal_chip, _ = Chip.objects.get_or_create(name="NORMAL")
-    hard_chip, _ = Chip.objects.get_or_create(name="HARD")
 
-    #기존 칩 제거
-    game.chip.remove(easy_chip, normal_chip, hard_chip)
+def assign_chip_based_on_difficulty(game):
+    """
+    게임에 난이도 칩 부여 (EASY, NORMAL, HARD)
+    난이도 평균을 이용함 (리뷰를 다시 읽지 않고 Game의 난이도 합계/개수 사용)
+    """
+    #게임에 대한 평균 난이도 (F()로 갱신된 최신 값을 읽음)
+    game.refresh_from_db(fields=["difficulty_sum", "difficulty_cnt"])
+    average_difficulty = get_average_difficulty(game)
 
-    #기준에 맞게 칩 부여
+    #기준에 맞게 칩 결정
     if average_difficulty < 0.7:
-        game.chip.add(easy_chip)
+        chip_name = "EASY"
     elif average_difficulty > 1.3:
-        game.chip.add(hard_chip)
+        chip_name = "HARD"
     else:
-        game.chip.add(normal_chip)
+        chip_name = "NORMAL"
 
+    #기존 난이도 칩과 비교하여 달라진 경우에만 through 테이블 갱신
+    set_exclusive_chip(game.pk, chip_name, DIFFICULTY_CHIPS)
 
-def send_discord_notification(game):
-    webhook_url = DISCORD_GAME_UPLOAD_CHANNEL_WEBHOOK_URL
 
-    message = {
-        "content": f"📢 새로운 게임이 업로드되었습니다! 관리자 계정으로 확인해주세요.\n"
-                   f"🎮 게임명: {game.title}\n"
-                   f"👤 업로더: {game.maker.nickname}\n"
-    }
-
-    try:
-        resp = requests.post(webhook_url, json=message)
-        # resp.raise_for_status()
-    except Exception as e:
-        # logger 도입하는대로 해당 코드 라인은 살릴 예정
-        # 지금은 print 처리
-        # raise DiscordAlertException
-        # 실패 시 로깅 처리
-        print(f"Discord 알림 실패: {e}")
+def send_discord_notification(game):
+    # 관리자 채널 알림 (호출한 트랜잭션과 함께 저장되고 commons.tasks.dispatch_outbox가 전송)
+    enqueue_discord(
+        "game_upload",
+        f"📢 새로운 게임이 업로드되었습니다! 관리자 계정으로 확인해주세요.\n"
+        f"🎮 게임명: {game.title}\n"
+        f"👤 업로더: {game.maker.nickname}\n",
+    )
@@ -0,0 +1,119 @@
+# 게임 조회수 수집 (Redis 버퍼 -> 주기적으로 View 행 일괄 저장)
+# - 상세 조회마다 DB에 쓰지 않고 Redis 리스트에 이벤트("game_id:user_id")를 추가 (Lua 스크립트 1회 왕복)
+# - 같은 사용자(비회원은 IP)가 같은 게임을 VIEW_DEDUPE_WINDOW 안에 다시 보면 기록하지 않음
+#   SET NX EX 키로 판단 (정확한 중복 제거, 창이 지나면 키가 자동 삭제됨)
+# - flush_view_events(games.tasks.flush_game_views, Celery beat 1분 주기)가 리스트를 처리용 키로 RENAME한 뒤 배치 단위로 bulk_create
+#   DB 커밋 후에만 리스트에서 제거하므로, 커밋 직후 작업이 죽으면 한 배치가 중복 저장될 수 있음 (유실은 없음)
+# - Redis 장애 시에는 DB에 바로 기록 (중복 제거 없이)
+# - View.created_at은 저장 시각이므로 실제 조회 시각보다 최대 flush 주기만큼 늦음 (집계는 시간 단위라 영향 없음)
+from datetime import timedelta
+
+import redis
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from rest_framework.throttling import BaseThrottle
+
+from spartagames.utils import drain_list, get_redis
+from .models import Game, View
+
+
+VIEW_DEDUPE_WINDOW = timedelta(minutes=30)
+FLUSH_BATCH = 5000
+FLUSH_LOCK_TIMEOUT = 5 * 60  # 초
+
+EVENTS_KEY = "views:events"
+PROCESSING_KEY = "views:events:processing"
+SEEN_KEY_PREFIX = "views:seen:"
+FLUSH_LOCK_KEY = "views:flush-lock"
+
+# KEYS[1]: 중복 확인 키, KEYS[2]: 이벤트 리스트 / ARGV[1]: 중복 창(초), ARGV[2]: 이벤트
+RECORD_SCRIPT = """
+if redis.call('SET', KEYS[1], '1', 'NX', 'EX', ARGV[1]) then
+    return redis.call('RPUSH', KEYS[2], ARGV[2])
+end
+return 0
+"""
+
+_scripts = {}
+
+
+def _record_script(client):
+    script = _scripts.get(id(client))
+    if script is None:
+        script = _scripts.setdefault(id(client), client.register_script(RECORD_SCRIPT))
+    return script
+
+
+def _viewer(request):
+    # 비회원은 DRF throttle과 같은 방식으로 IP 식별 (NUM_PROXIES 설정 반영)
+    if request.user.is_authenticated:
+        return f"u{request.user.pk}"
+    return f"ip{BaseThrottle().get_ident(request)}"
+
+
+def record_view(request, game_id):
+    """
+    반환: 새 조회로 기록했으면 True (중복 창 안의 재조회는 False)
+    """
+    user_id = request.user.pk if request.user.is_authenticated else None
+    client = get_redis()
+    try:
+        return bool(_record_script(client)(
+            keys=[f"{SEEN_KEY_PREFIX}{game_id}:{_viewer(request)}", EVENTS_KEY],
+            args=[int(VIEW_DEDUPE_WINDOW.total_seconds()), f"{game_id}:{user_id or ''}"],
+        ))
+    except redis.RedisError:
+        View.objects.create(game_id=game_id, user_id=user_id)
+        return True
+
+
+def _parse(raw):
+    game_id, _, user_id = raw.decode().partition(":")
+    return int(game_id), int(user_id) if user_id else None
+
+
+def _save(events):
+    # 이벤트가 쌓이는 동안 삭제된 게임/회원은 제외 (탈퇴 회원의 조회는 비회원 조회로 저장)
+    game_ids = set(Game.objects.filter(pk__in={game_id for game_id, _ in events}).values_list("pk", flat=True))
+    user_ids = set(
+        get_user_model().objects.filter(
+            pk__in={user_id for _, user_id in events if user_id}
+        ).values_list("pk", flat=True)
+    )
+    rows = [
+        View(game_id=game_id, user_id=user_id if user_id in user_ids else None)
+        for game_id, user_id in events
+        if game_id in game_ids
+    ]
+    with transaction.atomic():
+        View.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def flush_view_events(batch_size=FLUSH_BATCH):
+    """
+    버퍼의 조회 이벤트를 View 행으로 저장
+    반환: (처리한 이벤트 수, 저장한 행 수), 다른 작업이 처리 중이면 None
+    """
+    client = get_redis()
+    lock = client.lock(FLUSH_LOCK_KEY, timeout=FLUSH_LOCK_TIMEOUT)
+    if not lock.acquire(blocking=False):
+        return None
+    try:
+        saved = []
+        processed = drain_list(
+            client, EVENTS_KEY, PROCESSING_KEY,
+            lambda items: saved.append(_save([_parse(item) for item in items])),
+            batch_size,
+        )
+        return processed, sum(saved)
+    finally:
+        try:
+            lock.release()
+        except redis.exceptions.LockError:  # 처리 중 잠금 시간이 지난 경우
+            pass
+
+
+def pending_view_events():
+    client = get_redis()
+    return client.llen(EVENTS_KEY) + client.llen(PROCESSING_KEY)
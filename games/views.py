@@ -3,19 +3,20 @@ import re
 from django.core.files.storage import default_storage
 from django.http import Http404
 from django.shortcuts import get_object_or_404
-from django.db.models import Q, Count
+from django.db import transaction
+from django.db.models import Q, Count, F
 
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated, AllowAny  # 로그인 인증토큰
 from rest_framework import status
-from rest_framework.decorators import permission_classes
+from redis import RedisError
+from rest_framework.decorators import permission_classes, throttle_classes
 
 from games.pagination import CategoryGamesPagination, ReviewPagination
 
 from .models import (
-    Chip,
     Game,
     Like,
     View,
@@ -23,11 +24,10 @@ from .models import (
     Screenshot,
     GameCategory,
     ReviewsLike,
-    PlayLog,
     TotalPlayTime,
 )
-from accounts.models import BotCnt
 from .serializers import (
+    prefetch_game_list,
     GameListSerializer,
     GameDetailSerializer,
     ReviewSerializer,
@@ -39,10 +39,18 @@ from django.conf import settings
 from openai import OpenAI
 from django.utils import timezone
 from spartagames.utils import std_response
-from spartagames.pagination import ReviewCustomPagination
-import random
+from spartagames.pagination import ReviewCustomPagination, SegmentedSequence
+from spartagames.throttling import ChatbotThrottle, SearchThrottle
 from urllib.parse import urlencode
-from .utils import assign_chip_based_on_difficulty, validate_image, validate_zip_file, send_discord_notification
+from . import ratings
+from .chips import get_chip_id
+from .feeds import get_categories, get_home_feed
+from .search import search_games
+from .tasks import validate_game_file
+from .view_events import record_view
+from . import play_sessions
+from .utils import assign_chip_based_on_difficulty, validate_image, validate_zip_file
+from commons.uploads import claim_upload
 
 class GameListAPIView(APIView):
     """
@@ -62,92 +70,20 @@ class GameListAPIView(APIView):
     """
 
     def get(self, request):
-        order = request.query_params.get('order')
-        new_game_chip = Chip.objects.filter(name="New Game").first()
         limit = int(request.query_params.get('limit', 4))
-        categories = list(GameCategory.objects.all().values_list('name',flat=True))
+        # 홈 피드는 캐시된 선반 조각을 조합하여 구성 (games.feeds 참고)
+        categories = get_categories()
         if not categories:
             return std_response(message="카테고리가 존재하지 않는다. 카테고리 생성이 필요하다", status="fail", error_code="SERVER_FAIL", status_code=status.HTTP_404_NOT_FOUND)
             #return Response({"message": "카테고리가 존재하지 않는다. 카테고리 생성이 필요하다"}, status=status.HTTP_404_NOT_FOUND)
         if len(categories) < 3:
             return std_response(message="카테고리가 2개 이하입니다. 카테고리가 최소 3개 필요합니다.", status="fail", error_code="SERVER_FAIL", status_code=status.HTTP_404_NOT_FOUND)
             #return Response({"message": "카테고리가 2개 이하입니다. 카테고리가 최소 3개 필요합니다."}, status=status.HTTP_404_NOT_FOUND)
-        selected_categories = random.sample(categories, 3)
-        
-        rand1 = Game.objects.filter(is_visible=True, register_state=1,category__name=selected_categories[0]).order_by('-created_at')[:limit]
-        rand2 = Game.objects.filter(is_visible=True, register_state=1,category__name=selected_categories[1]).order_by('-created_at')[:limit]
-        rand3 = Game.objects.filter(is_visible=True, register_state=1,category__name=selected_categories[2]).order_by('-created_at')[:limit]
-        favorites = Game.objects.filter(chip__name="Daily Top",is_visible=True, register_state=1).order_by('-created_at')[:limit]
-        updated_games = Game.objects.filter(is_visible=True, register_state=1).order_by('-updated_at')[:limit]
-        if new_game_chip:
-            recent_games = Game.objects.filter(chip=new_game_chip, is_visible=True, register_state=1).order_by('-created_at')[:limit]
-        else:
-            recent_games = Game.objects.none()  # new_game 칩이 없으면 빈 QuerySet
+
+        # 응답 데이터 구성 (rand1~3, trending_games, recent, updated)
+        data = get_home_feed(request.user, limit=limit)
 
         # 2024-12-30 FE 요청으로 games/api/list 에서 게임팩 삭제, users/api/<int:user_pk>/gamepacks/ 로 이관
-        # # 유저 존재 시 my_game_pack 추가
-        # my_game_pack = None
-        # if request.user.is_authenticated:
-        #     # 1. 즐겨찾기한 게임
-        #     liked_games = Game.objects.filter(likes__user=request.user, is_visible=True, register_state=1).order_by('-created_at')[:4]
-        #     # 2. 최근 플레이한 게임
-        #     recently_played_games = Game.objects.filter(is_visible=True, register_state=1,totalplaytime__user=request.user).order_by('-totalplaytime__latest_at').distinct()
-            
-        #     # 좋아요한 게임과 최근 플레이한 게임을 조합하여 최대 4개의 게임으로 구성
-        #     liked_games_count = liked_games.count()
-        #     if liked_games_count < 4:
-        #         additional_recent_games = recently_played_games[:4 - liked_games_count]
-        #         combined_games = list(liked_games) + list(additional_recent_games)
-        #     else:
-        #         combined_games = liked_games  # 좋아요한 게임만으로 4개가 이미 채워짐
-
-        #     # my_game_pack 설정
-        #     if combined_games:
-        #         my_game_pack = GameListSerializer(combined_games, many=True, context={'user': request.user}).data
-        #     else:
-        #         my_game_pack = [{"message": "게임이 없습니다."}]
-        # else:
-        #     my_game_pack = [{"message": "사용자가 인증되지 않았습니다."}]
-
-        # 추가 옵션 정렬
-        """ if order == 'new':
-            rows = rows.order_by('-created_at')
-        elif order == 'view':
-            rows = rows.order_by('-view_cnt')
-        elif order == 'star':
-            rows = rows.order_by('-star')
-        else:
-            rows = rows.order_by('-created_at') """
-
-        # 시리얼라이저 및 데이터 확인
-        serializer = GameListSerializer(rand1, many=True, context={'user': request.user})
-        serializer2 = GameListSerializer(rand2, many=True, context={'user': request.user})
-        serializer3 = GameListSerializer(rand3, many=True, context={'user': request.user})
-        favorite_serializer = GameListSerializer(favorites, many=True, context={'user': request.user}).data if favorites.exists() else []
-        recent_serializer = GameListSerializer(recent_games, many=True, context={'user': request.user}).data if recent_games.exists() else []
-        updated_serializer = GameListSerializer(updated_games, many=True, context={'user': request.user}).data if updated_games.exists() else []
-
-        # 응답 데이터 구성
-        data = {
-            "rand1": {
-                "category_name": selected_categories[0],
-                "game_list": serializer.data if rand1.exists() else []
-            },
-            "rand2": {
-                "category_name": selected_categories[1],
-                "game_list": serializer2.data if rand2.exists() else []
-            },
-            "rand3": {
-                "category_name": selected_categories[2],
-                "game_list": serializer3.data if rand3.exists() else []
-            },
-            "trending_games": favorite_serializer,
-            "recent": recent_serializer,
-            "updated": updated_serializer,
-        }
-        # 2024-12-30 FE 요청으로 games/api/list 에서 게임팩 삭제, users/api/<int:user_pk>/gamepacks/ 로 이관
-        # if request.user.is_authenticated:
-        #     data["my_game_pack"] = my_game_pack
         return std_response(data=data, message="게임 목록을 성공적으로 가져왔습니다.", status="success", status_code=status.HTTP_200_OK)
         #return Response(data, status=status.HTTP_200_OK)
 
@@ -157,9 +93,11 @@ class GameListAPIView(APIView):
     """
 
     def post(self, request):
-        # 필수 항목 확인
-        required_fields = ["title", "category", "content", "gamefile","thumbnail"]
+        # 필수 항목 확인 (게임 파일은 gamefile 직접 업로드 또는 멀티파트 업로드 완료 후 upload_id)
+        required_fields = ["title", "category", "content", "thumbnail"]
         missing_fields = [field for field in required_fields if not request.data.get(field)]
+        if not request.data.get("gamefile") and not request.data.get("upload_id"):
+            missing_fields.append("gamefile")
 
         # 누락된 필수 항목이 있을 경우 에러 메시지 반환
         if missing_fields:
@@ -184,12 +122,13 @@ class GameListAPIView(APIView):
                 return std_response(message=error_msg, status="fail", error_code="CLIENT_FAIL", status_code=status.HTTP_400_BAD_REQUEST)
                 #return Response({"error": error_msg}, status=status.HTTP_400_BAD_REQUEST)
 
-        # ZIP 파일 검증
+        # ZIP 파일 검증 (압축 해제 검사는 등록 후 validate_game_file에서 비동기로 진행)
         gamefile = request.FILES.get("gamefile")
-        is_valid, error_msg = validate_zip_file(gamefile)
-        if not is_valid:
-            return std_response(message=error_msg, status="fail", error_code="CLIENT_FAIL", status_code=status.HTTP_400_BAD_REQUEST)
-            #return Response({"error": error_msg}, status=status.HTTP_400_BAD_REQUEST)
+        if gamefile:
+            is_valid, error_msg = validate_zip_file(gamefile)
+            if not is_valid:
+                return std_response(message=error_msg, status="fail", error_code="CLIENT_FAIL", status_code=status.HTTP_400_BAD_REQUEST)
+                #return Response({"error": error_msg}, status=status.HTTP_400_BAD_REQUEST)
 
         # 카테고리 이름 가져오기
         category_name = request.data.get('category')
@@ -202,75 +141,78 @@ class GameListAPIView(APIView):
             return std_response(message=f"'{category_name}' 카테고리는 존재하지 않습니다.", status="error", error_code="SERVER_FAIL", status_code=status.HTTP_404_NOT_FOUND)
             #return Response({"message": f"'{category_name}' 카테고리는 존재하지 않습니다."}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Game model에 우선 저장
-        game = Game.objects.create(
-            title=request.data.get('title'),
-            thumbnail=thumbnail,
-            youtube_url=request.data.get('youtube_url'),
-            maker=request.user,
-            content=request.data.get('content'),
-            gamefile=gamefile,
-            star=0,
-            review_cnt=0,
-        )
+        upload_id = None
+        if not gamefile:
+            try:
+                upload_id = int(request.data.get("upload_id"))
+            except (TypeError, ValueError):
+                return std_response(message="upload_id가 올바르지 않습니다.", status="fail", error_code="CLIENT_FAIL", status_code=status.HTTP_400_BAD_REQUEST)
+
+        # 업로드 사용 처리와 게임 저장을 한 트랜잭션에서 처리
+        with transaction.atomic():
+            # 멀티파트로 S3에 직접 올린 zip 사용
+            if not gamefile:
+                upload = claim_upload(request.user, upload_id)
+                if upload is None:
+                    return std_response(message="완료된 업로드를 찾을 수 없습니다.", status="fail", error_code="CLIENT_FAIL", status_code=status.HTTP_400_BAD_REQUEST)
+                gamefile = upload.gamefile_name
+
+            # Game model에 우선 저장 (zip 검증이 끝날 때까지 register_state 3)
+            game = Game.objects.create(
+                title=request.data.get('title'),
+                thumbnail=thumbnail,
+                youtube_url=request.data.get('youtube_url'),
+                maker=request.user,
+                content=request.data.get('content'),
+                gamefile=gamefile,
+                register_state=3,
+                star=0,
+                review_cnt=0,
+            )
 
-        # 카테고리 하나만 설정
-        game.category.set([category])
+            # 카테고리 하나만 설정
+            game.category.set([category])
 
-        new_game_chip, created = Chip.objects.get_or_create(name="New Game")
-        game.chip.add(new_game_chip)
+            # 'New Game' 칩과 기본 'NORMAL' 칩 추가
+            game.chip.add(get_chip_id("New Game"), get_chip_id("NORMAL"))
 
-        # 기본 'NORMAL' 칩 추가
-        normal_chip, _ = Chip.objects.get_or_create(name="NORMAL")
-        game.chip.add(normal_chip)
+            # 이후 Screenshot model에 저장
+            for item in screenshots:
+                scrfeenshot=Screenshot.objects.create(src=item, game=game)
 
-        # 이후 Screenshot model에 저장
-        for item in screenshots:
-            scrfeenshot=Screenshot.objects.create(src=item, game=game)
+            # zip 검증 후 검수요청 로그 추가 및 디스코드 알림 (games.tasks.validate_game_file)
+            transaction.on_commit(lambda: validate_game_file.delay(game.pk))
 
-        # 게임 등록 로그에 데이터 추가
-        game.logs_game.create(
-            recoder = request.user,
-            maker = request.user,
-            game = game,
-            content = f"검수요청 (기록자: {request.user.email}, 제작자: {request.user.email})",
-        )
-        
-        # 디스코드 알림
-        send_discord_notification(game)
-        
         return std_response(message="게임 등록이 완료되었습니다.", status="success", status_code=status.HTTP_200_OK)
         #return Response({"message": "게임업로드 성공했습니다"}, status=status.HTTP_200_OK)
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])  # 인증이 필요할 경우 IsAuthenticated로 변경 가능
+@throttle_classes([SearchThrottle])
 def game_list_search(request):
     keyword = request.query_params.get('keyword')
 
-    # 기본 필터 조건
-    query = Q(is_visible=True, register_state=1)
+    # 게임 목록 필터링 (키워드가 있으면 관련도순, 없으면 최신순 - games.search 참고)
+    games = prefetch_game_list(search_games(Game.objects.filter(is_visible=True, register_state=1), keyword))
 
-    # 키워드 조건 추가
-    if keyword:
-        query &= Q(
-            Q(category__name__icontains=keyword) |
-            Q(title__icontains=keyword) |
-            Q(maker__nickname__icontains=keyword)
-        )
-
-    # 게임 목록 필터링
-    games = Game.objects.filter(query).distinct().order_by('-created_at')
-
-    # 즐겨찾기 분리
-    favorite_games = []
+    # 즐겨찾기 분리 (즐겨찾기 게임을 앞쪽 구간에 고정, 개수는 한 번의 집계 쿼리로 계산)
     if request.user.is_authenticated:
-        favorite_games = games.filter(likes__user=request.user)
-        favorite_cnt=len(favorite_games)
-        if favorite_games:
-            games = games.exclude(pk__in=favorite_games.values_list('pk', flat=True))
-    all_games = list(favorite_games) + list(games)
-    if all_games==[]:
+        liked_game_ids = Like.objects.filter(user=request.user).values('game_id')
+        favorite_games = games.filter(pk__in=liked_game_ids)
+        other_games = games.exclude(pk__in=liked_game_ids)
+        counts = games.order_by().aggregate(
+            total=Count('pk'),
+            favorite=Count('pk', filter=Q(pk__in=liked_game_ids)),
+        )
+        favorite_cnt = counts["favorite"]
+        all_games = SegmentedSequence(
+            favorite_games, other_games, counts=[favorite_cnt, counts["total"] - favorite_cnt]
+        )
+    else:
+        favorite_cnt = 0
+        all_games = SegmentedSequence(games)
+    if all_games.count() == 0:
         return std_response(message="검색한 게임이 없습니다.", status="fail", error_code="SERVER_FAIL", status_code=status.HTTP_404_NOT_FOUND)
         #return Response({"message": "게임이 없습니다."}, status=404)
     # 페이지네이션 처리
@@ -283,15 +225,14 @@ def game_list_search(request):
     # 응답 데이터 구성
     response_data = paginator.get_paginated_response(game_serializer.data).data
 
-    # 1페이지일 경우 즐겨찾기 게임 추가
+    # 1페이지일 경우 즐겨찾기 게임을 분리하고 그 자리를 빈 값으로 채움
     if request.user.is_authenticated:
-        if paginator.page.number == 1 and favorite_games.exists():
-            all_games=response_data["results"]["all_games"]
-            list_of_games=[]
-            for i in range(favorite_cnt):
-                list_of_games.append(all_games.pop(i))
-                all_games.insert(0,{})
-            response_data["results"]["favorite_games"]=list_of_games
+        response_data["results"]["favorite_games"] = []
+        if paginator.page.number == 1 and favorite_cnt:
+            all_games = response_data["results"]["all_games"]
+            pinned_cnt = min(favorite_cnt, len(all_games))
+            response_data["results"]["favorite_games"] = all_games[:pinned_cnt]
+            response_data["results"]["all_games"] = [{} for _ in range(pinned_cnt)] + all_games[pinned_cnt:]
     # 응답 구성용 딕셔너리
     data_response = {
         "all_games": response_data["results"]["all_games"]
@@ -329,11 +270,11 @@ def category_games_list(request):
         return std_response(message=f"'{category_name}' 카테고리는 존재하지 않습니다.", status="error", error_code="SERVER_FAIL", status_code=status.HTTP_404_NOT_FOUND)
     
     # 해당 카테고리에 속하는 게임 필터링
-    games = Game.objects.filter(
+    games = prefetch_game_list(Game.objects.filter(
         category=category,
         is_visible=True,
         register_state=1
-    ).order_by('-created_at')  # 최신순 정렬
+    ).order_by('-created_at'))  # 최신순 정렬
 
     if not games.exists():
         return std_response(message=f"카테고리 '{category_name}'에 맞는 게임이 없습니다.", status="fail", error_code="SERVER_FAIL", status_code=status.HTTP_404_NOT_FOUND)
@@ -367,10 +308,11 @@ class GameDetailAPIView(APIView):
 
         return permissions
 
-    def get_object(self, game_id):
+    def get_object(self, game_id, prefetch=False):
         #return get_object_or_404(Game, pk=game_id, is_visible=True)
+        rows = prefetch_game_list(Game.objects.all()) if prefetch else Game.objects.all()
         try:
-            return Game.objects.get(pk=game_id, is_visible=True)
+            return rows.get(pk=game_id, is_visible=True)
         except Game.DoesNotExist:
             return std_response(message="게임이 존재하지 않습니다.", status="error", error_code="SERVER_FAIL", status_code=status.HTTP_404_NOT_FOUND)
 
@@ -379,19 +321,21 @@ class GameDetailAPIView(APIView):
     """
 
     def get(self, request, game_id):
-        game = self.get_object(game_id)
+        game = self.get_object(game_id, prefetch=True)
         # game이 Response라면 바로 반환
         if isinstance(game, Response):
             return game
+        # 조회수 기록 (Redis 버퍼에 추가, games.tasks.flush_game_views가 DB에 저장)
+        record_view(request, game.pk)
         serializer = GameDetailSerializer(game, context={'user': request.user})
         # data에 serializer.data를 assignment
         # serializer.data의 리턴값인 ReturnDict는 불변객체이다
         data = serializer.data
 
-        screenshots = Screenshot.objects.filter(game_id=game_id)
+        screenshots = Screenshot.objects.filter(game_id=game_id).prefetch_related("renditions")
         screenshot_serializer = ScreenshotSerializer(screenshots, many=True)
 
-        categories = game.category.all()
+        categories = game.category.all()  # prefetch 된 카테고리 사용
         category_serializer = CategorySerailizer(categories, many=True)
 
         data["screenshot"] = screenshot_serializer.data
@@ -416,96 +360,131 @@ class GameDetailAPIView(APIView):
             return std_response(message="작성자가 아닙니다.", status="fail", error_code="CLIENT_FAIL", status_code=status.HTTP_403_FORBIDDEN)
             #return Response({"error": "작성자가 아닙니다."}, status=status.HTTP_403_FORBIDDEN)
 
-        # 게임 파일 검증 및 변경 처리
+        # 모든 검증을 먼저 끝낸 뒤 저장 (검증 실패 시 업로드 사용 처리/게임 저장이 일어나지 않음)
+        # 게임 파일 검증 (gamefile 직접 업로드 또는 멀티파트 업로드 완료 후 upload_id)
         gamefile = request.FILES.get("gamefile")
+        upload_id = request.data.get("upload_id")
+        if upload_id:
+            try:
+                upload_id = int(upload_id)
+            except (TypeError, ValueError):
+                return std_response(message="upload_id가 올바르지 않습니다.", status="fail", error_code="CLIENT_FAIL", status_code=status.HTTP_400_BAD_REQUEST)
         if game.register_state == 2:
-            if not gamefile:
+            if not gamefile and not upload_id:
                 return std_response(message="수정한 게임 파일을 올려주세요.", status="fail", error_code="CLIENT_FAIL", status_code=status.HTTP_400_BAD_REQUEST)
         if gamefile:
             is_valid, error_msg = validate_zip_file(gamefile)
             if not is_valid:
                 return std_response(message=error_msg, status="fail", error_code="CLIENT_FAIL", status_code=status.HTTP_400_BAD_REQUEST)
                 #return Response({"error": error_msg}, status=status.HTTP_400_BAD_REQUEST)
-            game.register_state = 0
-            game.gamefile = gamefile
-            changes.append("gamefile")
 
-        # 썸네일 검증 및 변경 처리
+        # 썸네일 검증
         thumbnail = request.FILES.get("thumbnail")
         if thumbnail:
             is_valid, error_msg = validate_image(thumbnail)
             if not is_valid:
                 return std_response(message=error_msg, status="fail", error_code="CLIENT_FAIL", status_code=status.HTTP_400_BAD_REQUEST)
                 #return Response({"error": error_msg}, status=status.HTTP_400_BAD_REQUEST)
-            if thumbnail != game.thumbnail:
-                # 기존 파일 s3에서 삭제
-                default_storage.delete(game.thumbnail.name)
-                # request로 받은 파일로 교체
-                game.thumbnail = thumbnail
-                changes.append("thumbnail")
-
-        # 필드 업데이트 (값이 변경되었는지 확인)
-        title = request.data.get("title", game.title)
-        if title != game.title:
-            game.title = title
-            changes.append("title")
 
-        youtube_url = request.data.get("youtube_url", game.youtube_url)
-        if youtube_url != game.youtube_url:
-            game.youtube_url = youtube_url
-            changes.append("youtube_url")
-
-        content = request.data.get("content", game.content)
-        if content != game.content:
-            game.content = content
-            changes.append("content")
-
-        game.save()
+        # 스크린샷 검증
+        screenshots = self.request.FILES.getlist("new_screenshots")
+        for screenshot in screenshots:
+            is_valid, error_msg = validate_image(screenshot)
+            if not is_valid:
+                return std_response(message=error_msg, status="fail", error_code="CLIENT_FAIL", status_code=status.HTTP_400_BAD_REQUEST)
+                #return Response({"error": error_msg}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            old_screenshots = [int(pk) for pk in self.request.data.getlist('old_screenshots', [])]
+        except (TypeError, ValueError):
+            return std_response(message="old_screenshots가 올바르지 않습니다.", status="fail", error_code="CLIENT_FAIL", status_code=status.HTTP_400_BAD_REQUEST)
 
-        # 카테고리 변경 처리 (1개만 허용)
+        # 카테고리 확인 (1개만 허용)
+        category = None
         category_name = request.data.get("category")
         if category_name:
             try:
                 category = GameCategory.objects.get(name=category_name)
-                if not game.category.filter(pk=category.pk).exists():  # 기존과 다를 경우 변경
-                    game.category.set([category])  # 기존 카테고리를 삭제하고 새로운 하나만 설정
-                    changes.append("category")
             except GameCategory.DoesNotExist:
                 return std_response(message=f"'{category_name}' 카테고리는 존재하지 않습니다.", status="error", error_code="SERVER_FAIL", status_code=status.HTTP_404_NOT_FOUND)
                 #return Response({"message": f"'{category_name}' 카테고리는 존재하지 않습니다."}, status=status.HTTP_400_BAD_REQUEST)
 
-        # 기존 스크린샷 유지 또는 삭제
-        old_screenshots = self.request.data.getlist('old_screenshots', [])
-        old_screenshots = [int(pk) for pk in old_screenshots]
-        for item in Screenshot.objects.filter(game=game).exclude(pk__in=old_screenshots):
-            default_storage.delete(item.src.name)
-            item.delete()
+        # 업로드 사용 처리, 게임 저장, 로그, 검증 작업 등록을 한 트랜잭션에서 처리
+        # (S3 파일 삭제와 검증 작업은 커밋 후 실행)
+        with transaction.atomic():
+            if not gamefile and upload_id:
+                upload = claim_upload(request.user, upload_id)
+                if upload is None:
+                    return std_response(message="완료된 업로드를 찾을 수 없습니다.", status="fail", error_code="CLIENT_FAIL", status_code=status.HTTP_400_BAD_REQUEST)
+                gamefile = upload.gamefile_name
+            if gamefile:
+                # zip 검증이 끝나면 검수 대기(0)로 전환
+                game.register_state = 3
+                game.gamefile = gamefile
+                changes.append("gamefile")
+
+            if thumbnail and thumbnail != game.thumbnail:
+                # 기존 파일 s3에서 삭제
+                old_thumbnail = game.thumbnail.name
+                transaction.on_commit(lambda: default_storage.delete(old_thumbnail))
+                # request로 받은 파일로 교체
+                game.thumbnail = thumbnail
+                changes.append("thumbnail")
 
-        # 새로운 스크린샷 업로드
-        # 스크린샷 검증
-        screenshots = self.request.FILES.getlist("new_screenshots")
-        for screenshot in screenshots:
-            is_valid, error_msg = validate_image(screenshot)
-            if not is_valid:
-                return std_response(message=error_msg, status="fail", error_code="CLIENT_FAIL", status_code=status.HTTP_400_BAD_REQUEST)
-                #return Response({"error": error_msg}, status=status.HTTP_400_BAD_REQUEST)
-        # 데이터 추가
-        for item in screenshots:
-            screenshot = Screenshot.objects.create(src=item, game=game)
+            # 필드 업데이트 (값이 변경되었는지 확인)
+            title = request.data.get("title", game.title)
+            if title != game.title:
+                game.title = title
+                changes.append("title")
+
+            youtube_url = request.data.get("youtube_url", game.youtube_url)
+            if youtube_url != game.youtube_url:
+                game.youtube_url = youtube_url
+                changes.append("youtube_url")
+
+            content = request.data.get("content", game.content)
+            if content != game.content:
+                game.content = content
+                changes.append("content")
+
+            # 변경한 필드만 저장 (별점/난이도 집계는 games.ratings에서 F()로 갱신하므로 덮어쓰지 않음)
+            update_fields = ["updated_at"]
+            for field in changes:
+                update_fields.append(field)
+                if field == "gamefile":
+                    update_fields.append("register_state")
+            game.save(update_fields=update_fields)
+
+            # 카테고리 변경 처리 (기존과 다를 경우 기존 카테고리를 삭제하고 새로운 하나만 설정)
+            if category is not None and not game.category.filter(pk=category.pk).exists():
+                game.category.set([category])
+                changes.append("category")
+
+            # 기존 스크린샷 유지 또는 삭제
+            for item in Screenshot.objects.filter(game=game).exclude(pk__in=old_screenshots):
+                old_src = item.src.name
+                transaction.on_commit(lambda old_src=old_src: default_storage.delete(old_src))
+                item.delete()
+
+            # 새로운 스크린샷 추가
+            for item in screenshots:
+                screenshot = Screenshot.objects.create(src=item, game=game)
+
+            # 게임 등록 로그에 데이터 추가 (게임 파일 수정인 경우 검수요청 로그는 여기서만 남김, games.tasks.validate_game_file 참고)
+            if changes:
+                if "gamefile" in changes:
+                    log_content = f"수정 후 검수요청: {', '.join(changes)} (기록자: {request.user.email}, 제작자: {request.user.email})"
+                else:
+                    log_content = f"수정: {', '.join(changes)} (기록자: {request.user.email}, 제작자: {request.user.email})"
+                game.logs_game.create(
+                    recoder=request.user,
+                    maker=request.user,
+                    game=game,
+                    content=log_content,
+                )
 
-        # 게임 파일 수정인 경우 게임 등록 로그에 데이터 추가
-        if changes:
             if "gamefile" in changes:
-                log_content = f"수정 후 검수요청: {', '.join(changes)} (기록자: {request.user.email}, 제작자: {request.user.email})"
-            else:
-                log_content = f"수정: {', '.join(changes)} (기록자: {request.user.email}, 제작자: {request.user.email})"
-            game.logs_game.create(
-                recoder=request.user,
-                maker=request.user,
-                game=game,
-                content=log_content,
-            )
-        
+                transaction.on_commit(lambda: validate_game_file.delay(game.pk))
+
         return std_response(message="게임 수정이 완료되었습니다.", status="success", status_code=status.HTTP_200_OK)
         #return Response({"message": "수정이 완료됐습니다"}, status=status.HTTP_200_OK)
 
@@ -520,7 +499,7 @@ class GameDetailAPIView(APIView):
         # 작성한 유저이거나 관리자일 경우 동작함
         if game.maker == request.user or request.user.is_staff == True:
             game.is_visible = False
-            game.save()
+            game.save(update_fields=["is_visible", "updated_at"])
             
             # 게임 삭제 시 게임 등록 로그에 데이터 추가
             game.logs_game.create(
@@ -630,7 +609,7 @@ class ReviewAPIView(APIView):
         order = request.query_params.get('order', 'new')  # 기본값 'new'
 
         # 모든 리뷰 가져오기
-        reviews = Review.objects.filter(game=game_id, is_visible=True)
+        reviews = Review.objects.filter(game=game_id, is_visible=True).select_related('author')
 
         # 로그인 상태에서 내 리뷰 추출
         my_review = None
@@ -643,13 +622,9 @@ class ReviewAPIView(APIView):
 
         # 정렬 조건 적용
         if order == 'likes':
-            reviews = reviews.annotate(
-                like_count=Count('reviews', filter=Q(reviews__is_like=1))
-            ).order_by('-like_count', '-created_at')
+            reviews = reviews.order_by('-like_count', '-created_at')
         elif order == 'dislikes':
-            reviews = reviews.annotate(
-                dislike_count=Count('reviews', filter=Q(reviews__is_like=2))
-            ).order_by('-dislike_count', '-created_at')
+            reviews = reviews.order_by('-dislike_count', '-created_at')
         else:
             reviews = reviews.order_by('-created_at')  # 최신순
 
@@ -670,13 +645,12 @@ class ReviewAPIView(APIView):
             "game_id": game_id
         }
 
-        # `my_review`를 포함한 쿼리셋 생성
+        # `my_review`(없으면 빈 자리)를 첫 구간으로 고정하고 나머지 리뷰는 DB에서 페이지 범위만 조회
         if my_review:
-            all_reviews = [my_review] + list(reviews)
+            all_reviews = SegmentedSequence([my_review], reviews)
         else:
-            all_reviews = list(reviews)
-            all_reviews.insert(0, empty_review_placeholder)
-        
+            all_reviews = SegmentedSequence([empty_review_placeholder], reviews)
+
         # 페이지네이션 처리
         paginator = ReviewPagination()
         paginated_reviews = paginator.paginate_queryset(all_reviews, request, self)
@@ -755,14 +729,14 @@ class ReviewAPIView(APIView):
                 status_code=status.HTTP_400_BAD_REQUEST,
                 error_code="CLIENT_FAIL"
             )
-        game.star = game.star + ((star - game.star) / (game.review_cnt + 1))
-        game.review_cnt = game.review_cnt + 1
-        game.save()
 
         serializer = ReviewSerializer(
             data=request.data, context={'user': request.user})
         if serializer.is_valid(raise_exception=True):
-            serializer.save(author=request.user, game=game)  # 데이터베이스에 저장
+            # 리뷰 저장과 별점 집계 갱신을 함께 처리 (games.ratings)
+            with transaction.atomic():
+                review = serializer.save(author=request.user, game=game)  # 데이터베이스에 저장
+                ratings.review_created(review)
             assign_chip_based_on_difficulty(game)
             # return Response(serializer.data, status=status.HTTP_201_CREATED)
             return std_response(
@@ -826,17 +800,6 @@ class ReviewDetailAPIView(APIView):
 
         # 작성한 유저이거나 관리자일 경우 동작함
         if request.user == review.author or request.user.is_staff == True:
-            game_id = request.data.get('game_id')
-            # game = get_object_or_404(Game, pk=game_id)  # game 객체를 올바르게 설정
-            try:
-                game = Game.objects.get(pk=game_id)
-            except:
-                return std_response(
-                    message="게임이 존재하지 않습니다.",
-                    status="error",
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    error_code="SERVER_FAIL"
-                    )
             star = request.data.get('star')
             if star not in [1, 2, 3, 4, 5]:
                 # return Response({"message": "올바른 별점이 아닙니다."}, status=status.HTTP_400_BAD_REQUEST)
@@ -846,12 +809,17 @@ class ReviewDetailAPIView(APIView):
                     status_code=status.HTTP_404_NOT_FOUND,
                     error_code="CLIENT_FAIL"
                     )
-            game.star = game.star + ((star - request.data.get('pre_star')) / (game.review_cnt))
-            game.save()
             serializer = ReviewSerializer(
                 review, data=request.data, partial=True, context={'user': request.user})
             if serializer.is_valid(raise_exception=True):
-                serializer.save()
+                # 이전 별점/난이도는 클라이언트 값(pre_star)이 아닌 DB에 저장된 값을 기준으로 집계 갱신
+                with transaction.atomic():
+                    locked = Review.objects.select_for_update().get(pk=review.pk)
+                    before = {"star": locked.star, "difficulty": locked.difficulty}
+                    review = serializer.save()
+                    after = {"star": review.star, "difficulty": review.difficulty}
+                    if locked.is_visible:
+                        ratings.review_updated(review.game_id, before, after)
                 assign_chip_based_on_difficulty(review.game)
                 # return Response(serializer.data, status=status.HTTP_200_OK)
                 return std_response(
@@ -894,26 +862,13 @@ class ReviewDetailAPIView(APIView):
 
         # 작성한 유저이거나 관리자일 경우 동작함
         if request.user == review.author or request.user.is_staff == True:
-            game_id = request.data.get('game_id')
-            # game = get_object_or_404(Game, pk=game_id)  # game 객체를 올바르게 설정
-            try:
-                game = Game.objects.get(pk=game_id)
-            except:
-                return std_response(
-                    message="게임이 존재하지 않습니다.",
-                    status="error",
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    error_code="SERVER_FAIL"
-                    )
-            if game.review_cnt > 1:
-                game.star = game.star + \
-                    ((game.star-review.star)/(game.review_cnt-1))
-            else:
-                game.star = 0
-            game.review_cnt = game.review_cnt-1
-            game.save()
-            review.is_visible = False
-            review.save()
+            # 동시 삭제 요청으로 집계가 두 번 빠지지 않도록 공개 상태인 경우에만 비공개 처리 후 집계 갱신
+            with transaction.atomic():
+                hidden = Review.objects.filter(pk=review.pk, is_visible=True).update(
+                    is_visible=False, updated_at=timezone.now()
+                )
+                if hidden:
+                    ratings.review_deleted(review)
             assign_chip_based_on_difficulty(review.game)
             # return Response({"message": "삭제를 완료했습니다"}, status=status.HTTP_200_OK)
             return std_response(
@@ -950,27 +905,38 @@ def toggle_review_like(request, review_id):
             status_code=status.HTTP_404_NOT_FOUND,
             error_code="SERVER_FAIL"
         )
-    # ReviewsLike 객체를 가져오거나 새로 생성
-    # get_or_create 리턴: review_like - ReviewsLike 객체(행), _ - 행 생성 여부
-    review_like, _ = ReviewsLike.objects.get_or_create(
-        user=user, review=review)
-
     # 요청에서 받은 'action'에 따라 상태 변경
     action = request.data.get('action', None)
-    if action == 'like':
-        if review_like.is_like != 1:  # 현재 상태가 'like'가 아니면 'like'로 변경
-            review_like.is_like = 1
-        else:
-            # 이미 'like' 상태일 경우 'no state'로 전환
-            review_like.is_like = 0
-    elif action == 'dislike':
-        if review_like.is_like != 2:  # 현재 상태가 'dislike'가 아니면 'dislike'로 변경
-            review_like.is_like = 2
-        else:
-            # 이미 'dislike' 상태일 경우 'no state'로 전환
-            review_like.is_like = 0
-
-    review_like.save()  # 변경 사항 저장
+    with transaction.atomic():
+        # ReviewsLike 객체를 가져오거나 새로 생성 후 잠금 (동시 요청 시 집계 값이 어긋나지 않도록)
+        # get_or_create 리턴: review_like - ReviewsLike 객체(행), _ - 행 생성 여부
+        ReviewsLike.objects.get_or_create(user=user, review=review)
+        review_like = ReviewsLike.objects.select_for_update().filter(user=user, review=review).first()
+        previous = review_like.is_like
+
+        if action == 'like':
+            if review_like.is_like != 1:  # 현재 상태가 'like'가 아니면 'like'로 변경
+                review_like.is_like = 1
+            else:
+                # 이미 'like' 상태일 경우 'no state'로 전환
+                review_like.is_like = 0
+        elif action == 'dislike':
+            if review_like.is_like != 2:  # 현재 상태가 'dislike'가 아니면 'dislike'로 변경
+                review_like.is_like = 2
+            else:
+                # 이미 'dislike' 상태일 경우 'no state'로 전환
+                review_like.is_like = 0
+
+        review_like.save()  # 변경 사항 저장
+
+        # 리뷰의 좋아요/싫어요 수 갱신 (0↔1↔2 전환에 따른 증감)
+        like_delta = int(review_like.is_like == 1) - int(previous == 1)
+        dislike_delta = int(review_like.is_like == 2) - int(previous == 2)
+        if like_delta or dislike_delta:
+            Review.objects.filter(pk=review.pk).update(
+                like_count=F('like_count') + like_delta,
+                dislike_count=F('dislike_count') + dislike_delta,
+            )
     # return Response({"message": f"리뷰(id: {review_id})에 {review_like.is_like} 동작을 수행했습니다."}, status=status.HTTP_200_OK)
     return std_response(
         message=f"리뷰(id: {review_id})에 {review_like.is_like} 동작을 수행했습니다.",
@@ -1047,128 +1013,107 @@ class CategoryAPIView(APIView):
 
 
 class GamePlaytimeAPIView(APIView):
-    def get(self, request, game_id):
+    """
+    게임 플레이 시간 기록 (games.play_sessions, Redis에 모았다가 1분마다 PlayLog/TotalPlayTime에 반영)
+    GET: 플레이 시작 (playtime_id 발급)
+    POST: playtime_id로 하트비트(event=heartbeat, heartbeat_interval초마다) 또는 플레이 종료(event 생략 또는 end)
+    종료 요청 없이 하트비트가 끊기면 마지막 하트비트 시각으로 자동 종료
+    """
+
+    def check_request(self, request, game_id):
         # 로그인 여부 확인
         if request.user.is_authenticated is False:
-            # return Response({"error": "로그인이 필요합니다."}, status=status.HTTP_401_UNAUTHORIZED)
             return std_response(
                 message="로그인이 필요합니다.",
                 status="fail",
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 error_code="CLIENT_FAIL"
             )
-        if Game.objects.filter(pk=game_id, is_visible=True).exists():
-            try:
-                game = Game.objects.get(pk=game_id, is_visible=True)
-            except:
-                return std_response(
-                    message="게임이 존재하지 않습니다.",
-                    status="error",
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    error_code="SERVER_FAIL"
-                    )
-            playtime = PlayLog.objects.create(
-                user=request.user,
-                game=game,
-                start_at=timezone.now()  # 현재 시간으로 start_time
-            )
-            playtime_id = playtime.pk
-            # return Response({"message": "게임 플레이 시작시간 기록을 성공했습니다.", "playtime_id":playtime_id}, status=status.HTTP_200_OK)
+        game = Game.objects.filter(pk=game_id, is_visible=True).only("pk").first()
+        if game is None:
+            return std_response(message="게임이 존재하지 않습니다.",status="fail",  status_code=status.HTTP_404_NOT_FOUND, error_code="SERVER_FAIL")
+        return game
+
+    def get(self, request, game_id):
+        game = self.check_request(request, game_id)
+        if isinstance(game, Response):
+            return game
+        try:
+            playtime_id = play_sessions.start_session(request.user, game)
+        except RedisError:
             return std_response(
-                data={
-                    "playtime_id":playtime_id
-                },
-                message="게임 플레이 시작시간 기록을 성공했습니다.",
-                status="success",
-                status_code=status.HTTP_200_OK
+                message="플레이 기록을 시작하지 못했습니다.",
+                status="error",
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                error_code="SERVER_FAIL"
             )
-        else:
-            # return Response({"error": "게임이 존재하지 않습니다."}, status=status.HTTP_404_NOT_FOUND)
-            return std_response(message="게임이 존재하지 않습니다.",status="fail",  status_code=status.HTTP_404_NOT_FOUND, error_code="SERVER_FAIL")
+        return std_response(
+            data={
+                "playtime_id": playtime_id,
+                "heartbeat_interval": int(play_sessions.HEARTBEAT_INTERVAL.total_seconds()),
+            },
+            message="게임 플레이 시작시간 기록을 성공했습니다.",
+            status="success",
+            status_code=status.HTTP_200_OK
+        )
 
     def post(self, request, game_id):
-        # 로그인 여부 확인
-        if request.user.is_authenticated is False:
-            # return Response({"error": "로그인이 필요합니다."}, status=status.HTTP_401_UNAUTHORIZED)
+        game = self.check_request(request, game_id)
+        if isinstance(game, Response):
+            return game
+        playtime_id = str(request.data.get("playtime_id", ""))
+        event = request.data.get("event", "end")
+        if event not in ("heartbeat", "end"):
             return std_response(
-                message="로그인이 필요합니다.",
+                message="event는 heartbeat 또는 end 중 하나여야 합니다.",
                 status="fail",
-                status_code=status.HTTP_401_UNAUTHORIZED,
+                status_code=status.HTTP_400_BAD_REQUEST,
                 error_code="CLIENT_FAIL"
             )
-        if Game.objects.filter(pk=game_id, is_visible=True).exists():
-            # game=get_object_or_404(Game, pk=game_id, is_visible=True)
-            try:
-                game = Game.objects.get(pk=game_id, is_visible=True)
-            except:
-                return std_response(
-                    message="게임이 존재하지 않습니다.",
-                    status="error",
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    error_code="SERVER_FAIL"
-                    )
-            # playlog = get_object_or_404(PlayLog, pk=request.data.get("playtime_id"))
-            try:
-                playlog = PlayLog.objects.get(pk=request.data.get("playtime_id"))
-            except:
-                return std_response(
-                    message="로그가 존재하지 않습니다.",
-                    status="error",
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    error_code="SERVER_FAIL"
-                    )
-            totalplaytime,_ = TotalPlayTime.objects.get_or_create(user=request.user, game=game)
-
-            playlog.end_at = timezone.now()  # 현재 시간으로 end_time
-            totalplaytime.latest_at = timezone.now()
-
-            totaltime = (playlog.end_at - playlog.start_at).total_seconds()
-            playlog.playtime = totaltime  # playtime_seconds로 playtime_seconds 계산
-            totalplaytime.totaltime = totalplaytime.totaltime + totaltime
-
-            playlog.save()
-            totalplaytime.save()
-            # return Response({"message": "게임 플레이 종료시간 기록을 성공했습니다.", 
-            #                 "start_time":playlog.start_at,
-            #                 "end_time":playlog.end_at,
-            #                 "playtime": playlog.playtime,
-            #                 "totalplaytime":totalplaytime.totaltime}
-            #                 , status=status.HTTP_200_OK)
+        try:
+            if event == "heartbeat":
+                if not play_sessions.heartbeat(request.user, game, playtime_id):
+                    raise play_sessions.PlaySessionError("진행 중인 플레이 기록이 없습니다.")
+                return std_response(message="게임 플레이 하트비트 기록을 성공했습니다.", status="success", status_code=status.HTTP_200_OK)
+            start_at, end_at, playtime = play_sessions.end_session(request.user, game, playtime_id)
+        except play_sessions.PlaySessionError:
             return std_response(
-                data={
-                    "start_time":playlog.start_at,
-                    "end_time":playlog.end_at,
-                    "playtime": playlog.playtime,
-                    "totalplaytime":totalplaytime.totaltime
-                },
-                message="게임 플레이 종료시간 기록을 성공했습니다.",
-                status="success",
-                status_code=status.HTTP_200_OK
+                message="로그가 존재하지 않습니다.",
+                status="error",
+                status_code=status.HTTP_404_NOT_FOUND,
+                error_code="SERVER_FAIL"
             )
-        else:
-            # return Response({"error": "게임이 존재하지 않습니다."}, status=status.HTTP_404_NOT_FOUND)
-            return std_response(message="게임이 존재하지 않습니다.",status="fail",  status_code=status.HTTP_404_NOT_FOUND, error_code="SERVER_FAIL")
+        except RedisError:
+            return std_response(
+                message="플레이 기록을 저장하지 못했습니다.",
+                status="error",
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                error_code="SERVER_FAIL"
+            )
+
+        # 누적 시간은 DB 반영 전이므로 저장된 누적값에 이번 플레이 시간을 더해 응답
+        saved_total = TotalPlayTime.objects.filter(user=request.user, game=game).values_list("totaltime", flat=True).first()
+        return std_response(
+            data={
+                "start_time": start_at,
+                "end_time": end_at,
+                "playtime": playtime,
+                "totalplaytime": (saved_total or 0) + playtime
+            },
+            message="게임 플레이 종료시간 기록을 성공했습니다.",
+            status="success",
+            status_code=status.HTTP_200_OK
+        )
 
 
 CLIENT = OpenAI(api_key=settings.OPEN_API_KEY)
-MAX_USES_PER_DAY = 10  # 하루 당 질문 10개로 제한기준
 
 # chatbot API
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@throttle_classes([ChatbotThrottle])  # 하루 사용 횟수 제한 (REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]["chatbot"])
 def ChatbotAPIView(request):
-    user = request.user
-    today = timezone.now().date()
-
-    usage, created = BotCnt.objects.get_or_create(user=user, date=today)
-
-    if usage.count >= MAX_USES_PER_DAY:
-        return Response({"error": "Daily usage limit reached"}, status=status.HTTP_400_BAD_REQUEST)
-
-    usage.count += 1
-    usage.save()
-
     input_data = request.data.get('input_data')
     categorylist = list(GameCategory.objects.values_list('name', flat=True))
 
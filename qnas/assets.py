@@ -0,0 +1,147 @@
+# 게임 에셋 헤더/압축 정책 (qnas.publishing에서 사용)
+# - Content-Type: 게임 빌드에 나오는 확장자 표를 우선 사용하고, 없으면 mimetypes, 그래도 없으면 octet-stream
+# - 이미 압축된 파일(.gz, .br)은 그대로 올리고 Content-Encoding만 지정 (타입은 안쪽 확장자 기준)
+# - 압축 효과가 있는 파일(텍스트, js, wasm, 압축 안 된 Unity .data 등)은 업로드 전에 압축
+#   결과가 항상 같도록(gzip mtime=0) 하여 같은 입력이면 같은 객체가 만들어짐
+# - 압축은 COMPRESS_CHUNK_SIZE 단위 스트리밍으로 처리하여 파일 크기와 관계없이 메모리 사용량이 일정
+#   (업로드 스레드에서 바로 실행, zlib/brotli는 GIL을 놓고 압축함)
+import mimetypes
+import zlib
+
+from django.conf import settings
+
+try:
+    import brotli
+except ImportError:  # brotli는 선택 의존성 (없으면 gzip만 사용)
+    brotli = None
+
+
+# 버전 폴더는 내용이 바뀌지 않으므로 브라우저/CDN이 오래 캐시해도 됨
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+COMPRESS_MIN_SIZE = 1024  # 이보다 작은 파일은 압축 효과보다 헤더 비용이 큼
+COMPRESS_CHUNK_SIZE = 1024 * 1024  # 한 번에 읽어 압축할 크기
+GZIP_LEVEL = 9
+GZIP_WBITS = 31  # zlib gzip 형식 (헤더 mtime은 0)
+BROTLI_QUALITY = 9
+
+CONTENT_TYPES = {
+    # 문서/스크립트
+    "html": "text/html",
+    "htm": "text/html",
+    "js": "application/javascript",
+    "mjs": "application/javascript",
+    "css": "text/css",
+    "json": "application/json",
+    "map": "application/json",
+    "webmanifest": "application/manifest+json",
+    "xml": "application/xml",
+    "txt": "text/plain",
+    "csv": "text/csv",
+    # 엔진 바이너리
+    "wasm": "application/wasm",
+    "data": "application/octet-stream",
+    "mem": "application/octet-stream",
+    "unityweb": "application/octet-stream",
+    "pck": "application/octet-stream",
+    "bundle": "application/octet-stream",
+    # 이미지
+    "png": "image/png",
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "gif": "image/gif",
+    "webp": "image/webp",
+    "avif": "image/avif",
+    "bmp": "image/bmp",
+    "ico": "image/x-icon",
+    "svg": "image/svg+xml",
+    # 폰트
+    "woff": "font/woff",
+    "woff2": "font/woff2",
+    "ttf": "font/ttf",
+    "otf": "font/otf",
+    "eot": "application/vnd.ms-fontobject",
+    # 오디오/비디오
+    "mp3": "audio/mpeg",
+    "ogg": "audio/ogg",
+    "wav": "audio/wav",
+    "m4a": "audio/mp4",
+    "mp4": "video/mp4",
+    "webm": "video/webm",
+}
+
+# 이미 압축된 파일의 접미사 -> Content-Encoding
+PRECOMPRESSED = {
+    "gz": "gzip",
+    "br": "br",
+}
+
+# 압축해서 올릴 확장자 (이미지/오디오/woff2 등은 이미 압축된 형식이라 제외)
+COMPRESSIBLE = {
+    "html", "htm", "js", "mjs", "css", "json", "map", "webmanifest", "xml", "txt", "csv",
+    "svg", "wasm", "data", "mem", "ttf", "otf", "eot",
+}
+
+
+def _extension(file_name):
+    return file_name.rsplit('/', 1)[-1].split('.')[-1].lower()
+
+
+def get_content_type(file_name):
+    extension = _extension(file_name)
+    if extension in CONTENT_TYPES:
+        return CONTENT_TYPES[extension]
+    guessed, _ = mimetypes.guess_type(file_name)
+    return guessed or "application/octet-stream"
+
+
+def get_encoding():
+    """
+    새로 압축할 때 사용할 Content-Encoding (GAME_ASSET_ENCODING 설정, 기본 gzip)
+    """
+    encoding = getattr(settings, "GAME_ASSET_ENCODING", "gzip")
+    if encoding == "br" and brotli is None:
+        return "gzip"
+    return encoding
+
+
+def plan_headers(file_name, size):
+    """
+    반환: (Content-Type, Content-Encoding, 업로드 전에 압축할지 여부)
+    """
+    extension = _extension(file_name)
+    if extension in PRECOMPRESSED:
+        inner_name = file_name[:-(len(extension) + 1)]
+        return get_content_type(inner_name), PRECOMPRESSED[extension], False
+    content_type = get_content_type(file_name)
+    if extension in COMPRESSIBLE and size >= COMPRESS_MIN_SIZE:
+        encoding = get_encoding()
+        if encoding != "identity":
+            return content_type, encoding, True
+    return content_type, "identity", False
+
+
+def compress_stream(source, target, encoding, chunk_size=COMPRESS_CHUNK_SIZE):
+    """
+    source(read 지원)를 chunk_size 단위로 읽어 압축하면서 target(write 지원)에 씀
+    반환: 압축 결과 크기
+    """
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        process, finish = compressor.process, compressor.finish
+    else:
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, GZIP_WBITS)
+        process, finish = compressor.compress, compressor.flush
+
+    size = 0
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            break
+        data = process(chunk)
+        if data:
+            target.write(data)
+            size += len(data)
+    data = finish()
+    target.write(data)
+    return size + len(data)
@@ -0,0 +1,124 @@
+# S3 객체 다운로드 응답 (관리자 게임 zip 다운로드 등)
+# - stream: S3 본문을 DOWNLOAD_CHUNK 단위로 읽어 그대로 흘려보냄 (웹 작업자 메모리는 파일 크기와 무관하게 청크 하나)
+#   Range(단일 구간)/If-Range, If-None-Match(ETag) 지원 -> 이어받기와 재다운로드 생략 가능
+# - redirect: 짧게 유효한 presigned GET URL로 303 응답 (전송이 웹 작업자를 전혀 거치지 않음)
+import re
+
+from django.http import HttpResponse, HttpResponseNotModified, HttpResponseRedirect, StreamingHttpResponse
+from django.utils.http import http_date, quote_etag
+
+
+DOWNLOAD_CHUNK = 1024 * 1024
+PRESIGNED_EXPIRES = 5 * 60  # presigned URL 유효 시간 (초)
+DOWNLOAD_MODES = ("stream", "redirect")
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_range(header, size):
+    """
+    Range 헤더 해석 (단일 구간만 지원, 여러 구간이거나 형식이 다르면 None -> 전체 전송)
+    반환: (start, end) end 포함, 또는 None
+    만족할 수 없는 구간이면 ValueError
+    """
+    match = RANGE_RE.match((header or "").strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # 마지막 N바이트
+        length = int(last)
+        if length == 0:
+            raise ValueError("빈 구간")
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError("범위를 벗어난 구간")
+    return start, end
+
+
+def _etag_matches(header, etag):
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # 약한 비교 (W/ 접두사 무시)
+    tags = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return etag in tags
+
+
+def _body_chunks(body, chunk_size):
+    try:
+        yield from body.iter_chunks(chunk_size)
+    finally:
+        body.close()
+
+
+def stream_s3_object(request, s3, bucket, key, filename, content_type="application/zip", chunk_size=DOWNLOAD_CHUNK):
+    head = s3.head_object(Bucket=bucket, Key=key)
+    size = head["ContentLength"]
+    etag = quote_etag(head["ETag"])
+    last_modified = http_date(head["LastModified"].timestamp())
+
+    if _etag_matches(request.headers.get("If-None-Match"), etag):
+        if request.method in ("GET", "HEAD"):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(status=412)
+        response["ETag"] = etag
+        return response
+
+    byte_range = None
+    if_range = request.headers.get("If-Range")
+    if not if_range or if_range.strip() == etag:
+        try:
+            byte_range = parse_range(request.headers.get("Range"), size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+    # IfMatch로 head_object 이후 객체가 바뀐 경우 다른 버전이 섞이지 않도록 함
+    params = {"Bucket": bucket, "Key": key, "IfMatch": head["ETag"]}
+    if byte_range:
+        params["Range"] = f"bytes={byte_range[0]}-{byte_range[1]}"
+    s3_response = s3.get_object(**params)
+
+    response = StreamingHttpResponse(
+        _body_chunks(s3_response["Body"], chunk_size),
+        status=206 if byte_range else 200,
+        content_type=content_type,
+    )
+    if byte_range:
+        response["Content-Range"] = f"bytes {byte_range[0]}-{byte_range[1]}/{size}"
+        response["Content-Length"] = byte_range[1] - byte_range[0] + 1
+    else:
+        response["Content-Length"] = size
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    response["Last-Modified"] = last_modified
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+def presigned_download_url(s3, bucket, key, filename, expires=PRESIGNED_EXPIRES):
+    return s3.generate_presigned_url(
+        ClientMethod="get_object",
+        Params={
+            "Bucket": bucket,
+            "Key": key,
+            "ResponseContentDisposition": f'attachment; filename="{filename}"',
+        },
+        ExpiresIn=expires,
+    )
+
+
+def redirect_to_s3_object(s3, bucket, key, filename):
+    # POST 요청이어도 브라우저가 GET으로 따라가도록 303 See Other
+    response = HttpResponseRedirect(presigned_download_url(s3, bucket, key, filename))
+    response.status_code = 303
+    response["Cache-Control"] = "no-store"
+    return response
@@ -0,0 +1,90 @@
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from games.models import Game
+from qnas import assets
+from qnas.remote_zip import S3RangeFile
+from spartagames.utils import get_s3_client
+
+
+class _NullSink:
+    # 압축 결과 크기만 필요하므로 버림
+    def write(self, data):
+        return len(data)
+
+
+class Command(BaseCommand):
+    help = (
+        "게임 빌드 zip의 압축 대상 파일을 gzip/brotli로 압축해 보고 "
+        "크기 감소, 압축 시간(직렬/스레드 풀), 예상 전송 시간을 출력합니다."
+    )
+
+    def add_arguments(self, parser):
+        target = parser.add_mutually_exclusive_group(required=True)
+        target.add_argument("--zip", help="로컬 zip 경로")
+        target.add_argument("--game-id", type=int, help="Game.gamefile의 zip을 S3에서 Range 요청으로 읽음")
+        parser.add_argument("--mbps", type=float, default=20.0, help="예상 전송 시간 계산용 대역폭 (Mbps)")
+        parser.add_argument("--workers", type=int, default=4, help="동시에 압축할 스레드 수")
+
+    def handle(self, *args, **options):
+        if options["zip"]:
+            source = options["zip"]
+        else:
+            game = Game.objects.filter(pk=options["game_id"]).first()
+            if game is None or not game.gamefile:
+                raise CommandError(f"게임 {options['game_id']}의 zip 파일이 없습니다.")
+            source = S3RangeFile(get_s3_client(), settings.AWS_STORAGE_BUCKET_NAME, f"media/{game.gamefile.name}")
+
+        with zipfile.ZipFile(source) as archive:
+            infos = [info for info in archive.infolist() if not info.is_dir()]
+        # 멤버 본문은 메모리에 올리지 않고 압축할 때마다 스트리밍으로 읽음
+        targets = {
+            info.filename: info.file_size
+            for info in infos
+            if assets.plan_headers(info.filename, info.file_size)[2]
+        }
+        total_bytes = sum(info.file_size for info in infos)
+        target_bytes = sum(targets.values())
+        self.stdout.write(
+            f"파일 {len(infos)}개 / {total_bytes} bytes 중 압축 대상 {len(targets)}개 / {target_bytes} bytes"
+        )
+        if not targets:
+            return
+
+        local = threading.local()
+
+        def compressed_size(name, encoding):
+            # 스레드마다 zip 핸들을 따로 엶 (S3RangeFile은 블록 캐시를 공유하는 새 핸들)
+            archive = getattr(local, "archive", None)
+            if archive is None:
+                archive = local.archive = zipfile.ZipFile(source.clone() if hasattr(source, "clone") else source)
+            with archive.open(name) as body:
+                return assets.compress_stream(body, _NullSink(), encoding)
+
+        encodings = ["gzip"] + (["br"] if assets.brotli is not None else [])
+        bytes_per_second = options["mbps"] * 1000 * 1000 / 8
+        for encoding in encodings:
+            started = time.monotonic()
+            sizes = {name: compressed_size(name, encoding) for name in targets}
+            serial = time.monotonic() - started
+
+            started = time.monotonic()
+            with ThreadPoolExecutor(max_workers=options["workers"]) as executor:
+                list(executor.map(compressed_size, targets, [encoding] * len(targets)))
+            pooled = time.monotonic() - started
+
+            compressed_bytes = sum(sizes.values())
+            after = total_bytes - target_bytes + compressed_bytes
+            self.stdout.write(
+                f"[{encoding}] {target_bytes} -> {compressed_bytes} bytes "
+                f"({compressed_bytes / target_bytes:.1%}), 빌드 전체 {total_bytes} -> {after} bytes, "
+                f"압축 {serial:.2f}s(직렬) / {pooled:.2f}s({options['workers']}개 풀), "
+                f"{options['mbps']:g}Mbps 기준 전송 {total_bytes / bytes_per_second:.1f}s -> {after / bytes_per_second:.1f}s"
+            )
+            for name, size in sorted(sizes.items(), key=lambda item: -targets[item[0]])[:5]:
+                self.stdout.write(f"    {name}: {targets[name]} -> {size} bytes")
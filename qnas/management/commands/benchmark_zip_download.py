@@ -0,0 +1,71 @@
+import io
+import resource
+import time
+import tracemalloc
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.http import FileResponse
+from django.test import RequestFactory
+
+from games.models import Game
+from qnas import downloads
+from spartagames.utils import get_s3_client
+
+
+class Command(BaseCommand):
+    help = (
+        "관리자 zip 다운로드를 전체 읽기(기존 방식)와 스트리밍(qnas.downloads)으로 응답 본문을 끝까지 소비해 "
+        "소요 시간과 최대 메모리를 비교합니다. 스트리밍의 최대 메모리는 파일 크기와 무관하게 청크 크기 수준이어야 합니다. "
+        "AWS_S3_ENDPOINT_URL로 로컬 S3 호환 서버(MinIO 등)에서 실행할 수 있습니다."
+    )
+
+    def add_arguments(self, parser):
+        target = parser.add_mutually_exclusive_group(required=True)
+        target.add_argument("--game-id", type=int, help="Game.gamefile의 zip을 사용")
+        target.add_argument("--key", help="버킷 안의 zip 키 (예: media/zips/xxx.zip)")
+        parser.add_argument("--bucket", default=settings.AWS_STORAGE_BUCKET_NAME)
+        parser.add_argument("--skip-full", action="store_true", help="전체 읽기 방식은 실행하지 않음 (큰 파일)")
+
+    def handle(self, *args, **options):
+        if options["game_id"]:
+            game = Game.objects.filter(pk=options["game_id"]).first()
+            if game is None or not game.gamefile:
+                raise CommandError(f"게임 {options['game_id']}의 zip 파일이 없습니다.")
+            key = f"media/{game.gamefile.name}"
+        else:
+            key = options["key"]
+
+        s3 = get_s3_client()
+        bucket = options["bucket"]
+        request = RequestFactory().get("/")
+
+        def full_read():
+            body = s3.get_object(Bucket=bucket, Key=key)["Body"].read()
+            return FileResponse(io.BytesIO(body), content_type="application/zip")
+
+        def streaming():
+            return downloads.stream_s3_object(request, s3, bucket, key, "game.zip")
+
+        modes = [("streaming", streaming)]
+        if not options["skip_full"]:
+            modes.insert(0, ("full read", full_read))
+
+        for label, respond in modes:
+            tracemalloc.start()
+            started = time.monotonic()
+            response = respond()
+            sent = 0
+            for chunk in response.streaming_content:
+                sent += len(chunk)
+            response.close()
+            elapsed = time.monotonic() - started
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            self.stdout.write(
+                f"[{label}] {sent} bytes 전송, {elapsed:.3f}s, 최대 Python 메모리 {peak / 1024 / 1024:.1f}MB"
+            )
+
+        # ru_maxrss는 리눅스에서 KB 단위, 프로세스 전체의 최댓값
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        self.stdout.write(self.style.SUCCESS(f"프로세스 최대 RSS: {max_rss / 1024:.1f}MB"))
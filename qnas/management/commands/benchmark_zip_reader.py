@@ -0,0 +1,76 @@
+import io
+import resource
+import time
+import tracemalloc
+import zipfile
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from games.models import Game
+from qnas.remote_zip import S3RangeFile
+from spartagames.utils import get_s3_client
+
+
+class Command(BaseCommand):
+    help = (
+        "S3 zip을 전체 다운로드(기존 방식)와 Range 요청(S3RangeFile)으로 읽어 "
+        "전송량/요청 수/소요 시간/최대 메모리를 비교합니다. "
+        "AWS_S3_ENDPOINT_URL로 로컬 S3 호환 서버(MinIO 등)에서 실행할 수 있습니다."
+    )
+
+    def add_arguments(self, parser):
+        target = parser.add_mutually_exclusive_group(required=True)
+        target.add_argument("--game-id", type=int, help="Game.gamefile의 zip을 사용")
+        target.add_argument("--key", help="버킷 안의 zip 키 (예: media/zips/xxx.zip)")
+        parser.add_argument("--bucket", default=settings.AWS_STORAGE_BUCKET_NAME)
+        parser.add_argument("--member", default="index.html", help="읽어 볼 zip 멤버 (기본: index.html)")
+        parser.add_argument("--all-members", action="store_true", help="모든 멤버를 끝까지 읽음 (배포와 같은 작업량)")
+
+    def handle(self, *args, **options):
+        if options["game_id"]:
+            game = Game.objects.filter(pk=options["game_id"]).first()
+            if game is None or not game.gamefile:
+                raise CommandError(f"게임 {options['game_id']}의 zip 파일이 없습니다.")
+            key = f"media/{game.gamefile.name}"
+        else:
+            key = options["key"]
+
+        s3 = get_s3_client()
+        bucket = options["bucket"]
+
+        def full_download():
+            body = s3.get_object(Bucket=bucket, Key=key)["Body"].read()
+            return zipfile.ZipFile(io.BytesIO(body)), {"requests": 1, "bytes_fetched": len(body)}
+
+        def range_reader():
+            remote = S3RangeFile(s3, bucket, key)
+            return zipfile.ZipFile(remote), remote.cache
+
+        for label, open_zip in (("full download", full_download), ("range reader", range_reader)):
+            tracemalloc.start()
+            started = time.monotonic()
+            archive, transfer = open_zip()
+            with archive:
+                names = [options["member"]]
+                if options["all_members"]:
+                    names = [info.filename for info in archive.infolist() if not info.is_dir()]
+                read_bytes = 0
+                for name in names:
+                    with archive.open(name) as member:
+                        while chunk := member.read(1024 * 1024):
+                            read_bytes += len(chunk)
+            elapsed = time.monotonic() - started
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            stats = transfer if isinstance(transfer, dict) else transfer.stats()
+            self.stdout.write(
+                f"[{label}] 멤버 {len(names)}개 / {read_bytes} bytes 읽음, "
+                f"전송 {stats['bytes_fetched']} bytes ({stats['requests']}회 요청), "
+                f"{elapsed:.3f}s, 최대 Python 메모리 {peak / 1024 / 1024:.1f}MB"
+            )
+
+        # ru_maxrss는 리눅스에서 KB 단위, 프로세스 전체의 최댓값
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        self.stdout.write(self.style.SUCCESS(f"프로세스 최대 RSS: {max_rss / 1024:.1f}MB"))
@@ -0,0 +1,51 @@
+# Generated by Django 4.2 on 2026-10-18 21:04
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0012_engagementrollup_rollupwatermark'),
+        ('qnas', '0004_alter_gameregisterlog_maker_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GameBuild',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=511)),
+                ('prefix', models.CharField(max_length=511)),
+                ('file_count', models.IntegerField(default=0)),
+                ('total_bytes', models.BigIntegerField(default=0)),
+                ('uploaded_bytes', models.BigIntegerField(default=0)),
+                ('saved_bytes', models.BigIntegerField(default=0)),
+                ('deleted_count', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('game', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='builds', to='games.game')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='GameBuildFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(max_length=511)),
+                ('size', models.BigIntegerField()),
+                ('sha256', models.CharField(max_length=64)),
+                ('crc32', models.BigIntegerField()),
+                ('content_type', models.CharField(max_length=100)),
+                ('content_encoding', models.CharField(max_length=20)),
+                ('build', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='files', to='qnas.gamebuild')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='gamebuildfile',
+            constraint=models.UniqueConstraint(fields=('build', 'path'), name='unique_game_build_file'),
+        ),
+        migrations.AddIndex(
+            model_name='gamebuild',
+            index=models.Index(fields=['game', '-created_at'], name='game_build_latest_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2 on 2026-10-18 21:06
+
+from django.db import migrations, models
+
+
+def activate_latest_builds(apps, schema_editor):
+    # 기존 배포 기록은 게임별 마지막 빌드가 현재 gamepath
+    GameBuild = apps.get_model("qnas", "GameBuild")
+    latest_ids = {}
+    for build_id, game_id in GameBuild.objects.order_by("created_at", "pk").values_list("pk", "game_id"):
+        latest_ids[game_id] = build_id
+    GameBuild.objects.filter(pk__in=latest_ids.values()).update(is_active=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('qnas', '0005_gamebuild'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gamebuild',
+            name='activated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='gamebuild',
+            name='is_active',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(activate_latest_builds, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='gamebuild',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_active', True)), fields=('game',), name='unique_active_game_build'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2 on 2026-10-18 21:09
+
+from django.db import migrations, models
+
+
+def backfill_stored_size(apps, schema_editor):
+    # 이전 배포는 압축 없이 원본 그대로 올렸으므로 저장 크기 = 원본 크기
+    GameBuildFile = apps.get_model("qnas", "GameBuildFile")
+    GameBuildFile.objects.update(stored_size=models.F("size"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('qnas', '0006_gamebuild_is_active'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gamebuildfile',
+            name='stored_size',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_stored_size, migrations.RunPython.noop),
+    ]
@@ -47,3 +47,50 @@ class DeleteUsers(models.Model):
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="delete_user"
     )
     created_at = models.DateTimeField(auto_now_add=True)
+
+
+# 게임 빌드 배포 기록 (qnas.publishing에서 생성)
+# 빌드마다 새 prefix(버전 폴더)에 올리고, 검증이 끝난 뒤 is_active 빌드와 Game.gamepath를 한 번에 전환
+# 다음 배포 때 이전 매니페스트와 비교하여 바뀐 파일만 업로드 (나머지는 S3 안에서 복사)
+class GameBuild(models.Model):
+    game = models.ForeignKey(
+        Game, on_delete=models.CASCADE, related_name="builds"
+    )
+    source = models.CharField(max_length=511)  # 원본 zip 키 (media/zips/...)
+    prefix = models.CharField(max_length=511)  # 배포 위치 (media/games/<폴더>/)
+    file_count = models.IntegerField(default=0)
+    total_bytes = models.BigIntegerField(default=0)
+    uploaded_bytes = models.BigIntegerField(default=0)
+    saved_bytes = models.BigIntegerField(default=0)  # 변경 없어 업로드를 건너뛴 크기
+    deleted_count = models.IntegerField(default=0)  # 이전 빌드에 있었지만 새 빌드에서 빠진 파일 수
+    is_active = models.BooleanField(default=False)  # 현재 Game.gamepath가 가리키는 빌드
+    activated_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["game", "-created_at"], name="game_build_latest_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["game"], condition=models.Q(is_active=True), name="unique_active_game_build"
+            ),
+        ]
+
+
+class GameBuildFile(models.Model):
+    build = models.ForeignKey(
+        GameBuild, on_delete=models.CASCADE, related_name="files"
+    )
+    path = models.CharField(max_length=511)  # zip 안의 경로 (prefix 기준 상대 경로)
+    size = models.BigIntegerField()
+    sha256 = models.CharField(max_length=64)
+    crc32 = models.BigIntegerField()  # zip 헤더 값 (같은 크기/CRC면 본문을 읽지 않고 변경 없음으로 판단)
+    content_type = models.CharField(max_length=100)
+    content_encoding = models.CharField(max_length=20)
+    stored_size = models.BigIntegerField(default=0)  # S3에 저장된 크기 (업로드 전에 압축했으면 압축 후 크기)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["build", "path"], name="unique_game_build_file"),
+        ]
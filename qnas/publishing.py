@@ -0,0 +1,463 @@
+# 게임 배포 파이프라인 (qnas.tasks.game_register_task에서 사용)
+# 1. S3의 원본 zip을 내려받지 않고 Range 요청으로 중앙 디렉터리만 읽음 (qnas.remote_zip)
+# 2. index.html만 메모리에서 수정
+# 3. 나머지 파일은 새 zip을 만들지 않고 원본 zip에서 필요한 구간만 읽어 스레드 풀로 병렬 업로드
+#    (upload_fileobj가 큰 파일(.data.gz, .wasm.gz 등)은 멀티파트로 나누어 올림)
+# 4. 빌드마다 새 버전 폴더(media/games/<game_id>/<버전>/)에 올리며, 한 번 공개된 폴더는 수정하지 않음
+#    이전 빌드의 매니페스트(GameBuildFile)와 같은 파일은 업로드 대신 S3 안에서 복사
+# 5. 업로드 결과를 목록 조회로 검증한 뒤 GameBuild.is_active와 Game.gamepath를 한 트랜잭션에서 전환
+#    (실패하면 기존 빌드가 그대로 서비스됨, 이전 빌드는 롤백용으로 보관 후 prune_builds로 정리)
+# 6. 압축 효과가 있는 파일은 미리 압축하고, 모든 파일에 정확한 Content-Type/Encoding과 immutable 캐시 헤더 지정
+#    (정책은 qnas.assets, 멤버를 스트리밍으로 압축해 SPOOL_MAX_SIZE를 넘는 결과는 임시 파일에 보관)
+# 7. 단계별 소요 시간과 업로드를 건너뛴 크기(saved_bytes)를 기록하여 반환
+import hashlib
+import io
+import logging
+import secrets
+import tempfile
+import threading
+import time
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from boto3.s3.transfer import TransferConfig
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from games.models import Game
+from . import assets
+from .models import GameBuild, GameBuildFile
+
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_WORKERS = 8
+KEEP_BUILDS = 3  # 활성 빌드 외에 롤백용으로 보관할 빌드 수
+ORPHAN_GRACE = timedelta(days=1)  # 실패한 배포가 남긴 폴더를 지우기 전 대기 시간
+MULTIPART_THRESHOLD = 16 * 1024 * 1024
+SPOOL_MAX_SIZE = 8 * 1024 * 1024  # 압축 결과를 메모리에 둘 최대 크기 (넘으면 임시 파일, 업로드 스레드마다 1개)
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=MULTIPART_THRESHOLD,
+    multipart_chunksize=MULTIPART_THRESHOLD,
+    max_concurrency=4,
+)
+
+SIZE_SCRIPT = """
+                <script>
+                  function sendSizeToParent() {
+                    var canvas = document.querySelector("#unity-canvas");
+                    var width = canvas.clientWidth;
+                    var height = canvas.clientHeight;
+                    window.parent.postMessage({ width: width, height: height }, '*');
+                  }
+
+                  window.addEventListener('resize', sendSizeToParent);
+                  window.addEventListener('load', sendSizeToParent);
+                </script>
+                </body>
+                """
+
+
+class PublishError(Exception):
+    pass
+
+
+def game_base_url(prefix):
+    return f"https://{settings.AWS_S3_CUSTOM_DOMAIN}/{prefix}"
+
+
+def game_builds_root(game_id):
+    return f"media/games/{game_id}/"
+
+
+def new_build_prefix(game_id):
+    # 재시도해도 이전 시도와 겹치지 않도록 시각 + 난수
+    version = f"{timezone.now().strftime('%Y%m%d%H%M%S')}-{secrets.token_hex(3)}"
+    return f"{game_builds_root(game_id)}{version}/"
+
+
+def rewrite_index_html(index_text, base_url):
+    """
+    Unity WebGL index.html의 리소스 경로를 S3 주소로 바꾸고, 화면 크기를 부모 창에 맞추도록 수정
+    """
+    lines = []
+    is_check_build = False
+
+    for line in index_text.splitlines():
+        if 'link' in line:
+            cursor = line.find("TemplateData")
+            lines.append(line[:cursor] + base_url + line[cursor:])
+        elif "buildUrl" in line and not is_check_build:
+            is_check_build = True
+            cursor = line.find("Build")
+            lines.append(line[:cursor] + base_url + line[cursor:])
+        elif "canvas.style.width" in line or "canvas.style.height" in line:
+            cursor = line.find('"')
+            lines.append(line[:cursor] + '"100%"\n')
+        else:
+            lines.append(line)
+    new_text = "".join(line + "\n" for line in lines)
+
+    new_text = new_text.replace(
+        '<body', '<body style="margin: 0; padding: 0; width: 100%; height: 100%; overflow: hidden;"'
+    ).replace(
+        '<div id="unity-container"', '<div id="unity-container" style="width: 100%; height: 100%; overflow: hidden;"'
+    )
+    return new_text.replace("</body>", SIZE_SCRIPT)
+
+
+def is_uploadable(file_name):
+    # 폴더(또는 확장자 없이 폴더 안에 있는 항목)는 S3에 올리지 않음
+    file_extension = file_name.split('.')[-1].lower()
+    return bool(file_extension) and '/' not in file_extension
+
+
+def _open_source(source):
+    # S3RangeFile은 위치(position)를 가지므로 스레드마다 블록 캐시를 공유하는 새 핸들을 사용
+    return source.clone() if hasattr(source, "clone") else source
+
+
+class _ArchiveReader:
+    """
+    스레드마다 zip 핸들을 따로 열어 멤버를 동시에 읽을 수 있도록 함
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self._local = threading.local()
+        self._handles = []
+        self._lock = threading.Lock()
+
+    def open(self, name):
+        archive = getattr(self._local, "archive", None)
+        if archive is None:
+            archive = zipfile.ZipFile(_open_source(self.source))
+            self._local.archive = archive
+            with self._lock:
+                self._handles.append(archive)
+        return archive.open(name)
+
+    def close(self):
+        with self._lock:
+            for archive in self._handles:
+                archive.close()
+            self._handles.clear()
+
+
+class _HashingReader:
+    """
+    업로드하면서 SHA-256을 계산하는 읽기 전용 래퍼
+    seek을 제공하지 않으므로 upload_fileobj가 크기를 구하려고 멤버를 끝까지 한 번 더 읽지 않음
+    """
+
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+        self.hash = hashlib.sha256()
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        data = self.fileobj.read(size)
+        self.hash.update(data)
+        return data
+
+
+def _manifest_entry(name, size, crc32, sha256, content_type, content_encoding, stored_size):
+    return {
+        "path": name,
+        "size": size,
+        "crc32": crc32,
+        "sha256": sha256,
+        "content_type": content_type,
+        "content_encoding": content_encoding,
+        "stored_size": stored_size,
+    }
+
+
+def delete_objects(s3, bucket, keys):
+    # delete_objects는 요청당 최대 1000개
+    keys = list(keys)
+    for start in range(0, len(keys), 1000):
+        s3.delete_objects(
+            Bucket=bucket,
+            Delete={"Objects": [{"Key": key} for key in keys[start:start + 1000]], "Quiet": True},
+        )
+    return len(keys)
+
+
+def publish_archive(
+    s3, source, bucket, prefix, base_url, previous=None, previous_prefix=None, max_workers=UPLOAD_WORKERS
+):
+    """
+    source(로컬 zip 경로 또는 S3RangeFile)의 게임 빌드를 s3://bucket/prefix 아래에 업로드
+    previous: previous_prefix에 배포된 이전 매니페스트 {path: {"size", "crc32", "sha256", ...}}
+              주어지면 같은 파일은 previous_prefix에서 복사하고 바뀐 파일만 업로드 (None이면 전체 업로드)
+    반환: {"files", "bytes", "stored_bytes", "uploaded_bytes", "saved_bytes", "deleted", "manifest",
+           "rewrite", "upload", "compress"} (compress는 압축 대상 파일을 읽고 압축한 시간의 합)
+    """
+    previous = previous or {}
+    timings = {}
+
+    started = time.monotonic()
+    with zipfile.ZipFile(_open_source(source)) as archive:
+        members = [
+            info for info in archive.infolist()
+            if info.filename != "index.html" and is_uploadable(info.filename)
+        ]
+        index_html = rewrite_index_html(archive.read("index.html").decode("utf-8"), base_url).encode("utf-8")
+    timings["rewrite"] = time.monotonic() - started
+
+    def extra_args(content_type, content_encoding):
+        return {
+            "ContentType": content_type,
+            "ContentEncoding": content_encoding,
+            "CacheControl": assets.IMMUTABLE_CACHE_CONTROL,
+        }
+
+    def upload(name, fileobj, content_type, content_encoding):
+        s3.upload_fileobj(
+            fileobj,
+            bucket,
+            f"{prefix}{name}",
+            ExtraArgs=extra_args(content_type, content_encoding),
+            Config=TRANSFER_CONFIG,
+        )
+
+    def copy(name, content_type, content_encoding):
+        # 헤더를 다시 지정하여 이전(캐시 헤더가 없던) 빌드에서 복사해도 같은 헤더가 붙도록 함
+        s3.copy(
+            {"Bucket": bucket, "Key": f"{previous_prefix}{name}"},
+            bucket,
+            f"{prefix}{name}",
+            ExtraArgs={**extra_args(content_type, content_encoding), "MetadataDirective": "REPLACE"},
+            Config=TRANSFER_CONFIG,
+        )
+
+    def is_unchanged(name, size, crc32, content_type, content_encoding):
+        # 변경 여부는 zip 중앙 디렉터리의 크기 + CRC32로 판단 (SHA-256은 본문을 읽어야 하므로 비교하지 않고 매니페스트 기록용)
+        # 압축 정책이 바뀐 파일도 다시 올림
+        old = previous.get(name)
+        return (
+            old is not None
+            and old["size"] == size
+            and old["crc32"] == crc32
+            and old["content_type"] == content_type
+            and old["content_encoding"] == content_encoding
+        )
+
+    reader = _ArchiveReader(source)
+    compress_seconds = []
+
+    def compress(fileobj, target, encoding):
+        started = time.monotonic()
+        size = assets.compress_stream(fileobj, target, encoding)
+        compress_seconds.append(time.monotonic() - started)
+        return size
+
+    def publish_member(info):
+        name = info.filename
+        content_type, content_encoding, should_compress = assets.plan_headers(name, info.file_size)
+        # 크기/CRC/헤더가 이전 매니페스트와 같으면 본문을 읽지 않고 이전 빌드에서 복사
+        if is_unchanged(name, info.file_size, info.CRC, content_type, content_encoding):
+            old = previous[name]
+            copy(name, content_type, content_encoding)
+            return _manifest_entry(
+                name, info.file_size, info.CRC, old["sha256"], content_type, content_encoding, old["stored_size"]
+            ), False
+        if should_compress:
+            with reader.open(name) as body, tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as spooled:
+                hashing = _HashingReader(body)
+                stored_size = compress(hashing, spooled, content_encoding)
+                spooled.seek(0)
+                upload(name, spooled, content_type, content_encoding)
+            return _manifest_entry(
+                name, info.file_size, info.CRC, hashing.hash.hexdigest(), content_type, content_encoding, stored_size
+            ), True
+        with reader.open(name) as body:
+            hashing = _HashingReader(body)
+            upload(name, hashing, content_type, content_encoding)
+        return _manifest_entry(
+            name, info.file_size, info.CRC, hashing.hash.hexdigest(), content_type, content_encoding, info.file_size
+        ), True
+
+    results = []
+
+    started = time.monotonic()
+    try:
+        # index.html은 버전 폴더 주소가 들어가므로 항상 새로 업로드
+        content_type, content_encoding, should_compress = assets.plan_headers("index.html", len(index_html))
+        index_body = index_html
+        if should_compress:
+            target = io.BytesIO()
+            compress(io.BytesIO(index_html), target, content_encoding)
+            index_body = target.getvalue()
+        upload("index.html", io.BytesIO(index_body), content_type, content_encoding)
+        results.append((_manifest_entry(
+            "index.html", len(index_html), zlib.crc32(index_html), hashlib.sha256(index_html).hexdigest(),
+            content_type, content_encoding, len(index_body),
+        ), True))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # 하나라도 실패하면 예외가 그대로 전달되어 작업이 재시도됨
+            results.extend(executor.map(publish_member, members))
+    finally:
+        reader.close()
+    timings["upload"] = time.monotonic() - started
+    timings["compress"] = sum(compress_seconds)
+
+    manifest = [entry for entry, _ in results]
+    current = {entry["path"] for entry in manifest}
+    uploaded_bytes = sum(entry["size"] for entry, uploaded in results if uploaded)
+    total_bytes = sum(entry["size"] for entry in manifest)
+    return {
+        "files": len(manifest),
+        "bytes": total_bytes,
+        "stored_bytes": sum(entry["stored_size"] for entry in manifest),
+        "uploaded_bytes": uploaded_bytes,
+        "saved_bytes": total_bytes - uploaded_bytes,
+        "deleted": sum(1 for path in previous if path not in current),
+        "manifest": manifest,
+        **{stage: round(seconds, 3) for stage, seconds in timings.items()},
+    }
+
+
+def list_objects(s3, bucket, prefix):
+    """
+    반환: {key: {"size", "last_modified"}}
+    """
+    objects = {}
+    for page in s3.get_paginator("list_objects_v2").paginate(Bucket=bucket, Prefix=prefix):
+        for item in page.get("Contents", []):
+            objects[item["Key"]] = {"size": item["Size"], "last_modified": item["LastModified"]}
+    return objects
+
+
+def verify_prefix(s3, bucket, prefix, manifest):
+    """
+    매니페스트의 모든 파일이 prefix 아래에 같은 크기로 올라갔는지 확인 (실패 시 PublishError)
+    """
+    objects = list_objects(s3, bucket, prefix)
+    missing = [
+        entry["path"] for entry in manifest
+        if objects.get(f"{prefix}{entry['path']}", {}).get("size") != entry["stored_size"]
+    ]
+    if missing:
+        raise PublishError(f"{prefix} 검증 실패: {len(missing)}개 파일 누락 또는 크기 불일치 (예: {missing[:5]})")
+
+
+def get_active_build(game):
+    return game.builds.filter(is_active=True).first()
+
+
+def load_manifest(build):
+    """
+    반환: {path: {"size", "crc32", "sha256", "content_type", "content_encoding", "stored_size"}}
+    """
+    if build is None:
+        return {}
+    return {
+        row["path"]: row
+        for row in build.files.values(
+            "path", "size", "crc32", "sha256", "content_type", "content_encoding", "stored_size"
+        )
+    }
+
+
+def _activate(game_id, build, register_state=None):
+    """
+    build를 활성 빌드로 지정하고 gamepath를 전환 (호출하는 쪽에서 트랜잭션 처리)
+    """
+    game = Game.objects.select_for_update().get(pk=game_id)
+    GameBuild.objects.filter(game_id=game_id, is_active=True).exclude(pk=build.pk).update(is_active=False)
+    build.is_active = True
+    build.activated_at = timezone.now()
+    build.save(update_fields=["is_active", "activated_at"])
+
+    game.gamepath = game_base_url(build.prefix).rstrip('/')
+    update_fields = ["gamepath", "updated_at"]
+    if register_state is not None:
+        game.register_state = register_state
+        update_fields.append("register_state")
+    game.save(update_fields=update_fields)
+    return game
+
+
+def record_build(game, source_key, prefix, result):
+    """
+    배포 결과와 매니페스트를 저장하고, 이 빌드로 gamepath를 전환하여 등록 완료 처리
+    """
+    with transaction.atomic():
+        build = GameBuild.objects.create(
+            game=game,
+            source=source_key,
+            prefix=prefix,
+            file_count=result["files"],
+            total_bytes=result["bytes"],
+            uploaded_bytes=result["uploaded_bytes"],
+            saved_bytes=result["saved_bytes"],
+            deleted_count=result["deleted"],
+        )
+        GameBuildFile.objects.bulk_create(
+            [GameBuildFile(build=build, **entry) for entry in result["manifest"]], batch_size=1000
+        )
+        _activate(game.pk, build, register_state=1)
+    return build
+
+
+def rollback_build(game, build_id=None):
+    """
+    보관 중인 빌드로 gamepath를 되돌림 (build_id가 없으면 현재 활성 빌드 바로 이전 빌드)
+    반환: 활성화한 GameBuild (되돌릴 빌드가 없으면 None)
+    """
+    with transaction.atomic():
+        builds = GameBuild.objects.filter(game=game)
+        if build_id is not None:
+            build = builds.filter(pk=build_id).first()
+        else:
+            active = builds.filter(is_active=True).first()
+            older = builds.filter(is_active=False)
+            if active is not None:
+                older = older.filter(created_at__lt=active.created_at)
+            build = older.order_by("-created_at", "-pk").first()
+        if build is None:
+            return None
+        _activate(game.pk, build)
+    return build
+
+
+def prune_builds(s3, bucket, game_id, keep=KEEP_BUILDS, now=None):
+    """
+    활성 빌드와 최근 keep개를 제외한 빌드의 폴더/기록을 삭제하고,
+    기록 없이 남은 폴더(실패한 배포)는 ORPHAN_GRACE가 지난 뒤 삭제
+    반환: (삭제한 빌드 수, 삭제한 객체 수)
+    """
+    now = now or timezone.now()
+    builds = list(GameBuild.objects.filter(game_id=game_id).order_by("-is_active", "-created_at", "-pk"))
+    retained, expired = builds[:keep + 1], builds[keep + 1:]
+    # 0013 이전 방식의 배포는 여러 빌드가 같은 폴더를 쓰므로, 남는 빌드가 쓰는 폴더는 지우지 않음
+    retained_prefixes = {build.prefix for build in retained}
+
+    deleted_objects = 0
+    for build in expired:
+        if build.prefix not in retained_prefixes:
+            deleted_objects += delete_objects(s3, bucket, list_objects(s3, bucket, build.prefix))
+    GameBuild.objects.filter(pk__in=[build.pk for build in expired]).delete()
+
+    # 버전 폴더 중 기록이 없는 것 (업로드 중 실패 후 재시도되지 않은 배포)
+    root = game_builds_root(game_id)
+    orphans = {}
+    for key, item in list_objects(s3, bucket, root).items():
+        rest = key[len(root):]
+        if '/' not in rest:
+            continue
+        folder = f"{root}{rest.split('/', 1)[0]}/"
+        if folder not in retained_prefixes:
+            orphans.setdefault(folder, []).append((key, item["last_modified"]))
+    for folder, items in orphans.items():
+        if max(last_modified for _, last_modified in items) < now - ORPHAN_GRACE:
+            deleted_objects += delete_objects(s3, bucket, [key for key, _ in items])
+
+    return len(expired), deleted_objects
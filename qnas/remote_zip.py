@@ -0,0 +1,153 @@
+# S3 객체를 Range 요청으로 읽는 파일 객체
+# - zipfile.ZipFile이 그대로 사용할 수 있도록 seek/tell/read를 지원 (전체 파일을 받지 않음)
+# - ZipFile은 끝부분(중앙 디렉터리)을 먼저 읽고, 멤버는 필요할 때 해당 구간만 읽음
+# - 작은 읽기는 블록 단위로 받아 LRU 캐시에 보관 (헤더를 여러 번 읽어도 요청은 1회)
+# - 큰 읽기(멤버 본문 스트리밍)는 캐시를 거치지 않고 필요한 구간만 바로 요청
+# - 같은 객체를 여러 스레드에서 읽을 때는 clone()으로 캐시를 공유하는 새 핸들을 사용
+import io
+import threading
+import zipfile
+from collections import OrderedDict
+
+
+BLOCK_SIZE = 256 * 1024
+CACHE_BLOCKS = 64
+DIRECT_READ_SIZE = 4 * BLOCK_SIZE
+
+
+class BlockCache:
+    """
+    스레드 간 공유 가능한 블록 캐시 + 전송량 통계
+    """
+
+    def __init__(self, block_size=BLOCK_SIZE, max_blocks=CACHE_BLOCKS):
+        self.block_size = block_size
+        self.max_blocks = max_blocks
+        self.requests = 0
+        self.bytes_fetched = 0
+        self._blocks = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, index):
+        with self._lock:
+            block = self._blocks.get(index)
+            if block is not None:
+                self._blocks.move_to_end(index)
+            return block
+
+    def put(self, index, block):
+        with self._lock:
+            self._blocks[index] = block
+            self._blocks.move_to_end(index)
+            while len(self._blocks) > self.max_blocks:
+                self._blocks.popitem(last=False)
+
+    def record(self, size):
+        with self._lock:
+            self.requests += 1
+            self.bytes_fetched += size
+
+    def stats(self):
+        return {"requests": self.requests, "bytes_fetched": self.bytes_fetched}
+
+
+class S3RangeFile(io.RawIOBase):
+    """
+    읽기 전용 S3 객체 핸들 (스레드마다 별도 핸들 사용)
+    """
+
+    def __init__(self, s3, bucket, key, size=None, cache=None):
+        super().__init__()
+        self.s3 = s3
+        self.bucket = bucket
+        self.key = key
+        self.cache = cache or BlockCache()
+        if size is None:
+            size = s3.head_object(Bucket=bucket, Key=key)["ContentLength"]
+        self.size = size
+        self._position = 0
+
+    def clone(self):
+        return S3RangeFile(self.s3, self.bucket, self.key, size=self.size, cache=self.cache)
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self.size + offset
+        else:
+            raise ValueError(f"잘못된 whence 값: {whence}")
+        if position < 0:
+            raise ValueError("음수 위치로 이동할 수 없습니다.")
+        self._position = position
+        return position
+
+    def _fetch(self, start, end):
+        # end는 포함하지 않음 (HTTP Range의 끝은 포함이므로 -1)
+        response = self.s3.get_object(Bucket=self.bucket, Key=self.key, Range=f"bytes={start}-{end - 1}")
+        data = response["Body"].read()
+        self.cache.record(len(data))
+        return data
+
+    def _read_blocks(self, start, end):
+        block_size = self.cache.block_size
+        first, last = start // block_size, (end - 1) // block_size
+        blocks = {index: self.cache.get(index) for index in range(first, last + 1)}
+
+        # 연속으로 비어 있는 블록은 한 번의 요청으로 받음
+        index = first
+        while index <= last:
+            if blocks[index] is not None:
+                index += 1
+                continue
+            run_end = index
+            while run_end + 1 <= last and blocks[run_end + 1] is None:
+                run_end += 1
+            data = self._fetch(index * block_size, min((run_end + 1) * block_size, self.size))
+            for offset, missing in enumerate(range(index, run_end + 1)):
+                block = data[offset * block_size:(offset + 1) * block_size]
+                blocks[missing] = block
+                self.cache.put(missing, block)
+            index = run_end + 1
+
+        data = b"".join(blocks[index] for index in range(first, last + 1))
+        return data[start - first * block_size:end - first * block_size]
+
+    def read(self, size=-1):
+        start = self._position
+        end = self.size if size is None or size < 0 else min(self.size, start + size)
+        if start >= end:
+            return b""
+        if end - start >= DIRECT_READ_SIZE:
+            data = self._fetch(start, end)
+        else:
+            data = self._read_blocks(start, end)
+        self._position = start + len(data)
+        return data
+
+    def readinto(self, buffer):
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def readall(self):
+        return self.read(-1)
+
+
+def open_remote_zip(s3, bucket, key):
+    """
+    반환: (zipfile.ZipFile, S3RangeFile)
+    """
+    remote = S3RangeFile(s3, bucket, key)
+    return zipfile.ZipFile(remote), remote
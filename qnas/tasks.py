@@ -1,11 +1,7 @@
 from datetime import timedelta
 import logging
-from tempfile import NamedTemporaryFile
-import os
-import re
-import zipfile
+import time
 
-import boto3
 from celery import shared_task
 
 from django.conf import settings
@@ -15,7 +11,10 @@ from django.db.models import Count, Q, Sum
 from django.utils import timezone
 
 from spartagames.config import ADMIN_STAFF_EMAIL, ADMIN_USER_EMAIL
-from .models import DeleteUsers, GameRegisterLog
+from spartagames.utils import get_s3_client
+from . import publishing
+from .remote_zip import S3RangeFile
+from .models import DeleteUsers, GameBuild, GameRegisterLog
 from games.models import Game
 
 
@@ -48,7 +47,7 @@ def hard_delete_user():
                     content=f"제작자 {user.nickname}의 게임 데이터를 관리자 계정으로 이관"
                 )
                 game.maker = admin_user
-                game.save()
+                game.save(update_fields=["maker", "updated_at"])
 
             # 리뷰 이관 처리
             reviews = user.reviews.all()
@@ -70,178 +69,96 @@ def hard_delete_user():
     retry_backoff=True,
     retry_kwargs={'max_retries': 0},
 )
-def game_register_task(self, game_id):
+def game_register_task(self, game_id, incremental=True):
+    """
+    새 버전 폴더에 배포 후 검증이 끝나면 gamepath 전환 (배포 중에도 기존 빌드가 그대로 서비스됨)
+    incremental: 활성 빌드와 같은 파일은 업로드 대신 S3 안에서 복사
+    """
     try:
         row = Game.objects.get(pk=game_id, is_visible=True, register_state=0)
     except ObjectDoesNotExist as e:
         logger.error(f"게임 {game_id} 없음 또는 등록 불가 상태")
         raise self.retry(exc=e)
 
-    s3 = boto3.client(
-        "s3",
-        aws_access_key_id=settings.AWS_S3_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_S3_SECRET_ACCESS_KEY,
-        region_name=settings.AWS_S3_REGION_NAME,
-    )
+    s3 = get_s3_client()
+    bucket = settings.AWS_STORAGE_BUCKET_NAME
+    timings = {}
+    source_key = f"media/{row.gamefile.name}"
+    prefix = publishing.new_build_prefix(row.pk)
 
+    previous_build = publishing.get_active_build(row) if incremental else None
+    previous = publishing.load_manifest(previous_build)
+
+    # zip 전체를 내려받지 않고 중앙 디렉터리와 필요한 멤버 구간만 Range 요청으로 읽음
+    started = time.monotonic()
     try:
-        zip_resp = s3.get_object(
-            Bucket=settings.AWS_STORAGE_BUCKET_NAME,
-            Key=f"media/{row.gamefile.name}"
-        )
+        source = S3RangeFile(s3, bucket, source_key)
     except Exception as e:
         logger.exception("S3에서 zip 파일 가져오기 실패")
         raise self.retry(exc=e)
+    timings["open"] = round(time.monotonic() - started, 3)
 
-    with NamedTemporaryFile(delete=False) as tmp_file:
-        for chunk in zip_resp["Body"].iter_chunks(chunk_size=8192):
-            tmp_file.write(chunk)
-        zip_path = tmp_file.name
-
-    game_folder = row.gamefile.name.split('/')[-1].split('.')[0]
-
-    # 업로드 된 같은 이름의 폴더나 파일이 존재할 경우 제거
-    s3_for_delete = boto3.resource(
-        "s3",
-        aws_access_key_id=settings.AWS_S3_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_S3_SECRET_ACCESS_KEY,
-        region_name=settings.AWS_S3_REGION_NAME,
-    )
-    bucket_for_delete = s3_for_delete.Bucket(settings.AWS_STORAGE_BUCKET_NAME)
-    bucket_for_delete.objects.filter(Prefix=f"media/games/{game_folder}/").delete()
-
-    # index.html 변경 후 S3 업로드
+    # index.html 변경 후 S3 업로드 (원본 zip에서 바로 병렬 업로드)
     try:
-        with zipfile.ZipFile(zip_path, "r") as zip_ref:
-            index_text = zip_ref.read("index.html").decode("utf-8")
-            new_lines = ""
-            is_check_build = False
-
-            for line in index_text.splitlines():
-                if 'link' in line:
-                    cursor = line.find("TemplateData")
-                    new_lines += line[:cursor] + f"https://{settings.AWS_S3_CUSTOM_DOMAIN}/media/games/{game_folder}/" + line[cursor:]
-                elif "buildUrl" in line and not is_check_build:
-                    is_check_build = True
-                    cursor = line.find("Build")
-                    new_lines += line[:cursor] + f"https://{settings.AWS_S3_CUSTOM_DOMAIN}/media/games/{game_folder}/" + line[cursor:]
-                elif "canvas.style.width" in line or "canvas.style.height" in line:
-                    cursor = line.find('"')
-                    new_lines += line[:cursor] + '"100%"\n'
-                else:
-                    new_lines += line
-                new_lines += "\n"
-
-            new_lines = new_lines.replace(
-                '<body', '<body style="margin: 0; padding: 0; width: 100%; height: 100%; overflow: hidden;"'
-            ).replace(
-                '<div id="unity-container"', '<div id="unity-container" style="width: 100%; height: 100%; overflow: hidden;"'
-            )
-
-            new_lines = new_lines.replace(
-                "</body>",
-                """
-                <script>
-                  function sendSizeToParent() {
-                    var canvas = document.querySelector("#unity-canvas");
-                    var width = canvas.clientWidth;
-                    var height = canvas.clientHeight;
-                    window.parent.postMessage({ width: width, height: height }, '*');
-                  }
-
-                  window.addEventListener('resize', sendSizeToParent);
-                  window.addEventListener('load', sendSizeToParent);
-                </script>
-                </body>
-                """
-            )
-
-            with NamedTemporaryFile(delete=False) as out_zip:
-                with zipfile.ZipFile(out_zip, "w") as new_zip:
-                    for item in zip_ref.infolist():
-                        if item.filename != "index.html":
-                            new_zip.writestr(item, zip_ref.read(item.filename))
-                    new_zip.writestr("index.html", new_lines.encode("utf-8"))
-
-                out_zip_path = out_zip.name
-
-        with zipfile.ZipFile(out_zip_path) as final_zip:
-            for file_name in final_zip.namelist():
-                pattern1 = r".+\.(data|symbols\.json)\.gz$"
-                pattern2 = r".+\.js\.gz$"
-                pattern3 = r".+\.wasm\.gz$"
-                
-                # 만약 file_name이 폴더명 이라면 S3에 올리는 과정 거치지 않도록 스킵
-                file_extension = file_name.split('.')[-1].lower()
-                if not file_extension or '/' in file_extension:
-                    continue
-                
-                body = final_zip.open(file_name)
-
-                content_type = None
-                content_encoding = None
-
-                # 메타데이터 설정
-                metadata = {}
-                if re.match(pattern1, file_name):
-                    content_type = 'application/octet-stream'
-                    content_encoding = 'gzip'
-                elif re.match(pattern2, file_name):
-                    content_type = 'application/javascript'
-                    content_encoding = 'gzip'
-                elif re.match(pattern3, file_name):
-                    content_type = 'application/wasm'
-                    content_encoding = 'gzip'
-                else:
-                    if file_extension == "js":
-                        content_type = 'application/javascript'
-                    elif file_extension == "html":
-                        content_type = 'text/html'
-                    elif file_extension == "ico":
-                        content_type = 'image/x-icon'
-                    elif file_extension == "png":
-                        content_type = 'image/png'
-                    elif file_extension == "css":
-                        content_type = 'text/css'
-
-                s3.put_object(
-                    Body=body,
-                    Bucket=settings.AWS_STORAGE_BUCKET_NAME,
-                    Key=f"media/games/{game_folder}/{file_name}",
-                    ContentType=(content_type if content_type else 'text/plain'),
-                    ContentEncoding=(content_encoding if content_encoding else 'identity'),
-                )
-                
-                body.close()
-
+        result = publishing.publish_archive(
+            s3,
+            source,
+            bucket,
+            prefix,
+            publishing.game_base_url(prefix),
+            previous=previous,
+            previous_prefix=previous_build.prefix if previous_build else None,
+        )
+        started = time.monotonic()
+        publishing.verify_prefix(s3, bucket, prefix, result["manifest"])
+        timings["verify"] = round(time.monotonic() - started, 3)
     except Exception as e:
+        # 올라간 파일은 gamepath가 가리키지 않으므로 prune_game_builds가 정리
         logger.exception("게임 등록 중 에러 발생")
         raise self.retry(exc=e)
-    
-    # 생성했던 임시 파일 삭제
-    finally:
-        # 열린 파일 핸들 강제로 close 시도
-        import gc
-        gc.collect()
-
-        if zip_path and os.path.exists(zip_path):
-            try:
-                os.remove(zip_path)
-            except Exception as e:
-                logger.warning(f"zip_path 삭제 실패: {e}")
-
-        if out_zip_path and os.path.exists(out_zip_path):
-            try:
-                os.remove(out_zip_path)
-            except Exception as e:
-                logger.warning(f"out_zip_path 삭제 실패: {e}")
-
-    row.gamepath = f"https://{settings.AWS_S3_CUSTOM_DOMAIN}/media/games/{game_folder}"
-    row.register_state = 1
-    row.save()
+
+    timings["rewrite"] = result.pop("rewrite")
+    timings["upload"] = result.pop("upload")
+    timings["compress"] = result.pop("compress")
+    transfer = source.cache.stats()
+    logger.info(
+        f"게임 {game_id} 배포 완료 ({prefix}): {result['files']}개 파일, {result['bytes']} bytes "
+        f"(압축 후 {result['stored_bytes']} bytes) "
+        f"(업로드 {result['uploaded_bytes']} bytes, 복사로 절약 {result['saved_bytes']} bytes, 제외 {result['deleted']}개), "
+        f"zip {source.size} bytes 중 {transfer['bytes_fetched']} bytes / {transfer['requests']}회 요청, {timings}"
+    )
+
+    # 빌드 기록 + gamepath 전환 + 등록 상태 변경을 한 트랜잭션에서 처리
+    build = publishing.record_build(row, source_key, prefix, result)
 
     return {
         "status": "success",
         "game_id": game_id,
-        "gamepath": row.gamepath,
+        "build_id": build.pk,
+        "gamepath": publishing.game_base_url(prefix).rstrip('/'),
+        "files": result["files"],
+        "stored_bytes": result["stored_bytes"],
+        "uploaded_bytes": result["uploaded_bytes"],
+        "saved_bytes": result["saved_bytes"],
+        "deleted": result["deleted"],
+        "bytes_fetched": transfer["bytes_fetched"],
+        "timings": timings,
     }
+
+
+@shared_task
+def prune_game_builds():
+    """
+    롤백용으로 보관 중인 오래된 빌드와 실패한 배포가 남긴 폴더 정리
+    """
+    try:
+        s3 = get_s3_client()
+        game_ids = GameBuild.objects.values_list("game_id", flat=True).distinct()
+        builds = objects = 0
+        for game_id in game_ids:
+            pruned_builds, pruned_objects = publishing.prune_builds(s3, settings.AWS_STORAGE_BUCKET_NAME, game_id)
+            builds += pruned_builds
+            objects += pruned_objects
+        return f"Pruned {builds} game builds ({objects} objects)."
+    except Exception as e:
+        return f"Error in pruning game builds : {str(e)}"
@@ -1,3 +1,595 @@
-from django.test import TestCase
+import gzip
+import hashlib
+import io
+import random
+import re
+import zipfile
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from games.models import Game
+from . import assets, downloads, publishing, remote_zip, tasks
+from .models import GameBuild
+
+
+class FakeBody:
+    """
+    S3 응답 본문 (StreamingBody처럼 read/iter_chunks/close 제공, 읽기 크기 기록)
+    """
+
+    def __init__(self, data):
+        self._data = io.BytesIO(data)
+        self.max_read = 0
+        self.closed = False
+
+    def read(self, size=-1):
+        data = self._data.read(size)
+        self.max_read = max(self.max_read, len(data))
+        return data
+
+    def iter_chunks(self, chunk_size):
+        while True:
+            chunk = self.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+    def close(self):
+        self.closed = True
+
+
+class NoSuchUpload(Exception):
+    pass
+
+
+class FakeS3:
+    """
+    테스트용 S3 클라이언트 (사용하는 메서드만 구현, 객체는 메모리에 보관)
+    """
+
+    exceptions = type("exceptions", (), {"NoSuchUpload": NoSuchUpload})
+
+    def __init__(self):
+        self.objects = {}  # key: {"body", "extra", "last_modified"}
+        self.uploads = {}  # 멀티파트 업로드 id: {"key", "parts": {번호: 본문}}
+        self.calls = []
+        self.bodies = []  # get_object로 돌려준 FakeBody
+
+    def put(self, key, body, **extra):
+        self.objects[key] = {"body": body, "extra": extra, "last_modified": timezone.now()}
+
+    def etag(self, key):
+        return f'"{hashlib.md5(self.objects[key]["body"]).hexdigest()}"'
+
+    def head_object(self, Bucket, Key):
+        self.calls.append(("head_object", Key))
+        item = self.objects[Key]
+        return {"ContentLength": len(item["body"]), "ETag": self.etag(Key), "LastModified": item["last_modified"]}
+
+    def get_object(self, Bucket, Key, Range=None, IfMatch=None):
+        self.calls.append(("get_object", Key, Range))
+        if IfMatch is not None and IfMatch != self.etag(Key):
+            raise AssertionError("ETag mismatch (PreconditionFailed)")
+        body = self.objects[Key]["body"]
+        if Range is not None:
+            start, end = map(int, re.fullmatch(r"bytes=(\d+)-(\d+)", Range).groups())
+            body = body[start:end + 1]
+        self.bodies.append(FakeBody(body))
+        return {"Body": self.bodies[-1], "ContentLength": len(body)}
+
+    def upload_fileobj(self, Fileobj, Bucket, Key, ExtraArgs=None, Config=None):
+        self.calls.append(("upload_fileobj", Key))
+        self.put(Key, Fileobj.read(), **(ExtraArgs or {}))
+
+    def copy(self, CopySource, Bucket, Key, ExtraArgs=None, Config=None):
+        self.calls.append(("copy", CopySource["Key"], Key))
+        extra = {key: value for key, value in (ExtraArgs or {}).items() if key != "MetadataDirective"}
+        self.put(Key, self.objects[CopySource["Key"]]["body"], **extra)
+
+    def create_multipart_upload(self, Bucket, Key, ContentType=None):
+        self.calls.append(("create_multipart_upload", Key))
+        upload_id = f"upload-{len(self.calls_of('create_multipart_upload'))}"
+        self.uploads[upload_id] = {"key": Key, "parts": {}}
+        return {"UploadId": upload_id}
+
+    def generate_presigned_url(self, ClientMethod, Params, ExpiresIn):
+        return f"https://s3.test/{Params['Key']}?method={ClientMethod}&part={Params.get('PartNumber')}"
+
+    def upload_part(self, UploadId, PartNumber, body):
+        # 클라이언트가 presigned URL로 파트를 올린 상황 (반환: ETag)
+        self.uploads[UploadId]["parts"][PartNumber] = body
+        return f'"{hashlib.md5(body).hexdigest()}"'
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        self.calls.append(("complete_multipart_upload", Key))
+        upload = self.uploads.pop(UploadId, None)
+        if upload is None:
+            raise NoSuchUpload(UploadId)
+        body = b""
+        for part in MultipartUpload["Parts"]:
+            data = upload["parts"][part["PartNumber"]]
+            if part["ETag"] != f'"{hashlib.md5(data).hexdigest()}"':
+                raise AssertionError("ETag mismatch (InvalidPart)")
+            body += data
+        self.put(Key, body)
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.calls.append(("abort_multipart_upload", Key))
+        if self.uploads.pop(UploadId, None) is None:
+            raise NoSuchUpload(UploadId)
+
+    def delete_object(self, Bucket, Key):
+        self.calls.append(("delete_object", Key))
+        self.objects.pop(Key, None)
+
+    def delete_objects(self, Bucket, Delete):
+        for item in Delete["Objects"]:
+            self.objects.pop(item["Key"], None)
+
+    def get_paginator(self, name):
+        s3 = self
+
+        class Paginator:
+            def paginate(self, Bucket, Prefix):
+                yield {"Contents": [
+                    {"Key": key, "Size": len(item["body"]), "LastModified": item["last_modified"]}
+                    for key, item in sorted(s3.objects.items())
+                    if key.startswith(Prefix)
+                ]}
+
+        return Paginator()
+
+    def calls_of(self, name):
+        return [call for call in self.calls if call[0] == name]
+
+
+def build_zip(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in files.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+INDEX_HTML = (
+    '<html><head><link rel="stylesheet" href="TemplateData/style.css"></head>'
+    '<body><div id="unity-container"></div>\n'
+    '<script>var buildUrl = "Build";</script></body></html>'
+)
+
+
+class _ReadSizeRecorder:
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+        self.max_read = 0
+
+    def read(self, size=-1):
+        self.max_read = max(self.max_read, size if size >= 0 else float("inf"))
+        return self.fileobj.read(size)
+
+
+class StreamingCompressionTest(SimpleTestCase):
+    def test_compress_stream_reads_in_chunks(self):
+        data = b"console.log('spartagames');\n" * 200000
+        source = _ReadSizeRecorder(io.BytesIO(data))
+        target = io.BytesIO()
+
+        size = assets.compress_stream(source, target, "gzip")
+        self.assertEqual(size, len(target.getvalue()))
+        self.assertEqual(gzip.decompress(target.getvalue()), data)
+        self.assertLessEqual(source.max_read, assets.COMPRESS_CHUNK_SIZE)
+
+    def test_compress_stream_is_deterministic(self):
+        data = b"x" * 5000
+        first, second = io.BytesIO(), io.BytesIO()
+        assets.compress_stream(io.BytesIO(data), first, "gzip")
+        assets.compress_stream(io.BytesIO(data), second, "gzip", chunk_size=7)
+        self.assertEqual(first.getvalue(), second.getvalue())
+
+    def test_large_files_are_compressed(self):
+        # 압축 결과를 임시 파일에 두므로 크기 상한 없음
+        self.assertEqual(
+            assets.plan_headers("Build/game.data", 1024 * 1024 * 1024),
+            ("application/octet-stream", "gzip", True),
+        )
+        self.assertEqual(assets.plan_headers("Build/game.js", 100), ("application/javascript", "identity", False))
+        self.assertEqual(assets.plan_headers("Build/game.wasm.gz", 10000), ("application/wasm", "gzip", False))
+
+    @override_settings(AWS_S3_CUSTOM_DOMAIN="cdn.test")
+    def test_publish_streams_compressed_members(self):
+        script = b"function f() { return 1; }\n" * 100000
+        files = {"index.html": INDEX_HTML, "Build/game.js": script, "Build/game.wasm.gz": b"\x1f\x8b" + b"\0" * 2000}
+        s3 = FakeS3()
+        source = io.BytesIO(build_zip(files))
+
+        result = publishing.publish_archive(s3, source, "bucket", "media/games/1/v1/", "https://cdn.test/media/games/1/v1/")
+        uploaded = s3.objects["media/games/1/v1/Build/game.js"]
+        self.assertEqual(gzip.decompress(uploaded["body"]), script)
+        self.assertEqual(uploaded["extra"]["ContentEncoding"], "gzip")
+        self.assertEqual(uploaded["extra"]["CacheControl"], assets.IMMUTABLE_CACHE_CONTROL)
+
+        manifest = {entry["path"]: entry for entry in result["manifest"]}
+        self.assertEqual(manifest["Build/game.js"]["sha256"], hashlib.sha256(script).hexdigest())
+        self.assertEqual(manifest["Build/game.js"]["stored_size"], len(uploaded["body"]))
+        self.assertEqual(manifest["Build/game.wasm.gz"]["stored_size"], 2002)
+        index = s3.objects["media/games/1/v1/index.html"]
+        self.assertEqual(index["extra"]["ContentEncoding"], "identity")  # COMPRESS_MIN_SIZE 미만
+        self.assertIn(b'"https://cdn.test/media/games/1/v1/Build"', index["body"])
+
+
+def publish(s3, files, prefix, previous_build=None):
+    source = io.BytesIO(build_zip(files))
+    return publishing.publish_archive(
+        s3, source, "bucket", prefix, publishing.game_base_url(prefix),
+        previous=previous_build["manifest"] if previous_build else None,
+        previous_prefix=previous_build["prefix"] if previous_build else None,
+    )
+
+
+@override_settings(AWS_S3_CUSTOM_DOMAIN="cdn.test")
+class PublishArchiveTest(SimpleTestCase):
+    def setUp(self):
+        self.s3 = FakeS3()
+        self.files = {
+            "index.html": INDEX_HTML,
+            "Build/game.js": b"var game = 1;\n" * 1000,
+            "Build/game.data": bytes(range(256)) * 100,
+            "TemplateData/logo.png": b"\x89PNG" + b"\1" * 500,
+        }
+
+    def test_first_publish_uploads_everything(self):
+        result = publish(self.s3, self.files, "media/games/1/v1/")
+        self.assertEqual(result["files"], 4)
+        self.assertEqual(len(self.s3.calls_of("upload_fileobj")), 4)
+        self.assertEqual(self.s3.calls_of("copy"), [])
+        self.assertEqual(result["saved_bytes"], 0)
+        self.assertEqual(result["deleted"], 0)
+        self.assertEqual(self.s3.objects["media/games/1/v1/TemplateData/logo.png"]["extra"]["ContentType"], "image/png")
+        publishing.verify_prefix(self.s3, "bucket", "media/games/1/v1/", result["manifest"])
+
+    def test_unchanged_files_are_copied_from_previous_build(self):
+        first = publish(self.s3, self.files, "media/games/1/v1/")
+        previous = {
+            "manifest": {entry["path"]: entry for entry in first["manifest"]},
+            "prefix": "media/games/1/v1/",
+        }
+        files = dict(self.files)
+        files["Build/game.js"] = b"var game = 2;\n" * 1000
+        del files["TemplateData/logo.png"]
+        files["TemplateData/new.png"] = b"\x89PNG" + b"\2" * 300
+        self.s3.calls.clear()
+
+        result = publish(self.s3, files, "media/games/1/v2/", previous)
+        # index.html은 주소가 바뀌므로 항상 업로드
+        self.assertEqual(
+            sorted(call[1] for call in self.s3.calls_of("upload_fileobj")),
+            ["media/games/1/v2/Build/game.js", "media/games/1/v2/TemplateData/new.png", "media/games/1/v2/index.html"],
+        )
+        self.assertEqual(
+            self.s3.calls_of("copy"),
+            [("copy", "media/games/1/v1/Build/game.data", "media/games/1/v2/Build/game.data")],
+        )
+        copied = self.s3.objects["media/games/1/v2/Build/game.data"]
+        self.assertEqual(copied["body"], self.s3.objects["media/games/1/v1/Build/game.data"]["body"])
+        self.assertEqual(copied["extra"]["CacheControl"], assets.IMMUTABLE_CACHE_CONTROL)
+        self.assertEqual(result["saved_bytes"], len(self.files["Build/game.data"]))
+        self.assertEqual(result["deleted"], 1)
+
+        manifest = {entry["path"]: entry for entry in result["manifest"]}
+        self.assertEqual(manifest["Build/game.data"], previous["manifest"]["Build/game.data"])
+        self.assertNotEqual(manifest["Build/game.js"]["sha256"], previous["manifest"]["Build/game.js"]["sha256"])
+        publishing.verify_prefix(self.s3, "bucket", "media/games/1/v2/", result["manifest"])
+        # 이전 버전 폴더는 수정하지 않음
+        self.assertIn("media/games/1/v1/TemplateData/logo.png", self.s3.objects)
+
+    def test_removed_members_are_dropped_from_new_build(self):
+        first = publish(self.s3, self.files, "media/games/1/v1/")
+        previous = {"manifest": {entry["path"]: entry for entry in first["manifest"]}, "prefix": "media/games/1/v1/"}
+        files = {name: data for name, data in self.files.items() if name != "Build/game.data"}
+
+        result = publish(self.s3, files, "media/games/1/v2/", previous)
+        self.assertEqual(result["deleted"], 1)
+        self.assertNotIn("Build/game.data", {entry["path"] for entry in result["manifest"]})
+        self.assertNotIn("media/games/1/v2/Build/game.data", self.s3.objects)
+        self.assertNotIn(("copy", "media/games/1/v1/Build/game.data", "media/games/1/v2/Build/game.data"), self.s3.calls)
+        # 이전 빌드 폴더의 파일은 롤백용으로 남음 (prune_builds에서 정리)
+        self.assertIn("media/games/1/v1/Build/game.data", self.s3.objects)
+
+    def test_byte_accounting(self):
+        first = publish(self.s3, self.files, "media/games/1/v1/")
+        sizes = {entry["path"]: entry["size"] for entry in first["manifest"]}
+        self.assertEqual(first["bytes"], sum(sizes.values()))
+        self.assertEqual(first["uploaded_bytes"], first["bytes"])
+        self.assertEqual(
+            first["stored_bytes"],
+            sum(len(item["body"]) for key, item in self.s3.objects.items() if key.startswith("media/games/1/v1/")),
+        )
+        self.assertLess(first["stored_bytes"], first["bytes"])  # game.js는 압축되어 저장
+
+        previous = {"manifest": {entry["path"]: entry for entry in first["manifest"]}, "prefix": "media/games/1/v1/"}
+        files = dict(self.files)
+        files["Build/game.js"] = b"var game = 2;\n" * 1000
+        result = publish(self.s3, files, "media/games/1/v2/", previous)
+        self.assertEqual(result["uploaded_bytes"], sizes["index.html"] + sizes["Build/game.js"])
+        self.assertEqual(result["saved_bytes"], sizes["Build/game.data"] + sizes["TemplateData/logo.png"])
+        self.assertEqual(result["uploaded_bytes"] + result["saved_bytes"], result["bytes"])
+
+    def test_same_size_and_crc_with_changed_headers_is_uploaded(self):
+        first = publish(self.s3, self.files, "media/games/1/v1/")
+        manifest = {entry["path"]: dict(entry) for entry in first["manifest"]}
+        manifest["Build/game.js"]["content_encoding"] = "identity"  # 이전 압축 정책으로 배포된 파일
+        self.s3.calls.clear()
+
+        publish(self.s3, self.files, "media/games/1/v2/", {"manifest": manifest, "prefix": "media/games/1/v1/"})
+        self.assertIn(("upload_fileobj", "media/games/1/v2/Build/game.js"), self.s3.calls)
+        self.assertEqual(len(self.s3.calls_of("copy")), 2)
+
+    def test_verify_prefix_detects_missing_and_truncated_objects(self):
+        result = publish(self.s3, self.files, "media/games/1/v1/")
+        del self.s3.objects["media/games/1/v1/Build/game.data"]
+        with self.assertRaises(publishing.PublishError):
+            publishing.verify_prefix(self.s3, "bucket", "media/games/1/v1/", result["manifest"])
+
+        result = publish(self.s3, self.files, "media/games/1/v2/")
+        self.s3.objects["media/games/1/v2/Build/game.js"]["body"] = b"truncated"
+        with self.assertRaises(publishing.PublishError):
+            publishing.verify_prefix(self.s3, "bucket", "media/games/1/v2/", result["manifest"])
+
+
+@override_settings(AWS_S3_CUSTOM_DOMAIN="cdn.test")
+class GameBuildTest(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="maker@test.com", nickname="maker", password="password1!", login_type="DEFAULT"
+        )
+        self.game = Game.objects.create(
+            title="game", thumbnail="images/thumbnail/test.png", maker=self.user, content="content",
+            gamefile="zips/test.zip", star=0, review_cnt=0, register_state=0,
+        )
+        self.s3 = FakeS3()
+
+    def record(self, version, files):
+        prefix = f"media/games/{self.game.pk}/{version}/"
+        result = publish(self.s3, files, prefix)
+        publishing.verify_prefix(self.s3, "bucket", prefix, result["manifest"])
+        return publishing.record_build(self.game, "media/zips/test.zip", prefix, result)
+
+    def test_record_build_activates_and_rollback_restores(self):
+        first = self.record("v1", {"index.html": INDEX_HTML, "Build/game.js": b"1" * 2000})
+        self.game.refresh_from_db()
+        self.assertEqual(self.game.register_state, 1)
+        self.assertEqual(self.game.gamepath, f"https://cdn.test/media/games/{self.game.pk}/v1")
+        self.assertEqual(first.files.count(), 2)
+
+        second = self.record("v2", {"index.html": INDEX_HTML, "Build/game.js": b"2" * 2000})
+        first.refresh_from_db()
+        self.assertFalse(first.is_active)
+        self.assertEqual(publishing.get_active_build(self.game), second)
+
+        self.assertEqual(publishing.rollback_build(self.game), first)
+        self.game.refresh_from_db()
+        self.assertEqual(self.game.gamepath, f"https://cdn.test/media/games/{self.game.pk}/v1")
+        self.assertEqual(list(GameBuild.objects.filter(is_active=True)), [first])
+
+        # 지정한 빌드로 되돌리기
+        self.assertEqual(publishing.rollback_build(self.game, build_id=second.pk), second)
+        self.game.refresh_from_db()
+        self.assertEqual(self.game.gamepath, f"https://cdn.test/media/games/{self.game.pk}/v2")
+        self.assertIsNone(publishing.rollback_build(self.game, build_id=0))
+
+    def test_rollback_without_older_build(self):
+        self.record("v1", {"index.html": INDEX_HTML})
+        self.assertIsNone(publishing.rollback_build(self.game))
+
+    def prefix_keys(self, version):
+        prefix = f"media/games/{self.game.pk}/{version}/"
+        return [key for key in self.s3.objects if key.startswith(prefix)]
+
+    def test_prune_keeps_active_and_recent_builds(self):
+        builds = [self.record(f"v{i}", {"index.html": INDEX_HTML, "Build/game.js": b"%d" % i * 2000}) for i in range(1, 7)]
+        publishing.rollback_build(self.game, build_id=builds[0].pk)  # 가장 오래된 빌드가 활성
+
+        # 기록 없이 남은 폴더: 오래된 것은 삭제, 업로드 중일 수 있는 최근 것은 유지
+        self.s3.put(f"media/games/{self.game.pk}/failed/index.html", b"old")
+        self.s3.objects[f"media/games/{self.game.pk}/failed/index.html"]["last_modified"] -= timedelta(days=2)
+        self.s3.put(f"media/games/{self.game.pk}/uploading/index.html", b"new")
+        self.s3.put(f"media/games/{self.game.pk}/legacy.html", b"root")  # 버전 폴더 밖의 파일
+
+        pruned, deleted = publishing.prune_builds(self.s3, "bucket", self.game.pk, keep=3)
+        self.assertEqual(pruned, 2)
+        self.assertEqual(deleted, 2 + 2 + 1)
+        self.assertEqual(
+            set(GameBuild.objects.values_list("pk", flat=True)), {builds[0].pk, builds[3].pk, builds[4].pk, builds[5].pk}
+        )
+        for version in ["v2", "v3", "failed"]:
+            self.assertEqual(self.prefix_keys(version), [])
+        for version in ["v1", "v4", "v5", "v6", "uploading"]:
+            self.assertTrue(self.prefix_keys(version))
+        self.assertIn(f"media/games/{self.game.pk}/legacy.html", self.s3.objects)
+        self.game.refresh_from_db()
+        self.assertEqual(self.game.gamepath, f"https://cdn.test/media/games/{self.game.pk}/v1")
+
+    def test_prune_keeps_prefix_shared_with_retained_build(self):
+        # 버전 폴더 도입 전 방식: 여러 빌드가 같은 폴더 사용
+        builds = [self.record("shared", {"index.html": INDEX_HTML}) for _ in range(3)]
+        pruned, deleted = publishing.prune_builds(self.s3, "bucket", self.game.pk, keep=1)
+        self.assertEqual((pruned, deleted), (1, 0))
+        self.assertFalse(GameBuild.objects.filter(pk=builds[0].pk).exists())
+        self.assertTrue(self.prefix_keys("shared"))
+
+    def test_prune_task(self):
+        for i in range(1, 6):
+            self.record(f"v{i}", {"index.html": INDEX_HTML})
+        with mock.patch("qnas.tasks.get_s3_client", return_value=self.s3):
+            self.assertEqual(tasks.prune_game_builds(), "Pruned 1 game builds (1 objects).")
+        self.assertEqual(GameBuild.objects.count(), 4)
+
+
+class S3RangeFileTest(SimpleTestCase):
+    def setUp(self):
+        self.s3 = FakeS3()
+        self.files = {
+            "index.html": INDEX_HTML,
+            "Build/game.data": random.Random(0).randbytes(2 * 1024 * 1024),  # 압축되지 않는 2MB
+            "Build/game.js": b"var game = 1;\n" * 100,
+        }
+        self.s3.put("media/zips/game.zip", build_zip(self.files))
+
+    def test_zipfile_reads_members_with_range_requests(self):
+        archive, remote = remote_zip.open_remote_zip(self.s3, "bucket", "media/zips/game.zip")
+        with archive:
+            self.assertEqual(sorted(archive.namelist()), sorted(self.files))
+            for name, data in self.files.items():
+                self.assertEqual(archive.read(name), data.encode() if isinstance(data, str) else data)
+
+        gets = self.s3.calls_of("get_object")
+        self.assertTrue(gets)
+        self.assertTrue(all(call[2] is not None for call in gets))  # 전체 객체 요청 없음
+        self.assertEqual(remote.cache.stats()["requests"], len(gets))
+
+    def test_only_needed_ranges_are_fetched(self):
+        archive, remote = remote_zip.open_remote_zip(self.s3, "bucket", "media/zips/game.zip")
+        with archive:
+            archive.read("Build/game.js")
+        # 큰 멤버(game.data)는 읽지 않았으므로 받은 크기가 zip 크기보다 훨씬 작음
+        self.assertLess(remote.cache.stats()["bytes_fetched"], remote.size // 2)
+
+    def test_small_reads_share_cached_blocks(self):
+        remote = remote_zip.S3RangeFile(self.s3, "bucket", "media/zips/game.zip")
+        first = remote.read(100)
+        remote.seek(10)
+        self.assertEqual(remote.read(50), first[10:60])
+        clone = remote.clone()
+        clone.seek(20)
+        self.assertEqual(clone.read(10), first[20:30])
+        self.assertEqual(remote.cache.stats()["requests"], 1)
+
+    def test_seek_and_read_bounds(self):
+        remote = remote_zip.S3RangeFile(self.s3, "bucket", "media/zips/game.zip")
+        body = self.s3.objects["media/zips/game.zip"]["body"]
+        self.assertEqual(remote.seek(-10, io.SEEK_END), len(body) - 10)
+        self.assertEqual(remote.read(), body[-10:])
+        self.assertEqual(remote.read(5), b"")
+        remote.seek(0)
+        self.assertEqual(remote.read(remote_zip.DIRECT_READ_SIZE + 1), body[:remote_zip.DIRECT_READ_SIZE + 1])
+        with self.assertRaises(ValueError):
+            remote.seek(-1)
+
+
+@override_settings(GAME_DOWNLOAD_MODE="stream", AWS_STORAGE_BUCKET_NAME="bucket")
+class GameDownloadTest(TestCase):
+    def setUp(self):
+        self.staff = get_user_model().objects.create_user(
+            email="admin@test.com", nickname="admin", password="password1!", login_type="DEFAULT", is_staff=True
+        )
+        self.game = Game.objects.create(
+            title="game", thumbnail="images/thumbnail/test.png", maker=self.staff, content="content",
+            gamefile="zips/game.zip", star=0, review_cnt=0, register_state=0,
+        )
+        self.data = random.Random(0).randbytes(5 * downloads.DOWNLOAD_CHUNK + 123)
+        self.s3 = FakeS3()
+        self.s3.put("media/zips/game.zip", self.data)
+        patcher = mock.patch("qnas.views.get_s3_client", return_value=self.s3)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.staff)
+        self.url = f"/directs/api/list/{self.game.pk}/dzip/"
+
+    def test_streams_in_bounded_chunks(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Length"], str(len(self.data)))
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="game.zip"')
+
+        received = 0
+        for chunk in response.streaming_content:
+            self.assertLessEqual(len(chunk), downloads.DOWNLOAD_CHUNK)
+            self.assertEqual(chunk, self.data[received:received + len(chunk)])
+            received += len(chunk)
+        self.assertEqual(received, len(self.data))
+
+        body = self.s3.bodies[-1]
+        self.assertLessEqual(body.max_read, downloads.DOWNLOAD_CHUNK)
+        self.assertTrue(body.closed)
+        self.assertEqual(self.s3.calls_of("get_object")[-1][2], None)  # 전체 전송은 Range 없이 요청
+
+    def test_range_request(self):
+        response = self.client.get(self.url, HTTP_RANGE="bytes=100-199")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], f"bytes 100-199/{len(self.data)}")
+        self.assertEqual(b"".join(response.streaming_content), self.data[100:200])
+        self.assertEqual(self.s3.calls_of("get_object")[-1][2], "bytes=100-199")
+
+        response = self.client.get(self.url, HTTP_RANGE="bytes=-10")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b"".join(response.streaming_content), self.data[-10:])
+
+    def test_unsatisfiable_range(self):
+        response = self.client.get(self.url, HTTP_RANGE=f"bytes={len(self.data)}-")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], f"bytes */{len(self.data)}")
+        self.assertEqual(self.s3.calls_of("get_object"), [])
+
+    def test_if_range_mismatch_sends_full_body(self):
+        response = self.client.get(self.url, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Length"], str(len(self.data)))
+
+    def test_if_none_match(self):
+        etag = self.s3.etag("media/zips/game.zip")
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(self.s3.calls_of("get_object"), [])
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH='"other"')
+        self.assertEqual(response.status_code, 200)
+
+    def test_redirect_mode(self):
+        self.s3.generate_presigned_url = mock.Mock(return_value="https://s3.test/presigned")
+        response = self.client.get(self.url, {"mode": "redirect"})
+        self.assertEqual(response.status_code, 303)
+        self.assertEqual(response["Location"], "https://s3.test/presigned")
+
+        response = self.client.get(self.url, {"mode": "inline"})
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(AWS_S3_CUSTOM_DOMAIN="cdn.test")
+class GameBuildsViewTest(TestCase):
+    def setUp(self):
+        self.staff = get_user_model().objects.create_user(
+            email="admin@test.com", nickname="admin", password="password1!", login_type="DEFAULT", is_staff=True
+        )
+        self.game = Game.objects.create(
+            title="game", thumbnail="images/thumbnail/test.png", maker=self.staff, content="content",
+            gamefile="zips/game.zip", star=0, review_cnt=0, register_state=1,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.staff)
+        self.url = f"/directs/api/admin/list/{self.game.pk}/builds/"
+
+    def test_non_integer_build_id(self):
+        response = self.client.post(self.url, {"build_id": "abc"}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_rollback_to_build(self):
+        first = GameBuild.objects.create(game=self.game, source="media/zips/a.zip", prefix="media/games/1/v1/")
+        GameBuild.objects.create(
+            game=self.game, source="media/zips/b.zip", prefix="media/games/1/v2/", is_active=True
+        )
+        response = self.client.post(self.url, {"build_id": str(first.pk)}, format="json")
+        self.assertEqual(response.status_code, 200)
+        first.refresh_from_db()
+        self.assertTrue(first.is_active)
+
+        response = self.client.post(self.url, {"build_id": 0}, format="json")
+        self.assertEqual(response.status_code, 404)
@@ -14,12 +14,14 @@ urlpatterns = [
     path("api/admin/stats/", views.get_stats, name="game_stats"),
     path("api/admin/list/", views.game_register_list, name="game_register_list"),
     path("api/admin/list/<int:game_id>/", views.game_register_logs_all, name="game_register_logs_all"),
+    path("api/admin/list/<int:game_id>/builds/", views.game_builds, name="game_builds"),
     # path("api/list/<int:game_id>/register/", views.game_register, name="game_register"),
     path("api/list/<int:game_id>/register/", views.game_register_v2, name="game_register"),
     path("api/list/task-status/<uuid:task_id>/", views.get_task_status, name="get_task_status"),
     path("api/list/<int:game_id>/deny/", views.game_register_deny, name="game_register_deny"),
     path("api/denylog/<int:game_id>/", views.deny_log, name="deny_log"),
     path('api/list/<int:game_id>/dzip/', views.game_dzip, name='game_dzip'),
+    path('api/list/<int:game_id>/files/', views.game_zip_files, name='game_zip_files'),
     # 작업예정
     # path('api/admin/makers/', views.maker_list, name='maker_list'),
     
@@ -3,24 +3,24 @@ import os
 import re
 import zipfile
 
-import boto3
-
 from django.conf import settings
 from django.core.files.storage import FileSystemStorage
 from django.db.models import Q
-from django.http import FileResponse
 from django.shortcuts import render, get_object_or_404
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from spartagames import config
+from . import downloads, publishing
 from .models import (
+    GameBuild,
     GameRegisterLog,
     QnA,
 )
 from .pagination import (
     GameRegisterListPagination,
 )
+from .remote_zip import open_remote_zip
 from .serializers import (
     QnAPostListSerializer,
     CategorySerializer,
@@ -30,7 +30,7 @@ from games.models import (
     Game,
 )
 
-from spartagames.utils import std_response
+from spartagames.utils import get_s3_client, std_response
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated  # 로그인 인증토큰
@@ -165,6 +165,7 @@ def get_stats(request):
         "state_ready": rows.filter(register_state=0).count(),
         "state_ok": rows.filter(register_state=1).count(),
         "state_deny": rows.filter(register_state=2).count(),
+        "state_validating": rows.filter(register_state=3).count(),
     }
     
     return std_response(
@@ -249,6 +250,79 @@ def game_register_logs_all(request, game_id):
     )
 
 
+# 관리자용 게임 빌드(배포 버전) 목록 / 롤백
+@api_view(['GET', 'POST'])
+def game_builds(request, game_id):
+    if request.user.is_staff == False:
+        return std_response(
+            message="관리자 권한이 필요합니다.",
+            status="fail",
+            error_code="CLIENT_FAIL",
+            status_code=status.HTTP_403_FORBIDDEN
+        )
+
+    try:
+        game = Game.objects.get(pk=game_id, is_visible=True)
+    except Game.DoesNotExist:
+        return std_response(
+            status="error",
+            error_code="SERVER_FAIL",
+            status_code=status.HTTP_404_NOT_FOUND
+        )
+
+    if request.method == "POST":
+        # build_id가 없으면 현재 빌드 바로 이전 빌드로 되돌림
+        build_id = request.data.get("build_id")
+        if build_id in (None, ""):
+            build_id = None
+        else:
+            try:
+                build_id = int(build_id)
+            except (TypeError, ValueError):
+                return std_response(
+                    message="build_id가 올바르지 않습니다.",
+                    status="fail",
+                    error_code="CLIENT_FAIL",
+                    status_code=status.HTTP_400_BAD_REQUEST
+                )
+        build = publishing.rollback_build(game, build_id)
+        if build is None:
+            return std_response(
+                message="되돌릴 빌드가 없습니다.",
+                status="fail",
+                error_code="CLIENT_FAIL",
+                status_code=status.HTTP_404_NOT_FOUND
+            )
+        GameRegisterLog.objects.create(
+            recoder=request.user,
+            maker=game.maker,
+            game=game,
+            content=f"롤백 (빌드: {build.pk}, 기록자: {request.user.email})",
+        )
+
+    rows = GameBuild.objects.filter(game=game).order_by("-created_at", "-pk")
+    data = [
+        {
+            "id": build.pk,
+            "gamepath": publishing.game_base_url(build.prefix).rstrip('/'),
+            "is_active": build.is_active,
+            "file_count": build.file_count,
+            "total_bytes": build.total_bytes,
+            "uploaded_bytes": build.uploaded_bytes,
+            "saved_bytes": build.saved_bytes,
+            "created_at": build.created_at,
+            "activated_at": build.activated_at,
+        }
+        for build in rows
+    ]
+    return std_response(
+        data=data,
+        message="빌드를 되돌렸습니다." if request.method == "POST" else None,
+        status="success",
+        status_code=status.HTTP_200_OK
+    )
+
+
 #-------------------------------#
 # Deprecated APIView (20250730) #
 #-------------------------------#
@@ -280,20 +354,10 @@ def game_register(request, game_id):
     # ~/<업로드시각>_<압축파일명>.zip 에서 '<업로드시각>_<압축파일명>' 추출
     game_folder = path.split('/')[-1].split('.')[0]
 
-    s3 = boto3.client(
-        's3',
-        aws_access_key_id=config.AWS_AUTH["aws_access_key_id"],
-        aws_secret_access_key=config.AWS_AUTH["aws_secret_access_key"],
-        region_name='ap-northeast-2'
-    )
-    
-    # S3에서 zip 파일을 읽어옴
-    zip_resp = s3.get_object(Bucket=config.AWS_S3_BUCKET_NAME, Key=path)
+    s3 = get_s3_client()
 
-    # BytesIO를 사용하여 메모리에 파일 데이터를 읽음
-    zip_data = io.BytesIO(zip_resp['Body'].read())
-
-    zip_ref = zipfile.ZipFile(zip_data)
+    # S3의 zip 파일을 전부 받지 않고 필요한 구간만 Range 요청으로 읽음
+    zip_ref, _ = open_remote_zip(s3, config.AWS_S3_BUCKET_NAME, path)
 
     """
     index.html 내용 수정
@@ -488,7 +552,7 @@ def game_register_deny(request, game_id):
             status_code=status.HTTP_404_NOT_FOUND
         )
     game.register_state = 2
-    game.save()
+    game.save(update_fields=["register_state", "updated_at"])
     
     # 등록 거부 사유 로그 추가
     GameRegisterLog.objects.create(
@@ -507,8 +571,10 @@ def game_register_deny(request, game_id):
     )
 
 
-# FileResponse 이므로 std_response로 변경하지 않음
-@api_view(['POST'])
+# 파일 응답(스트리밍/리다이렉트)이므로 std_response로 변경하지 않음
+# ?mode=stream(기본, GAME_DOWNLOAD_MODE 설정): S3 본문을 청크 단위로 전달, Range/If-None-Match 지원
+# ?mode=redirect: 짧게 유효한 presigned GET URL로 303 응답
+@api_view(['GET', 'POST'])
 # @permission_classes([IsAuthenticated])
 def game_dzip(request, game_id):
     # 관리자 여부 확인
@@ -520,6 +586,15 @@ def game_dzip(request, game_id):
             status_code=status.HTTP_403_FORBIDDEN
         )
 
+    mode = request.query_params.get("mode", settings.GAME_DOWNLOAD_MODE)
+    if mode not in downloads.DOWNLOAD_MODES:
+        return std_response(
+            message=f"mode는 {', '.join(downloads.DOWNLOAD_MODES)} 중 하나여야 합니다.",
+            status="fail",
+            error_code="CLIENT_FAIL",
+            status_code=status.HTTP_400_BAD_REQUEST
+        )
+
     try:
         row = Game.objects.get(pk=game_id, is_visible=True, register_state=0)
     except Game.DoesNotExist:
@@ -530,24 +605,79 @@ def game_dzip(request, game_id):
         )
     zip_path = "media/" + row.gamefile.name
     zip_name = os.path.basename(zip_path)
-    s3_client = boto3.client(
-        's3',
-        aws_access_key_id=config.AWS_AUTH["aws_access_key_id"],
-        aws_secret_access_key=config.AWS_AUTH["aws_secret_access_key"],
-        region_name='ap-northeast-2'
-    )
-    s3_response = s3_client.get_object(Bucket=config.AWS_S3_BUCKET_NAME, Key=zip_path)
-    file_stream = s3_response['Body'].read()
+    s3_client = get_s3_client()
+    bucket = settings.AWS_STORAGE_BUCKET_NAME
 
-    # 메모리 스트림을 FileResponse로 반환
-    response = FileResponse(io.BytesIO(file_stream), content_type='application/zip')
+    if mode == "redirect":
+        return downloads.redirect_to_s3_object(s3_client, bucket, zip_path, zip_name)
+    # 'Content-Disposition' 헤더로 zip_name 이름의 파일로 다운로드
+    return downloads.stream_s3_object(request, s3_client, bucket, zip_path, zip_name)
 
-    # 'Content-Disposition' value 값(HTTP Response 헤더값)을 설정
-    # 파일 이름을 zip_name 으로 다운로드 폴더에 받겠다는 뜻
-    response['Content-Disposition'] = f'attachment; filename="{zip_name}"'
 
-    # FileResponse 객체를 리턴
-    return response
+# 업로드된 zip의 파일 목록 (관리자 검수용, zip 전체를 받지 않고 중앙 디렉터리만 읽음)
+@api_view(['GET'])
+def game_zip_files(request, game_id):
+    # 관리자 여부 확인
+    if request.user.is_staff == False:
+        return std_response(
+            message="관리자 권한이 필요합니다.",
+            status="fail",
+            error_code="CLIENT_FAIL",
+            status_code=status.HTTP_403_FORBIDDEN
+        )
+
+    try:
+        row = Game.objects.get(pk=game_id, is_visible=True)
+    except Game.DoesNotExist:
+        return std_response(
+            status="error",
+            error_code="SERVER_FAIL",
+            status_code=status.HTTP_404_NOT_FOUND
+        )
+    if not row.gamefile:
+        return std_response(
+            message="업로드된 게임 파일이 없습니다.",
+            status="fail",
+            error_code="CLIENT_FAIL",
+            status_code=status.HTTP_404_NOT_FOUND
+        )
+
+    try:
+        zip_ref, remote = open_remote_zip(get_s3_client(), settings.AWS_STORAGE_BUCKET_NAME, f"media/{row.gamefile.name}")
+        with zip_ref:
+            files = [
+                {
+                    "name": info.filename,
+                    "size": info.file_size,
+                    "compressed_size": info.compress_size,
+                }
+                for info in zip_ref.infolist()
+                if not info.is_dir()
+            ]
+    except zipfile.BadZipFile:
+        return std_response(
+            message="zip 파일 형식이 올바르지 않습니다.",
+            status="fail",
+            error_code="CLIENT_FAIL",
+            status_code=status.HTTP_400_BAD_REQUEST
+        )
+    except Exception as e:
+        return std_response(
+            message=f"S3에서 zip 파일을 읽지 못했습니다: {str(e)}",
+            status="error",
+            error_code="THIRD_FAIL",
+            status_code=status.HTTP_502_BAD_GATEWAY
+        )
+
+    return std_response(
+        data={
+            "zip_size": remote.size,
+            "has_index": any(file["name"] == "index.html" for file in files),
+            "files": files,
+        },
+        status="success",
+        status_code=status.HTTP_200_OK
+    )
 
 
 # 게임 등록 거부 사유 불러오는 API
@@ -1,5 +1,253 @@
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class CursorModeMixin:
+    """
+    PageNumberPagination에 커서(keyset) 모드를 추가하는 Mixin
+    - ?pagination=cursor 일 때만 동작하며, 그 외에는 기존 페이지 번호 방식 그대로 사용
+    - 정렬 기준 (예: -created_at, -id) 의 마지막 값을 커서로 넘겨 OFFSET 없이 다음 페이지 조회
+    - count는 기본 null, ?count=approx (PostgreSQL 실행 계획 추정치) / ?count=exact 로 요청 가능
+    - 리스트(고정 항목 포함 등)나 관계 필드 정렬처럼 커서로 표현할 수 없으면 페이지 번호 방식으로 처리
+    """
+    mode_query_param = 'pagination'
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    cursor_ordering = ('-created_at', '-id')  # 정렬되지 않은 queryset에 적용할 기본 정렬
+
+    cursor_mode = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_mode = False
+        if request.query_params.get(self.mode_query_param) != 'cursor' or not isinstance(queryset, QuerySet):
+            return super().paginate_queryset(queryset, request, view)
+
+        ordering = self._get_cursor_ordering(queryset)
+        if ordering is None:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.cursor_mode = True
+        self.request = request
+        self.ordering = ordering
+        self.page_size = self.get_page_size(request)
+        self.count = self._get_cursor_count(queryset, request)
+
+        values, reverse = self._decode_cursor(request)
+        if reverse:
+            queryset = queryset.order_by(*[self._invert(field) for field in ordering])
+        else:
+            queryset = queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(self._keyset_filter(ordering, values, reverse))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+
+        # 뒤로 이동한 경우: 다음 페이지는 항상 존재, 이전 페이지는 추가로 조회된 행이 있을 때만 존재
+        # 앞으로 이동한 경우: 커서가 있으면 이전 페이지 존재, 다음 페이지는 추가로 조회된 행이 있을 때만 존재
+        self.has_next = True if reverse else has_more
+        self.has_previous = has_more if reverse else values is not None
+        self.first_values = self._get_values(results[0], ordering) if results else values
+        self.last_values = self._get_values(results[-1], ordering) if results else values
+        return results
+
+    def get_paginated_response(self, data):
+        if not self.cursor_mode:
+            return super().get_paginated_response(data)
+        return Response({
+            'count': self.count,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_next_link(self):
+        if not self.cursor_mode:
+            return super().get_next_link()
+        if not self.has_next or self.last_values is None:
+            return None
+        return self._build_link(self.last_values, reverse=False)
+
+    def get_previous_link(self):
+        if not self.cursor_mode:
+            return super().get_previous_link()
+        if not self.has_previous or self.first_values is None:
+            return None
+        return self._build_link(self.first_values, reverse=True)
+
+    def _build_link(self, values, reverse):
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, self._encode_cursor(values, reverse))
+
+    # 정렬 기준
+    @staticmethod
+    def _invert(field):
+        return field[1:] if field.startswith('-') else '-' + field
+
+    def _get_cursor_ordering(self, queryset):
+        ordering = list(queryset.query.order_by) or list(queryset.model._meta.ordering) or list(self.cursor_ordering)
+        if not all(isinstance(field, str) for field in ordering):
+            return None
+
+        names = [field.lstrip('-') for field in ordering]
+        for name in names:
+            if name in ('pk', 'id') or name in queryset.query.annotations:
+                continue
+            if '__' in name:
+                return None
+            try:
+                field = queryset.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                return None
+            if field.null or not field.concrete:
+                return None
+
+        # 값이 같은 행이 있을 수 있으므로 pk를 마지막 정렬 기준으로 추가
+        if 'pk' not in names and 'id' not in names:
+            ordering.append('-pk' if ordering[-1].startswith('-') else 'pk')
+        return ordering
+
+    def _get_values(self, obj, ordering):
+        values = []
+        for field in ordering:
+            name = field.lstrip('-')
+            if name in ('pk', 'id'):
+                values.append(obj.pk)
+            else:
+                try:
+                    name = obj._meta.get_field(name).attname
+                except FieldDoesNotExist:
+                    pass
+                values.append(getattr(obj, name))
+        return values
+
+    def _keyset_filter(self, ordering, values, reverse):
+        # (a, b, c) 정렬일 때: a < x OR (a = x AND b < y) OR (a = x AND b = y AND c < z)
+        query = Q()
+        for index, field in enumerate(ordering):
+            descending = field.startswith('-') != reverse
+            name = field.lstrip('-')
+            condition = Q(**{prev.lstrip('-'): values[j] for j, prev in enumerate(ordering[:index])})
+            condition &= Q(**{f"{name}__{'lt' if descending else 'gt'}": values[index]})
+            query |= condition
+        return query
+
+    # 커서 인코딩
+    @staticmethod
+    def _to_json(value):
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        if isinstance(value, Decimal):
+            return str(value)
+        return value
+
+    def _encode_cursor(self, values, reverse):
+        payload = {'v': [self._to_json(value) for value in values], 'r': int(reverse)}
+        return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode()
+
+    def _decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            values, reverse = payload['v'], bool(payload.get('r'))
+        except (TypeError, ValueError, KeyError, AttributeError):
+            raise NotFound('유효하지 않은 커서입니다.')
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound('유효하지 않은 커서입니다.')
+        return values, reverse
+
+    # 전체 개수
+    def _get_cursor_count(self, queryset, request):
+        count_mode = request.query_params.get(self.count_query_param)
+        if count_mode == 'exact':
+            return queryset.count()
+        if count_mode == 'approx':
+            return estimate_count(queryset)
+        return None
+
+
+def estimate_count(queryset):
+    """
+    PostgreSQL 실행 계획의 예상 행 수로 전체 개수를 추정 (COUNT(*) 없이)
+    PostgreSQL이 아니면 정확한 개수 반환
+    """
+    connection = connections[queryset.db or DEFAULT_DB_ALIAS]
+    if connection.vendor != 'postgresql':
+        return queryset.count()
+    sql, params = queryset.order_by().values('pk').query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class SegmentedSequence:
+    """
+    여러 구간(고정 항목 queryset + 나머지 queryset 등)을 하나의 목록처럼 페이지네이션하기 위한 시퀀스
+    - 전체를 리스트로 불러오지 않고, 요청한 범위에 해당하는 구간만 DB에서 LIMIT/OFFSET으로 조회
+    - 구간에는 QuerySet 또는 리스트(빈 자리 placeholder 등)를 사용할 수 있음
+    - counts: 구간별 개수를 미리 계산한 경우 전달 (없으면 구간마다 count() 호출)
+    """
+
+    def __init__(self, *segments, counts=None):
+        self.segments = segments
+        self._counts = list(counts) if counts is not None else None
+
+    @property
+    def counts(self):
+        if self._counts is None:
+            self._counts = [
+                segment.count() if isinstance(segment, QuerySet) else len(segment)
+                for segment in self.segments
+            ]
+        return self._counts
+
+    def count(self):
+        return sum(self.counts)
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            if index < 0:
+                index += self.count()
+            items = self[index:index + 1] if index >= 0 else []
+            if not items:
+                raise IndexError(index)
+            return items[0]
+
+        start, stop, _ = index.indices(self.count())
+        items = []
+        offset = 0
+        for segment, segment_count in zip(self.segments, self.counts):
+            segment_start = max(start - offset, 0)
+            segment_stop = min(stop - offset, segment_count)
+            if segment_start < segment_stop:
+                items.extend(segment[segment_start:segment_stop])
+            offset += segment_count
+            if offset >= stop:
+                break
+        return items
+
 
 class ReviewCustomPagination(PageNumberPagination):
     page_size = 4  # 기본 페이지 크기
@@ -11,15 +259,12 @@ class ReviewCustomPagination(PageNumberPagination):
         """
         빈 값을 추가하고 총 개수를 조정합니다.
         """
-        # 데이터가 리스트인지 QuerySet인지 확인
-        if not hasattr(queryset, 'count'):
-            queryset = list(queryset)
+        # 리스트, QuerySet, SegmentedSequence 모두 count()/len()으로 개수 계산 (전체를 불러오지 않음)
+        page = super().paginate_queryset(queryset, request, view)
 
         # 총 개수 계산 (빈 값 포함)
-        self.total_count = len(queryset)
-        
-        # 부모 클래스의 paginate_queryset 호출
-        return super().paginate_queryset(queryset, request, view)
+        self.total_count = self.page.paginator.count
+        return page
 
     def get_paginated_response(self, data):
         """
@@ -34,7 +279,7 @@ class ReviewCustomPagination(PageNumberPagination):
             },
         })
 
-class CustomPagination(PageNumberPagination):
+class CustomPagination(CursorModeMixin, PageNumberPagination):
     page_size = 20  # 기본 페이지 크기
     page_size_query_param = 'limit'  # 클라이언트가 페이지 크기를 제어
     page_query_param = 'page'  # 페이지 번호 쿼리 파라미터
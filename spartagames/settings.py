@@ -152,6 +152,17 @@ DATABASES = {
     }
 }
 
+# 캐시 (홈 피드 등) - Celery 브로커와 같은 Redis의 다른 DB 사용
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': 'redis://127.0.0.1:6379/1',
+    }
+}
+
+# 캐시와 별도로 보존해야 하는 데이터(조회수 이벤트 버퍼 등)용 Redis DB (spartagames.utils.get_redis)
+REDIS_URL = 'redis://127.0.0.1:6379/2'
+
 # Celery 브로커로 Django 데이터베이스 사용
 CELERY_BROKER_URL = 'redis://127.0.0.1:6379/0'
 CELERY_RESULT_BACKEND = 'django-db'
@@ -192,6 +203,56 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'accounts.tasks.routine_email_by_token',
         'schedule': crontab(day_of_month=1, hour=6, minute=0, month_of_year='*/3'),
     },
+    'verify-game-ratings-daily': {
+        'task': 'games.tasks.verify_game_ratings',
+        'schedule': crontab(hour=3, minute=30),
+    },
+    'roll-up-engagement': {
+        'task': 'games.tasks.roll_up_engagement',
+        'schedule': timedelta(minutes=5),
+    },
+    'build-home-feed': {
+        'task': 'games.tasks.build_home_feed',
+        'schedule': timedelta(minutes=10),
+    },
+    'requeue-stale-game-validations': {
+        'task': 'games.tasks.requeue_stale_game_validations',
+        'schedule': timedelta(minutes=30),
+    },
+    'abort-stale-game-uploads-daily': {
+        'task': 'games.tasks.abort_stale_game_uploads',
+        'schedule': crontab(hour=5, minute=10),
+    },
+    'prune-game-builds-daily': {
+        'task': 'qnas.tasks.prune_game_builds',
+        'schedule': crontab(hour=5, minute=0),
+    },
+    'flush-game-views': {
+        'task': 'games.tasks.flush_game_views',
+        'schedule': timedelta(minutes=1),
+    },
+    'flush-game-play-sessions': {
+        'task': 'games.tasks.flush_game_play_sessions',
+        'schedule': timedelta(minutes=1),
+    },
+    'dispatch-outbox': {
+        'task': 'commons.tasks.dispatch_outbox',
+        'schedule': timedelta(minutes=1),
+    },
+    'persist-chatbot-usage': {
+        'task': 'games.tasks.persist_chatbot_usage',
+        'schedule': timedelta(minutes=5),
+    },
+    'prune-outbox-daily': {
+        'task': 'commons.tasks.prune_outbox',
+        'schedule': crontab(hour=5, minute=20),
+    },
+}
+
+# 외부 알림 전송 방식 (commons.outbox), 테스트/로컬 개발에서는 'commons.transports.FakeTransport'로 교체
+OUTBOX_TRANSPORTS = {
+    'discord': 'commons.transports.DiscordTransport',
+    'gmail': 'commons.transports.GmailTransport',
 }
 
 # Auth User Model - Custom
@@ -242,11 +303,20 @@ SITE_ID = 2
 # DRF Auth setting - default: JWT
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.CachedJWTAuthentication",
     ],
     'DEFAULT_PAGINATION_CLASS': 'spartagames.pagination.CustomPagination',
     'PAGE_SIZE': 20,
     "EXCEPTION_HANDLER": "spartagames.exceptions.custom_exception_handler",
+    # spartagames.throttling (Redis 카운터)
+    "DEFAULT_THROTTLE_RATES": {
+        "chatbot": "10/day",  # 하루 당 질문 10개로 제한기준
+        "search": "60/min",
+        "email_send": "10/hour",
+        "email_address": "5/hour",
+        "email_code": "10/hour",
+        "presigned_url": "60/min",
+    },
 }
 
 # DRF JWT setting
@@ -256,8 +326,15 @@ SIMPLE_JWT = {
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
     "AUTH_HEADER_TYPES": ("Bearer",),
+    "TOKEN_REFRESH_SERIALIZER": "accounts.tokens.TokenRefreshSerializer",
+    "TOKEN_VERIFY_SERIALIZER": "accounts.tokens.TokenVerifySerializer",
+    "TOKEN_BLACKLIST_SERIALIZER": "accounts.tokens.TokenBlacklistSerializer",
 }
 
+# refresh 토큰 발급/블랙리스트 저장소 (accounts.token_store)
+# 기존 테이블로 되돌릴 때는 'accounts.token_store.DatabaseTokenStore'
+TOKEN_STORE = 'accounts.token_store.RedisTokenStore'
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
 
@@ -278,6 +355,12 @@ AWS_S3_SECRET_ACCESS_KEY = config.AWS_AUTH["aws_secret_access_key"]
 AWS_STORAGE_BUCKET_NAME = config.AWS_S3_BUCKET_NAME
 AWS_S3_REGION_NAME = "ap-northeast-2"
 AWS_S3_CUSTOM_DOMAIN = f"{AWS_STORAGE_BUCKET_NAME}.s3.{AWS_S3_REGION_NAME}.amazonaws.com"
+# 로컬 S3 호환 서버(MinIO 등)로 테스트할 때만 설정
+AWS_S3_ENDPOINT_URL = getattr(config, "AWS_S3_ENDPOINT_URL", None)
+# 게임 에셋을 배포할 때 미리 압축하는 방식 (gzip / br(brotli 패키지 필요) / identity)
+GAME_ASSET_ENCODING = "gzip"
+# 관리자 게임 zip 다운로드 방식 (stream: 웹 서버가 청크 단위로 전달 / redirect: presigned URL로 이동)
+GAME_DOWNLOAD_MODE = "stream"
 
 AWS_S3_FILE_OVERWRITE = False
 AWS_QUERYSTRING_AUTH = False
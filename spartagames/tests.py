@@ -0,0 +1,270 @@
+import base64
+import json
+from datetime import timedelta
+from unittest import mock
+
+import redis
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from accounts.models import BotCnt
+from games.models import Game
+from games.tasks import persist_chatbot_usage
+from games.tests import use_fake_redis
+from .pagination import CustomPagination, SegmentedSequence
+from .throttling import ChatbotThrottle, RedisRateThrottle
+
+
+def create_games(maker, count, created_at):
+    games = [
+        Game.objects.create(
+            title=f"game {i}", thumbnail="images/thumbnail/test.png", maker=maker, content="content",
+            gamefile="zips/test.zip", star=0, review_cnt=0, register_state=1,
+        )
+        for i in range(count)
+    ]
+    Game.objects.filter(pk__in=[game.pk for game in games]).update(created_at=created_at)
+    return games
+
+
+class CursorPaginationTest(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        maker = get_user_model().objects.create_user(
+            email="user@test.com", nickname="tester1", password="password1!", login_type="DEFAULT"
+        )
+        now = timezone.now()
+        # created_at이 같은 게임이 페이지 경계에 걸치도록 생성
+        create_games(maker, 2, now)
+        create_games(maker, 5, now - timedelta(hours=1))
+        create_games(maker, 2, now - timedelta(hours=2))
+        self.expected = list(Game.objects.order_by("-created_at", "-pk").values_list("pk", flat=True))
+
+    def paginate(self, url):
+        paginator = CustomPagination()
+        request = Request(self.factory.get(url))
+        page = paginator.paginate_queryset(Game.objects.order_by("-created_at"), request)
+        return [game.pk for game in page], paginator
+
+    def test_pages_through_equal_ordering_values(self):
+        pages = []
+        url = "/games/?pagination=cursor&limit=3"
+        while url:
+            ids, paginator = self.paginate(url)
+            self.assertTrue(paginator.cursor_mode)
+            pages.append(ids)
+            url = paginator.get_next_link()
+        self.assertEqual([pk for ids in pages for pk in ids], self.expected)
+        self.assertEqual([len(ids) for ids in pages], [3, 3, 3])
+
+        # 마지막 페이지에서 이전 링크를 따라가면 같은 페이지를 역순으로 지남
+        back = []
+        url = paginator.get_previous_link()
+        while url:
+            ids, paginator = self.paginate(url)
+            back.append(ids)
+            url = paginator.get_previous_link()
+        self.assertEqual(back, pages[-2::-1])
+        self.assertIsNotNone(paginator.get_next_link())
+
+    def test_first_page_has_no_previous_link(self):
+        ids, paginator = self.paginate("/games/?pagination=cursor&limit=4&count=exact")
+        self.assertEqual(ids, self.expected[:4])
+        self.assertIsNone(paginator.get_previous_link())
+        self.assertEqual(paginator.count, 9)
+
+    def test_page_number_mode_is_default(self):
+        ids, paginator = self.paginate("/games/?limit=4&page=2")
+        self.assertFalse(paginator.cursor_mode)
+        self.assertEqual(len(ids), 4)
+        self.assertIsNotNone(paginator.page)
+
+    def test_invalid_cursor(self):
+        wrong_length = base64.urlsafe_b64encode(json.dumps({"v": [1], "r": 0}).encode()).decode()
+        for cursor in ["zzz", "bm90IGpzb24=", wrong_length]:
+            with self.subTest(cursor=cursor), self.assertRaises(NotFound):
+                self.paginate(f"/games/?pagination=cursor&cursor={cursor}")
+
+
+class SegmentedSequenceTest(TestCase):
+    def setUp(self):
+        maker = get_user_model().objects.create_user(
+            email="user@test.com", nickname="tester1", password="password1!", login_type="DEFAULT"
+        )
+        games = create_games(maker, 7, timezone.now())
+        pinned_ids = [game.pk for game in games[:3]]
+        # 고정 항목 3개 + 빈 자리 2개 + 나머지 4개
+        self.pinned = Game.objects.filter(pk__in=pinned_ids).order_by("pk")
+        self.placeholders = [None, None]
+        self.rest = Game.objects.exclude(pk__in=pinned_ids).order_by("pk")
+        self.expected = list(self.pinned.all()) + self.placeholders + list(self.rest.all())
+
+    def sequence(self, counts=None):
+        return SegmentedSequence(self.pinned.all(), self.placeholders, self.rest.all(), counts=counts)
+
+    def test_count(self):
+        sequence = self.sequence()
+        with self.assertNumQueries(2):  # queryset 구간마다 한 번, 이후에는 재사용
+            self.assertEqual(sequence.count(), 9)
+            self.assertEqual(len(sequence), 9)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.sequence(counts=[3, 2, 4]).count(), 9)
+
+    def test_slices_across_segment_boundaries(self):
+        sequence = self.sequence(counts=[3, 2, 4])
+        for start in range(0, 10):
+            for stop in range(start, 11):
+                with self.subTest(start=start, stop=stop):
+                    self.assertEqual(sequence[start:stop], self.expected[start:stop])
+
+    def test_only_overlapping_segments_are_queried(self):
+        sequence = self.sequence(counts=[3, 2, 4])
+        with self.assertNumQueries(1):
+            self.assertEqual(sequence[0:2], self.expected[0:2])
+        with self.assertNumQueries(1):  # 고정 항목 끝 + 빈 자리
+            self.assertEqual(sequence[2:5], self.expected[2:5])
+        with self.assertNumQueries(2):  # 고정 항목 + 빈 자리 + 나머지
+            self.assertEqual(sequence[1:7], self.expected[1:7])
+        with self.assertNumQueries(1):
+            self.assertEqual(sequence[5:], self.expected[5:])
+
+    def test_index(self):
+        sequence = self.sequence()
+        self.assertEqual(sequence[0], self.expected[0])
+        self.assertIsNone(sequence[4])
+        self.assertEqual(sequence[-1], self.expected[-1])
+        with self.assertRaises(IndexError):
+            sequence[9]
+
+    def test_paginator_pages(self):
+        paginator = CustomPagination()
+        request = Request(APIRequestFactory().get("/games/?limit=4&page=2"))
+        page = paginator.paginate_queryset(self.sequence(), request)
+        self.assertEqual(page, self.expected[4:8])
+        self.assertEqual(paginator.page.paginator.count, 9)
+
+
+class FixedThrottle(RedisRateThrottle):
+    scope = "test"
+    rate = "3/min"
+
+    def get_cache_key(self, request, view):
+        return request.query_params.get("ident")
+
+
+class RedisRateThrottleTest(TestCase):
+    def setUp(self):
+        self.redis = use_fake_redis(self)
+        self.factory = APIRequestFactory()
+        self.now = 1_700_000_000.0  # 분 경계에서 20초 지난 시각
+        patcher = mock.patch("spartagames.throttling.time", mock.Mock(time=lambda: self.now))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def allow(self, throttle, ident="a"):
+        return throttle.allow_request(Request(self.factory.get("/", {"ident": ident})), None)
+
+    def test_limit_within_window(self):
+        throttle = FixedThrottle()
+        self.assertEqual([self.allow(throttle) for _ in range(5)], [True, True, True, False, False])
+        self.assertTrue(self.allow(throttle, ident="b"))  # 식별자별로 따로 셈
+        self.assertEqual(throttle.wait(), 40)
+
+        # 거부된 요청은 세지 않으므로 카운터 값 = 허용한 요청 수
+        key = throttle._counter_key("a", throttle.window())
+        self.assertEqual(int(self.redis.get(key)), 3)
+        self.assertAlmostEqual(self.redis.ttl(key), 40 + 60 * 60, delta=1)
+
+        self.now += 40  # 다음 창
+        self.assertTrue(self.allow(throttle))
+
+    def test_without_ident_is_not_limited(self):
+        throttle = FixedThrottle()
+        request = Request(self.factory.get("/"))
+        self.assertTrue(all(throttle.allow_request(request, None) for _ in range(5)))
+        self.assertEqual(self.redis.keys("throttle:*"), [])
+
+    def test_redis_failure(self):
+        with mock.patch.object(self.redis, "evalsha", side_effect=redis.ConnectionError), \
+                mock.patch.object(self.redis, "eval", side_effect=redis.ConnectionError):
+            self.assertTrue(self.allow(FixedThrottle()))  # 기본은 허용
+            with mock.patch.object(FixedThrottle, "fail_open", False):
+                self.assertFalse(self.allow(FixedThrottle()))
+
+
+class ChatbotThrottleTest(TestCase):
+    def setUp(self):
+        self.redis = use_fake_redis(self)
+        User = get_user_model()
+        self.users = [
+            User.objects.create_user(
+                email=f"user{i}@test.com", nickname=f"tester{i}", password="password1!", login_type="DEFAULT"
+            )
+            for i in range(2)
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(self.users[0])
+        message = mock.Mock(content="태그: 액션")
+        completion = mock.Mock(choices=[mock.Mock(message=message)])
+        patcher = mock.patch("games.views.CLIENT")
+        self.openai = patcher.start()
+        self.openai.chat.completions.create.return_value = completion
+        self.addCleanup(patcher.stop)
+
+    def ask(self):
+        return self.client.post("/games/api/chatbot/", {"input_data": "총 쏘는 게임"}, format="json")
+
+    def test_daily_limit_returns_429(self):
+        for _ in range(10):
+            response = self.ask()
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["data"], {"category": "액션"})
+
+        response = self.ask()
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.json()["error_code"], "throttled")
+        self.assertEqual(self.openai.chat.completions.create.call_count, 10)  # 한도를 넘으면 OpenAI를 호출하지 않음
+
+    def test_redis_failure_rejects(self):
+        with mock.patch.object(self.redis, "evalsha", side_effect=redis.ConnectionError), \
+                mock.patch.object(self.redis, "eval", side_effect=redis.ConnectionError):
+            self.assertEqual(self.ask().status_code, 429)
+        self.openai.chat.completions.create.assert_not_called()
+
+    def test_usage_is_persisted_idempotently(self):
+        for _ in range(3):
+            self.ask()
+        self.client.force_authenticate(self.users[1])
+        self.ask()
+
+        throttle = ChatbotThrottle()
+        usage = throttle.usage(throttle.window())
+        self.assertEqual(usage, {str(self.users[0].pk): 3, str(self.users[1].pk): 1})
+        self.assertEqual(throttle.usage(throttle.window() - 1), {})
+
+        today = timezone.now().date()  # UTC 날짜 (일 단위 창 경계)
+        for _ in range(2):  # 다시 실행해도 행이 늘지 않고 최신 값으로 덮어씀
+            self.assertEqual(persist_chatbot_usage(), "Persisted chatbot usage for 2 users.")
+            self.assertCountEqual(
+                BotCnt.objects.values_list("user_id", "date", "count"),
+                [(self.users[0].pk, today, 3), (self.users[1].pk, today, 1)],
+            )
+
+        self.client.force_authenticate(self.users[0])
+        self.ask()
+        persist_chatbot_usage()
+        self.assertEqual(BotCnt.objects.get(user=self.users[0], date=today).count, 4)
+
+    def test_deleted_users_are_skipped(self):
+        throttle = ChatbotThrottle()
+        window = throttle.window()
+        deleted_id = self.users[1].pk + 100
+        self.redis.sadd(throttle._usage_key(window), deleted_id, self.users[0].pk)
+        self.redis.set(throttle._counter_key(deleted_id, window), 2)
+        self.redis.set(throttle._counter_key(self.users[0].pk, window), 5)
+        self.assertEqual(persist_chatbot_usage(), "Persisted chatbot usage for 1 users.")
+        self.assertEqual(list(BotCnt.objects.values_list("user_id", "count")), [(self.users[0].pk, 5)])
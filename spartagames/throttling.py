@@ -0,0 +1,143 @@
+# Redis 카운터 기반 요청 제한 (DRF throttle 클래스)
+# - 고정 창(fixed window): 창 번호(현재 시각 // 창 길이)별 카운터 키를 Lua 스크립트로 확인 후 INCR (1회 왕복, 원자적)
+#   한도에 도달하면 더 늘리지 않으므로 카운터 값 = 허용한 요청 수 (BotCnt 등 사용량 기록에 그대로 사용)
+#   "10/day" 같은 일 단위 창은 UTC 날짜 경계와 같음
+# - DRF 기본 SimpleRateThrottle(캐시에 요청 시각 목록 저장)과 달리 동시 요청에도 한도를 넘지 않음
+# - 비율은 REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"][scope]
+# - record_usage가 True이면 창별로 식별자 집합을 함께 저장해 usage()로 사용량을 모아 DB에 반영할 수 있음
+import time
+
+import redis
+from rest_framework.throttling import SimpleRateThrottle
+
+from .utils import get_redis
+
+
+KEY_PREFIX = "throttle:"
+KEY_GRACE = 60 * 60  # 창이 끝난 뒤에도 사용량을 모을 수 있도록 키를 남겨두는 시간 (초)
+
+# KEYS[1]: 카운터, KEYS[2]: 식별자 집합 (record_usage가 아니면 빈 문자열)
+# ARGV: 한도, 키 TTL(초), 식별자
+# 반환: 허용하면 1
+ALLOW_SCRIPT = """
+local count = tonumber(redis.call('GET', KEYS[1]) or '0')
+if count >= tonumber(ARGV[1]) then
+    return 0
+end
+if redis.call('INCR', KEYS[1]) == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+if KEYS[2] ~= '' then
+    redis.call('SADD', KEYS[2], ARGV[3])
+    redis.call('EXPIRE', KEYS[2], ARGV[2])
+end
+return 1
+"""
+
+
+class RedisRateThrottle(SimpleRateThrottle):
+    """
+    get_cache_key는 요청 식별자(사용자 id, IP 등)를 반환 (None이면 제한하지 않음)
+    """
+
+    fail_open = True  # Redis 장애 시 요청 허용 여부
+    record_usage = False
+
+    def _counter_key(self, ident, window):
+        return f"{KEY_PREFIX}{self.scope}:{ident}:{window}"
+
+    def _usage_key(self, window):
+        return f"{KEY_PREFIX}{self.scope}:idents:{window}"
+
+    def window(self, now=None):
+        return int((now or time.time()) // self.duration)
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        ident = self.get_cache_key(request, view)
+        if ident is None:
+            return True
+
+        now = time.time()
+        window = self.window(now)
+        window_end = (window + 1) * self.duration
+        self.wait_seconds = window_end - now
+        try:
+            client = get_redis()
+            return bool(client.register_script(ALLOW_SCRIPT)(
+                keys=[self._counter_key(ident, window), self._usage_key(window) if self.record_usage else ""],
+                args=[self.num_requests, int(window_end - now) + KEY_GRACE, ident],
+            ))
+        except redis.RedisError:
+            return self.fail_open
+
+    def wait(self):
+        return self.wait_seconds
+
+    def usage(self, window):
+        """
+        창의 식별자별 사용량 {식별자: 횟수} (record_usage인 경우)
+        """
+        client = get_redis()
+        idents = [ident.decode() for ident in client.smembers(self._usage_key(window))]
+        if not idents:
+            return {}
+        counts = client.mget([self._counter_key(ident, window) for ident in idents])
+        return {ident: int(count) for ident, count in zip(idents, counts) if count is not None}
+
+
+class UserRateThrottle(RedisRateThrottle):
+    # 로그인 사용자는 id, 비회원은 IP로 구분
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return f"u{request.user.pk}"
+        return f"ip{self.get_ident(request)}"
+
+
+class IPRateThrottle(RedisRateThrottle):
+    def get_cache_key(self, request, view):
+        return self.get_ident(request)
+
+
+class EmailRateThrottle(RedisRateThrottle):
+    # 요청 본문의 이메일 주소로 구분 (같은 주소로의 메일 발송/인증 시도 제한)
+    def get_cache_key(self, request, view):
+        email = request.data.get("email")
+        if not isinstance(email, str) or not email:
+            return None
+        return email.strip().lower()
+
+
+class ChatbotThrottle(RedisRateThrottle):
+    # 하루 사용 횟수 제한, 사용량은 games.tasks.persist_chatbot_usage가 BotCnt에 반영
+    # OpenAI 호출 비용이 있으므로 Redis 장애 시 거부
+    scope = "chatbot"
+    fail_open = False
+    record_usage = True
+
+    def get_cache_key(self, request, view):
+        if not request.user or not request.user.is_authenticated:
+            return None
+        return str(request.user.pk)
+
+
+class SearchThrottle(UserRateThrottle):
+    scope = "search"
+
+
+class EmailSendThrottle(IPRateThrottle):
+    scope = "email_send"
+
+
+class EmailAddressThrottle(EmailRateThrottle):
+    scope = "email_address"
+
+
+class EmailCodeThrottle(EmailRateThrottle):
+    # 인증번호(6자리) 대입 시도 제한
+    scope = "email_code"
+
+
+class PresignedUrlThrottle(UserRateThrottle):
+    scope = "presigned_url"
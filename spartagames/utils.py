@@ -1,4 +1,9 @@
+import boto3
+import redis
+import requests
+from django.conf import settings
 from rest_framework import status
+from requests.adapters import HTTPAdapter
 from rest_framework.response import Response
 
 def std_response(
@@ -17,3 +22,67 @@ def std_response(
         "error_code": error_code
     }
     return Response(response, status=status_code)
+
+
+def get_s3_client():
+    """
+    S3 클라이언트 생성 (thread-safe, 스레드 간 공유 가능)
+    AWS_S3_ENDPOINT_URL을 설정하면 로컬 S3 호환 서버(MinIO 등)를 사용할 수 있음
+    """
+    return boto3.client(
+        "s3",
+        aws_access_key_id=settings.AWS_S3_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.AWS_S3_SECRET_ACCESS_KEY,
+        region_name=settings.AWS_S3_REGION_NAME,
+        endpoint_url=getattr(settings, "AWS_S3_ENDPOINT_URL", None),
+    )
+
+
+def http_session(pool_size=10):
+    """
+    커넥션을 재사용하는 requests 세션 (모듈 수준에서 한 번 만들어 공유)
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_redis_clients = {}
+
+
+def get_redis(url=None):
+    """
+    Redis 클라이언트 (URL별로 하나만 만들어 커넥션 풀 공유, thread-safe)
+    기본은 REDIS_URL 설정 (조회수 버퍼 등 캐시와 분리된 데이터용 DB)
+    """
+    url = url or settings.REDIS_URL
+    client = _redis_clients.get(url)
+    if client is None:
+        client = _redis_clients.setdefault(url, redis.Redis.from_url(url))
+    return client
+
+
+def drain_list(client, key, processing_key, handle, batch_size):
+    """
+    Redis 리스트(key)를 processing_key로 옮긴 뒤 batch_size개씩 handle(항목 목록)로 처리
+    handle이 끝난 배치만 리스트에서 제거하므로, 중간에 실패하면 다음 실행에서 남은 항목부터 이어서 처리
+    (동시에 실행되지 않도록 호출하는 쪽에서 잠금)
+    반환: 처리한 항목 수
+    """
+    # 이전 실행이 중간에 멈췄으면 남은 처리용 리스트부터 마저 처리
+    if not client.exists(processing_key):
+        try:
+            client.rename(key, processing_key)
+        except redis.ResponseError:  # 쌓인 항목 없음
+            return 0
+    processed = 0
+    while True:
+        items = client.lrange(processing_key, 0, batch_size - 1)
+        if not items:
+            break
+        handle(items)
+        client.ltrim(processing_key, len(items), -1)
+        processed += len(items)
+    return processed
@@ -2,6 +2,7 @@ import uuid
 
 from django.db import models
 from django.conf import settings
+from django.contrib.contenttypes.fields import GenericRelation
 from django.utils import timezone
 
 from commons.views import extract_content_text
@@ -62,6 +63,9 @@ class TeamBuildPost(models.Model):
     )
     title = models.CharField(max_length=100)
     thumbnail = models.ImageField(upload_to="images/thumbnail/teambuildings/")
+    renditions = GenericRelation(
+        "commons.ImageRendition", content_type_field="content_type", object_id_field="content_id"
+    )  # 이미지 변환본 (commons.images)
     purpose = models.CharField(max_length=20, choices=PURPOSE_CHOICES)
     duration = models.CharField(max_length=10, choices=DURATION_CHOICES)
     meeting_type = models.CharField(max_length=10, choices=MEETING_TYPE_CHOICES)
@@ -102,6 +106,9 @@ class TeamBuildProfile(models.Model):
         blank=True,
         null=True,
     )
+    renditions = GenericRelation(
+        "commons.ImageRendition", content_type_field="content_type", object_id_field="content_id"
+    )  # 이미지 변환본 (commons.images)
     career = models.CharField(max_length=10, choices=CAREER_CHOICES)
     my_role = models.ForeignKey(Role, on_delete=models.SET(if_role_deleted), related_name="team_build_profile")
     tech_stack = models.TextField(max_length=200, null=True, blank=True)
@@ -1,4 +1,6 @@
 from rest_framework import serializers
+
+from commons.images import serialize_renditions
 from .models import TeamBuildPost, TeamBuildProfile, TeamBuildPostComment
 
 
@@ -7,13 +9,14 @@ class TeamBuildPostSerializer(serializers.ModelSerializer):
     author_data = serializers.SerializerMethodField(read_only=True)
     want_roles = serializers.SerializerMethodField()
     thumbnail = serializers.SerializerMethodField()
+    thumbnail_renditions = serializers.SerializerMethodField()
 
     class Meta:
         model = TeamBuildPost
         fields = (
             'id', 'title', 'author_data', 'purpose',
             'duration', 'deadline', 'is_visible',
-            'status_chip', 'want_roles', 'thumbnail', 'content'
+            'status_chip', 'want_roles', 'thumbnail', 'thumbnail_renditions', 'content'
         )
         read_only_fields = ['id', 'author_data', 'is_visible', 'create_dt', 'update_dt', 'status_chip']
 
@@ -33,6 +36,9 @@ class TeamBuildPostSerializer(serializers.ModelSerializer):
     def get_thumbnail(self, obj):
         return obj.thumbnail.url if obj.thumbnail else None
 
+    def get_thumbnail_renditions(self, obj):
+        return serialize_renditions(obj, "thumbnail")
+
 
 class TeamBuildPostDetailSerializer(serializers.ModelSerializer):
     status_chip = serializers.CharField(read_only=True)
@@ -40,15 +46,16 @@ class TeamBuildPostDetailSerializer(serializers.ModelSerializer):
     thumbnail = serializers.ImageField(use_url=True)
     want_roles = serializers.SerializerMethodField()
     thumbnail_basic = serializers.SerializerMethodField(read_only=True)  # 기본 이미지 여부
+    thumbnail_renditions = serializers.SerializerMethodField(read_only=True)
     
     class Meta:
         model = TeamBuildPost
         fields = [
             "id", "title", "want_roles", "purpose", "duration", "meeting_type",
             "deadline", "contact", "content", "thumbnail", "author_data",
-            "create_dt", "status_chip", "thumbnail_basic"
+            "create_dt", "status_chip", "thumbnail_basic", "thumbnail_renditions"
         ]
-        read_only_fields = ["id", "author_data", "create_dt", "status_chip", "thumbnail_basic"]
+        read_only_fields = ["id", "author_data", "create_dt", "status_chip", "thumbnail_basic", "thumbnail_renditions"]
 
     def get_author_data(self, obj):
         return {
@@ -65,19 +72,23 @@ class TeamBuildPostDetailSerializer(serializers.ModelSerializer):
         # obj.thumbnail.name 은 MEDIA_ROOT 하위 경로를 반환
         return obj.thumbnail and obj.thumbnail.name == default_path
 
+    def get_thumbnail_renditions(self, obj):
+        return serialize_renditions(obj, "thumbnail")
+
 
 class RecommendedTeamBuildPostSerializer(serializers.ModelSerializer):
     status_chip = serializers.CharField(read_only=True)
     author_data = serializers.SerializerMethodField(read_only=True)
     want_roles = serializers.SerializerMethodField()
     thumbnail = serializers.SerializerMethodField()
+    thumbnail_renditions = serializers.SerializerMethodField()
 
     class Meta:
         model = TeamBuildPost
         fields = (
             'id', 'title', 'author_data', 'purpose',
             'duration', 'deadline', 'is_visible',
-            'status_chip', 'want_roles', 'thumbnail',
+            'status_chip', 'want_roles', 'thumbnail', 'thumbnail_renditions',
             'content_text',     # 추천 리스트 불러올 때는 html의 text 값만 가져오도록 수정
         )
         read_only_fields = ['id', 'author_data', 'is_visible', 'create_dt', 'update_dt', 'status_chip']
@@ -98,6 +109,9 @@ class RecommendedTeamBuildPostSerializer(serializers.ModelSerializer):
     def get_thumbnail(self, obj):
         return obj.thumbnail.url if obj.thumbnail else None
 
+    def get_thumbnail_renditions(self, obj):
+        return serialize_renditions(obj, "thumbnail")
+
 
 class TeamBuildPostCommentSerializer(serializers.ModelSerializer):
     author_data = serializers.SerializerMethodField(read_only=True)
@@ -120,6 +134,7 @@ class TeamBuildPostCommentSerializer(serializers.ModelSerializer):
 class TeamBuildProfileSerializer(serializers.ModelSerializer):
     author_data = serializers.SerializerMethodField()
     profile_image = serializers.SerializerMethodField()
+    profile_image_renditions = serializers.SerializerMethodField()
     game_genre = serializers.SlugRelatedField(
         many=True, read_only=True, slug_field="name"
     )
@@ -130,7 +145,7 @@ class TeamBuildProfileSerializer(serializers.ModelSerializer):
     class Meta:
         model = TeamBuildProfile
         fields = (
-            'id', 'author_data', 'profile_image', 'career', 'my_role',
+            'id', 'author_data', 'profile_image', 'profile_image_renditions', 'career', 'my_role',
             'tech_stack', 'game_genre', 'portfolio',
             'purpose', 'duration', 'meeting_type',
             'contact', 'title', 'content',
@@ -144,4 +159,7 @@ class TeamBuildProfileSerializer(serializers.ModelSerializer):
         }
 
     def get_profile_image(self, obj):
-        return obj.image.url if obj.image else None
\ No newline at end of file
+        return obj.image.url if obj.image else None
+
+    def get_profile_image_renditions(self, obj):
+        return serialize_renditions(obj, "image")
@@ -15,7 +15,7 @@ from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
 
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly, AllowAny  # 로그인 인증토큰
 from rest_framework.response import Response
 from rest_framework.views import APIView
@@ -36,10 +36,12 @@ from .serializers import (
 )
 from .utils import validate_want_roles, validate_choice, extract_srcs, parse_links, get_valid_duration_keys
 
+from accounts.authentication import get_active_user
 from games.models import GameCategory
 from games.utils import validate_image
 
 from spartagames.config import AWS_AUTH, AWS_S3_BUCKET_NAME, AWS_S3_REGION_NAME, AWS_S3_CUSTOM_DOMAIN, AWS_S3_BUCKET_IMAGES
+from spartagames.throttling import SearchThrottle
 from spartagames.utils import std_response
 from commons.models import UploadImage
 
@@ -223,12 +225,12 @@ class TeamBuildPostAPIView(APIView):
 
         # 페이지네이션
         paginator = TeamBuildPostPagination()
-        paginated_posts = paginator.paginate_queryset(teambuildposts, request)
+        paginated_posts = paginator.paginate_queryset(teambuildposts.prefetch_related("renditions"), request)
         serializer = TeamBuildPostSerializer(paginated_posts, many=True)
         response_data = paginator.get_paginated_response(serializer.data).data
 
         # 추천 게시글 직렬화
-        recommended_serializer = RecommendedTeamBuildPostSerializer(recommendedposts, many=True)
+        recommended_serializer = RecommendedTeamBuildPostSerializer(recommendedposts.prefetch_related("renditions"), many=True)
 
         # 프로필 존재 여부
         profile_exists = False
@@ -391,6 +393,7 @@ class TeamBuildPostAPIView(APIView):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])  # 인증이 필요할 경우 IsAuthenticated로 변경 가능
+@throttle_classes([SearchThrottle])
 def teambuild_post_search(request):
     keyword = request.query_params.get('keyword')
 
@@ -472,7 +475,7 @@ def teambuild_post_search(request):
 
     # 페이지네이션
     paginator = TeamBuildPostPagination()
-    paginated_teambuild_posts = paginator.paginate_queryset(teambuild_posts, request)
+    paginated_teambuild_posts = paginator.paginate_queryset(teambuild_posts.prefetch_related("renditions"), request)
     _serializer = TeamBuildPostSerializer(paginated_teambuild_posts, many=True)
     response_data = paginator.get_paginated_response(_serializer.data).data
 
@@ -1056,7 +1059,7 @@ class CreateTeamBuildProfileAPIView(APIView):
 
         # 페이지네이션 적용
         paginator = TeamBuildProfileListPagination()
-        paginated_profiles = paginator.paginate_queryset(profiles, request)
+        paginated_profiles = paginator.paginate_queryset(profiles.prefetch_related("renditions"), request)
         serializer = TeamBuildProfileSerializer(paginated_profiles, many=True)
         response_data = paginator.get_paginated_response(serializer.data).data
 
@@ -1210,6 +1213,7 @@ class CreateTeamBuildProfileAPIView(APIView):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])  # 인증이 필요할 경우 IsAuthenticated로 변경 가능
+@throttle_classes([SearchThrottle])
 def teambuild_profile_search(request):
     keyword = request.query_params.get('keyword')
 
@@ -1295,7 +1299,7 @@ def teambuild_profile_search(request):
 
     # 페이지네이션 적용
     paginator = TeamBuildProfileListPagination()
-    paginated_teambuild_profiles = paginator.paginate_queryset(teambuild_profiles, request)
+    paginated_teambuild_profiles = paginator.paginate_queryset(teambuild_profiles.prefetch_related("renditions"), request)
     serializer = TeamBuildProfileSerializer(paginated_teambuild_profiles, many=True)
     response_data = paginator.get_paginated_response(serializer.data).data
 
@@ -1326,7 +1330,7 @@ class TeamBuildProfileAPIView(APIView):
     # 개인 프로필 호출
     def get(self, request, user_id):
         try:
-            user = get_user_model().objects.get(pk=user_id, is_active=True)
+            user = get_active_user(request, user_id)
         except get_user_model().DoesNotExist:
             return std_response(
                 message="회원정보가 존재하지 않습니다.",
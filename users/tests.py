@@ -1,3 +1,129 @@
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
 
-# Create your tests here.
+from accounts.authentication import get_active_user, user_cache_key
+from games.models import Chip, Game, GameCategory, Like
+from games.tests import LOCMEM_CACHES, QueryCountTestMixin
+from spartagames.config import ADMIN_STAFF_EMAIL, ADMIN_USER_EMAIL
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class UserGameListQueryCountTest(QueryCountTestMixin, TestCase):
+    """
+    유저 페이지 게임 목록 API의 쿼리 수가 게임 수와 무관한지 확인
+    """
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="user@test.com", nickname="tester1", password="password1!", login_type="DEFAULT"
+        )
+        self.categories = [GameCategory.objects.create(name=name) for name in ["Action", "Puzzle"]]
+        self.chips = [Chip.objects.create(name=name) for name in ["EASY", "HARD", "Daily Top", "Review Top"]]
+        self.user.game_category.set([self.categories[0]])
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_games(self, count, liked):
+        start = Game.objects.count()
+        for i in range(start, start + count):
+            game = Game.objects.create(
+                title=f"game {i}", thumbnail="images/thumbnail/test.png", maker=self.user, content="content",
+                gamefile="zips/test.zip", star=0, review_cnt=0, register_state=1,
+            )
+            game.category.set([self.categories[i % 2]])
+            game.chip.set([self.chips[i % 2], self.chips[2 + i % 2]])
+            if liked:
+                Like.objects.create(user=self.user, game=game)
+
+    def test_like_games(self):
+        self.create_games(3, liked=True)
+        first, second = self.assertConstantQueries(
+            f"/users/api/{self.user.pk}/likes/?limit=100", lambda: self.create_games(3, liked=True)
+        )
+        self.assertEqual((len(first), len(second)), (3, 6))
+
+    def test_gamepacks(self):
+        # 즐겨찾기 1개 + 관심 카테고리 게임으로 채우는 경로
+        self.create_games(1, liked=True)
+        self.create_games(2, liked=False)
+        first, second = self.assertConstantQueries(
+            f"/users/api/{self.user.pk}/gamepacks/", lambda: self.create_games(4, liked=False)
+        )
+        self.assertEqual((len(first), len(second)), (2, 4))
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CachedUserTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        User = get_user_model()
+        self.user = User.objects.create_user(
+            email="user@test.com", nickname="tester1", password="password1!", login_type="DEFAULT"
+        )
+        self.other = User.objects.create_user(
+            email="other@test.com", nickname="other", password="password1!", login_type="DEFAULT"
+        )
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}")
+
+    def user_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        table = get_user_model()._meta.db_table
+        return [query["sql"] for query in queries if f'FROM "{table}"' in query["sql"]]
+
+    def test_profile_reuses_cached_user(self):
+        # 첫 요청: 인증에서 한 번 조회, 같은 사용자의 프로필은 요청 단위 identity map에서 재사용
+        self.assertEqual(len(self.user_queries(f"/users/api/{self.user.pk}/")), 1)
+        self.assertIsNotNone(cache.get(user_cache_key(self.user.pk)))
+        self.assertEqual(self.user_queries(f"/users/api/{self.user.pk}/"), [])
+
+        self.assertEqual(len(self.user_queries(f"/users/api/{self.other.pk}/")), 1)
+        self.assertEqual(self.user_queries(f"/users/api/{self.other.pk}/"), [])
+
+    def test_save_and_delete_invalidate_cache(self):
+        self.user_queries(f"/users/api/{self.other.pk}/")
+        key = user_cache_key(self.other.pk)
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.other.nickname = "renamed"
+            self.other.save()
+            self.assertIsNone(cache.get(key))
+            cache.set(key, "stale")  # 커밋 전에 다른 요청이 이전 값을 다시 캐시한 경우
+        self.assertEqual(len(callbacks), 1)
+        self.assertIsNone(cache.get(key))
+
+        response = self.client.get(f"/users/api/{self.other.pk}/")
+        self.assertEqual(response.json()["data"]["nickname"], "renamed")
+
+        self.assertIsNotNone(cache.get(key))
+        for email, nickname in [(ADMIN_STAFF_EMAIL, "staff"), (ADMIN_USER_EMAIL, "admin")]:
+            # 탈퇴 회원의 기록을 넘겨받는 관리자 계정
+            get_user_model().objects.create_user(
+                email=email, nickname=nickname, password="password1!", login_type="DEFAULT"
+            )
+        self.other.delete()
+        self.assertIsNone(cache.get(key))
+        self.assertEqual(self.client.get(f"/users/api/{self.other.pk}/").status_code, 404)
+
+    def test_inactive_user(self):
+        self.other.is_active = False
+        self.other.save()
+        request = RequestFactory().get("/")
+        for user_id in [self.other.pk, "abc", None, 0]:
+            with self.subTest(user_id=user_id), self.assertRaises(get_user_model().DoesNotExist):
+                get_active_user(request, user_id)
+        self.assertEqual(self.client.get(f"/users/api/{self.other.pk}/").status_code, 404)
+
+        # 비활성화된 사용자의 토큰은 캐시에 남아 있어도 인증 실패
+        self.user_queries(f"/users/api/{self.user.pk}/")
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(f"/users/api/{self.user.pk}/").status_code, 401)
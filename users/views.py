@@ -6,23 +6,26 @@ from django.shortcuts import get_object_or_404, render
 from django.utils import timezone
 
 from rest_framework import status
-from rest_framework.decorators import api_view, renderer_classes
+from rest_framework.decorators import api_view, renderer_classes, throttle_classes
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from spartagames.throttling import EmailCodeThrottle
 from spartagames.utils import std_response
 from spartagames.pagination import CustomPagination
 
 from .serializers import MyGameListSerializer
 
+from accounts.authentication import get_active_user
 from accounts.models import EmailVerification
+from commons.images import serialize_renditions
 from games.models import (
     Game,
     GameCategory,
 )
-from games.serializers import GameListSerializer
+from games.serializers import GameListSerializer, prefetch_game_list
 from teambuildings.models import TeamBuildPost
 from teambuildings.pagination import MyTeamBuildPostPagination
 from teambuildings.serializers import TeamBuildPostSerializer
@@ -41,7 +44,7 @@ class ProfileAPIView(APIView):
 
     def get(self, request, user_id):
         try:
-            user = get_user_model().objects.get(pk=user_id, is_active=True)
+            user = get_active_user(request, user_id)
         except get_user_model().DoesNotExist:
             return std_response(
                 message="회원정보가 존재하지 않습니다.",
@@ -65,6 +68,7 @@ class ProfileAPIView(APIView):
             "nickname": user.nickname,
             "login_type": user.login_type,
             "profile_image": profile_image,
+            "profile_image_renditions": serialize_renditions(user, "image"),
             "is_staff": user.is_staff,
             "is_maker": user.is_maker,
             "introduce": user.introduce,
@@ -183,6 +187,7 @@ class ProfileAPIView(APIView):
         data = {
             "nickname": user.nickname,
             "profile_image": user.image.url if user.image else "이미지 없음",
+            "profile_image_renditions": serialize_renditions(user, "image"),
             "is_staff": user.is_staff,
             "is_maker": user.is_maker,
             "introduce": user.introduce,
@@ -343,6 +348,7 @@ def change_password(request, user_id):
 
 
 @api_view(["POST"])
+@throttle_classes([EmailCodeThrottle])
 def password_verify_code(request):
     email = request.data.get('email')
     code = request.data.get('code')
@@ -459,7 +465,7 @@ def reset_password(request):
 @api_view(["GET"])
 def my_games(request, user_id):
     try:
-        user = get_user_model().objects.get(pk=user_id, is_active=True)
+        user = get_active_user(request, user_id)
     except get_user_model().DoesNotExist:
         return std_response(
             message="회원정보가 존재하지 않습니다.",
@@ -467,7 +473,7 @@ def my_games(request, user_id):
             error_code="SERVER_FAIL",
             status_code=status.HTTP_404_NOT_FOUND
         )
-    my_games = user.games.filter(is_visible=True).order_by('-created_at')
+    my_games = prefetch_game_list(user.games.filter(is_visible=True).order_by('-created_at'))
     if not my_games.exists():
         return std_response(
             message=f"{request.user}가 제작한 게임이 없습니다.",
@@ -526,7 +532,7 @@ def my_games(request, user_id):
 @api_view(["GET"])
 def like_games(request, user_id):
     try:
-        user = get_user_model().objects.get(pk=user_id, is_active=True)
+        user = get_active_user(request, user_id)
     except get_user_model().DoesNotExist:
         return std_response(
             message="회원정보가 존재하지 않습니다.",
@@ -534,7 +540,7 @@ def like_games(request, user_id):
             error_code="SERVER_FAIL",
             status_code=status.HTTP_404_NOT_FOUND
         )
-    like_games = Game.objects.filter(likes__user=user, is_visible=True, register_state=1)
+    like_games = prefetch_game_list(Game.objects.filter(likes__user=user, is_visible=True, register_state=1))
     if not like_games.exists():
         return std_response(
             data={},
@@ -596,7 +602,7 @@ def like_games(request, user_id):
 @api_view(["GET"])
 def gamepacks(request, user_id):
     try:
-        user = get_user_model().objects.get(pk=user_id, is_active=True)
+        user = get_active_user(request, user_id)
     except get_user_model().DoesNotExist:
         return std_response(
             message="회원정보가 존재하지 않습니다.",
@@ -615,21 +621,23 @@ def gamepacks(request, user_id):
     
     # 게임팩 세팅
     # 1. 즐겨찾기한 게임
-    liked_games = Game.objects.filter(likes__user=user, is_visible=True, register_state=1).order_by('-created_at')[:4]
+    liked_games = list(prefetch_game_list(
+        Game.objects.filter(likes__user=user, is_visible=True, register_state=1).order_by('-created_at')[:4]
+    ))
     # 2. 관심 있는 카테고리의 게임 가져오기
     interested_categories = user.game_category.all()
-    category_games = Game.objects.filter(
+    category_games = prefetch_game_list(Game.objects.filter(
         category__in=interested_categories,
         is_visible=True,
         register_state=1
-    ).exclude(likes__user=user).distinct().order_by('-star','-created_at')
+    ).exclude(likes__user=user).distinct().order_by('-star','-created_at'))
     # 좋아요한 게임과 최근 플레이한 게임을 조합하여 최대 4개의 게임으로 구성
-    liked_games_count = liked_games.count()
+    liked_games_count = len(liked_games)
     if liked_games_count < 4:
         additional_category_games = category_games[:4 - liked_games_count]
-        combined_games = list(liked_games) + list(additional_category_games)
+        combined_games = liked_games + list(additional_category_games)
     else:
-        combined_games = list(liked_games)  # 좋아요한 게임만으로 4개가 이미 채워짐
+        combined_games = liked_games  # 좋아요한 게임만으로 4개가 이미 채워짐
     
     # 리턴
     if combined_games:
@@ -640,7 +648,7 @@ def gamepacks(request, user_id):
             status_code=status.HTTP_200_OK
         )
     else:
-        latest_games=list(Game.objects.filter(is_visible=True, register_state=1).order_by('-created_at')[:4])
+        latest_games=list(prefetch_game_list(Game.objects.filter(is_visible=True, register_state=1).order_by('-created_at')[:4]))
         serializer = GameListSerializer(latest_games, many=True, context={'user': user})
         return std_response(
             data=serializer.data,
@@ -652,7 +660,7 @@ def gamepacks(request, user_id):
 @api_view(["GET"])
 def recently_played_games(request, user_id):
     try:
-        user = get_user_model().objects.get(pk=user_id, is_active=True)
+        user = get_active_user(request, user_id)
     except get_user_model().DoesNotExist:
         return std_response(
             message="회원정보가 존재하지 않습니다.",
@@ -670,7 +678,9 @@ def recently_played_games(request, user_id):
         )
     
     # 최근 플레이한 게임
-    recently_played_games = Game.objects.filter(is_visible=True, register_state=1, totalplaytime__user=user).order_by('-totalplaytime__latest_at').distinct()
+    recently_played_games = prefetch_game_list(
+        Game.objects.filter(is_visible=True, register_state=1, totalplaytime__user=user).order_by('-totalplaytime__latest_at').distinct()
+    )
 
     # 리턴
     if recently_played_games:
@@ -701,7 +711,7 @@ def recently_played_games(request, user_id):
 @api_view(["GET"])
 def teambuild_posts(request, user_id):
     try:
-        user = get_user_model().objects.get(pk=user_id, is_active=True)
+        user = get_active_user(request, user_id)
     except get_user_model().DoesNotExist:
         return std_response(
             message="회원정보가 존재하지 않습니다.",